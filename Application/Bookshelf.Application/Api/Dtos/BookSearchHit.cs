@@ -0,0 +1,18 @@
+namespace Bookshelf.Application.Api.Dtos;
+
+/// <summary>
+/// A book matching a full-text search
+/// </summary>
+/// <param name="Title">The title of the book</param>
+/// <param name="FullPath">The full path of the book</param>
+/// <param name="Author">The author of the book, or null if unknown</param>
+/// <param name="Score">The relevance of the book for the query, higher is better</param>
+/// <param name="MatchesMetadata">Whether a query term occurs in the title, author or subject</param>
+/// <param name="Pages">The pages with the most query terms, in page order</param>
+public sealed record BookSearchHit(
+    string Title,
+    string FullPath,
+    string? Author,
+    double Score,
+    bool MatchesMetadata,
+    IReadOnlyList<int> Pages);
@@ -0,0 +1,18 @@
+namespace Bookshelf.Application.Api.Dtos;
+
+/// <summary>
+/// Request to build or update the search index of a bookshelf directory
+/// </summary>
+/// <param name="BookshelfDirectory">The bookshelf directory containing PDF files</param>
+/// <param name="MaxParallelism">The maximum number of books whose text is extracted concurrently</param>
+/// <param name="Rebuild">Whether to discard the existing index and extract the text of every book again</param>
+public sealed record BuildIndexRequest(
+    string BookshelfDirectory,
+    int MaxParallelism = BuildIndexRequest.SequentialParallelism,
+    bool Rebuild = false)
+{
+    /// <summary>
+    /// Degree of parallelism that extracts one book after another
+    /// </summary>
+    public const int SequentialParallelism = 1;
+}
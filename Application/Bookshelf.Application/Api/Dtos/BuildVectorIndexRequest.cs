@@ -0,0 +1,18 @@
+namespace Bookshelf.Application.Api.Dtos;
+
+/// <summary>
+/// Request to build or update the vector index of a bookshelf directory
+/// </summary>
+/// <param name="BookshelfDirectory">The bookshelf directory containing PDF files</param>
+/// <param name="MaxParallelism">The maximum number of books that are extracted and embedded concurrently</param>
+/// <param name="Rebuild">Whether to discard the existing index and embed every book again</param>
+public sealed record BuildVectorIndexRequest(
+    string BookshelfDirectory,
+    int MaxParallelism = BuildVectorIndexRequest.SequentialParallelism,
+    bool Rebuild = false)
+{
+    /// <summary>
+    /// Degree of parallelism that embeds one book after another
+    /// </summary>
+    public const int SequentialParallelism = 1;
+}
@@ -6,4 +6,12 @@ namespace Bookshelf.Application.Api.Dtos;
 public sealed record CollectionProcessingResult(
     string OutputPath,
     bool WasMerged,
-    bool WasCopied);
+    bool WasCopied,
+    bool WasSkipped = false,
+    long BytesCopied = 0,
+    long BytesShared = 0,
+    bool WasDuplicate = false,
+    long MergedSourceBytes = 0,
+    long MergedOutputBytes = 0,
+    long CompressionSavedBytes = 0,
+    TimeSpan MergeTime = default);
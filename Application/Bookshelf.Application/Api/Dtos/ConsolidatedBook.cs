@@ -0,0 +1,57 @@
+namespace Bookshelf.Application.Api.Dtos;
+
+/// <summary>
+/// Specifies the outcome of consolidating a single book
+/// </summary>
+public enum ConsolidatedBookStatus
+{
+    /// <summary>
+    /// A single PDF was copied or linked into the bookshelf
+    /// </summary>
+    Copied,
+
+    /// <summary>
+    /// A collection was merged into one book
+    /// </summary>
+    Merged,
+
+    /// <summary>
+    /// The book is unchanged since the previous consolidation
+    /// </summary>
+    Skipped,
+
+    /// <summary>
+    /// The book was left out because its content equals a book consolidated before
+    /// </summary>
+    Duplicate,
+
+    /// <summary>
+    /// The book could not be copied or merged
+    /// </summary>
+    Failed
+}
+
+/// <summary>
+/// A book reported as soon as its consolidation finished
+/// </summary>
+/// <param name="Name">The display name of the book</param>
+/// <param name="SourcePath">The full path of the root PDF or collection directory</param>
+/// <param name="OutputPath">The path of the book in the bookshelf, or null for duplicates and failures</param>
+/// <param name="Status">The outcome of the consolidation</param>
+/// <param name="Change">How the book relates to the previous run</param>
+/// <param name="SourcePdfCount">The number of source PDFs of the book</param>
+/// <param name="BytesCopied">The bytes written to the bookshelf</param>
+/// <param name="BytesShared">The bytes shared with the source through a reflink or hard link</param>
+/// <param name="DeduplicatedBytes">The bytes left out because their content is consolidated already</param>
+/// <param name="DuplicateOf">The name of the book with identical content, or null if the book is unique</param>
+public sealed record ConsolidatedBook(
+    string Name,
+    string SourcePath,
+    string? OutputPath,
+    ConsolidatedBookStatus Status,
+    ConsolidationChangeKind Change,
+    int SourcePdfCount,
+    long BytesCopied = 0,
+    long BytesShared = 0,
+    long DeduplicatedBytes = 0,
+    string? DuplicateOf = null);
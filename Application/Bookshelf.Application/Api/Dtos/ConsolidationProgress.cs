@@ -0,0 +1,43 @@
+namespace Bookshelf.Application.Api.Dtos;
+
+/// <summary>
+/// Snapshot of a running consolidation
+/// </summary>
+/// <param name="TotalBooks">The number of root PDFs and collections in the source directory, 0 until it is walked</param>
+/// <param name="CompletedBooks">The number of books copied, merged, skipped or left out so far</param>
+/// <param name="ProcessedBytes">The source bytes of the books copied or merged so far</param>
+/// <param name="BytesPerSecond">The current throughput, smoothed over the recent updates</param>
+/// <param name="Elapsed">The time since the consolidation started</param>
+/// <param name="CurrentActivity">What the consolidation is doing right now</param>
+public sealed record ConsolidationProgress(
+    int TotalBooks,
+    int CompletedBooks,
+    long ProcessedBytes,
+    double BytesPerSecond,
+    TimeSpan Elapsed,
+    string CurrentActivity)
+{
+    /// <summary>
+    /// Gets the completed fraction of the books, between 0 and 1
+    /// </summary>
+    public double CompletedFraction => TotalBooks == 0 ? 0 : (double)CompletedBooks / TotalBooks;
+
+    /// <summary>
+    /// Gets the estimated time until all books are completed, extrapolated from the books completed so far,
+    /// or null before the first book is completed
+    /// </summary>
+    public TimeSpan? EstimatedRemaining
+    {
+        get
+        {
+            var canEstimate = CompletedBooks > 0 && TotalBooks > 0;
+            if (!canEstimate)
+            {
+                return null;
+            }
+
+            var remainingBooks = Math.Max(TotalBooks - CompletedBooks, 0);
+            return Elapsed * ((double)remainingBooks / CompletedBooks);
+        }
+    }
+}
@@ -1,8 +1,28 @@
+using Bookshelf.Application.Core.ValueObjects;
+
 namespace Bookshelf.Application.Api.Dtos;
 
 /// <summary>
 /// Request to consolidate PDF files
 /// </summary>
+/// <param name="SourceDirectory">The source directory containing PDF files and collections</param>
+/// <param name="TargetDirectory">The target bookshelf directory</param>
+/// <param name="MaxParallelism">The maximum number of books processed concurrently</param>
+/// <param name="FullRebuild">Whether to reprocess every book even if its sources are unchanged since the last run</param>
+/// <param name="AllowHardLinks">Whether copied books may be hard links to their source PDFs</param>
+/// <param name="Deduplicate">Whether byte-identical books and collection parts are consolidated only once</param>
+/// <param name="CompressionProfile">How much effort is spent compressing merged collections</param>
 public sealed record ConsolidationRequest(
     string SourceDirectory,
-    string TargetDirectory);
+    string TargetDirectory,
+    int MaxParallelism = ConsolidationRequest.SequentialParallelism,
+    bool FullRebuild = false,
+    bool AllowHardLinks = false,
+    bool Deduplicate = false,
+    PdfCompressionProfile CompressionProfile = PdfCompressionProfile.None)
+{
+    /// <summary>
+    /// Degree of parallelism that processes one book after another
+    /// </summary>
+    public const int SequentialParallelism = 1;
+}
@@ -0,0 +1,73 @@
+using Bookshelf.Application.Core.ValueObjects;
+
+namespace Bookshelf.Application.Api.Dtos;
+
+/// <summary>
+/// Specifies how a planned consolidation work item is processed
+/// </summary>
+public enum ConsolidationWorkKind
+{
+    /// <summary>
+    /// A PDF in the source root that is copied as-is
+    /// </summary>
+    IndividualPdf,
+
+    /// <summary>
+    /// A collection folder containing exactly one PDF that is copied as-is
+    /// </summary>
+    SinglePdfCollection,
+
+    /// <summary>
+    /// A collection folder containing several PDFs that are merged into one book
+    /// </summary>
+    MultiPdfCollection
+}
+
+/// <summary>
+/// Specifies how a work item relates to the result of the previous consolidation run
+/// </summary>
+public enum ConsolidationChangeKind
+{
+    /// <summary>
+    /// The book was not consolidated before
+    /// </summary>
+    New,
+
+    /// <summary>
+    /// The book was consolidated before but its sources changed
+    /// </summary>
+    Updated,
+
+    /// <summary>
+    /// The book was consolidated before and its sources are unchanged
+    /// </summary>
+    Unchanged
+}
+
+/// <summary>
+/// A unit of consolidation work planned before any file is written
+/// </summary>
+/// <param name="Kind">How the work item is processed</param>
+/// <param name="SourcePath">The full path of the root PDF or collection directory</param>
+/// <param name="Name">The display name of the book</param>
+/// <param name="SourcePdfs">The source PDFs in merge order</param>
+/// <param name="OutputFileName">The desired file name of the book in the target directory</param>
+/// <param name="Destination">The assigned destination, or null before naming or for duplicates</param>
+/// <param name="Change">How the work item relates to the previous run</param>
+/// <param name="Fingerprints">The fingerprints of the source PDFs in merge order</param>
+/// <param name="DuplicateOf">The name of an earlier book with identical content, or null if the book is unique</param>
+/// <param name="DeduplicatedBytes">The bytes of source PDFs left out because their content is consolidated already</param>
+/// <param name="RetiredOutputFileName">The output file name of the previous run if the book is now named differently, removed
+/// once the book is written under its new name</param>
+public sealed record ConsolidationWorkItem(
+    ConsolidationWorkKind Kind,
+    string SourcePath,
+    string Name,
+    IReadOnlyList<string> SourcePdfs,
+    string OutputFileName,
+    FileDestination? Destination = null,
+    ConsolidationChangeKind Change = ConsolidationChangeKind.New,
+    IReadOnlyList<SourceFingerprint>? Fingerprints = null,
+    string? DuplicateOf = null,
+    long DeduplicatedBytes = 0,
+    string? RetiredOutputFileName = null);
@@ -0,0 +1,9 @@
+namespace Bookshelf.Application.Api.Dtos;
+
+/// <summary>
+/// Snapshot of a running index build
+/// </summary>
+/// <param name="TotalBooks">The number of new or changed books whose text is extracted</param>
+/// <param name="CompletedBooks">The number of those books extracted so far</param>
+/// <param name="CurrentBook">The file name of the book completed last</param>
+public sealed record IndexProgress(int TotalBooks, int CompletedBooks, string CurrentBook);
@@ -42,12 +42,48 @@ public enum SortDirection
     Descending
 }
 
+/// <summary>
+/// Specifies how the persistent book metadata cache is used
+/// </summary>
+public enum BookMetadataCacheMode
+{
+    /// <summary>
+    /// Reuse cached metadata of unchanged books and update the cache
+    /// </summary>
+    Enabled,
+
+    /// <summary>
+    /// Neither read nor write the cache
+    /// </summary>
+    Disabled,
+
+    /// <summary>
+    /// Ignore the existing cache and replace it with freshly read metadata
+    /// </summary>
+    Rebuild
+}
+
 /// <summary>
 /// Request to list books in a bookshelf directory
 /// </summary>
+/// <param name="BookshelfDirectory">The bookshelf directory containing PDF files</param>
+/// <param name="TitleFilter">Optional case-insensitive title filter</param>
+/// <param name="IncludeDetails">Whether to read details such as the page count of each book</param>
+/// <param name="SortBy">The field to sort by</param>
+/// <param name="SortDirection">The sort direction</param>
+/// <param name="MaxParallelism">The maximum number of books whose details are read concurrently</param>
+/// <param name="CacheMode">How the persistent book metadata cache is used</param>
 public sealed record ListBooksRequest(
     string BookshelfDirectory,
     string? TitleFilter = null,
     bool IncludeDetails = false,
     BookListSortField SortBy = BookListSortField.Title,
-    SortDirection SortDirection = SortDirection.Ascending);
+    SortDirection SortDirection = SortDirection.Ascending,
+    int MaxParallelism = ListBooksRequest.SequentialParallelism,
+    BookMetadataCacheMode CacheMode = BookMetadataCacheMode.Enabled)
+{
+    /// <summary>
+    /// Degree of parallelism that reads one book after another
+    /// </summary>
+    public const int SequentialParallelism = 1;
+}
@@ -0,0 +1,32 @@
+namespace Bookshelf.Application.Api.Dtos;
+
+/// <summary>
+/// Request to retrieve the passages of a bookshelf that are most similar to a question
+/// </summary>
+/// <param name="BookshelfDirectory">The bookshelf directory whose vector index is searched</param>
+/// <param name="Question">The question the passages should answer</param>
+/// <param name="MaxPassages">The maximum number of passages returned</param>
+/// <param name="MinScore">The lowest cosine similarity of a returned passage</param>
+/// <param name="Probes">The number of inverted file lists searched; more lists find more passages but take longer</param>
+public sealed record RetrievePassagesRequest(
+    string BookshelfDirectory,
+    string Question,
+    int MaxPassages = RetrievePassagesRequest.DefaultMaxPassages,
+    double MinScore = RetrievePassagesRequest.DefaultMinScore,
+    int Probes = RetrievePassagesRequest.DefaultProbes)
+{
+    /// <summary>
+    /// Number of passages returned unless the request asks for another number
+    /// </summary>
+    public const int DefaultMaxPassages = 5;
+
+    /// <summary>
+    /// Lowest similarity of a returned passage unless the request asks for another one
+    /// </summary>
+    public const double DefaultMinScore = 0.1;
+
+    /// <summary>
+    /// Number of inverted file lists searched unless the request asks for another number
+    /// </summary>
+    public const int DefaultProbes = 32;
+}
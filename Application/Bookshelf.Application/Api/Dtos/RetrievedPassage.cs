@@ -0,0 +1,16 @@
+namespace Bookshelf.Application.Api.Dtos;
+
+/// <summary>
+/// A passage of a book retrieved for a question, with the book and page to cite
+/// </summary>
+/// <param name="Title">The title of the book</param>
+/// <param name="FullPath">The full path of the book</param>
+/// <param name="Page">The page number of the passage starting at 1</param>
+/// <param name="Text">The text of the passage</param>
+/// <param name="Score">The cosine similarity of the passage and the question, higher is better</param>
+public sealed record RetrievedPassage(
+    string Title,
+    string FullPath,
+    int Page,
+    string Text,
+    double Score);
@@ -0,0 +1,28 @@
+namespace Bookshelf.Application.Api.Dtos;
+
+/// <summary>
+/// Request to search the indexed books of a bookshelf directory
+/// </summary>
+/// <param name="BookshelfDirectory">The bookshelf directory whose index is searched</param>
+/// <param name="Query">
+/// The words every matching book must contain, case- and accent-insensitive; a word ending in * matches every word
+/// starting with it
+/// </param>
+/// <param name="MaxResults">The maximum number of books returned</param>
+/// <param name="MaxPagesPerHit">The maximum number of pages returned per book</param>
+public sealed record SearchBooksRequest(
+    string BookshelfDirectory,
+    string Query,
+    int MaxResults = SearchBooksRequest.DefaultMaxResults,
+    int MaxPagesPerHit = SearchBooksRequest.DefaultMaxPagesPerHit)
+{
+    /// <summary>
+    /// Number of books returned unless the request asks for another number
+    /// </summary>
+    public const int DefaultMaxResults = 20;
+
+    /// <summary>
+    /// Number of pages returned per book unless the request asks for another number
+    /// </summary>
+    public const int DefaultMaxPagesPerHit = 10;
+}
@@ -12,11 +12,13 @@ public interface IBookshelfConsolidationService
     /// Consolidates PDF files from a source directory into a target bookshelf directory
     /// </summary>
     /// <param name="request">The consolidation request containing source and target directories</param>
-    /// <param name="progressCallback">Optional callback for progress updates</param>
+    /// <param name="progressCallback">Optional callback for throttled progress updates with counts, throughput and the current activity</param>
+    /// <param name="bookCallback">Optional callback receiving each book as soon as it is consolidated, called from the worker that processed it</param>
     /// <param name="cancellationToken">Cancellation token</param>
     /// <returns>The consolidation result</returns>
     Task<ConsolidationResult> ConsolidateAsync(
         ConsolidationRequest request,
-        IProgress<string>? progressCallback = null,
+        IProgress<ConsolidationProgress>? progressCallback = null,
+        IProgress<ConsolidatedBook>? bookCallback = null,
         CancellationToken cancellationToken = default);
 }
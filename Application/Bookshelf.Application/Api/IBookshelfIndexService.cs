@@ -0,0 +1,32 @@
+using Bookshelf.Application.Api.Dtos;
+using Bookshelf.Application.Core.Entities;
+
+namespace Bookshelf.Application.Api;
+
+/// <summary>
+/// Service for building the full-text index of a bookshelf and searching it
+/// </summary>
+public interface IBookshelfIndexService
+{
+    /// <summary>
+    /// Builds the index of a bookshelf, extracting only the text of books added or changed since the last build
+    /// </summary>
+    /// <param name="request">The index request containing the bookshelf directory and options</param>
+    /// <param name="progressCallback">Optional callback receiving an update after every extracted book</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The index build result</returns>
+    Task<IndexBuildResult> BuildIndexAsync(
+        BuildIndexRequest request,
+        IProgress<IndexProgress>? progressCallback = null,
+        CancellationToken cancellationToken = default);
+
+    /// <summary>
+    /// Searches the index of a bookshelf for books containing all words of a query
+    /// </summary>
+    /// <param name="request">The search request containing the bookshelf directory and the query</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The ranked search result</returns>
+    Task<BookSearchResult> SearchAsync(
+        SearchBooksRequest request,
+        CancellationToken cancellationToken = default);
+}
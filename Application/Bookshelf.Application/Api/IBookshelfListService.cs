@@ -17,4 +17,15 @@ public interface IBookshelfListService
     Task<BookListResult> ListBooksAsync(
         ListBooksRequest request,
         CancellationToken cancellationToken = default);
+
+    /// <summary>
+    /// Streams the books of the specified bookshelf directory in list order, yielding each book as soon as its details are read
+    /// </summary>
+    /// <param name="request">The list books request containing directory and options</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The filtered and sorted books</returns>
+    /// <exception cref="DirectoryNotFoundException">The bookshelf directory does not exist</exception>
+    IAsyncEnumerable<BookInfo> StreamBooksAsync(
+        ListBooksRequest request,
+        CancellationToken cancellationToken = default);
 }
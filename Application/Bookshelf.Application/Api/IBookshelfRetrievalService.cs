@@ -0,0 +1,32 @@
+using Bookshelf.Application.Api.Dtos;
+using Bookshelf.Application.Core.Entities;
+
+namespace Bookshelf.Application.Api;
+
+/// <summary>
+/// Service for embedding the passages of a bookshelf and retrieving those relevant to a question
+/// </summary>
+public interface IBookshelfRetrievalService
+{
+    /// <summary>
+    /// Builds the vector index of a bookshelf, embedding only the books added or changed since the last build
+    /// </summary>
+    /// <param name="request">The request containing the bookshelf directory and options</param>
+    /// <param name="progressCallback">Optional callback receiving an update after every embedded book</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The vector index build result</returns>
+    Task<VectorIndexBuildResult> BuildVectorIndexAsync(
+        BuildVectorIndexRequest request,
+        IProgress<IndexProgress>? progressCallback = null,
+        CancellationToken cancellationToken = default);
+
+    /// <summary>
+    /// Retrieves the passages of a bookshelf most similar to a question, with the books and pages they come from
+    /// </summary>
+    /// <param name="request">The request containing the bookshelf directory and the question</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The retrieved passages</returns>
+    Task<PassageRetrievalResult> RetrievePassagesAsync(
+        RetrievePassagesRequest request,
+        CancellationToken cancellationToken = default);
+}
@@ -0,0 +1,209 @@
+using System.Diagnostics;
+using System.Diagnostics.Metrics;
+
+namespace Bookshelf.Application.Core.Diagnostics;
+
+/// <summary>
+/// Activity source, meter and instruments through which the bookshelf services report where their time goes
+/// </summary>
+/// <remarks>
+/// Spans and measurements cost next to nothing while nobody listens. Tracing tools subscribe to the
+/// <see cref="SourceName"/> activity source, metric collectors to the meter of the same name.
+/// </remarks>
+public static class BookshelfTelemetry
+{
+    /// <summary>
+    /// Name of the activity source and the meter
+    /// </summary>
+    public const string SourceName = "Bookshelf";
+
+    /// <summary>
+    /// Name of the histogram of stage durations in milliseconds
+    /// </summary>
+    public const string StageDurationName = "bookshelf.stage.duration";
+
+    /// <summary>
+    /// Name of the counter of bytes read from source files
+    /// </summary>
+    public const string BytesReadName = "bookshelf.bytes.read";
+
+    /// <summary>
+    /// Name of the counter of bytes written to the bookshelf
+    /// </summary>
+    public const string BytesWrittenName = "bookshelf.bytes.written";
+
+    /// <summary>
+    /// Name of the counter of pages written to merged collections
+    /// </summary>
+    public const string PagesMergedName = "bookshelf.pages.merged";
+
+    /// <summary>
+    /// Name of the tag holding the stage of a duration measurement
+    /// </summary>
+    public const string StageTagName = "bookshelf.stage";
+
+    /// <summary>
+    /// Name of the activity tag holding the book, collection or file a stage works on
+    /// </summary>
+    public const string ItemTagName = "bookshelf.item";
+
+    /// <summary>
+    /// Gets the activity source for the spans of every stage
+    /// </summary>
+    public static ActivitySource ActivitySource { get; } = new(SourceName);
+
+    /// <summary>
+    /// Gets the meter owning the bookshelf instruments
+    /// </summary>
+    public static Meter Meter { get; } = new(SourceName);
+
+    /// <summary>
+    /// Gets the histogram of stage durations, tagged with the stage
+    /// </summary>
+    public static Histogram<double> StageDuration { get; } = Meter.CreateHistogram<double>(
+        StageDurationName, "ms", "Duration of a consolidation or listing stage");
+
+    /// <summary>
+    /// Gets the counter of bytes read from source files
+    /// </summary>
+    public static Counter<long> BytesRead { get; } = Meter.CreateCounter<long>(
+        BytesReadName, "By", "Bytes read from source files");
+
+    /// <summary>
+    /// Gets the counter of bytes written to the bookshelf
+    /// </summary>
+    public static Counter<long> BytesWritten { get; } = Meter.CreateCounter<long>(
+        BytesWrittenName, "By", "Bytes written to the bookshelf");
+
+    /// <summary>
+    /// Gets the counter of pages written to merged collections
+    /// </summary>
+    public static Counter<long> PagesMerged { get; } = Meter.CreateCounter<long>(
+        PagesMergedName, "{page}", "Pages written to merged collections");
+
+    /// <summary>
+    /// Starts timing a stage; disposing the returned timer records its duration and ends its span
+    /// </summary>
+    /// <param name="stage">The stage, one of the <see cref="Stages"/> names</param>
+    /// <param name="item">The book, collection or file the stage works on, or null for a whole run</param>
+    /// <returns>The running stage timer</returns>
+    public static StageTimer StartStage(string stage, string? item = null)
+    {
+        // Precondition
+        Debug.Assert(!string.IsNullOrWhiteSpace(stage), "Stage must not be null");
+
+        var activity = ActivitySource.StartActivity(stage);
+        if (item != null)
+        {
+            activity?.SetTag(ItemTagName, item);
+        }
+
+        return new StageTimer(stage, activity, Stopwatch.GetTimestamp());
+    }
+
+    /// <summary>
+    /// Names of the timed stages
+    /// </summary>
+    public static class Stages
+    {
+        /// <summary>
+        /// A whole consolidation run
+        /// </summary>
+        public const string Consolidate = "consolidate";
+
+        /// <summary>
+        /// A whole listing
+        /// </summary>
+        public const string List = "list";
+
+        /// <summary>
+        /// Walking the source directory, a collection directory or the bookshelf
+        /// </summary>
+        public const string Enumerate = "enumerate";
+
+        /// <summary>
+        /// Detecting the naming pattern plugin of a collection
+        /// </summary>
+        public const string DetectPlugin = "detect-plugin";
+
+        /// <summary>
+        /// Hashing a changed source PDF
+        /// </summary>
+        public const string Fingerprint = "fingerprint";
+
+        /// <summary>
+        /// Extracting the metadata of the first PDF of a collection
+        /// </summary>
+        public const string ExtractMetadata = "extract-metadata";
+
+        /// <summary>
+        /// Merging a collection
+        /// </summary>
+        public const string Merge = "merge";
+
+        /// <summary>
+        /// Copying or linking a single PDF
+        /// </summary>
+        public const string Copy = "copy";
+
+        /// <summary>
+        /// Loading or saving the consolidation manifest
+        /// </summary>
+        public const string Manifest = "manifest";
+
+        /// <summary>
+        /// Loading or saving the book metadata cache
+        /// </summary>
+        public const string MetadataCache = "metadata-cache";
+
+        /// <summary>
+        /// Reading the page count of a book
+        /// </summary>
+        public const string ReadPageCount = "read-page-count";
+
+        /// <summary>
+        /// Building or updating the search index
+        /// </summary>
+        public const string Index = "index";
+
+        /// <summary>
+        /// Extracting the text of a new or changed book
+        /// </summary>
+        public const string ExtractText = "extract-text";
+
+        /// <summary>
+        /// Loading or saving the search index
+        /// </summary>
+        public const string SearchIndex = "search-index";
+
+        /// <summary>
+        /// Answering a query from the loaded search index
+        /// </summary>
+        public const string Search = "search";
+
+        /// <summary>
+        /// Building or updating the vector index
+        /// </summary>
+        public const string Embed = "embed";
+
+        /// <summary>
+        /// Embedding a batch of passages or a question
+        /// </summary>
+        public const string GenerateEmbeddings = "generate-embeddings";
+
+        /// <summary>
+        /// Opening or saving the vector index
+        /// </summary>
+        public const string VectorIndex = "vector-index";
+
+        /// <summary>
+        /// Grouping the passage vectors into inverted file lists
+        /// </summary>
+        public const string Cluster = "cluster";
+
+        /// <summary>
+        /// Finding the passages most similar to a question in the open vector index
+        /// </summary>
+        public const string Retrieve = "retrieve";
+    }
+}
@@ -0,0 +1,38 @@
+using System.Diagnostics;
+
+namespace Bookshelf.Application.Core.Diagnostics;
+
+/// <summary>
+/// Times a running stage started with <see cref="BookshelfTelemetry.StartStage"/>
+/// </summary>
+public readonly struct StageTimer : IDisposable
+{
+    private readonly string _stage;
+    private readonly Activity? _activity;
+    private readonly long _startTimestamp;
+
+    /// <summary>
+    /// Initializes a new instance of the StageTimer struct
+    /// </summary>
+    /// <param name="stage">The timed stage</param>
+    /// <param name="activity">The span of the stage, or null if nobody listens</param>
+    /// <param name="startTimestamp">The <see cref="Stopwatch"/> timestamp at which the stage started</param>
+    internal StageTimer(string stage, Activity? activity, long startTimestamp)
+    {
+        _stage = stage;
+        _activity = activity;
+        _startTimestamp = startTimestamp;
+    }
+
+    /// <summary>
+    /// Records the duration of the stage and ends its span
+    /// </summary>
+    public void Dispose()
+    {
+        var elapsed = Stopwatch.GetElapsedTime(_startTimestamp);
+        BookshelfTelemetry.StageDuration.Record(
+            elapsed.TotalMilliseconds,
+            new KeyValuePair<string, object?>(BookshelfTelemetry.StageTagName, _stage));
+        _activity?.Dispose();
+    }
+}
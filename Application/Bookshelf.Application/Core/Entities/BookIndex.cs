@@ -0,0 +1,92 @@
+using System.Diagnostics;
+using Bookshelf.Application.Core.ValueObjects;
+
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// Inverted full-text index of a bookshelf, mapping every term to the books and pages it occurs on
+/// </summary>
+/// <param name="Version">The index format version</param>
+/// <param name="Books">The indexed books; the position of a book is its id in the postings</param>
+/// <param name="Terms">The indexed terms in ordinal order</param>
+/// <param name="Postings">The postings of every term, at the position of the term and ordered by book and page</param>
+public sealed record BookIndex(
+    int Version,
+    IReadOnlyList<IndexedBook> Books,
+    IReadOnlyList<string> Terms,
+    IReadOnlyList<IndexPosting[]> Postings)
+{
+    /// <summary>
+    /// The current index format version
+    /// </summary>
+    public const int CurrentVersion = 1;
+
+    /// <summary>
+    /// The file name of the index inside the bookshelf directory
+    /// </summary>
+    public const string FileName = ".bookshelf-index.bin";
+
+    /// <summary>
+    /// Creates an empty index
+    /// </summary>
+    public static BookIndex Empty =>
+        new BookIndex(CurrentVersion, Array.Empty<IndexedBook>(), Array.Empty<string>(), Array.Empty<IndexPosting[]>());
+
+    /// <summary>
+    /// Finds the position of a term
+    /// </summary>
+    /// <param name="term">The normalized term</param>
+    /// <returns>The position of the term, or -1 if it is not indexed</returns>
+    public int FindTerm(string term)
+    {
+        var position = FindFirstTermAtOrAfter(term);
+        var isFound = position < Terms.Count && string.Equals(Terms[position], term, StringComparison.Ordinal);
+        return isFound ? position : -1;
+    }
+
+    /// <summary>
+    /// Finds the positions of all terms starting with a prefix
+    /// </summary>
+    /// <param name="prefix">The normalized prefix</param>
+    /// <returns>The positions of the matching terms, which are adjacent since terms are sorted</returns>
+    public IEnumerable<int> FindTermsWithPrefix(string prefix)
+    {
+        for (var position = FindFirstTermAtOrAfter(prefix); position < Terms.Count; position++)
+        {
+            var hasPrefix = Terms[position].StartsWith(prefix, StringComparison.Ordinal);
+            if (!hasPrefix)
+            {
+                yield break;
+            }
+
+            yield return position;
+        }
+    }
+
+    /// <summary>
+    /// Binary searches the sorted terms for the first term that is not ordinally less than the given one
+    /// </summary>
+    private int FindFirstTermAtOrAfter(string term)
+    {
+        // Precondition
+        Debug.Assert(Terms.Count == Postings.Count, "Every term must have postings");
+
+        var low = 0;
+        var high = Terms.Count;
+        while (low < high)
+        {
+            var middle = low + (high - low) / 2;
+            var isBefore = string.CompareOrdinal(Terms[middle], term) < 0;
+            if (isBefore)
+            {
+                low = middle + 1;
+            }
+            else
+            {
+                high = middle;
+            }
+        }
+
+        return low;
+    }
+}
@@ -0,0 +1,72 @@
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// Persistent cache of book metadata stored next to a bookshelf
+/// </summary>
+/// <param name="Version">The cache format version</param>
+/// <param name="Entries">The cache entries keyed by file path</param>
+public sealed record BookMetadataCache(
+    int Version,
+    IReadOnlyDictionary<string, BookMetadataCacheEntry> Entries)
+{
+    /// <summary>
+    /// The current cache format version
+    /// </summary>
+    public const int CurrentVersion = 1;
+
+    /// <summary>
+    /// The file name of the cache inside the bookshelf directory
+    /// </summary>
+    public const string FileName = ".bookshelf-cache.json";
+
+    /// <summary>
+    /// The maximum number of entries kept in the cache
+    /// </summary>
+    public const int MaxEntries = 100_000;
+
+    /// <summary>
+    /// Creates an empty cache
+    /// </summary>
+    public static BookMetadataCache Empty =>
+        new BookMetadataCache(CurrentVersion, new Dictionary<string, BookMetadataCacheEntry>());
+
+    /// <summary>
+    /// Finds the entry of a file if it still matches the file's size and modification time
+    /// </summary>
+    /// <param name="filePath">The full path of the book</param>
+    /// <param name="fileSizeBytes">The current file size in bytes</param>
+    /// <param name="lastWriteTimeUtc">The current last modification time in UTC</param>
+    /// <returns>The entry if found and current, null otherwise</returns>
+    public BookMetadataCacheEntry? FindCurrentEntry(string filePath, long fileSizeBytes, DateTime lastWriteTimeUtc)
+    {
+        var isCurrent = Entries.TryGetValue(filePath, out var entry) &&
+                        entry.HasSameFileStatistics(fileSizeBytes, lastWriteTimeUtc);
+        return isCurrent ? entry : null;
+    }
+
+    /// <summary>
+    /// Replaces all entries with the entries of the latest listing, evicting the oldest entries beyond the size limit
+    /// </summary>
+    /// <param name="entries">The entries of all books in the latest listing</param>
+    /// <param name="maxEntries">The maximum number of entries to keep</param>
+    /// <returns>A new cache containing at most the given number of the most recently read entries</returns>
+    public BookMetadataCache WithEntries(IEnumerable<BookMetadataCacheEntry> entries, int maxEntries = MaxEntries)
+    {
+        if (entries == null)
+        {
+            throw new ArgumentNullException(nameof(entries));
+        }
+
+        if (maxEntries < 0)
+        {
+            throw new ArgumentException("Max entries cannot be negative", nameof(maxEntries));
+        }
+
+        var retainedEntries = entries
+            .OrderByDescending(e => e.CachedAtUtc)
+            .Take(maxEntries)
+            .ToDictionary(e => e.FilePath, StringComparer.Ordinal);
+
+        return new BookMetadataCache(CurrentVersion, retainedEntries);
+    }
+}
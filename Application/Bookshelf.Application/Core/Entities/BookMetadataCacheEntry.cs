@@ -0,0 +1,34 @@
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// Cached metadata of a book in a bookshelf, valid as long as the file keeps its size and modification time
+/// </summary>
+/// <param name="FilePath">The full path of the book</param>
+/// <param name="FileSizeBytes">The file size in bytes when the metadata was read</param>
+/// <param name="LastWriteTimeUtc">The last modification time in UTC when the metadata was read</param>
+/// <param name="Title">The title of the book</param>
+/// <param name="CreationDate">The creation date of the file</param>
+/// <param name="HasDetails">Whether the details such as the page count were read</param>
+/// <param name="PageCount">The page count, or null if it was not read or could not be read</param>
+/// <param name="CachedAtUtc">When the metadata was read</param>
+public sealed record BookMetadataCacheEntry(
+    string FilePath,
+    long FileSizeBytes,
+    DateTime LastWriteTimeUtc,
+    string Title,
+    DateTime CreationDate,
+    bool HasDetails,
+    int? PageCount,
+    DateTime CachedAtUtc)
+{
+    /// <summary>
+    /// Determines whether the entry still describes a file with the given statistics
+    /// </summary>
+    /// <param name="fileSizeBytes">The current file size in bytes</param>
+    /// <param name="lastWriteTimeUtc">The current last modification time in UTC</param>
+    /// <returns>True if size and modification time are unchanged</returns>
+    public bool HasSameFileStatistics(long fileSizeBytes, DateTime lastWriteTimeUtc)
+    {
+        return FileSizeBytes == fileSizeBytes && LastWriteTimeUtc == lastWriteTimeUtc;
+    }
+}
@@ -0,0 +1,38 @@
+using Bookshelf.Application.Api.Dtos;
+
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// Represents the result of a full-text search over the index of a bookshelf
+/// </summary>
+/// <param name="Success">Whether the search could be answered</param>
+/// <param name="Hits">The best matching books, ordered by relevance</param>
+/// <param name="TotalHits">The number of books matching all terms of the query</param>
+/// <param name="IndexedBookCount">The number of books in the index</param>
+/// <param name="StaleBookCount">The number of books added, changed or removed since the index was built</param>
+/// <param name="Elapsed">The time spent answering the query from the loaded index</param>
+/// <param name="ErrorMessage">The error message if the search failed</param>
+public sealed record BookSearchResult(
+    bool Success,
+    IReadOnlyList<BookSearchHit> Hits,
+    int TotalHits,
+    int IndexedBookCount,
+    int StaleBookCount,
+    TimeSpan Elapsed,
+    string? ErrorMessage = null)
+{
+    /// <summary>
+    /// Gets whether the bookshelf changed since the index was built
+    /// </summary>
+    public bool IsIndexStale => StaleBookCount > 0;
+
+    /// <summary>
+    /// Creates a failed search result
+    /// </summary>
+    /// <param name="errorMessage">The error message</param>
+    /// <returns>A failed result</returns>
+    public static BookSearchResult CreateFailure(string errorMessage)
+    {
+        return new BookSearchResult(false, Array.Empty<BookSearchHit>(), 0, 0, 0, TimeSpan.Zero, errorMessage);
+    }
+}
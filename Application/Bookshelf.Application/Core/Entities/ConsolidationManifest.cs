@@ -0,0 +1,88 @@
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// Persistent record of what earlier consolidation runs produced in a target directory
+/// </summary>
+/// <param name="Version">The manifest format version</param>
+/// <param name="Entries">The manifest entries keyed by source path</param>
+public sealed record ConsolidationManifest(
+    int Version,
+    IReadOnlyDictionary<string, ManifestEntry> Entries)
+{
+    /// <summary>
+    /// The current manifest format version
+    /// </summary>
+    public const int CurrentVersion = 1;
+
+    /// <summary>
+    /// The file name of the manifest inside the target directory
+    /// </summary>
+    public const string FileName = ".bookshelf-manifest.json";
+
+    /// <summary>
+    /// Creates an empty manifest
+    /// </summary>
+    public static ConsolidationManifest Empty =>
+        new ConsolidationManifest(CurrentVersion, new Dictionary<string, ManifestEntry>());
+
+    /// <summary>
+    /// Finds the entry recorded for a source path
+    /// </summary>
+    /// <param name="sourcePath">The full path of the root PDF or collection directory</param>
+    /// <returns>The entry if found, null otherwise</returns>
+    public ManifestEntry? FindEntry(string sourcePath)
+    {
+        return Entries.TryGetValue(sourcePath, out var entry) ? entry : null;
+    }
+
+    /// <summary>
+    /// Gets all entries recorded for books of a source directory
+    /// </summary>
+    /// <param name="sourceDirectory">The full path of the consolidated source directory</param>
+    /// <returns>The entries whose source lies inside the directory</returns>
+    public IEnumerable<ManifestEntry> GetSourceDirectoryEntries(string sourceDirectory)
+    {
+        if (string.IsNullOrWhiteSpace(sourceDirectory))
+        {
+            throw new ArgumentException("Source directory cannot be null or whitespace", nameof(sourceDirectory));
+        }
+
+        var sourceDirectoryPrefix = GetSourceDirectoryPrefix(sourceDirectory);
+        return Entries.Values.Where(e => e.SourcePath.StartsWith(sourceDirectoryPrefix, StringComparison.Ordinal));
+    }
+
+    /// <summary>
+    /// Replaces all entries belonging to a source directory with the entries of the latest run
+    /// </summary>
+    /// <param name="sourceDirectory">The full path of the consolidated source directory</param>
+    /// <param name="entries">The entries produced by the latest run</param>
+    /// <returns>A new manifest containing the entries of other source directories and the given entries</returns>
+    public ConsolidationManifest WithSourceDirectoryEntries(string sourceDirectory, IEnumerable<ManifestEntry> entries)
+    {
+        if (string.IsNullOrWhiteSpace(sourceDirectory))
+        {
+            throw new ArgumentException("Source directory cannot be null or whitespace", nameof(sourceDirectory));
+        }
+
+        if (entries == null)
+        {
+            throw new ArgumentNullException(nameof(entries));
+        }
+
+        var sourceDirectoryPrefix = GetSourceDirectoryPrefix(sourceDirectory);
+        var mergedEntries = Entries.Values
+            .Where(e => !e.SourcePath.StartsWith(sourceDirectoryPrefix, StringComparison.Ordinal))
+            .Concat(entries)
+            .ToDictionary(e => e.SourcePath, StringComparer.Ordinal);
+
+        return new ConsolidationManifest(CurrentVersion, mergedEntries);
+    }
+
+    /// <summary>
+    /// Gets the prefix shared by the paths of all sources inside a source directory
+    /// </summary>
+    private static string GetSourceDirectoryPrefix(string sourceDirectory)
+    {
+        return Path.TrimEndingDirectorySeparator(sourceDirectory) + Path.DirectorySeparatorChar;
+    }
+}
@@ -0,0 +1,148 @@
+using System.Diagnostics;
+using Bookshelf.Application.Api.Dtos;
+
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// Tracks the progress of a consolidation and reports throttled snapshots of it
+/// </summary>
+/// <remarks>
+/// Workers complete books concurrently, so all members are thread-safe. Snapshots are reported at most once per
+/// report interval, except when the total is known and when the last book is completed, so reporting stays cheap
+/// no matter how many small books are copied. The callback is called while the tracker is locked and should
+/// return quickly, as <see cref="Progress{T}"/> does by posting the snapshot.
+/// </remarks>
+public sealed class ConsolidationProgressTracker
+{
+    /// <summary>
+    /// Minimum time between two reported snapshots
+    /// </summary>
+    public static readonly TimeSpan DefaultReportInterval = TimeSpan.FromMilliseconds(250);
+
+    /// <summary>
+    /// Weight of the latest throughput sample in the smoothed throughput
+    /// </summary>
+    private const double ThroughputSmoothing = 0.3;
+
+    private readonly object _syncRoot = new();
+    private readonly IProgress<ConsolidationProgress>? _callback;
+    private readonly TimeSpan _reportInterval;
+    private readonly long _startTimestamp;
+    private int _totalBooks;
+    private int _completedBooks;
+    private long _processedBytes;
+    private string _currentActivity = string.Empty;
+    private TimeSpan _lastReportElapsed;
+    private long _lastReportProcessedBytes;
+    private double _bytesPerSecond;
+
+    /// <summary>
+    /// Initializes a new instance of the ConsolidationProgressTracker class and starts the clock
+    /// </summary>
+    /// <param name="callback">The callback receiving the snapshots, or null to only track</param>
+    /// <param name="reportInterval">The minimum time between two snapshots, or null for the default</param>
+    public ConsolidationProgressTracker(IProgress<ConsolidationProgress>? callback, TimeSpan? reportInterval = null)
+    {
+        _callback = callback;
+        _reportInterval = reportInterval ?? DefaultReportInterval;
+        _startTimestamp = Stopwatch.GetTimestamp();
+    }
+
+    /// <summary>
+    /// Sets the number of books to consolidate and reports it right away
+    /// </summary>
+    /// <param name="totalBooks">The number of root PDFs and collections</param>
+    public void SetTotalBooks(int totalBooks)
+    {
+        // Precondition
+        Debug.Assert(totalBooks >= 0, "Total books must not be negative");
+
+        lock (_syncRoot)
+        {
+            _totalBooks = totalBooks;
+            ReportIfDue(isForced: true);
+        }
+    }
+
+    /// <summary>
+    /// Records what the consolidation is doing right now
+    /// </summary>
+    /// <param name="activity">The activity shown to the user</param>
+    public void ReportActivity(string activity)
+    {
+        lock (_syncRoot)
+        {
+            _currentActivity = activity;
+            ReportIfDue(isForced: false);
+        }
+    }
+
+    /// <summary>
+    /// Records a completed book
+    /// </summary>
+    /// <param name="processedBytes">The source bytes copied or merged for the book, 0 if it needed no work</param>
+    public void CompleteBook(long processedBytes)
+    {
+        lock (_syncRoot)
+        {
+            _completedBooks++;
+            _processedBytes += processedBytes;
+
+            var isLastBook = _completedBooks == _totalBooks;
+            ReportIfDue(isForced: isLastBook);
+        }
+    }
+
+    /// <summary>
+    /// Records the final activity and reports it regardless of the report interval
+    /// </summary>
+    /// <param name="activity">The activity shown to the user</param>
+    public void ReportFinal(string activity)
+    {
+        lock (_syncRoot)
+        {
+            _currentActivity = activity;
+            ReportIfDue(isForced: true);
+        }
+    }
+
+    /// <summary>
+    /// Reports a snapshot if one is forced or the report interval has passed, updating the smoothed throughput
+    /// </summary>
+    private void ReportIfDue(bool isForced)
+    {
+        if (_callback == null)
+        {
+            return;
+        }
+
+        var elapsed = Stopwatch.GetElapsedTime(_startTimestamp);
+        var sinceLastReport = elapsed - _lastReportElapsed;
+        var isDue = isForced || sinceLastReport >= _reportInterval;
+        if (!isDue)
+        {
+            return;
+        }
+
+        var hasSampleTime = sinceLastReport > TimeSpan.Zero;
+        if (hasSampleTime)
+        {
+            var sampleBytesPerSecond = (_processedBytes - _lastReportProcessedBytes) / sinceLastReport.TotalSeconds;
+            var hasThroughput = _bytesPerSecond > 0;
+            _bytesPerSecond = hasThroughput
+                ? ThroughputSmoothing * sampleBytesPerSecond + (1 - ThroughputSmoothing) * _bytesPerSecond
+                : sampleBytesPerSecond;
+        }
+
+        _lastReportElapsed = elapsed;
+        _lastReportProcessedBytes = _processedBytes;
+
+        _callback.Report(new ConsolidationProgress(
+            _totalBooks,
+            _completedBooks,
+            _processedBytes,
+            _bytesPerSecond,
+            elapsed,
+            _currentActivity));
+    }
+}
@@ -10,6 +10,17 @@ public sealed record ConsolidationResult(
     int CollectionsMerged,
     IReadOnlyList<string> ConsolidatedBooks,
     IReadOnlyList<string> NamingConflicts,
+    int NewBooks = 0,
+    int UpdatedBooks = 0,
+    int SkippedBooks = 0,
+    long BytesCopied = 0,
+    long BytesShared = 0,
+    int DuplicateBooks = 0,
+    long BytesDeduplicated = 0,
+    long MergedSourceBytes = 0,
+    long MergedOutputBytes = 0,
+    long CompressionSavedBytes = 0,
+    TimeSpan MergeTime = default,
     string? ErrorMessage = null)
 {
     /// <summary>
@@ -20,7 +31,18 @@ public sealed record ConsolidationResult(
         int individualPdfsCopied,
         int collectionsMerged,
         IReadOnlyList<string> consolidatedBooks,
-        IReadOnlyList<string> namingConflicts)
+        IReadOnlyList<string> namingConflicts,
+        int newBooks,
+        int updatedBooks,
+        int skippedBooks,
+        long bytesCopied = 0,
+        long bytesShared = 0,
+        int duplicateBooks = 0,
+        long bytesDeduplicated = 0,
+        long mergedSourceBytes = 0,
+        long mergedOutputBytes = 0,
+        long compressionSavedBytes = 0,
+        TimeSpan mergeTime = default)
     {
         return new ConsolidationResult(
             true,
@@ -28,7 +50,18 @@ public sealed record ConsolidationResult(
             individualPdfsCopied,
             collectionsMerged,
             consolidatedBooks,
-            namingConflicts);
+            namingConflicts,
+            newBooks,
+            updatedBooks,
+            skippedBooks,
+            bytesCopied,
+            bytesShared,
+            duplicateBooks,
+            bytesDeduplicated,
+            mergedSourceBytes,
+            mergedOutputBytes,
+            compressionSavedBytes,
+            mergeTime);
     }
 
     /// <summary>
@@ -43,6 +76,6 @@ public sealed record ConsolidationResult(
             0,
             Array.Empty<string>(),
             Array.Empty<string>(),
-            errorMessage);
+            ErrorMessage: errorMessage);
     }
 }
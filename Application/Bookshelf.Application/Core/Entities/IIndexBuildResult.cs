@@ -0,0 +1,22 @@
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// The outcome shared by the results of building or updating an index of a bookshelf
+/// </summary>
+public interface IIndexBuildResult
+{
+    /// <summary>
+    /// Gets whether the index was built
+    /// </summary>
+    bool Success { get; }
+
+    /// <summary>
+    /// Gets the error message if the index could not be built
+    /// </summary>
+    string? ErrorMessage { get; }
+
+    /// <summary>
+    /// Gets whether the index was already up to date
+    /// </summary>
+    bool IsUnchanged { get; }
+}
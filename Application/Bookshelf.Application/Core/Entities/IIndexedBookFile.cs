@@ -0,0 +1,25 @@
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// A book of a bookshelf index, valid as long as the file keeps its size and modification time
+/// </summary>
+public interface IIndexedBookFile
+{
+    /// <summary>
+    /// Gets the file name of the book inside the bookshelf directory
+    /// </summary>
+    string FileName { get; }
+
+    /// <summary>
+    /// Gets whether the text of the book could not be extracted when it was indexed
+    /// </summary>
+    bool IsUnread { get; }
+
+    /// <summary>
+    /// Determines whether the book was indexed from a file of the given size and modification time
+    /// </summary>
+    /// <param name="fileSizeBytes">The current file size in bytes</param>
+    /// <param name="lastWriteTimeUtc">The current last modification time in UTC</param>
+    /// <returns>True if the file is unchanged since it was indexed</returns>
+    bool HasSameFileStatistics(long fileSizeBytes, DateTime lastWriteTimeUtc);
+}
@@ -0,0 +1,38 @@
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// Represents the result of building or updating the search index of a bookshelf
+/// </summary>
+/// <param name="Success">Whether the index was built</param>
+/// <param name="BookCount">The number of books in the index</param>
+/// <param name="ExtractedBookCount">The number of new or changed books whose text was extracted</param>
+/// <param name="ReusedBookCount">The number of unchanged books taken over from the previous index</param>
+/// <param name="RemovedBookCount">The number of books of the previous index that are no longer in the bookshelf</param>
+/// <param name="FailedBookCount">The number of books whose text could not be extracted, indexed by title only</param>
+/// <param name="TermCount">The number of distinct terms in the index</param>
+/// <param name="ErrorMessage">The error message if the index could not be built</param>
+public sealed record IndexBuildResult(
+    bool Success,
+    int BookCount,
+    int ExtractedBookCount,
+    int ReusedBookCount,
+    int RemovedBookCount,
+    int FailedBookCount,
+    int TermCount,
+    string? ErrorMessage = null) : IIndexBuildResult
+{
+    /// <summary>
+    /// Gets whether the index was already up to date
+    /// </summary>
+    public bool IsUnchanged => Success && ExtractedBookCount == 0 && RemovedBookCount == 0;
+
+    /// <summary>
+    /// Creates a failed index build result
+    /// </summary>
+    /// <param name="errorMessage">The error message</param>
+    /// <returns>A failed result</returns>
+    public static IndexBuildResult CreateFailure(string errorMessage)
+    {
+        return new IndexBuildResult(false, 0, 0, 0, 0, 0, 0, errorMessage);
+    }
+}
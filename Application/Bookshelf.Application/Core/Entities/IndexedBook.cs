@@ -0,0 +1,43 @@
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// A book of the search index, valid as long as the file keeps its size and modification time
+/// </summary>
+/// <param name="FileName">The file name of the book inside the bookshelf directory</param>
+/// <param name="FileSizeBytes">The file size in bytes when the book was indexed</param>
+/// <param name="LastWriteTimeUtc">The last modification time in UTC when the book was indexed</param>
+/// <param name="Title">The title from the document information, or the file name without extension</param>
+/// <param name="Author">The author from the document information, or null if it has none</param>
+/// <param name="PageCount">The number of pages whose text was indexed</param>
+/// <param name="TokenCount">The number of indexed terms of the book, counting repetitions</param>
+public sealed record IndexedBook(
+    string FileName,
+    long FileSizeBytes,
+    DateTime LastWriteTimeUtc,
+    string Title,
+    string? Author,
+    int PageCount,
+    int TokenCount) : IIndexedBookFile
+{
+    /// <summary>
+    /// The file size recorded for a book whose text could not be extracted, which matches no file
+    /// so the next index run extracts the book again
+    /// </summary>
+    public const long UnreadFileSizeBytes = -1;
+
+    /// <summary>
+    /// Gets whether only the file name of the book is indexed because its text could not be extracted
+    /// </summary>
+    public bool IsUnread => FileSizeBytes == UnreadFileSizeBytes;
+
+    /// <summary>
+    /// Determines whether the book was indexed from a file of the given size and modification time
+    /// </summary>
+    /// <param name="fileSizeBytes">The current file size in bytes</param>
+    /// <param name="lastWriteTimeUtc">The current last modification time in UTC</param>
+    /// <returns>True if the file is unchanged since it was indexed</returns>
+    public bool HasSameFileStatistics(long fileSizeBytes, DateTime lastWriteTimeUtc)
+    {
+        return FileSizeBytes == fileSizeBytes && LastWriteTimeUtc == lastWriteTimeUtc;
+    }
+}
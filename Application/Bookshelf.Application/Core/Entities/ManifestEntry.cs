@@ -0,0 +1,31 @@
+using Bookshelf.Application.Core.ValueObjects;
+
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// Records the sources of a consolidated book and the output file they produced
+/// </summary>
+/// <param name="SourcePath">The full path of the root PDF or collection directory</param>
+/// <param name="OutputFileName">The file name of the produced book in the target directory</param>
+/// <param name="Sources">The fingerprints of all source PDFs in merge order</param>
+public sealed record ManifestEntry(
+    string SourcePath,
+    string OutputFileName,
+    IReadOnlyList<SourceFingerprint> Sources)
+{
+    /// <summary>
+    /// Determines whether the given sources have the same content and order as the recorded ones
+    /// </summary>
+    /// <param name="currentSources">The fingerprints of the current source PDFs</param>
+    /// <returns>True if the sources are unchanged</returns>
+    public bool HasSameSources(IReadOnlyList<SourceFingerprint> currentSources)
+    {
+        if (currentSources == null)
+        {
+            throw new ArgumentNullException(nameof(currentSources));
+        }
+
+        return Sources.Count == currentSources.Count &&
+               Sources.Zip(currentSources).All(pair => pair.First.HasSameContent(pair.Second));
+    }
+}
@@ -0,0 +1,43 @@
+using Bookshelf.Application.Api.Dtos;
+
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// Represents the passages retrieved from the vector index of a bookshelf for a question
+/// </summary>
+/// <param name="Success">Whether the question could be answered from the index</param>
+/// <param name="Passages">The most similar passages, ordered by descending similarity</param>
+/// <param name="IndexedBookCount">The number of books in the index</param>
+/// <param name="IndexedChunkCount">The number of passages in the index</param>
+/// <param name="StaleBookCount">The number of books added, changed or removed since the index was built</param>
+/// <param name="Elapsed">The time spent searching the index, without embedding the question</param>
+/// <param name="ErrorMessage">The error message if the retrieval failed</param>
+public sealed record PassageRetrievalResult(
+    bool Success,
+    IReadOnlyList<RetrievedPassage> Passages,
+    int IndexedBookCount,
+    int IndexedChunkCount,
+    int StaleBookCount,
+    TimeSpan Elapsed,
+    string? ErrorMessage = null)
+{
+    /// <summary>
+    /// Gets whether no passage is similar enough to the question
+    /// </summary>
+    public bool IsEmpty => Success && Passages.Count == 0;
+
+    /// <summary>
+    /// Gets whether the bookshelf changed since the index was built
+    /// </summary>
+    public bool IsIndexStale => StaleBookCount > 0;
+
+    /// <summary>
+    /// Creates a failed retrieval result
+    /// </summary>
+    /// <param name="errorMessage">The error message</param>
+    /// <returns>A failed result</returns>
+    public static PassageRetrievalResult CreateFailure(string errorMessage)
+    {
+        return new PassageRetrievalResult(false, Array.Empty<RetrievedPassage>(), 0, 0, 0, TimeSpan.Zero, errorMessage);
+    }
+}
@@ -0,0 +1,130 @@
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// Thread-safe index of the file names taken in a target directory, allocating unique names without probing the file system
+/// </summary>
+public sealed class TargetFileNameIndex
+{
+    private readonly object _syncRoot = new();
+    private readonly HashSet<string> _takenFileNames;
+    private readonly Dictionary<string, int> _nextSuffixes;
+
+    /// <summary>
+    /// Initializes a new instance of the TargetFileNameIndex class
+    /// </summary>
+    /// <param name="takenFileNames">The names of the entries already in the directory and of names reserved for later writes</param>
+    /// <param name="fileNameComparer">The comparer matching the case sensitivity of the file system</param>
+    /// <exception cref="ArgumentNullException">Thrown when takenFileNames or fileNameComparer is null</exception>
+    public TargetFileNameIndex(IEnumerable<string> takenFileNames, StringComparer fileNameComparer)
+    {
+        if (takenFileNames == null)
+        {
+            throw new ArgumentNullException(nameof(takenFileNames));
+        }
+
+        if (fileNameComparer == null)
+        {
+            throw new ArgumentNullException(nameof(fileNameComparer));
+        }
+
+        _takenFileNames = new HashSet<string>(takenFileNames, fileNameComparer);
+        _nextSuffixes = new Dictionary<string, int>(fileNameComparer);
+    }
+
+    /// <summary>
+    /// Gets the number of taken file names
+    /// </summary>
+    public int Count
+    {
+        get
+        {
+            lock (_syncRoot)
+            {
+                return _takenFileNames.Count;
+            }
+        }
+    }
+
+    /// <summary>
+    /// Determines whether a file name is taken
+    /// </summary>
+    /// <param name="fileName">The file name to check</param>
+    /// <returns>True if the name is taken, false otherwise</returns>
+    public bool Contains(string fileName)
+    {
+        lock (_syncRoot)
+        {
+            return _takenFileNames.Contains(fileName);
+        }
+    }
+
+    /// <summary>
+    /// Reserves a file name, or the first free name with a numeric suffix (Name_1.pdf, Name_2.pdf, ...) if it is taken
+    /// </summary>
+    /// <param name="fileName">The desired file name</param>
+    /// <param name="wasTaken">Whether the desired file name was already taken</param>
+    /// <returns>The reserved file name</returns>
+    /// <exception cref="ArgumentException">Thrown when fileName is null or whitespace</exception>
+    public string Reserve(string fileName, out bool wasTaken)
+    {
+        if (string.IsNullOrWhiteSpace(fileName))
+        {
+            throw new ArgumentException("File name cannot be null or whitespace", nameof(fileName));
+        }
+
+        lock (_syncRoot)
+        {
+            wasTaken = !_takenFileNames.Add(fileName);
+            if (!wasTaken)
+            {
+                return fileName;
+            }
+
+            // Names are never released during a run, so the search resumes after the last suffix handed out
+            var nameWithoutExtension = Path.GetFileNameWithoutExtension(fileName);
+            var extension = Path.GetExtension(fileName);
+            var suffix = _nextSuffixes.GetValueOrDefault(fileName, 1);
+
+            string candidateFileName;
+            do
+            {
+                candidateFileName = $"{nameWithoutExtension}_{suffix}{extension}";
+                suffix++;
+            }
+            while (!_takenFileNames.Add(candidateFileName));
+
+            _nextSuffixes[fileName] = suffix;
+
+            return candidateFileName;
+        }
+    }
+
+    /// <summary>
+    /// Determines whether a file name is a desired file name or one of the suffixed names <see cref="Reserve"/> hands out
+    /// for it
+    /// </summary>
+    /// <param name="fileName">The file name to check</param>
+    /// <param name="desiredFileName">The desired file name</param>
+    /// <param name="fileNameComparer">The comparer for file names of the target directory</param>
+    /// <returns>True if the file name is the desired file name or a suffixed variant of it</returns>
+    public static bool IsNameOrVariantOf(string fileName, string desiredFileName, StringComparer fileNameComparer)
+    {
+        if (fileNameComparer.Equals(fileName, desiredFileName))
+        {
+            return true;
+        }
+
+        var nameWithoutExtension = Path.GetFileNameWithoutExtension(fileName);
+        var desiredNameWithoutExtension = Path.GetFileNameWithoutExtension(desiredFileName);
+        var hasSameExtension = fileNameComparer.Equals(Path.GetExtension(fileName), Path.GetExtension(desiredFileName));
+        var separatorIndex = nameWithoutExtension.LastIndexOf('_');
+        if (!hasSameExtension || separatorIndex < 0)
+        {
+            return false;
+        }
+
+        var suffix = nameWithoutExtension[(separatorIndex + 1)..];
+        var hasNumericSuffix = suffix.Length > 0 && suffix.All(char.IsAsciiDigit);
+        return hasNumericSuffix && fileNameComparer.Equals(nameWithoutExtension[..separatorIndex], desiredNameWithoutExtension);
+    }
+}
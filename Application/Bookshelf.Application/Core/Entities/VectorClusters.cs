@@ -0,0 +1,30 @@
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// Inverted file lists of a vector index, grouping the passage vectors by their nearest centroid
+/// </summary>
+/// <param name="Dimensions">The number of dimensions of the centroids</param>
+/// <param name="Centroids">The centroids, one after another</param>
+/// <param name="ListOffsets">The start of the list of every centroid in the chunk ids, followed by their total count</param>
+/// <param name="ListChunkIds">The passage ids grouped by centroid</param>
+public sealed record VectorClusters(
+    int Dimensions,
+    float[] Centroids,
+    int[] ListOffsets,
+    int[] ListChunkIds)
+{
+    /// <summary>
+    /// Gets the number of centroids, 0 if every passage is compared with the query
+    /// </summary>
+    public int Count => Dimensions == 0 ? 0 : Centroids.Length / Dimensions;
+
+    /// <summary>
+    /// Creates lists without centroids, for indexes small enough to compare every passage with the query
+    /// </summary>
+    /// <param name="dimensions">The number of dimensions of the vectors</param>
+    /// <returns>Empty inverted file lists</returns>
+    public static VectorClusters None(int dimensions)
+    {
+        return new VectorClusters(dimensions, Array.Empty<float>(), Array.Empty<int>(), Array.Empty<int>());
+    }
+}
@@ -0,0 +1,41 @@
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// A book of the vector index, valid as long as the file keeps its size and modification time
+/// </summary>
+/// <param name="FileName">The file name of the book inside the bookshelf directory</param>
+/// <param name="FileSizeBytes">The file size in bytes when the book was embedded</param>
+/// <param name="LastWriteTimeUtc">The last modification time in UTC when the book was embedded</param>
+/// <param name="Title">The title from the document information, or the file name without extension</param>
+/// <param name="FirstChunkId">The id of the first passage of the book; its passages have consecutive ids</param>
+/// <param name="ChunkCount">The number of passages of the book</param>
+public sealed record VectorIndexBook(
+    string FileName,
+    long FileSizeBytes,
+    DateTime LastWriteTimeUtc,
+    string Title,
+    int FirstChunkId,
+    int ChunkCount) : IIndexedBookFile
+{
+    /// <summary>
+    /// The file size recorded for a book whose text could not be extracted, which matches no file
+    /// so the next embed run embeds the book again
+    /// </summary>
+    public const long UnreadFileSizeBytes = -1;
+
+    /// <summary>
+    /// Gets whether the book has no passages because its text could not be extracted
+    /// </summary>
+    public bool IsUnread => FileSizeBytes == UnreadFileSizeBytes;
+
+    /// <summary>
+    /// Determines whether the book was embedded from a file of the given size and modification time
+    /// </summary>
+    /// <param name="fileSizeBytes">The current file size in bytes</param>
+    /// <param name="lastWriteTimeUtc">The current last modification time in UTC</param>
+    /// <returns>True if the file is unchanged since it was embedded</returns>
+    public bool HasSameFileStatistics(long fileSizeBytes, DateTime lastWriteTimeUtc)
+    {
+        return FileSizeBytes == fileSizeBytes && LastWriteTimeUtc == lastWriteTimeUtc;
+    }
+}
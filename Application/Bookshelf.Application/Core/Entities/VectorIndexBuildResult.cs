@@ -0,0 +1,40 @@
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// Represents the result of building or updating the vector index of a bookshelf
+/// </summary>
+/// <param name="Success">Whether the index was built</param>
+/// <param name="BookCount">The number of books in the index</param>
+/// <param name="EmbeddedBookCount">The number of new or changed books whose passages were embedded</param>
+/// <param name="ReusedBookCount">The number of unchanged books whose embeddings were taken over from the previous index</param>
+/// <param name="RemovedBookCount">The number of books of the previous index that are no longer in the bookshelf</param>
+/// <param name="FailedBookCount">The number of books whose text could not be extracted</param>
+/// <param name="ChunkCount">The number of passages in the index</param>
+/// <param name="ClusterCount">The number of inverted file lists, 0 if every passage is compared with a query</param>
+/// <param name="ErrorMessage">The error message if the index could not be built</param>
+public sealed record VectorIndexBuildResult(
+    bool Success,
+    int BookCount,
+    int EmbeddedBookCount,
+    int ReusedBookCount,
+    int RemovedBookCount,
+    int FailedBookCount,
+    int ChunkCount,
+    int ClusterCount,
+    string? ErrorMessage = null) : IIndexBuildResult
+{
+    /// <summary>
+    /// Gets whether the index was already up to date
+    /// </summary>
+    public bool IsUnchanged => Success && EmbeddedBookCount == 0 && RemovedBookCount == 0;
+
+    /// <summary>
+    /// Creates a failed vector index build result
+    /// </summary>
+    /// <param name="errorMessage">The error message</param>
+    /// <returns>A failed result</returns>
+    public static VectorIndexBuildResult CreateFailure(string errorMessage)
+    {
+        return new VectorIndexBuildResult(false, 0, 0, 0, 0, 0, 0, 0, errorMessage);
+    }
+}
@@ -0,0 +1,9 @@
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// A passage of the vector index
+/// </summary>
+/// <param name="BookId">The position of the book of the passage in the index</param>
+/// <param name="Page">The page number of the passage starting at 1</param>
+/// <param name="Text">The text of the passage</param>
+public sealed record VectorIndexChunk(int BookId, int Page, string Text);
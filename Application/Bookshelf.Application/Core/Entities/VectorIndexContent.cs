@@ -0,0 +1,29 @@
+namespace Bookshelf.Application.Core.Entities;
+
+/// <summary>
+/// Content of the vector index of a bookshelf, as it is built and saved
+/// </summary>
+/// <param name="ModelId">The embedding model the passages were embedded with</param>
+/// <param name="Dimensions">The number of dimensions of the embeddings</param>
+/// <param name="Books">The embedded books; the position of a book is its id in the passages</param>
+/// <param name="Chunks">The passages of all books, grouped by book in book order</param>
+/// <param name="Vectors">The normalized embedding of every passage, one after another in passage order</param>
+/// <param name="Clusters">The inverted file lists for approximate nearest neighbour search</param>
+public sealed record VectorIndexContent(
+    string ModelId,
+    int Dimensions,
+    IReadOnlyList<VectorIndexBook> Books,
+    IReadOnlyList<VectorIndexChunk> Chunks,
+    float[] Vectors,
+    VectorClusters Clusters)
+{
+    /// <summary>
+    /// The current index format version
+    /// </summary>
+    public const int CurrentVersion = 1;
+
+    /// <summary>
+    /// The file name of the vector index inside the bookshelf directory
+    /// </summary>
+    public const string FileName = ".bookshelf-vectors.bin";
+}
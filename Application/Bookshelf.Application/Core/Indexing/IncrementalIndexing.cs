@@ -0,0 +1,74 @@
+using System.Diagnostics;
+using System.Runtime.CompilerServices;
+using Bookshelf.Application.Core.Entities;
+
+namespace Bookshelf.Application.Core.Indexing;
+
+/// <summary>
+/// Shared steps of the incremental indexes of a bookshelf, which read only the books that changed since the last run
+/// </summary>
+public static class IncrementalIndexing
+{
+    /// <summary>
+    /// Reads books with bounded parallelism, yielding them in the order of the files
+    /// </summary>
+    /// <remarks>
+    /// At most <paramref name="maxParallelism"/> books are read ahead of the consumer, so only their content is held
+    /// in memory no matter how many books change.
+    /// </remarks>
+    /// <typeparam name="TFile">The type describing a file to read</typeparam>
+    /// <typeparam name="TBook">The type of a read book</typeparam>
+    /// <param name="files">The files to read, in the order their books are yielded</param>
+    /// <param name="maxParallelism">The maximum number of books read at the same time</param>
+    /// <param name="readBookAsync">Reads the book of a file</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The read books in the order of the files</returns>
+    public static async IAsyncEnumerable<TBook> ReadInOrderAsync<TFile, TBook>(
+        IReadOnlyList<TFile> files,
+        int maxParallelism,
+        Func<TFile, CancellationToken, Task<TBook>> readBookAsync,
+        [EnumeratorCancellation] CancellationToken cancellationToken = default)
+    {
+        // Precondition
+        Debug.Assert(maxParallelism > 0, "Max parallelism must be positive");
+
+        var pendingBooks = new Queue<Task<TBook>>(maxParallelism);
+        foreach (var file in files)
+        {
+            pendingBooks.Enqueue(readBookAsync(file, cancellationToken));
+
+            var isReadAheadFull = pendingBooks.Count >= maxParallelism;
+            if (isReadAheadFull)
+            {
+                yield return await pendingBooks.Dequeue();
+            }
+        }
+
+        while (pendingBooks.Count > 0)
+        {
+            yield return await pendingBooks.Dequeue();
+        }
+    }
+
+    /// <summary>
+    /// Counts the books added, changed or removed since an index was built, not counting unread books
+    /// that another run would most likely fail to read again
+    /// </summary>
+    /// <param name="indexedBooks">The books of the index</param>
+    /// <param name="currentFiles">The file name, size and modification time of every book on the bookshelf</param>
+    /// <returns>The number of books the index is missing, has outdated or still holds after their removal</returns>
+    public static int CountStaleBooks(
+        IReadOnlyList<IIndexedBookFile> indexedBooks,
+        IReadOnlyList<(string FileName, long FileSizeBytes, DateTime LastWriteTimeUtc)> currentFiles)
+    {
+        var booksByFileName = indexedBooks.ToDictionary(book => book.FileName, StringComparer.Ordinal);
+        var currentFileNames = currentFiles.Select(file => file.FileName).ToHashSet(StringComparer.Ordinal);
+
+        var addedOrChangedBookCount = currentFiles.Count(file =>
+            !booksByFileName.TryGetValue(file.FileName, out var book)
+            || (!book.IsUnread && !book.HasSameFileStatistics(file.FileSizeBytes, file.LastWriteTimeUtc)));
+        var removedBookCount = indexedBooks.Count(book => !currentFileNames.Contains(book.FileName));
+
+        return addedOrChangedBookCount + removedBookCount;
+    }
+}
@@ -25,15 +25,27 @@ public sealed class DefaultNamingPatternPlugin : NamingPatternPluginBase
     }
 
     /// <inheritdoc />
-    protected override FileCategory CategorizeFile(string filePath)
+    public override double? ScoreCollection(NamingPatternAnalysis analysis)
+    {
+        if (analysis == null)
+        {
+            throw new ArgumentNullException(nameof(analysis));
+        }
+
+        // Handles every collection, but recognizes no pattern
+        return 0;
+    }
+
+    /// <inheritdoc />
+    protected override FileCategory CategorizeFile(string fileName)
     {
         // All files treated as chapters for simple alphabetical sorting
         return FileCategory.Chapter;
     }
 
     /// <inheritdoc />
-    protected override string GetSortKey(string filePath)
+    protected override FileSortKey GetSortKey(string fileName, FileCategory category)
     {
-        return GetFileName(filePath);
+        return FileSortKey.FromText(category, fileName);
     }
 }
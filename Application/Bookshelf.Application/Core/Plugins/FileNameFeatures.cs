@@ -0,0 +1,118 @@
+namespace Bookshelf.Application.Core.Plugins;
+
+/// <summary>
+/// Naming pattern features recognized in a single file name
+/// </summary>
+[Flags]
+public enum FileNameFeatures
+{
+    /// <summary>
+    /// No known feature
+    /// </summary>
+    None = 0,
+
+    /// <summary>
+    /// A numbered German chapter (Kapitel_1_)
+    /// </summary>
+    Kapitel = 1 << 0,
+
+    /// <summary>
+    /// A numbered English chapter (Chapter_1_)
+    /// </summary>
+    Chapter = 1 << 1,
+
+    /// <summary>
+    /// A part with a Roman numeral (Teil_II_)
+    /// </summary>
+    Teil = 1 << 2,
+
+    /// <summary>
+    /// A lettered appendix (Anhang_A_)
+    /// </summary>
+    AnhangLetter = 1 << 3,
+
+    /// <summary>
+    /// A number enclosed in underscores (_1_)
+    /// </summary>
+    NumberedSection = 1 << 4,
+
+    /// <summary>
+    /// A Hanser ISBN chapter file (9783446######.001.pdf)
+    /// </summary>
+    IsbnChapter = 1 << 5,
+
+    /// <summary>
+    /// A Hanser ISBN front matter file (9783446######.fm.pdf)
+    /// </summary>
+    IsbnFrontMatter = 1 << 6,
+
+    /// <summary>
+    /// A Hanser ISBN back matter file (9783446######.bm.pdf)
+    /// </summary>
+    IsbnBackMatter = 1 << 7,
+
+    /// <summary>
+    /// Contains BEGINN
+    /// </summary>
+    Beginn = 1 << 8,
+
+    /// <summary>
+    /// Contains Vorwort
+    /// </summary>
+    Vorwort = 1 << 9,
+
+    /// <summary>
+    /// Contains Inhaltsverzeichnis
+    /// </summary>
+    Inhaltsverzeichnis = 1 << 10,
+
+    /// <summary>
+    /// Contains Inhalt, which includes every Inhaltsverzeichnis
+    /// </summary>
+    Inhalt = 1 << 11,
+
+    /// <summary>
+    /// Contains Cover
+    /// </summary>
+    Cover = 1 << 12,
+
+    /// <summary>
+    /// Contains Titel
+    /// </summary>
+    Titel = 1 << 13,
+
+    /// <summary>
+    /// Contains Einleitung
+    /// </summary>
+    Einleitung = 1 << 14,
+
+    /// <summary>
+    /// Contains über den Autor
+    /// </summary>
+    UeberDenAutor = 1 << 15,
+
+    /// <summary>
+    /// Contains Glossar
+    /// </summary>
+    Glossar = 1 << 16,
+
+    /// <summary>
+    /// Contains Stichwortverzeichnis
+    /// </summary>
+    Stichwortverzeichnis = 1 << 17,
+
+    /// <summary>
+    /// Contains Index
+    /// </summary>
+    Index = 1 << 18,
+
+    /// <summary>
+    /// Contains Anhang
+    /// </summary>
+    Anhang = 1 << 19,
+
+    /// <summary>
+    /// Contains Anhänge or its transliteration Anhnge
+    /// </summary>
+    Anhaenge = 1 << 20
+}
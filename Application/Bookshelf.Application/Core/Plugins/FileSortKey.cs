@@ -0,0 +1,42 @@
+namespace Bookshelf.Application.Core.Plugins;
+
+/// <summary>
+/// Sort key of a file in a collection, ordering by category, then by number, then by text
+/// </summary>
+/// <param name="Category">The book section category of the file</param>
+/// <param name="Number">The position of the file within its category</param>
+/// <param name="Text">Text compared case-insensitively when categories and numbers are equal</param>
+public readonly record struct FileSortKey(
+    FileCategory Category,
+    int Number,
+    string Text = "") : IComparable<FileSortKey>
+{
+    /// <summary>
+    /// Creates a sort key ordering files of a category by text only
+    /// </summary>
+    /// <param name="category">The book section category of the file</param>
+    /// <param name="text">The text to order by, typically the file name</param>
+    /// <returns>The sort key</returns>
+    public static FileSortKey FromText(FileCategory category, string text)
+    {
+        return new FileSortKey(category, 0, text);
+    }
+
+    /// <inheritdoc />
+    public int CompareTo(FileSortKey other)
+    {
+        var categoryComparison = ((int)Category).CompareTo((int)other.Category);
+        if (categoryComparison != 0)
+        {
+            return categoryComparison;
+        }
+
+        var numberComparison = Number.CompareTo(other.Number);
+        if (numberComparison != 0)
+        {
+            return numberComparison;
+        }
+
+        return string.Compare(Text, other.Text, StringComparison.OrdinalIgnoreCase);
+    }
+}
@@ -6,8 +6,11 @@ namespace Bookshelf.Application.Core.Plugins;
 /// Naming pattern plugin for Hanser Verlag books with ISBN-based naming
 /// Handles patterns like: 9783446######.fm.pdf, 9783446######.001.pdf, 9783446######.bm.pdf
 /// </summary>
-public sealed class HanserNamingPatternPlugin : NamingPatternPluginBase
+public sealed partial class HanserNamingPatternPlugin : NamingPatternPluginBase
 {
+    private const FileNameFeatures RecognizedFeatures =
+        FileNameFeatures.IsbnFrontMatter | FileNameFeatures.IsbnChapter | FileNameFeatures.IsbnBackMatter;
+
     // Pattern for ISBN-based file naming (9783446 followed by 6 digits = 13 digit ISBN-13)
     private const string IsbnPattern = @"9783446\d{6}";
 
@@ -18,48 +21,40 @@ public sealed class HanserNamingPatternPlugin : NamingPatternPluginBase
     public override int Priority => 15;
 
     /// <inheritdoc />
-    public override bool CanHandle(IReadOnlyList<string> pdfFilePaths)
+    public override double? ScoreCollection(NamingPatternAnalysis analysis)
     {
-        if (pdfFilePaths == null)
+        if (analysis == null)
         {
-            throw new ArgumentNullException(nameof(pdfFilePaths));
+            throw new ArgumentNullException(nameof(analysis));
         }
 
-        var fileNames = pdfFilePaths.Select(GetFileName).ToList();
-        
         // Check for ISBN-based naming pattern with .fm. or .bm. or numeric extensions
-        var hasIsbnPattern = fileNames.Any(f => 
-            Regex.IsMatch(f, $@"{IsbnPattern}\.\d{{3}}\.pdf", RegexOptions.IgnoreCase));
-        
-        var hasFrontMatter = fileNames.Any(f => 
-            Regex.IsMatch(f, $@"{IsbnPattern}\.fm\.pdf", RegexOptions.IgnoreCase));
-
-        var hasBackMatter = fileNames.Any(f => 
-            Regex.IsMatch(f, $@"{IsbnPattern}\.bm\.pdf", RegexOptions.IgnoreCase));
+        var hasIsbnPattern = analysis.HasAny(FileNameFeatures.IsbnChapter);
+        var hasFrontOrBackMatter = analysis.HasAny(FileNameFeatures.IsbnFrontMatter | FileNameFeatures.IsbnBackMatter);
 
         // Must have numeric chapter pattern and at least front or back matter
-        return hasIsbnPattern && (hasFrontMatter || hasBackMatter);
+        var canHandle = hasIsbnPattern && hasFrontOrBackMatter;
+
+        return canHandle ? analysis.GetShareOfFilesWithAny(RecognizedFeatures) : null;
     }
 
     /// <inheritdoc />
-    protected override FileCategory CategorizeFile(string filePath)
+    protected override FileCategory CategorizeFile(string fileName)
     {
-        var fileName = GetFileName(filePath);
-
         // Front matter (.fm.pdf)
-        if (Regex.IsMatch(fileName, $@"{IsbnPattern}\.fm\.pdf", RegexOptions.IgnoreCase))
+        if (FrontMatterRegex().IsMatch(fileName))
         {
             return FileCategory.FrontMatter;
         }
 
         // Back matter (.bm.pdf)
-        if (Regex.IsMatch(fileName, $@"{IsbnPattern}\.bm\.pdf", RegexOptions.IgnoreCase))
+        if (BackMatterRegex().IsMatch(fileName))
         {
             return FileCategory.BackMatter;
         }
 
         // Chapters (numeric extensions like .001.pdf, .002.pdf)
-        if (Regex.IsMatch(fileName, $@"{IsbnPattern}\.\d{{3}}\.pdf", RegexOptions.IgnoreCase))
+        if (ChapterRegex().IsMatch(fileName))
         {
             return FileCategory.Chapter;
         }
@@ -68,31 +63,37 @@ public sealed class HanserNamingPatternPlugin : NamingPatternPluginBase
     }
 
     /// <inheritdoc />
-    protected override string GetSortKey(string filePath)
+    protected override FileSortKey GetSortKey(string fileName, FileCategory category)
     {
-        var fileName = GetFileName(filePath);
-        var category = CategorizeFile(filePath);
-
         return category switch
         {
-            FileCategory.FrontMatter => "0000",
-            FileCategory.Chapter => GetChapterSortKey(fileName),
-            FileCategory.BackMatter => "9999",
-            _ => fileName
+            FileCategory.FrontMatter => new FileSortKey(category, 0),
+            FileCategory.Chapter => new FileSortKey(category, GetChapterNumber(fileName)),
+            FileCategory.BackMatter => new FileSortKey(category, 9999),
+            _ => FileSortKey.FromText(category, fileName)
         };
     }
 
-    private static string GetChapterSortKey(string fileName)
+    private static int GetChapterNumber(string fileName)
     {
         // Extract the three-digit chapter number
-        var match = Regex.Match(fileName, $@"{IsbnPattern}\.(\d{{3}})\.pdf", RegexOptions.IgnoreCase);
+        var match = ChapterRegex().Match(fileName);
         if (match.Success)
         {
-            if (int.TryParse(match.Groups[1].Value, out var number))
+            if (int.TryParse(match.Groups[1].ValueSpan, out var number))
             {
-                return number.ToString("D4");
+                return number;
             }
         }
-        return "5000";
+        return 5000;
     }
+
+    [GeneratedRegex(IsbnPattern + @"\.fm\.pdf", RegexOptions.IgnoreCase)]
+    private static partial Regex FrontMatterRegex();
+
+    [GeneratedRegex(IsbnPattern + @"\.bm\.pdf", RegexOptions.IgnoreCase)]
+    private static partial Regex BackMatterRegex();
+
+    [GeneratedRegex(IsbnPattern + @"\.(\d{3})\.pdf", RegexOptions.IgnoreCase)]
+    private static partial Regex ChapterRegex();
 }
@@ -22,10 +22,17 @@ public interface INamingPatternPlugin
     /// <returns>True if this plugin can order the files, false otherwise</returns>
     bool CanHandle(IReadOnlyList<string> pdfFilePaths);
 
+    /// <summary>
+    /// Scores how well this plugin matches a collection from the features of its file names
+    /// </summary>
+    /// <param name="analysis">The naming pattern analysis of the collection</param>
+    /// <returns>The confidence between 0 and 1, or null if this plugin cannot handle the collection</returns>
+    double? ScoreCollection(NamingPatternAnalysis analysis);
+
     /// <summary>
     /// Orders the PDF files according to the publisher's naming pattern
     /// </summary>
-    /// <param name="pdfFilePaths">The PDF file paths to order</param>
+    /// <param name="pdfFilePaths">The PDF file paths to order, already filtered with <see cref="FilterFiles"/></param>
     /// <returns>The ordered list of PDF file paths</returns>
     IReadOnlyList<string> OrderFiles(IReadOnlyList<string> pdfFilePaths);
 
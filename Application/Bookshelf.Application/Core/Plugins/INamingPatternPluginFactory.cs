@@ -18,6 +18,14 @@ public interface INamingPatternPluginFactory
     /// <exception cref="ArgumentNullException">Thrown when pdfFilePaths is null</exception>
     INamingPatternPlugin DetectPlugin(IReadOnlyList<string> pdfFilePaths);
 
+    /// <summary>
+    /// Detects the appropriate naming pattern plugin for the given PDF files in a single pass over their names
+    /// </summary>
+    /// <param name="pdfFilePaths">The PDF file paths to analyze</param>
+    /// <returns>The detected plugin with its confidence and the detection time</returns>
+    /// <exception cref="ArgumentNullException">Thrown when pdfFilePaths is null</exception>
+    PluginDetectionResult Detect(IReadOnlyList<string> pdfFilePaths);
+
     /// <summary>
     /// Gets a plugin by name
     /// </summary>
@@ -6,8 +6,16 @@ namespace Bookshelf.Application.Core.Plugins;
 /// Naming pattern plugin for mitp publisher books with German naming conventions
 /// Handles patterns like: Cover, Titel, Inhaltsverzeichnis, Einleitung, über den Autor, Kapitel_1_, Anhang_A_, Glossar, Stichwortverzeichnis
 /// </summary>
-public sealed class MitpNamingPatternPlugin : NamingPatternPluginBase
+public sealed partial class MitpNamingPatternPlugin : NamingPatternPluginBase
 {
+    private const FileNameFeatures FrontMatterFeatures =
+        FileNameFeatures.Cover | FileNameFeatures.Titel | FileNameFeatures.Inhaltsverzeichnis |
+        FileNameFeatures.Einleitung | FileNameFeatures.UeberDenAutor;
+
+    private const FileNameFeatures RecognizedFeatures =
+        FrontMatterFeatures | FileNameFeatures.Kapitel | FileNameFeatures.AnhangLetter |
+        FileNameFeatures.Glossar | FileNameFeatures.Stichwortverzeichnis;
+
     private static readonly string[] FrontMatterPatterns = 
         ["Cover", "Titel", "Inhaltsverzeichnis", "Einleitung", "über den Autor"];
     
@@ -21,45 +29,38 @@ public sealed class MitpNamingPatternPlugin : NamingPatternPluginBase
     public override int Priority => 10;
 
     /// <inheritdoc />
-    public override bool CanHandle(IReadOnlyList<string> pdfFilePaths)
+    public override double? ScoreCollection(NamingPatternAnalysis analysis)
     {
-        if (pdfFilePaths == null)
+        if (analysis == null)
         {
-            throw new ArgumentNullException(nameof(pdfFilePaths));
+            throw new ArgumentNullException(nameof(analysis));
         }
 
-        var fileNames = pdfFilePaths.Select(GetFileName).ToList();
-        
         // Check for characteristic mitp patterns
-        var hasKapitelPattern = fileNames.Any(f => 
-            Regex.IsMatch(f, @"Kapitel_\d+_", RegexOptions.IgnoreCase));
-        
-        var hasFrontMatter = fileNames.Any(f => 
-            FrontMatterPatterns.Any(p => f.Contains(p, StringComparison.OrdinalIgnoreCase)));
-
-        var hasAnhangPattern = fileNames.Any(f => 
-            Regex.IsMatch(f, @"Anhang_[A-Z]_", RegexOptions.IgnoreCase));
+        var hasKapitelPattern = analysis.HasAny(FileNameFeatures.Kapitel);
+        var hasFrontMatter = analysis.HasAny(FrontMatterFeatures);
+        var hasAnhangPattern = analysis.HasAny(FileNameFeatures.AnhangLetter);
 
         // Must have chapter pattern and at least one other mitp characteristic
-        return hasKapitelPattern && (hasFrontMatter || hasAnhangPattern);
+        var canHandle = hasKapitelPattern && (hasFrontMatter || hasAnhangPattern);
+
+        return canHandle ? analysis.GetShareOfFilesWithAny(RecognizedFeatures) : null;
     }
 
     /// <inheritdoc />
-    protected override FileCategory CategorizeFile(string filePath)
+    protected override FileCategory CategorizeFile(string fileName)
     {
-        var fileName = GetFileName(filePath);
-
         if (FrontMatterPatterns.Any(p => fileName.Contains(p, StringComparison.OrdinalIgnoreCase)))
         {
             return FileCategory.FrontMatter;
         }
 
-        if (Regex.IsMatch(fileName, @"Kapitel_\d+_", RegexOptions.IgnoreCase))
+        if (KapitelRegex().IsMatch(fileName))
         {
             return FileCategory.Chapter;
         }
 
-        if (Regex.IsMatch(fileName, @"Anhang_[A-Z]_", RegexOptions.IgnoreCase))
+        if (AnhangRegex().IsMatch(fileName))
         {
             return FileCategory.Appendix;
         }
@@ -73,61 +74,34 @@ public sealed class MitpNamingPatternPlugin : NamingPatternPluginBase
     }
 
     /// <inheritdoc />
-    protected override string GetSortKey(string filePath)
+    protected override FileSortKey GetSortKey(string fileName, FileCategory category)
     {
-        var fileName = GetFileName(filePath);
-        var category = CategorizeFile(filePath);
-
         return category switch
         {
-            FileCategory.FrontMatter => GetFrontMatterSortKey(fileName),
-            FileCategory.Chapter => GetChapterSortKey(fileName),
-            FileCategory.Appendix => GetAppendixSortKey(fileName),
-            FileCategory.BackMatter => GetBackMatterSortKey(fileName),
-            _ => fileName
+            // Order: Cover, Titel, Inhaltsverzeichnis, Einleitung, über den Autor
+            FileCategory.FrontMatter => new FileSortKey(category, IndexOfContainedPattern(fileName, FrontMatterPatterns)),
+            FileCategory.Chapter => new FileSortKey(category, ExtractNumber(fileName, KapitelRegex())),
+            FileCategory.Appendix => new FileSortKey(category, GetAppendixLetter(fileName)),
+            // Order: Glossar, Stichwortverzeichnis
+            FileCategory.BackMatter => new FileSortKey(category, IndexOfContainedPattern(fileName, BackMatterPatterns)),
+            _ => FileSortKey.FromText(category, fileName)
         };
     }
 
-    private static string GetFrontMatterSortKey(string fileName)
-    {
-        // Order: Cover, Titel, Inhaltsverzeichnis, Einleitung, über den Autor
-        for (var i = 0; i < FrontMatterPatterns.Length; i++)
-        {
-            if (fileName.Contains(FrontMatterPatterns[i], StringComparison.OrdinalIgnoreCase))
-            {
-                return i.ToString("D4");
-            }
-        }
-        return "9999";
-    }
-
-    private static string GetChapterSortKey(string fileName)
-    {
-        var number = ExtractNumber(fileName, @"Kapitel_(\d+)_");
-        return number.ToString("D4");
-    }
-
-    private static string GetAppendixSortKey(string fileName)
+    private static char GetAppendixLetter(string fileName)
     {
         // Extract letter from Anhang_A_, Anhang_B_, etc.
-        var match = Regex.Match(fileName, @"Anhang_([A-Z])_", RegexOptions.IgnoreCase);
+        var match = AnhangRegex().Match(fileName);
         if (match.Success)
         {
-            return match.Groups[1].Value.ToUpperInvariant();
+            return char.ToUpperInvariant(match.Groups[1].ValueSpan[0]);
         }
-        return "Z";
+        return 'Z';
     }
 
-    private static string GetBackMatterSortKey(string fileName)
-    {
-        // Order: Glossar, Stichwortverzeichnis
-        for (var i = 0; i < BackMatterPatterns.Length; i++)
-        {
-            if (fileName.Contains(BackMatterPatterns[i], StringComparison.OrdinalIgnoreCase))
-            {
-                return i.ToString("D4");
-            }
-        }
-        return "9999";
-    }
+    [GeneratedRegex(@"Kapitel_(\d+)_", RegexOptions.IgnoreCase)]
+    private static partial Regex KapitelRegex();
+
+    [GeneratedRegex(@"Anhang_([A-Z])_", RegexOptions.IgnoreCase)]
+    private static partial Regex AnhangRegex();
 }
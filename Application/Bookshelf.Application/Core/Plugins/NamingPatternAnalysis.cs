@@ -0,0 +1,286 @@
+using System.Buffers;
+
+namespace Bookshelf.Application.Core.Plugins;
+
+/// <summary>
+/// Naming pattern features of a collection, gathered by tokenizing every file name once
+/// </summary>
+public sealed class NamingPatternAnalysis
+{
+    private static readonly (string Keyword, FileNameFeatures Feature)[] UpperCaseKeywords =
+    [
+        ("BEGINN", FileNameFeatures.Beginn),
+        ("VORWORT", FileNameFeatures.Vorwort),
+        ("INHALTSVERZEICHNIS", FileNameFeatures.Inhaltsverzeichnis),
+        ("INHALT", FileNameFeatures.Inhalt),
+        ("COVER", FileNameFeatures.Cover),
+        ("TITEL", FileNameFeatures.Titel),
+        ("EINLEITUNG", FileNameFeatures.Einleitung),
+        ("ÜBER DEN AUTOR", FileNameFeatures.UeberDenAutor),
+        ("GLOSSAR", FileNameFeatures.Glossar),
+        ("STICHWORTVERZEICHNIS", FileNameFeatures.Stichwortverzeichnis),
+        ("INDEX", FileNameFeatures.Index),
+        ("ANHANG", FileNameFeatures.Anhang),
+        ("ANHNGE", FileNameFeatures.Anhaenge),
+        ("ANHÄNGE", FileNameFeatures.Anhaenge)
+    ];
+
+    private static readonly SearchValues<char> RomanNumeralCharacters = SearchValues.Create("IVX");
+
+    private const int MaxStackFileNameLength = 512;
+    private const string HanserIsbnPrefix = "9783446";
+    private const int IsbnLength = 13;
+
+    private readonly Dictionary<FileNameFeatures, int> _fileCountsByFeatures;
+
+    private NamingPatternAnalysis(int fileCount, Dictionary<FileNameFeatures, int> fileCountsByFeatures)
+    {
+        FileCount = fileCount;
+        _fileCountsByFeatures = fileCountsByFeatures;
+        Features = fileCountsByFeatures.Keys.Aggregate(FileNameFeatures.None, (all, features) => all | features);
+    }
+
+    /// <summary>
+    /// Gets the number of analyzed files
+    /// </summary>
+    public int FileCount { get; }
+
+    /// <summary>
+    /// Gets the features found in at least one file
+    /// </summary>
+    public FileNameFeatures Features { get; }
+
+    /// <summary>
+    /// Analyzes the file names of a collection
+    /// </summary>
+    /// <param name="pdfFilePaths">The PDF file paths to analyze</param>
+    /// <returns>The analysis of the collection</returns>
+    /// <exception cref="ArgumentNullException">Thrown when pdfFilePaths is null</exception>
+    public static NamingPatternAnalysis Analyze(IReadOnlyList<string> pdfFilePaths)
+    {
+        if (pdfFilePaths == null)
+        {
+            throw new ArgumentNullException(nameof(pdfFilePaths));
+        }
+
+        // Files are grouped by their feature combination, of which a collection has only a few
+        var fileCountsByFeatures = new Dictionary<FileNameFeatures, int>();
+        foreach (var filePath in pdfFilePaths)
+        {
+            var features = GetFeatures(Path.GetFileName(filePath));
+            fileCountsByFeatures[features] = fileCountsByFeatures.GetValueOrDefault(features) + 1;
+        }
+
+        return new NamingPatternAnalysis(pdfFilePaths.Count, fileCountsByFeatures);
+    }
+
+    /// <summary>
+    /// Determines whether at least one file has any of the given features
+    /// </summary>
+    /// <param name="features">The features to look for</param>
+    /// <returns>True if a file has one of the features, false otherwise</returns>
+    public bool HasAny(FileNameFeatures features)
+    {
+        return (Features & features) != 0;
+    }
+
+    /// <summary>
+    /// Gets the share of files having any of the given features
+    /// </summary>
+    /// <param name="features">The features a file must have one of</param>
+    /// <returns>The share between 0 and 1, or 0 for an empty collection</returns>
+    public double GetShareOfFilesWithAny(FileNameFeatures features)
+    {
+        if (FileCount == 0)
+        {
+            return 0;
+        }
+
+        var matchingFiles = _fileCountsByFeatures
+            .Where(entry => (entry.Key & features) != 0)
+            .Sum(entry => entry.Value);
+
+        return (double)matchingFiles / FileCount;
+    }
+
+    /// <summary>
+    /// Tokenizes a file name and determines its naming pattern features
+    /// </summary>
+    /// <param name="fileName">The file name without directory</param>
+    /// <returns>The features of the file name</returns>
+    public static FileNameFeatures GetFeatures(string fileName)
+    {
+        if (fileName == null)
+        {
+            throw new ArgumentNullException(nameof(fileName));
+        }
+
+        // Upper-casing once turns every case-insensitive keyword search into a vectorized ordinal search
+        var buffer = fileName.Length <= MaxStackFileNameLength
+            ? stackalloc char[fileName.Length]
+            : new char[fileName.Length];
+        fileName.AsSpan().ToUpperInvariant(buffer);
+        ReadOnlySpan<char> upperCaseFileName = buffer;
+
+        var features = FileNameFeatures.None;
+        foreach (var (keyword, feature) in UpperCaseKeywords)
+        {
+            if (upperCaseFileName.Contains(keyword, StringComparison.Ordinal))
+            {
+                features |= feature;
+            }
+        }
+
+        return features | GetUnderscoreFeatures(upperCaseFileName) | GetIsbnFeatures(upperCaseFileName);
+    }
+
+    /// <summary>
+    /// Recognizes the underscore-delimited tokens such as Kapitel_1_, Teil_II_, Anhang_A_ and _1_ in an upper-case file name
+    /// </summary>
+    private static FileNameFeatures GetUnderscoreFeatures(ReadOnlySpan<char> fileName)
+    {
+        var features = FileNameFeatures.None;
+        var previousToken = ReadOnlySpan<char>.Empty;
+        var tokenStart = -1;
+
+        for (var index = 0; index < fileName.Length; index++)
+        {
+            if (fileName[index] != '_')
+            {
+                continue;
+            }
+
+            // Only tokens enclosed by underscores on both sides are candidates
+            var isEnclosed = tokenStart >= 0;
+            if (isEnclosed)
+            {
+                var token = fileName[tokenStart..index];
+                features |= GetTokenFeatures(previousToken, token);
+                previousToken = token;
+            }
+            else
+            {
+                previousToken = fileName[..index];
+            }
+
+            tokenStart = index + 1;
+        }
+
+        return features;
+    }
+
+    /// <summary>
+    /// Recognizes an underscore-enclosed token given the text before its opening underscore
+    /// </summary>
+    private static FileNameFeatures GetTokenFeatures(ReadOnlySpan<char> previousToken, ReadOnlySpan<char> token)
+    {
+        var features = FileNameFeatures.None;
+        if (token.IsEmpty)
+        {
+            return features;
+        }
+
+        var isNumber = IsNumber(token);
+        if (isNumber)
+        {
+            features |= FileNameFeatures.NumberedSection;
+
+            if (previousToken.EndsWith("KAPITEL", StringComparison.Ordinal))
+            {
+                features |= FileNameFeatures.Kapitel;
+            }
+
+            if (previousToken.EndsWith("CHAPTER", StringComparison.Ordinal))
+            {
+                features |= FileNameFeatures.Chapter;
+            }
+        }
+
+        var isRomanNumeral = !token.ContainsAnyExcept(RomanNumeralCharacters);
+        if (isRomanNumeral && previousToken.EndsWith("TEIL", StringComparison.Ordinal))
+        {
+            features |= FileNameFeatures.Teil;
+        }
+
+        var isLetter = token.Length == 1 && char.IsAsciiLetterUpper(token[0]);
+        if (isLetter && previousToken.EndsWith("ANHANG", StringComparison.Ordinal))
+        {
+            features |= FileNameFeatures.AnhangLetter;
+        }
+
+        return features;
+    }
+
+    /// <summary>
+    /// Recognizes the Hanser ISBN file names 9783446######.fm.pdf, .bm.pdf and .###.pdf in an upper-case file name
+    /// </summary>
+    private static FileNameFeatures GetIsbnFeatures(ReadOnlySpan<char> fileName)
+    {
+        var features = FileNameFeatures.None;
+
+        for (var dot = fileName.IndexOf('.'); dot >= 0; dot = NextIndexOf(fileName, '.', dot + 1))
+        {
+            var isAfterIsbn = dot >= IsbnLength && IsHanserIsbn(fileName[(dot - IsbnLength)..dot]);
+            if (!isAfterIsbn)
+            {
+                continue;
+            }
+
+            var sectionEnd = NextIndexOf(fileName, '.', dot + 1);
+            if (sectionEnd < 0)
+            {
+                break;
+            }
+
+            var isPdf = fileName[(sectionEnd + 1)..].StartsWith("PDF", StringComparison.Ordinal);
+            if (!isPdf)
+            {
+                continue;
+            }
+
+            var section = fileName[(dot + 1)..sectionEnd];
+            if (section.SequenceEqual("FM"))
+            {
+                features |= FileNameFeatures.IsbnFrontMatter;
+            }
+            else if (section.SequenceEqual("BM"))
+            {
+                features |= FileNameFeatures.IsbnBackMatter;
+            }
+            else if (section.Length == 3 && IsNumber(section))
+            {
+                features |= FileNameFeatures.IsbnChapter;
+            }
+        }
+
+        return features;
+    }
+
+    private static bool IsHanserIsbn(ReadOnlySpan<char> candidate)
+    {
+        return candidate.StartsWith(HanserIsbnPrefix, StringComparison.Ordinal) &&
+            IsNumber(candidate[HanserIsbnPrefix.Length..]);
+    }
+
+    /// <summary>
+    /// Determines whether every character is a decimal digit, like \d in a regex
+    /// </summary>
+    private static bool IsNumber(ReadOnlySpan<char> value)
+    {
+        foreach (var character in value)
+        {
+            if (!char.IsDigit(character))
+            {
+                return false;
+            }
+        }
+
+        return !value.IsEmpty;
+    }
+
+    private static int NextIndexOf(ReadOnlySpan<char> value, char character, int startIndex)
+    {
+        var index = value[startIndex..].IndexOf(character);
+        return index < 0 ? -1 : startIndex + index;
+    }
+}
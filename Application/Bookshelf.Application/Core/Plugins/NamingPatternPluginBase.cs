@@ -5,7 +5,7 @@ namespace Bookshelf.Application.Core.Plugins;
 /// <summary>
 /// Base class for naming pattern plugins providing common functionality
 /// </summary>
-public abstract class NamingPatternPluginBase : INamingPatternPlugin
+public abstract partial class NamingPatternPluginBase : INamingPatternPlugin
 {
     /// <inheritdoc />
     public abstract string PluginName { get; }
@@ -14,7 +14,18 @@ public abstract class NamingPatternPluginBase : INamingPatternPlugin
     public virtual int Priority => 0;
 
     /// <inheritdoc />
-    public abstract bool CanHandle(IReadOnlyList<string> pdfFilePaths);
+    public virtual bool CanHandle(IReadOnlyList<string> pdfFilePaths)
+    {
+        if (pdfFilePaths == null)
+        {
+            throw new ArgumentNullException(nameof(pdfFilePaths));
+        }
+
+        return ScoreCollection(NamingPatternAnalysis.Analyze(pdfFilePaths)) != null;
+    }
+
+    /// <inheritdoc />
+    public abstract double? ScoreCollection(NamingPatternAnalysis analysis);
 
     /// <inheritdoc />
     public virtual IReadOnlyList<string> OrderFiles(IReadOnlyList<string> pdfFilePaths)
@@ -24,15 +35,25 @@ public abstract class NamingPatternPluginBase : INamingPatternPlugin
             throw new ArgumentNullException(nameof(pdfFilePaths));
         }
 
-        var filteredFiles = FilterFiles(pdfFilePaths);
-        var categorizedFiles = filteredFiles
-            .Select(f => new { Path = f, Category = CategorizeFile(f), SortKey = GetSortKey(f) })
-            .OrderBy(f => f.Category)
-            .ThenBy(f => f.SortKey, StringComparer.OrdinalIgnoreCase)
-            .Select(f => f.Path)
-            .ToList();
+        // Category and sort key are computed once per file, then compared without further parsing
+        var orderedFiles = new OrderedFile[pdfFilePaths.Count];
+        for (var index = 0; index < orderedFiles.Length; index++)
+        {
+            var filePath = pdfFilePaths[index];
+            var fileName = GetFileName(filePath);
+            var sortKey = GetSortKey(fileName, CategorizeFile(fileName));
+            orderedFiles[index] = new OrderedFile(sortKey, index, filePath);
+        }
+
+        Array.Sort(orderedFiles);
+
+        var result = new string[orderedFiles.Length];
+        for (var index = 0; index < orderedFiles.Length; index++)
+        {
+            result[index] = orderedFiles[index].FilePath;
+        }
 
-        return categorizedFiles;
+        return result;
     }
 
     /// <inheritdoc />
@@ -51,16 +72,17 @@ public abstract class NamingPatternPluginBase : INamingPatternPlugin
     /// <summary>
     /// Categorizes a file into its book section category
     /// </summary>
-    /// <param name="filePath">The file path to categorize</param>
+    /// <param name="fileName">The file name to categorize</param>
     /// <returns>The file category</returns>
-    protected abstract FileCategory CategorizeFile(string filePath);
+    protected abstract FileCategory CategorizeFile(string fileName);
 
     /// <summary>
     /// Gets the sort key for ordering files within the same category
     /// </summary>
-    /// <param name="filePath">The file path to get the sort key for</param>
-    /// <returns>A string sort key for ordering</returns>
-    protected abstract string GetSortKey(string filePath);
+    /// <param name="fileName">The file name to get the sort key for</param>
+    /// <param name="category">The category of the file as returned by <see cref="CategorizeFile"/></param>
+    /// <returns>The sort key for ordering</returns>
+    protected abstract FileSortKey GetSortKey(string fileName, FileCategory category);
 
     /// <summary>
     /// Determines if a file is a duplicate that should be filtered out
@@ -71,21 +93,21 @@ public abstract class NamingPatternPluginBase : INamingPatternPlugin
     {
         var fileName = Path.GetFileName(filePath);
         // Check for common duplicate patterns like "(1)", "(2)", etc.
-        return Regex.IsMatch(fileName, @"\(\d+\)\.[^.]+$");
+        return DuplicateFileRegex().IsMatch(fileName);
     }
 
     /// <summary>
     /// Extracts a numeric value from a string for sorting
     /// </summary>
     /// <param name="input">The input string</param>
-    /// <param name="pattern">The regex pattern with a capture group for the number</param>
+    /// <param name="regex">The regex with a capture group for the number</param>
     /// <returns>The extracted number, or int.MaxValue if not found</returns>
-    protected static int ExtractNumber(string input, string pattern)
+    protected static int ExtractNumber(string input, Regex regex)
     {
-        var match = Regex.Match(input, pattern, RegexOptions.IgnoreCase);
+        var match = regex.Match(input);
         if (match.Success && match.Groups.Count > 1)
         {
-            if (int.TryParse(match.Groups[1].Value, out var number))
+            if (int.TryParse(match.Groups[1].ValueSpan, out var number))
             {
                 return number;
             }
@@ -93,25 +115,49 @@ public abstract class NamingPatternPluginBase : INamingPatternPlugin
         return int.MaxValue;
     }
 
+    /// <summary>
+    /// Gets the position of the first pattern contained in a file name
+    /// </summary>
+    /// <param name="fileName">The file name</param>
+    /// <param name="patterns">The patterns in their sort order</param>
+    /// <returns>The index of the first contained pattern, or 9999 if none is contained</returns>
+    protected static int IndexOfContainedPattern(string fileName, string[] patterns)
+    {
+        for (var i = 0; i < patterns.Length; i++)
+        {
+            if (fileName.Contains(patterns[i], StringComparison.OrdinalIgnoreCase))
+            {
+                return i;
+            }
+        }
+        return 9999;
+    }
+
     /// <summary>
     /// Converts a Roman numeral to an integer
     /// </summary>
     /// <param name="roman">The Roman numeral string</param>
     /// <returns>The integer value</returns>
-    protected static int RomanToInt(string roman)
+    protected static int RomanToInt(ReadOnlySpan<char> roman)
     {
-        var romanNumerals = new Dictionary<char, int>
-        {
-            { 'I', 1 }, { 'V', 5 }, { 'X', 10 }, { 'L', 50 },
-            { 'C', 100 }, { 'D', 500 }, { 'M', 1000 }
-        };
-
         var result = 0;
         var previousValue = 0;
 
-        foreach (var c in roman.ToUpperInvariant().Reverse())
+        for (var i = roman.Length - 1; i >= 0; i--)
         {
-            if (!romanNumerals.TryGetValue(c, out var value))
+            var value = char.ToUpperInvariant(roman[i]) switch
+            {
+                'I' => 1,
+                'V' => 5,
+                'X' => 10,
+                'L' => 50,
+                'C' => 100,
+                'D' => 500,
+                'M' => 1000,
+                _ => 0
+            };
+
+            if (value == 0)
             {
                 return int.MaxValue;
             }
@@ -139,4 +185,24 @@ public abstract class NamingPatternPluginBase : INamingPatternPlugin
     {
         return Path.GetFileName(filePath);
     }
+
+    /// <summary>
+    /// Matches numbered copies like "Book (1).pdf"
+    /// </summary>
+    [GeneratedRegex(@"\(\d+\)\.[^.]+$")]
+    private static partial Regex DuplicateFileRegex();
+
+    /// <summary>
+    /// A file with its precomputed sort key, ordered stably by its position in the input
+    /// </summary>
+    private readonly record struct OrderedFile(FileSortKey SortKey, int Position, string FilePath)
+        : IComparable<OrderedFile>
+    {
+        /// <inheritdoc />
+        public int CompareTo(OrderedFile other)
+        {
+            var sortKeyComparison = SortKey.CompareTo(other.SortKey);
+            return sortKeyComparison != 0 ? sortKeyComparison : Position.CompareTo(other.Position);
+        }
+    }
 }
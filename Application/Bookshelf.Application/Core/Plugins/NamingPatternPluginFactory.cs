@@ -1,3 +1,5 @@
+using System.Diagnostics;
+
 namespace Bookshelf.Application.Core.Plugins;
 
 /// <summary>
@@ -49,21 +51,39 @@ public sealed class NamingPatternPluginFactory : INamingPatternPluginFactory
 
     /// <inheritdoc />
     public INamingPatternPlugin DetectPlugin(IReadOnlyList<string> pdfFilePaths)
+    {
+        return Detect(pdfFilePaths).Plugin;
+    }
+
+    /// <inheritdoc />
+    public PluginDetectionResult Detect(IReadOnlyList<string> pdfFilePaths)
     {
         if (pdfFilePaths == null)
         {
             throw new ArgumentNullException(nameof(pdfFilePaths));
         }
 
+        var startTimestamp = Stopwatch.GetTimestamp();
+
+        // Every file name is tokenized once; plugins score the shared analysis instead of re-reading the names
+        var analysis = NamingPatternAnalysis.Analyze(pdfFilePaths);
+
+        // Plugins are ordered by priority, so the first one able to handle the collection wins
         foreach (var plugin in _plugins)
         {
-            if (plugin.CanHandle(pdfFilePaths))
+            var confidence = plugin.ScoreCollection(analysis);
+            if (confidence.HasValue)
             {
-                return plugin;
+                return new PluginDetectionResult(
+                    plugin, confidence.Value, analysis.FileCount, Stopwatch.GetElapsedTime(startTimestamp));
             }
         }
 
-        return _defaultPlugin;
+        return new PluginDetectionResult(
+            _defaultPlugin,
+            _defaultPlugin.ScoreCollection(analysis) ?? 0,
+            analysis.FileCount,
+            Stopwatch.GetElapsedTime(startTimestamp));
     }
 
     /// <inheritdoc />
@@ -6,8 +6,12 @@ namespace Bookshelf.Application.Core.Plugins;
 /// Naming pattern plugin for O'Reilly publisher books
 /// Handles patterns like: BEGINN, Inhalt, Vorwort, Kapitel_1_, Chapter_1_, Index, Anhang
 /// </summary>
-public sealed class OReillyNamingPatternPlugin : NamingPatternPluginBase
+public sealed partial class OReillyNamingPatternPlugin : NamingPatternPluginBase
 {
+    private const FileNameFeatures RecognizedFeatures =
+        FileNameFeatures.Beginn | FileNameFeatures.Inhalt | FileNameFeatures.Vorwort | FileNameFeatures.Kapitel |
+        FileNameFeatures.Chapter | FileNameFeatures.Anhang | FileNameFeatures.Index;
+
     private static readonly string[] FrontMatterPatterns = 
         ["BEGINN", "Inhalt", "Vorwort"];
     
@@ -21,44 +25,34 @@ public sealed class OReillyNamingPatternPlugin : NamingPatternPluginBase
     public override int Priority => 8;
 
     /// <inheritdoc />
-    public override bool CanHandle(IReadOnlyList<string> pdfFilePaths)
+    public override double? ScoreCollection(NamingPatternAnalysis analysis)
     {
-        if (pdfFilePaths == null)
+        if (analysis == null)
         {
-            throw new ArgumentNullException(nameof(pdfFilePaths));
+            throw new ArgumentNullException(nameof(analysis));
         }
 
-        var fileNames = pdfFilePaths.Select(GetFileName).ToList();
-        
         // O'Reilly supports both Kapitel_ and Chapter_ patterns
-        var hasKapitelPattern = fileNames.Any(f => 
-            Regex.IsMatch(f, @"Kapitel_\d+_", RegexOptions.IgnoreCase));
-        
-        var hasChapterPattern = fileNames.Any(f => 
-            Regex.IsMatch(f, @"Chapter_\d+_", RegexOptions.IgnoreCase));
-
-        var hasBeginn = fileNames.Any(f => 
-            f.Contains("BEGINN", StringComparison.OrdinalIgnoreCase));
-
-        var hasIndex = fileNames.Any(f => 
-            f.Contains("Index", StringComparison.OrdinalIgnoreCase));
+        var hasChapterPattern = analysis.HasAny(FileNameFeatures.Kapitel | FileNameFeatures.Chapter);
+        var hasBeginn = analysis.HasAny(FileNameFeatures.Beginn);
+        var hasIndex = analysis.HasAny(FileNameFeatures.Index);
 
         // Must have BEGINN pattern and either chapter patterns or Index
         // This distinguishes O'Reilly from mitp (which doesn't have BEGINN)
-        return hasBeginn && ((hasKapitelPattern || hasChapterPattern) || hasIndex);
+        var canHandle = hasBeginn && (hasChapterPattern || hasIndex);
+
+        return canHandle ? analysis.GetShareOfFilesWithAny(RecognizedFeatures) : null;
     }
 
     /// <inheritdoc />
-    protected override FileCategory CategorizeFile(string filePath)
+    protected override FileCategory CategorizeFile(string fileName)
     {
-        var fileName = GetFileName(filePath);
-
         if (FrontMatterPatterns.Any(p => fileName.Contains(p, StringComparison.OrdinalIgnoreCase)))
         {
             return FileCategory.FrontMatter;
         }
 
-        if (Regex.IsMatch(fileName, @"(Kapitel|Chapter)_\d+_", RegexOptions.IgnoreCase))
+        if (KapitelOrChapterRegex().IsMatch(fileName))
         {
             return FileCategory.Chapter;
         }
@@ -77,68 +71,53 @@ public sealed class OReillyNamingPatternPlugin : NamingPatternPluginBase
     }
 
     /// <inheritdoc />
-    protected override string GetSortKey(string filePath)
+    protected override FileSortKey GetSortKey(string fileName, FileCategory category)
     {
-        var fileName = GetFileName(filePath);
-        var category = CategorizeFile(filePath);
-
         return category switch
         {
-            FileCategory.FrontMatter => GetFrontMatterSortKey(fileName),
-            FileCategory.Chapter => GetChapterSortKey(fileName),
-            FileCategory.Appendix => GetAppendixSortKey(fileName),
-            FileCategory.BackMatter => GetBackMatterSortKey(fileName),
-            _ => fileName
+            // Order: BEGINN, Inhalt, Vorwort
+            FileCategory.FrontMatter => new FileSortKey(category, IndexOfContainedPattern(fileName, FrontMatterPatterns)),
+            FileCategory.Chapter => new FileSortKey(category, GetChapterNumber(fileName)),
+            FileCategory.Appendix => new FileSortKey(category, GetAppendixLetter(fileName)),
+            FileCategory.BackMatter => new FileSortKey(category, IndexOfContainedPattern(fileName, BackMatterPatterns)),
+            _ => FileSortKey.FromText(category, fileName)
         };
     }
 
-    private static string GetFrontMatterSortKey(string fileName)
-    {
-        // Order: BEGINN, Inhalt, Vorwort
-        for (var i = 0; i < FrontMatterPatterns.Length; i++)
-        {
-            if (fileName.Contains(FrontMatterPatterns[i], StringComparison.OrdinalIgnoreCase))
-            {
-                return i.ToString("D4");
-            }
-        }
-        return "9999";
-    }
-
-    private static string GetChapterSortKey(string fileName)
+    private static int GetChapterNumber(string fileName)
     {
         // Try Kapitel pattern first
-        var number = ExtractNumber(fileName, @"Kapitel_(\d+)_");
+        var number = ExtractNumber(fileName, KapitelRegex());
         if (number == int.MaxValue)
         {
             // Try Chapter pattern
-            number = ExtractNumber(fileName, @"Chapter_(\d+)_");
+            number = ExtractNumber(fileName, ChapterRegex());
         }
-        return number.ToString("D4");
+        return number;
     }
 
-    private static string GetAppendixSortKey(string fileName)
+    private static char GetAppendixLetter(string fileName)
     {
         // Extract letter from Anhang_A_, Anhang_B_, etc. or just Anhang
-        var match = Regex.Match(fileName, @"Anhang_([A-Z])_", RegexOptions.IgnoreCase);
+        var match = AnhangRegex().Match(fileName);
         if (match.Success)
         {
-            return match.Groups[1].Value.ToUpperInvariant();
+            return char.ToUpperInvariant(match.Groups[1].ValueSpan[0]);
         }
-        
+
         // If just "Anhang" without letter, it's a single appendix
-        return "A";
+        return 'A';
     }
 
-    private static string GetBackMatterSortKey(string fileName)
-    {
-        for (var i = 0; i < BackMatterPatterns.Length; i++)
-        {
-            if (fileName.Contains(BackMatterPatterns[i], StringComparison.OrdinalIgnoreCase))
-            {
-                return i.ToString("D4");
-            }
-        }
-        return "9999";
-    }
+    [GeneratedRegex(@"Kapitel_(\d+)_", RegexOptions.IgnoreCase)]
+    private static partial Regex KapitelRegex();
+
+    [GeneratedRegex(@"Chapter_(\d+)_", RegexOptions.IgnoreCase)]
+    private static partial Regex ChapterRegex();
+
+    [GeneratedRegex(@"(Kapitel|Chapter)_\d+_", RegexOptions.IgnoreCase)]
+    private static partial Regex KapitelOrChapterRegex();
+
+    [GeneratedRegex(@"Anhang_([A-Z])_", RegexOptions.IgnoreCase)]
+    private static partial Regex AnhangRegex();
 }
@@ -0,0 +1,14 @@
+namespace Bookshelf.Application.Core.Plugins;
+
+/// <summary>
+/// Result of detecting the naming pattern plugin of a collection
+/// </summary>
+/// <param name="Plugin">The detected plugin, or the default plugin if no pattern matched</param>
+/// <param name="Confidence">The share of files the plugin recognizes, between 0 and 1</param>
+/// <param name="FileCount">The number of analyzed files</param>
+/// <param name="Elapsed">The time spent tokenizing the file names and scoring the plugins</param>
+public sealed record PluginDetectionResult(
+    INamingPatternPlugin Plugin,
+    double Confidence,
+    int FileCount,
+    TimeSpan Elapsed);
@@ -7,8 +7,12 @@ namespace Bookshelf.Application.Core.Plugins;
 /// Handles patterns like: Teil_I_, Teil_II_, Teil_III_, with chapters nested within parts
 /// Also handles: BEGINN, Vorwort, Inhaltsverzeichnis, Index, Anhang
 /// </summary>
-public sealed class TeilBasedNamingPatternPlugin : NamingPatternPluginBase
+public sealed partial class TeilBasedNamingPatternPlugin : NamingPatternPluginBase
 {
+    private const FileNameFeatures RecognizedFeatures =
+        FileNameFeatures.Beginn | FileNameFeatures.Vorwort | FileNameFeatures.Inhaltsverzeichnis |
+        FileNameFeatures.Teil | FileNameFeatures.Kapitel | FileNameFeatures.Anhang | FileNameFeatures.Index;
+
     private static readonly string[] FrontMatterPatterns = 
         ["BEGINN", "Vorwort", "Inhaltsverzeichnis"];
     
@@ -22,41 +26,35 @@ public sealed class TeilBasedNamingPatternPlugin : NamingPatternPluginBase
     public override int Priority => 12;
 
     /// <inheritdoc />
-    public override bool CanHandle(IReadOnlyList<string> pdfFilePaths)
+    public override double? ScoreCollection(NamingPatternAnalysis analysis)
     {
-        if (pdfFilePaths == null)
+        if (analysis == null)
         {
-            throw new ArgumentNullException(nameof(pdfFilePaths));
+            throw new ArgumentNullException(nameof(analysis));
         }
 
-        var fileNames = pdfFilePaths.Select(GetFileName).ToList();
-        
-        // Check for Teil pattern with Roman numerals
-        var hasTeilPattern = fileNames.Any(f => 
-            Regex.IsMatch(f, @"Teil_[IVX]+_", RegexOptions.IgnoreCase));
-
         // Must have Teil pattern - this is the distinguishing feature
-        return hasTeilPattern;
+        var hasTeilPattern = analysis.HasAny(FileNameFeatures.Teil);
+
+        return hasTeilPattern ? analysis.GetShareOfFilesWithAny(RecognizedFeatures) : null;
     }
 
     /// <inheritdoc />
-    protected override FileCategory CategorizeFile(string filePath)
+    protected override FileCategory CategorizeFile(string fileName)
     {
-        var fileName = GetFileName(filePath);
-
         if (FrontMatterPatterns.Any(p => fileName.Contains(p, StringComparison.OrdinalIgnoreCase)))
         {
             return FileCategory.FrontMatter;
         }
 
         // Teil (Part) patterns
-        if (Regex.IsMatch(fileName, @"Teil_[IVX]+_", RegexOptions.IgnoreCase))
+        if (TeilRegex().IsMatch(fileName))
         {
             return FileCategory.Part;
         }
 
         // Chapters within parts
-        if (Regex.IsMatch(fileName, @"Kapitel_\d+_", RegexOptions.IgnoreCase))
+        if (KapitelRegex().IsMatch(fileName))
         {
             return FileCategory.Chapter;
         }
@@ -75,73 +73,48 @@ public sealed class TeilBasedNamingPatternPlugin : NamingPatternPluginBase
     }
 
     /// <inheritdoc />
-    protected override string GetSortKey(string filePath)
+    protected override FileSortKey GetSortKey(string fileName, FileCategory category)
     {
-        var fileName = GetFileName(filePath);
-        var category = CategorizeFile(filePath);
-
         return category switch
         {
-            FileCategory.FrontMatter => GetFrontMatterSortKey(fileName),
-            FileCategory.Part => GetPartSortKey(fileName),
-            FileCategory.Chapter => GetChapterSortKey(fileName),
-            FileCategory.Appendix => GetAppendixSortKey(fileName),
-            FileCategory.BackMatter => GetBackMatterSortKey(fileName),
-            _ => fileName
+            // Order: BEGINN, Vorwort, Inhaltsverzeichnis
+            FileCategory.FrontMatter => new FileSortKey(category, IndexOfContainedPattern(fileName, FrontMatterPatterns)),
+            FileCategory.Part => new FileSortKey(category, GetPartNumber(fileName)),
+            FileCategory.Chapter => new FileSortKey(category, ExtractNumber(fileName, KapitelRegex())),
+            FileCategory.Appendix => new FileSortKey(category, GetAppendixLetter(fileName)),
+            FileCategory.BackMatter => new FileSortKey(category, IndexOfContainedPattern(fileName, BackMatterPatterns)),
+            _ => FileSortKey.FromText(category, fileName)
         };
     }
 
-    private static string GetFrontMatterSortKey(string fileName)
-    {
-        // Order: BEGINN, Vorwort, Inhaltsverzeichnis
-        for (var i = 0; i < FrontMatterPatterns.Length; i++)
-        {
-            if (fileName.Contains(FrontMatterPatterns[i], StringComparison.OrdinalIgnoreCase))
-            {
-                return i.ToString("D4");
-            }
-        }
-        return "9999";
-    }
-
-    private static string GetPartSortKey(string fileName)
+    private static int GetPartNumber(string fileName)
     {
         // Extract Roman numeral from Teil_I_, Teil_II_, etc.
-        var match = Regex.Match(fileName, @"Teil_([IVX]+)_", RegexOptions.IgnoreCase);
+        var match = TeilRegex().Match(fileName);
         if (match.Success)
         {
-            var romanValue = RomanToInt(match.Groups[1].Value);
-            return romanValue.ToString("D4");
+            return RomanToInt(match.Groups[1].ValueSpan);
         }
-        return "5000";
+        return 5000;
     }
 
-    private static string GetChapterSortKey(string fileName)
-    {
-        var number = ExtractNumber(fileName, @"Kapitel_(\d+)_");
-        return number.ToString("D4");
-    }
-
-    private static string GetAppendixSortKey(string fileName)
+    private static char GetAppendixLetter(string fileName)
     {
         // Extract letter from Anhang_A_, Anhang_B_, etc.
-        var match = Regex.Match(fileName, @"Anhang_([A-Z])_", RegexOptions.IgnoreCase);
+        var match = AnhangRegex().Match(fileName);
         if (match.Success)
         {
-            return match.Groups[1].Value.ToUpperInvariant();
+            return char.ToUpperInvariant(match.Groups[1].ValueSpan[0]);
         }
-        return "A";
+        return 'A';
     }
 
-    private static string GetBackMatterSortKey(string fileName)
-    {
-        for (var i = 0; i < BackMatterPatterns.Length; i++)
-        {
-            if (fileName.Contains(BackMatterPatterns[i], StringComparison.OrdinalIgnoreCase))
-            {
-                return i.ToString("D4");
-            }
-        }
-        return "9999";
-    }
+    [GeneratedRegex(@"Teil_([IVX]+)_", RegexOptions.IgnoreCase)]
+    private static partial Regex TeilRegex();
+
+    [GeneratedRegex(@"Kapitel_(\d+)_", RegexOptions.IgnoreCase)]
+    private static partial Regex KapitelRegex();
+
+    [GeneratedRegex(@"Anhang_([A-Z])_", RegexOptions.IgnoreCase)]
+    private static partial Regex AnhangRegex();
 }
@@ -6,8 +6,12 @@ namespace Bookshelf.Application.Core.Plugins;
 /// Naming pattern plugin for Wichmann Verlag books with underscore-based numbering
 /// Handles patterns like: Vorwort, Inhalt, _1_, _2_, ..., _8_, Anhnge, Stichwortverzeichnis
 /// </summary>
-public sealed class WichmannNamingPatternPlugin : NamingPatternPluginBase
+public sealed partial class WichmannNamingPatternPlugin : NamingPatternPluginBase
 {
+    private const FileNameFeatures RecognizedFeatures =
+        FileNameFeatures.Vorwort | FileNameFeatures.Inhalt | FileNameFeatures.NumberedSection |
+        FileNameFeatures.Anhaenge | FileNameFeatures.Stichwortverzeichnis;
+
     private static readonly string[] FrontMatterPatterns = ["Vorwort", "Inhalt"];
     private static readonly string[] BackMatterPatterns = ["Stichwortverzeichnis"];
     private static readonly string[] AppendixPatterns = ["Anhnge", "Anhänge"];
@@ -19,45 +23,38 @@ public sealed class WichmannNamingPatternPlugin : NamingPatternPluginBase
     public override int Priority => 5;
 
     /// <inheritdoc />
-    public override bool CanHandle(IReadOnlyList<string> pdfFilePaths)
+    public override double? ScoreCollection(NamingPatternAnalysis analysis)
     {
-        if (pdfFilePaths == null)
+        if (analysis == null)
         {
-            throw new ArgumentNullException(nameof(pdfFilePaths));
+            throw new ArgumentNullException(nameof(analysis));
         }
 
-        var fileNames = pdfFilePaths.Select(GetFileName).ToList();
-        
         // Check for characteristic Wichmann patterns: _1_, _2_, etc.
-        var hasNumberPattern = fileNames.Any(f => 
-            Regex.IsMatch(f, @"_\d+_", RegexOptions.IgnoreCase));
-        
-        var hasFrontMatter = fileNames.Any(f => 
-            FrontMatterPatterns.Any(p => f.Contains(p, StringComparison.OrdinalIgnoreCase)));
+        var hasNumberPattern = analysis.HasAny(FileNameFeatures.NumberedSection);
+        var hasFrontMatter = analysis.HasAny(FileNameFeatures.Vorwort | FileNameFeatures.Inhalt);
 
         // Check for Anhänge/Anhnge pattern
-        var hasAnhange = fileNames.Any(f => 
-            AppendixPatterns.Any(p => f.Contains(p, StringComparison.OrdinalIgnoreCase)));
+        var hasAnhange = analysis.HasAny(FileNameFeatures.Anhaenge);
 
         // Must have number pattern and either front matter or appendix pattern
         // But should NOT have Kapitel_ pattern (which would be mitp)
-        var hasKapitelPattern = fileNames.Any(f => 
-            Regex.IsMatch(f, @"Kapitel_\d+_", RegexOptions.IgnoreCase));
+        var hasKapitelPattern = analysis.HasAny(FileNameFeatures.Kapitel);
+
+        var canHandle = hasNumberPattern && (hasFrontMatter || hasAnhange) && !hasKapitelPattern;
 
-        return hasNumberPattern && (hasFrontMatter || hasAnhange) && !hasKapitelPattern;
+        return canHandle ? analysis.GetShareOfFilesWithAny(RecognizedFeatures) : null;
     }
 
     /// <inheritdoc />
-    protected override FileCategory CategorizeFile(string filePath)
+    protected override FileCategory CategorizeFile(string fileName)
     {
-        var fileName = GetFileName(filePath);
-
         if (FrontMatterPatterns.Any(p => fileName.Contains(p, StringComparison.OrdinalIgnoreCase)))
         {
             return FileCategory.FrontMatter;
         }
 
-        if (Regex.IsMatch(fileName, @"_\d+_", RegexOptions.IgnoreCase) &&
+        if (NumberRegex().IsMatch(fileName) &&
             !AppendixPatterns.Any(p => fileName.Contains(p, StringComparison.OrdinalIgnoreCase)))
         {
             return FileCategory.Chapter;
@@ -77,49 +74,22 @@ public sealed class WichmannNamingPatternPlugin : NamingPatternPluginBase
     }
 
     /// <inheritdoc />
-    protected override string GetSortKey(string filePath)
+    protected override FileSortKey GetSortKey(string fileName, FileCategory category)
     {
-        var fileName = GetFileName(filePath);
-        var category = CategorizeFile(filePath);
-
         return category switch
         {
-            FileCategory.FrontMatter => GetFrontMatterSortKey(fileName),
-            FileCategory.Chapter => GetChapterSortKey(fileName),
-            FileCategory.Appendix => "0000", // Single appendix section
-            FileCategory.BackMatter => GetBackMatterSortKey(fileName),
-            _ => fileName
+            // Order: Vorwort, Inhalt
+            FileCategory.FrontMatter => new FileSortKey(category, IndexOfContainedPattern(fileName, FrontMatterPatterns)),
+            FileCategory.Chapter => new FileSortKey(category, ExtractNumber(fileName, NumberRegex())),
+            FileCategory.Appendix => new FileSortKey(category, 0), // Single appendix section
+            FileCategory.BackMatter => new FileSortKey(category, IndexOfContainedPattern(fileName, BackMatterPatterns)),
+            _ => FileSortKey.FromText(category, fileName)
         };
     }
 
-    private static string GetFrontMatterSortKey(string fileName)
-    {
-        // Order: Vorwort, Inhalt
-        for (var i = 0; i < FrontMatterPatterns.Length; i++)
-        {
-            if (fileName.Contains(FrontMatterPatterns[i], StringComparison.OrdinalIgnoreCase))
-            {
-                return i.ToString("D4");
-            }
-        }
-        return "9999";
-    }
+    [GeneratedRegex(@"_(\d+)_", RegexOptions.IgnoreCase)]
+    private static partial Regex NumberRegex();
 
-    private static string GetChapterSortKey(string fileName)
-    {
-        var number = ExtractNumber(fileName, @"_(\d+)_");
-        return number.ToString("D4");
-    }
-
-    private static string GetBackMatterSortKey(string fileName)
-    {
-        for (var i = 0; i < BackMatterPatterns.Length; i++)
-        {
-            if (fileName.Contains(BackMatterPatterns[i], StringComparison.OrdinalIgnoreCase))
-            {
-                return i.ToString("D4");
-            }
-        }
-        return "9999";
-    }
+    [GeneratedRegex(@"Kapitel_\d+_", RegexOptions.IgnoreCase)]
+    private static partial Regex KapitelRegex();
 }
@@ -0,0 +1,76 @@
+using System.Diagnostics;
+using Bookshelf.Application.Core.ValueObjects;
+
+namespace Bookshelf.Application.Core.Retrieval;
+
+/// <summary>
+/// Splits the pages of a book into overlapping passages of similar length, the unit that is embedded and retrieved
+/// </summary>
+/// <remarks>
+/// Passages never span pages, so every passage can be cited with a single page number. Consecutive passages of a page
+/// share <see cref="DefaultOverlapWords"/> words so a sentence cut at a passage border is still found whole in one of
+/// them, and a short rest of a page is merged into the previous passage instead of becoming a passage of its own.
+/// </remarks>
+public static class TextChunker
+{
+    /// <summary>
+    /// Default number of words per passage
+    /// </summary>
+    public const int DefaultChunkWords = 200;
+
+    /// <summary>
+    /// Default number of words shared by consecutive passages of a page
+    /// </summary>
+    public const int DefaultOverlapWords = 40;
+
+    /// <summary>
+    /// Smallest number of words of a passage of its own; fewer words are merged into the previous passage
+    /// </summary>
+    public const int MinChunkWords = 8;
+
+    /// <summary>
+    /// Splits the pages of a book into passages, lazily so only the current page is split at a time
+    /// </summary>
+    /// <param name="pages">The text of every page, in page order</param>
+    /// <param name="chunkWords">The number of words per passage</param>
+    /// <param name="overlapWords">The number of words shared by consecutive passages of a page</param>
+    /// <returns>The passages in page order, with whitespace collapsed to single spaces</returns>
+    public static IEnumerable<TextChunk> ChunkPages(
+        IReadOnlyList<string> pages,
+        int chunkWords = DefaultChunkWords,
+        int overlapWords = DefaultOverlapWords)
+    {
+        // Precondition
+        Debug.Assert(chunkWords >= MinChunkWords, "Chunk words must be at least the minimum chunk words");
+        Debug.Assert(overlapWords >= 0 && overlapWords < chunkWords, "Overlap words must be less than the chunk words");
+
+        var stride = chunkWords - overlapWords;
+        for (var pageIndex = 0; pageIndex < pages.Count; pageIndex++)
+        {
+            var words = pages[pageIndex].Split((char[]?)null, StringSplitOptions.RemoveEmptyEntries);
+            var hasTooFewWords = words.Length < MinChunkWords;
+            if (hasTooFewWords)
+            {
+                continue;
+            }
+
+            for (var start = 0; start < words.Length; start += stride)
+            {
+                var end = Math.Min(start + chunkWords, words.Length);
+                var remainingWords = words.Length - end;
+                var isLastChunkOfPage = remainingWords < MinChunkWords;
+                if (isLastChunkOfPage)
+                {
+                    end = words.Length;
+                }
+
+                yield return new TextChunk(pageIndex + 1, string.Join(' ', words, start, end - start));
+
+                if (isLastChunkOfPage)
+                {
+                    break;
+                }
+            }
+        }
+    }
+}
@@ -0,0 +1,187 @@
+using System.Diagnostics;
+using Bookshelf.Application.Core.Entities;
+
+namespace Bookshelf.Application.Core.Retrieval;
+
+/// <summary>
+/// Groups passage vectors into inverted file lists with spherical k-means, so a query only compares the passages of
+/// the lists whose centroids are closest to it
+/// </summary>
+/// <remarks>
+/// <para>
+/// Below <see cref="MinChunksForClustering"/> passages comparing a query with every passage takes a few milliseconds
+/// and is exact, so smaller indexes are not clustered. Larger indexes get about the square root of their passage count
+/// as lists, trained on a sample of <see cref="SamplesPerCluster"/> passages per list, after which every passage is
+/// assigned to its nearest centroid.
+/// </para>
+/// <para>
+/// Sampling and initialization take evenly spaced passages instead of random ones, so building the same index twice
+/// yields the same lists. Unlike a graph index, the lists are rebuilt from scratch in seconds, which keeps incremental
+/// updates of a changing bookshelf simple.
+/// </para>
+/// </remarks>
+public static class VectorClustering
+{
+    /// <summary>
+    /// Smallest number of passages that are grouped into lists
+    /// </summary>
+    public const int MinChunksForClustering = 16384;
+
+    /// <summary>
+    /// Number of training passages per list
+    /// </summary>
+    public const int SamplesPerCluster = 64;
+
+    /// <summary>
+    /// Number of k-means iterations over the training passages
+    /// </summary>
+    public const int Iterations = 10;
+
+    /// <summary>
+    /// Groups passage vectors into inverted file lists
+    /// </summary>
+    /// <param name="vectors">The normalized passage vectors, one after another</param>
+    /// <param name="dimensions">The number of dimensions of the vectors</param>
+    /// <param name="maxParallelism">The maximum number of threads assigning passages to centroids</param>
+    /// <returns>The lists, or none if there are too few passages to be worth grouping</returns>
+    public static VectorClusters Build(float[] vectors, int dimensions, int maxParallelism)
+    {
+        // Precondition
+        Debug.Assert(dimensions > 0, "Dimensions must be positive");
+        Debug.Assert(vectors.Length % dimensions == 0, "Vectors must have the given dimensions");
+        Debug.Assert(maxParallelism > 0, "Max parallelism must be positive");
+
+        var chunkCount = vectors.Length / dimensions;
+        var hasTooFewChunks = chunkCount < MinChunksForClustering;
+        if (hasTooFewChunks)
+        {
+            return VectorClusters.None(dimensions);
+        }
+
+        var clusterCount = (int)Math.Round(Math.Sqrt(chunkCount));
+        var sampleCount = Math.Min(chunkCount, clusterCount * SamplesPerCluster);
+        var sampleIds = TakeEvenlySpaced(chunkCount, sampleCount);
+        var parallelOptions = new ParallelOptions { MaxDegreeOfParallelism = maxParallelism };
+
+        var centroids = new float[clusterCount * dimensions];
+        var initialIds = TakeEvenlySpaced(chunkCount, clusterCount);
+        for (var clusterId = 0; clusterId < clusterCount; clusterId++)
+        {
+            vectors.AsSpan(initialIds[clusterId] * dimensions, dimensions)
+                .CopyTo(centroids.AsSpan(clusterId * dimensions, dimensions));
+        }
+
+        var sampleAssignments = new int[sampleCount];
+        for (var iteration = 0; iteration < Iterations; iteration++)
+        {
+            Parallel.For(0, sampleCount, parallelOptions, sampleIndex =>
+                sampleAssignments[sampleIndex] = FindNearestCentroid(vectors, sampleIds[sampleIndex], centroids, dimensions));
+
+            UpdateCentroids(vectors, sampleIds, sampleAssignments, centroids, dimensions);
+        }
+
+        var assignments = new int[chunkCount];
+        Parallel.For(0, chunkCount, parallelOptions, chunkId =>
+            assignments[chunkId] = FindNearestCentroid(vectors, chunkId, centroids, dimensions));
+
+        var (listOffsets, listChunkIds) = GroupByCluster(assignments, clusterCount);
+        return new VectorClusters(dimensions, centroids, listOffsets, listChunkIds);
+    }
+
+    /// <summary>
+    /// Takes evenly spaced ids from 0 to the given count
+    /// </summary>
+    private static int[] TakeEvenlySpaced(int count, int takeCount)
+    {
+        var ids = new int[takeCount];
+        for (var index = 0; index < takeCount; index++)
+        {
+            ids[index] = (int)((long)index * count / takeCount);
+        }
+
+        return ids;
+    }
+
+    /// <summary>
+    /// Finds the centroid with the highest cosine similarity to a passage
+    /// </summary>
+    private static int FindNearestCentroid(float[] vectors, int chunkId, float[] centroids, int dimensions)
+    {
+        var vector = vectors.AsSpan(chunkId * dimensions, dimensions);
+        var nearestClusterId = 0;
+        var bestScore = float.NegativeInfinity;
+        for (var clusterId = 0; clusterId < centroids.Length / dimensions; clusterId++)
+        {
+            var score = VectorMath.Dot(vector, centroids.AsSpan(clusterId * dimensions, dimensions));
+            if (score > bestScore)
+            {
+                bestScore = score;
+                nearestClusterId = clusterId;
+            }
+        }
+
+        return nearestClusterId;
+    }
+
+    /// <summary>
+    /// Moves every centroid to the normalized mean of its training passages, keeping centroids without passages
+    /// </summary>
+    private static void UpdateCentroids(
+        float[] vectors,
+        int[] sampleIds,
+        int[] sampleAssignments,
+        float[] centroids,
+        int dimensions)
+    {
+        var clusterCount = centroids.Length / dimensions;
+        var sums = new float[centroids.Length];
+        var memberCounts = new int[clusterCount];
+        for (var sampleIndex = 0; sampleIndex < sampleIds.Length; sampleIndex++)
+        {
+            var clusterId = sampleAssignments[sampleIndex];
+            VectorMath.Add(
+                sums.AsSpan(clusterId * dimensions, dimensions),
+                vectors.AsSpan(sampleIds[sampleIndex] * dimensions, dimensions));
+            memberCounts[clusterId]++;
+        }
+
+        for (var clusterId = 0; clusterId < clusterCount; clusterId++)
+        {
+            var hasMembers = memberCounts[clusterId] > 0;
+            if (!hasMembers)
+            {
+                continue;
+            }
+
+            var centroid = centroids.AsSpan(clusterId * dimensions, dimensions);
+            sums.AsSpan(clusterId * dimensions, dimensions).CopyTo(centroid);
+            VectorMath.Normalize(centroid);
+        }
+    }
+
+    /// <summary>
+    /// Groups the passage ids by their centroid with a counting sort, keeping passage order within every list
+    /// </summary>
+    private static (int[] ListOffsets, int[] ListChunkIds) GroupByCluster(int[] assignments, int clusterCount)
+    {
+        var listOffsets = new int[clusterCount + 1];
+        foreach (var clusterId in assignments)
+        {
+            listOffsets[clusterId + 1]++;
+        }
+
+        for (var clusterId = 0; clusterId < clusterCount; clusterId++)
+        {
+            listOffsets[clusterId + 1] += listOffsets[clusterId];
+        }
+
+        var listChunkIds = new int[assignments.Length];
+        var nextPositions = listOffsets[..clusterCount];
+        for (var chunkId = 0; chunkId < assignments.Length; chunkId++)
+        {
+            listChunkIds[nextPositions[assignments[chunkId]]++] = chunkId;
+        }
+
+        return (listOffsets, listChunkIds);
+    }
+}
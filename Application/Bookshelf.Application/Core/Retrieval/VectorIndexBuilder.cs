@@ -0,0 +1,93 @@
+using System.Diagnostics;
+using Bookshelf.Application.Core.Diagnostics;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Core.ValueObjects;
+
+namespace Bookshelf.Application.Core.Retrieval;
+
+/// <summary>
+/// Builds the <see cref="VectorIndexContent"/> of a bookshelf from embedded passages, book by book
+/// </summary>
+/// <remarks>
+/// Passages are numbered in the order their books are added, so the passages of a book always have consecutive ids.
+/// Unchanged books of a previous index are added with their stored passages and vectors, changed books with freshly
+/// embedded ones; the builder does not tell them apart.
+/// </remarks>
+public sealed class VectorIndexBuilder
+{
+    private readonly string _modelId;
+    private readonly int _dimensions;
+    private readonly List<VectorIndexBook> _books = new();
+    private readonly List<VectorIndexChunk> _chunks = new();
+    private readonly List<float> _vectors = new();
+
+    /// <summary>
+    /// Initializes a new instance of the VectorIndexBuilder class
+    /// </summary>
+    /// <param name="modelId">The embedding model the passages are embedded with</param>
+    /// <param name="dimensions">The number of dimensions of the embeddings</param>
+    public VectorIndexBuilder(string modelId, int dimensions)
+    {
+        // Precondition
+        Debug.Assert(!string.IsNullOrWhiteSpace(modelId), "Model id must not be empty");
+        Debug.Assert(dimensions > 0, "Dimensions must be positive");
+
+        _modelId = modelId;
+        _dimensions = dimensions;
+    }
+
+    /// <summary>
+    /// Gets the number of passages added so far
+    /// </summary>
+    public int ChunkCount => _chunks.Count;
+
+    /// <summary>
+    /// Adds a book with its passages and their vectors
+    /// </summary>
+    /// <param name="fileName">The file name of the book inside the bookshelf directory</param>
+    /// <param name="fileSizeBytes">The file size in bytes</param>
+    /// <param name="lastWriteTimeUtc">The last modification time in UTC</param>
+    /// <param name="title">The title of the book</param>
+    /// <param name="chunks">The passages of the book, empty if it has no text</param>
+    /// <param name="vectors">The normalized vector of every passage, one after another</param>
+    public void AddBook(
+        string fileName,
+        long fileSizeBytes,
+        DateTime lastWriteTimeUtc,
+        string title,
+        IReadOnlyList<TextChunk> chunks,
+        ReadOnlySpan<float> vectors)
+    {
+        // Precondition
+        Debug.Assert(!string.IsNullOrWhiteSpace(fileName), "File name must not be empty");
+        Debug.Assert(vectors.Length == chunks.Count * _dimensions, "Every passage must have one vector");
+
+        var bookId = _books.Count;
+        _books.Add(new VectorIndexBook(fileName, fileSizeBytes, lastWriteTimeUtc, title, _chunks.Count, chunks.Count));
+
+        foreach (var chunk in chunks)
+        {
+            _chunks.Add(new VectorIndexChunk(bookId, chunk.Page, chunk.Text));
+        }
+
+        _vectors.AddRange(vectors);
+    }
+
+    /// <summary>
+    /// Groups the passages into inverted file lists and creates the index content
+    /// </summary>
+    /// <param name="maxParallelism">The maximum number of threads grouping the passages</param>
+    /// <returns>The index content</returns>
+    public VectorIndexContent Build(int maxParallelism)
+    {
+        var vectors = _vectors.ToArray();
+
+        VectorClusters clusters;
+        using (BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Cluster))
+        {
+            clusters = VectorClustering.Build(vectors, _dimensions, maxParallelism);
+        }
+
+        return new VectorIndexContent(_modelId, _dimensions, _books.ToList(), _chunks.ToList(), vectors, clusters);
+    }
+}
@@ -0,0 +1,103 @@
+using System.Diagnostics;
+
+namespace Bookshelf.Application.Core.Retrieval;
+
+/// <summary>
+/// Finds the passages of a vector index most similar to a query vector
+/// </summary>
+/// <remarks>
+/// An index without inverted file lists is searched exhaustively. Otherwise the query is compared with the centroids
+/// first and only the passages of the closest lists are compared with it, trading a little recall for reading a small
+/// part of the vectors; probing every list gives the exact result.
+/// </remarks>
+public static class VectorIndexSearcher
+{
+    /// <summary>
+    /// Finds the passages most similar to a query vector
+    /// </summary>
+    /// <param name="view">The vectors and lists of the index</param>
+    /// <param name="query">The normalized query vector</param>
+    /// <param name="maxResults">The maximum number of matches returned</param>
+    /// <param name="probes">The number of lists whose passages are compared with the query</param>
+    /// <returns>The best matches, ordered by descending score</returns>
+    public static IReadOnlyList<VectorMatch> Search(
+        VectorIndexView view,
+        ReadOnlySpan<float> query,
+        int maxResults,
+        int probes)
+    {
+        // Precondition
+        Debug.Assert(query.Length == view.Dimensions, "Query must have the dimensions of the index");
+        Debug.Assert(maxResults > 0, "Max results must be positive");
+        Debug.Assert(probes > 0, "Probes must be positive");
+
+        var bestMatches = new PriorityQueue<VectorMatch, float>(Math.Min(maxResults, view.ChunkCount) + 1);
+
+        var isClustered = view.ClusterCount > 0;
+        if (!isClustered)
+        {
+            for (var chunkId = 0; chunkId < view.ChunkCount; chunkId++)
+            {
+                Offer(bestMatches, maxResults, chunkId, VectorMath.Dot(query, view.GetVector(chunkId)));
+            }
+
+            return ToDescendingList(bestMatches);
+        }
+
+        foreach (var clusterId in FindNearestClusters(view, query, probes))
+        {
+            foreach (var chunkId in view.GetList(clusterId))
+            {
+                Offer(bestMatches, maxResults, chunkId, VectorMath.Dot(query, view.GetVector(chunkId)));
+            }
+        }
+
+        return ToDescendingList(bestMatches);
+    }
+
+    /// <summary>
+    /// Finds the lists whose centroids are most similar to the query
+    /// </summary>
+    private static IEnumerable<int> FindNearestClusters(VectorIndexView view, ReadOnlySpan<float> query, int probes)
+    {
+        var nearestClusters = new PriorityQueue<VectorMatch, float>(Math.Min(probes, view.ClusterCount) + 1);
+        for (var clusterId = 0; clusterId < view.ClusterCount; clusterId++)
+        {
+            Offer(nearestClusters, probes, clusterId, VectorMath.Dot(query, view.GetCentroid(clusterId)));
+        }
+
+        return nearestClusters.UnorderedItems.Select(item => item.Element.ChunkId).ToList();
+    }
+
+    /// <summary>
+    /// Keeps a match if it is among the best seen so far, evicting the worst one once the queue is full
+    /// </summary>
+    private static void Offer(PriorityQueue<VectorMatch, float> bestMatches, int maxCount, int id, float score)
+    {
+        var isFull = bestMatches.Count >= maxCount;
+        if (!isFull)
+        {
+            bestMatches.Enqueue(new VectorMatch(id, score), score);
+            return;
+        }
+
+        bestMatches.TryPeek(out _, out var worstScore);
+        var isBetter = score > worstScore;
+        if (isBetter)
+        {
+            bestMatches.EnqueueDequeue(new VectorMatch(id, score), score);
+        }
+    }
+
+    /// <summary>
+    /// Empties the queue into a list ordered by descending score, then by id
+    /// </summary>
+    private static IReadOnlyList<VectorMatch> ToDescendingList(PriorityQueue<VectorMatch, float> bestMatches)
+    {
+        return bestMatches.UnorderedItems
+            .Select(item => item.Element)
+            .OrderByDescending(match => match.Score)
+            .ThenBy(match => match.ChunkId)
+            .ToList();
+    }
+}
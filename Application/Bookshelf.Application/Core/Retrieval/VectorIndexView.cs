@@ -0,0 +1,100 @@
+using System.Diagnostics;
+
+namespace Bookshelf.Application.Core.Retrieval;
+
+/// <summary>
+/// Vectors and inverted file lists of a vector index, read in place from wherever the index keeps them
+/// </summary>
+public readonly ref struct VectorIndexView
+{
+    /// <summary>
+    /// Initializes a new instance of the VectorIndexView struct
+    /// </summary>
+    /// <param name="dimensions">The number of dimensions of the vectors</param>
+    /// <param name="vectors">The passage vectors, one after another in passage order</param>
+    /// <param name="centroids">The centroids of the inverted file lists, one after another</param>
+    /// <param name="listOffsets">The start of every list in the list chunk ids, followed by their total count</param>
+    /// <param name="listChunkIds">The passage ids grouped by centroid</param>
+    public VectorIndexView(
+        int dimensions,
+        ReadOnlySpan<float> vectors,
+        ReadOnlySpan<float> centroids,
+        ReadOnlySpan<int> listOffsets,
+        ReadOnlySpan<int> listChunkIds)
+    {
+        // Precondition
+        Debug.Assert(dimensions > 0, "Dimensions must be positive");
+        Debug.Assert(vectors.Length % dimensions == 0, "Vectors must have the given dimensions");
+
+        Dimensions = dimensions;
+        Vectors = vectors;
+        Centroids = centroids;
+        ListOffsets = listOffsets;
+        ListChunkIds = listChunkIds;
+    }
+
+    /// <summary>
+    /// Gets the number of dimensions of the vectors
+    /// </summary>
+    public int Dimensions { get; }
+
+    /// <summary>
+    /// Gets the passage vectors, one after another in passage order
+    /// </summary>
+    public ReadOnlySpan<float> Vectors { get; }
+
+    /// <summary>
+    /// Gets the centroids of the inverted file lists, one after another
+    /// </summary>
+    public ReadOnlySpan<float> Centroids { get; }
+
+    /// <summary>
+    /// Gets the start of every list in <see cref="ListChunkIds"/>, followed by their total count
+    /// </summary>
+    public ReadOnlySpan<int> ListOffsets { get; }
+
+    /// <summary>
+    /// Gets the passage ids grouped by centroid
+    /// </summary>
+    public ReadOnlySpan<int> ListChunkIds { get; }
+
+    /// <summary>
+    /// Gets the number of passages
+    /// </summary>
+    public int ChunkCount => Vectors.Length / Dimensions;
+
+    /// <summary>
+    /// Gets the number of inverted file lists, 0 if every passage is compared with a query
+    /// </summary>
+    public int ClusterCount => Centroids.Length / Dimensions;
+
+    /// <summary>
+    /// Gets the vector of a passage
+    /// </summary>
+    /// <param name="chunkId">The passage id</param>
+    /// <returns>The vector</returns>
+    public ReadOnlySpan<float> GetVector(int chunkId)
+    {
+        return Vectors.Slice(chunkId * Dimensions, Dimensions);
+    }
+
+    /// <summary>
+    /// Gets the centroid of an inverted file list
+    /// </summary>
+    /// <param name="clusterId">The list id</param>
+    /// <returns>The centroid</returns>
+    public ReadOnlySpan<float> GetCentroid(int clusterId)
+    {
+        return Centroids.Slice(clusterId * Dimensions, Dimensions);
+    }
+
+    /// <summary>
+    /// Gets the passage ids of an inverted file list
+    /// </summary>
+    /// <param name="clusterId">The list id</param>
+    /// <returns>The passage ids whose nearest centroid is the one of the list</returns>
+    public ReadOnlySpan<int> GetList(int clusterId)
+    {
+        return ListChunkIds[ListOffsets[clusterId]..ListOffsets[clusterId + 1]];
+    }
+}
@@ -0,0 +1,8 @@
+namespace Bookshelf.Application.Core.Retrieval;
+
+/// <summary>
+/// A passage of the vector index similar to a query
+/// </summary>
+/// <param name="ChunkId">The passage id</param>
+/// <param name="Score">The cosine similarity of the passage and the query</param>
+public readonly record struct VectorMatch(int ChunkId, float Score);
@@ -0,0 +1,83 @@
+using System.Diagnostics;
+using System.Numerics;
+using System.Runtime.InteropServices;
+
+namespace Bookshelf.Application.Core.Retrieval;
+
+/// <summary>
+/// Vector operations on embeddings, using the widest SIMD instructions of the hardware through <see cref="Vector{T}"/>
+/// </summary>
+public static class VectorMath
+{
+    /// <summary>
+    /// Computes the dot product of two vectors, which is their cosine similarity if both are normalized
+    /// </summary>
+    /// <param name="left">The first vector</param>
+    /// <param name="right">The second vector, of the same length</param>
+    /// <returns>The dot product</returns>
+    public static float Dot(ReadOnlySpan<float> left, ReadOnlySpan<float> right)
+    {
+        // Precondition
+        Debug.Assert(left.Length == right.Length, "Vectors must have the same length");
+
+        // Two accumulators let consecutive multiplications overlap instead of waiting for the previous addition
+        var leftVectors = MemoryMarshal.Cast<float, Vector<float>>(left);
+        var rightVectors = MemoryMarshal.Cast<float, Vector<float>>(right);
+        var evenSums = Vector<float>.Zero;
+        var oddSums = Vector<float>.Zero;
+        var vectorIndex = 0;
+        for (; vectorIndex + 1 < leftVectors.Length; vectorIndex += 2)
+        {
+            evenSums += leftVectors[vectorIndex] * rightVectors[vectorIndex];
+            oddSums += leftVectors[vectorIndex + 1] * rightVectors[vectorIndex + 1];
+        }
+
+        for (; vectorIndex < leftVectors.Length; vectorIndex++)
+        {
+            evenSums += leftVectors[vectorIndex] * rightVectors[vectorIndex];
+        }
+
+        var sum = Vector.Dot(evenSums + oddSums, Vector<float>.One);
+        for (var position = leftVectors.Length * Vector<float>.Count; position < left.Length; position++)
+        {
+            sum += left[position] * right[position];
+        }
+
+        return sum;
+    }
+
+    /// <summary>
+    /// Scales a vector to unit length, leaving a zero vector unchanged
+    /// </summary>
+    /// <param name="vector">The vector to normalize in place</param>
+    public static void Normalize(Span<float> vector)
+    {
+        var length = MathF.Sqrt(Dot(vector, vector));
+        var isZero = length == 0;
+        if (isZero)
+        {
+            return;
+        }
+
+        for (var position = 0; position < vector.Length; position++)
+        {
+            vector[position] /= length;
+        }
+    }
+
+    /// <summary>
+    /// Adds a vector to another one
+    /// </summary>
+    /// <param name="target">The vector that is added to</param>
+    /// <param name="source">The vector to add, of the same length</param>
+    public static void Add(Span<float> target, ReadOnlySpan<float> source)
+    {
+        // Precondition
+        Debug.Assert(target.Length == source.Length, "Vectors must have the same length");
+
+        for (var position = 0; position < target.Length; position++)
+        {
+            target[position] += source[position];
+        }
+    }
+}
@@ -0,0 +1,166 @@
+using System.Diagnostics;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Core.ValueObjects;
+
+namespace Bookshelf.Application.Core.Search;
+
+/// <summary>
+/// Builds a <see cref="BookIndex"/> from the unchanged books of a previous index and freshly extracted books
+/// </summary>
+/// <remarks>
+/// Books are numbered in the order they are added, so adding them in the same order on every run keeps the postings of
+/// each term ordered by book and page without sorting them.
+/// </remarks>
+public sealed class BookIndexBuilder
+{
+    private readonly List<IndexedBook> _books = new();
+    private readonly Dictionary<string, List<IndexPosting>> _postings = new(StringComparer.Ordinal);
+    private readonly Dictionary<string, int> _pageFrequencies = new(StringComparer.Ordinal);
+
+    /// <summary>
+    /// Gets the number of books added so far
+    /// </summary>
+    public int BookCount => _books.Count;
+
+    /// <summary>
+    /// Takes over books and their postings from a previous index without extracting their text again
+    /// </summary>
+    /// <remarks>
+    /// Must be called before any book is added, since the taken over books get the first ids.
+    /// </remarks>
+    /// <param name="index">The previous index</param>
+    /// <param name="bookIds">The ids of the books to take over in the previous index</param>
+    public void AddIndexedBooks(BookIndex index, IReadOnlySet<int> bookIds)
+    {
+        // Precondition
+        Debug.Assert(_books.Count == 0, "Indexed books must be taken over before other books are added");
+
+        var hasNoBooks = bookIds.Count == 0;
+        if (hasNoBooks)
+        {
+            return;
+        }
+
+        var newBookIds = new int[index.Books.Count];
+        for (var oldBookId = 0; oldBookId < index.Books.Count; oldBookId++)
+        {
+            var isKept = bookIds.Contains(oldBookId);
+            newBookIds[oldBookId] = isKept ? _books.Count : -1;
+            if (isKept)
+            {
+                _books.Add(index.Books[oldBookId]);
+            }
+        }
+
+        for (var termId = 0; termId < index.Terms.Count; termId++)
+        {
+            List<IndexPosting>? postings = null;
+            foreach (var posting in index.Postings[termId])
+            {
+                var newBookId = newBookIds[posting.BookId];
+                if (newBookId < 0)
+                {
+                    continue;
+                }
+
+                postings ??= GetPostings(index.Terms[termId]);
+                postings.Add(posting with { BookId = newBookId });
+            }
+        }
+    }
+
+    /// <summary>
+    /// Adds a book and the terms of its metadata and pages
+    /// </summary>
+    /// <param name="fileName">The file name of the book inside the bookshelf directory</param>
+    /// <param name="fileSizeBytes">The file size in bytes</param>
+    /// <param name="lastWriteTimeUtc">The last modification time in UTC</param>
+    /// <param name="title">The title of the book</param>
+    /// <param name="author">The author of the book, or null if unknown</param>
+    /// <param name="metadataTexts">The file name, title, author, subject and keywords of the book</param>
+    /// <param name="pageTexts">The text of every page, in page order</param>
+    /// <returns>The indexed book</returns>
+    public IndexedBook AddBook(
+        string fileName,
+        long fileSizeBytes,
+        DateTime lastWriteTimeUtc,
+        string title,
+        string? author,
+        IReadOnlyList<string> metadataTexts,
+        IReadOnlyList<string> pageTexts)
+    {
+        // Precondition
+        Debug.Assert(!string.IsNullOrWhiteSpace(fileName), "File name must not be null");
+
+        var bookId = _books.Count;
+
+        var tokenCount = AddPage(bookId, IndexPosting.MetadataPage, metadataTexts);
+        for (var pageIndex = 0; pageIndex < pageTexts.Count; pageIndex++)
+        {
+            tokenCount += AddPage(bookId, pageIndex + 1, new[] { pageTexts[pageIndex] });
+        }
+
+        var book = new IndexedBook(fileName, fileSizeBytes, lastWriteTimeUtc, title, author, pageTexts.Count, tokenCount);
+        _books.Add(book);
+        return book;
+    }
+
+    /// <summary>
+    /// Builds the index from the books added so far
+    /// </summary>
+    /// <returns>The index with its terms in ordinal order</returns>
+    public BookIndex Build()
+    {
+        var terms = _postings.Keys.ToArray();
+        Array.Sort(terms, StringComparer.Ordinal);
+
+        var postings = new IndexPosting[terms.Length][];
+        for (var termId = 0; termId < terms.Length; termId++)
+        {
+            postings[termId] = _postings[terms[termId]].ToArray();
+        }
+
+        return new BookIndex(BookIndex.CurrentVersion, _books.ToArray(), terms, postings);
+    }
+
+    /// <summary>
+    /// Counts the terms of a page and adds one posting per distinct term
+    /// </summary>
+    /// <returns>The number of terms on the page, counting repetitions</returns>
+    private int AddPage(int bookId, int page, IEnumerable<string?> texts)
+    {
+        _pageFrequencies.Clear();
+
+        var tokenCount = 0;
+        foreach (var text in texts)
+        {
+            foreach (var term in SearchTokenizer.Tokenize(text))
+            {
+                _pageFrequencies[term] = _pageFrequencies.GetValueOrDefault(term) + 1;
+                tokenCount++;
+            }
+        }
+
+        foreach (var (term, frequency) in _pageFrequencies)
+        {
+            GetPostings(term).Add(new IndexPosting(bookId, page, frequency));
+        }
+
+        return tokenCount;
+    }
+
+    /// <summary>
+    /// Gets the postings of a term, adding the term if it is new
+    /// </summary>
+    private List<IndexPosting> GetPostings(string term)
+    {
+        var isKnownTerm = _postings.TryGetValue(term, out var postings);
+        if (!isKnownTerm)
+        {
+            postings = new List<IndexPosting>();
+            _postings.Add(term, postings);
+        }
+
+        return postings!;
+    }
+}
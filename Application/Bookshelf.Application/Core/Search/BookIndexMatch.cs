@@ -0,0 +1,14 @@
+namespace Bookshelf.Application.Core.Search;
+
+/// <summary>
+/// A book of the index matching every term of a query
+/// </summary>
+/// <param name="BookId">The position of the book in the index</param>
+/// <param name="Score">The BM25 relevance of the book for the query, higher is better</param>
+/// <param name="MatchesMetadata">Whether a query term occurs in the file name, title, author or subject</param>
+/// <param name="Pages">The pages with the most query terms, in page order</param>
+public sealed record BookIndexMatch(
+    int BookId,
+    double Score,
+    bool MatchesMetadata,
+    IReadOnlyList<int> Pages);
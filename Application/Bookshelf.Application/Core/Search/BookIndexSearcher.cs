@@ -0,0 +1,258 @@
+using System.Diagnostics;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Core.ValueObjects;
+
+namespace Bookshelf.Application.Core.Search;
+
+/// <summary>
+/// Answers queries from a <see cref="BookIndex"/>, ranking the books that contain every query term with BM25
+/// </summary>
+/// <remarks>
+/// Query terms are looked up in the sorted term list and their postings are intersected starting with the rarest
+/// term, so a query only touches the postings of its own terms and never reads a book. Occurrences in the file name,
+/// title, author or subject weigh <see cref="MetadataBoost"/> times as much as occurrences on a page.
+/// </remarks>
+public static class BookIndexSearcher
+{
+    /// <summary>
+    /// Largest number of distinct query terms, further terms are ignored
+    /// </summary>
+    public const int MaxQueryTerms = 32;
+
+    /// <summary>
+    /// Weight of an occurrence in the metadata relative to an occurrence on a page
+    /// </summary>
+    public const int MetadataBoost = 3;
+
+    /// <summary>
+    /// Suffix of a query word matching every term starting with it
+    /// </summary>
+    public const char PrefixWildcard = '*';
+
+    private const double TermFrequencySaturation = 1.2;
+    private const double LengthNormalization = 0.75;
+
+    /// <summary>
+    /// Finds the books containing every term of a query
+    /// </summary>
+    /// <param name="index">The index to search</param>
+    /// <param name="query">The query words</param>
+    /// <param name="maxResults">The maximum number of matches returned</param>
+    /// <param name="maxPagesPerMatch">The maximum number of pages returned per match</param>
+    /// <param name="totalMatches">The number of books matching the query, including those beyond the maximum</param>
+    /// <returns>The best matches, ordered by descending score</returns>
+    public static IReadOnlyList<BookIndexMatch> Search(
+        BookIndex index,
+        string query,
+        int maxResults,
+        int maxPagesPerMatch,
+        out int totalMatches)
+    {
+        // Precondition
+        Debug.Assert(maxResults > 0, "Max results must be positive");
+        Debug.Assert(maxPagesPerMatch >= 0, "Max pages per match must not be negative");
+
+        totalMatches = 0;
+
+        var slots = ParseQuery(query)
+            .Select(queryTerm => FindTermIds(index, queryTerm))
+            .ToList();
+
+        var hasUnmatchableTerm = slots.Count == 0 || slots.Any(termIds => termIds.Count == 0);
+        if (hasUnmatchableTerm)
+        {
+            return Array.Empty<BookIndexMatch>();
+        }
+
+        var averageTokenCount = Math.Max(1.0, index.Books.Average(book => (double)book.TokenCount));
+
+        // The rarest term yields the fewest candidates, and every further term can only remove some of them
+        var orderedSlots = slots.OrderBy(termIds => termIds.Sum(termId => index.Postings[termId].Length));
+
+        Dictionary<int, MatchAccumulator>? candidates = null;
+        foreach (var termIds in orderedSlots)
+        {
+            var occurrences = CollectOccurrences(index, termIds, candidates, out var documentFrequency);
+            var inverseDocumentFrequency = Math.Log(
+                1 + (index.Books.Count - documentFrequency + 0.5) / (documentFrequency + 0.5));
+
+            var matchedCandidates = new Dictionary<int, MatchAccumulator>(occurrences.Count);
+            foreach (var (bookId, occurrence) in occurrences)
+            {
+                var accumulator = candidates?[bookId] ?? new MatchAccumulator();
+                var lengthRatio = index.Books[bookId].TokenCount / averageTokenCount;
+                accumulator.Add(occurrence, inverseDocumentFrequency, lengthRatio);
+                matchedCandidates.Add(bookId, accumulator);
+            }
+
+            candidates = matchedCandidates;
+            var hasNoCandidates = candidates.Count == 0;
+            if (hasNoCandidates)
+            {
+                return Array.Empty<BookIndexMatch>();
+            }
+        }
+
+        totalMatches = candidates!.Count;
+
+        return candidates
+            .OrderByDescending(candidate => candidate.Value.Score)
+            .ThenBy(candidate => index.Books[candidate.Key].Title, StringComparer.OrdinalIgnoreCase)
+            .Take(maxResults)
+            .Select(candidate => new BookIndexMatch(
+                candidate.Key,
+                candidate.Value.Score,
+                candidate.Value.MatchesMetadata,
+                candidate.Value.GetBestPages(maxPagesPerMatch)))
+            .ToList();
+    }
+
+    /// <summary>
+    /// Splits a query into distinct normalized terms, marking the last term of a word ending in the wildcard as prefix
+    /// </summary>
+    private static IReadOnlyList<QueryTerm> ParseQuery(string query)
+    {
+        var queryTerms = new List<QueryTerm>();
+        var words = query.Split((char[]?)null, StringSplitOptions.RemoveEmptyEntries);
+        foreach (var word in words)
+        {
+            var isPrefixWord = word.EndsWith(PrefixWildcard);
+            var terms = SearchTokenizer.Tokenize(word.TrimEnd(PrefixWildcard)).ToList();
+            for (var termIndex = 0; termIndex < terms.Count; termIndex++)
+            {
+                var isPrefix = isPrefixWord && termIndex == terms.Count - 1;
+                var queryTerm = new QueryTerm(terms[termIndex], isPrefix);
+                var isNewTerm = !queryTerms.Contains(queryTerm);
+                if (isNewTerm)
+                {
+                    queryTerms.Add(queryTerm);
+                }
+            }
+        }
+
+        return queryTerms.Take(MaxQueryTerms).ToList();
+    }
+
+    /// <summary>
+    /// Finds the indexed terms matching a query term
+    /// </summary>
+    private static IReadOnlyList<int> FindTermIds(BookIndex index, QueryTerm queryTerm)
+    {
+        if (queryTerm.IsPrefix)
+        {
+            return index.FindTermsWithPrefix(queryTerm.Term).ToList();
+        }
+
+        var termId = index.FindTerm(queryTerm.Term);
+        return termId < 0 ? Array.Empty<int>() : new[] { termId };
+    }
+
+    /// <summary>
+    /// Collects the occurrences of a query term in the candidate books, or in all books for the first term
+    /// </summary>
+    private static Dictionary<int, TermOccurrence> CollectOccurrences(
+        BookIndex index,
+        IReadOnlyList<int> termIds,
+        IReadOnlyDictionary<int, MatchAccumulator>? candidates,
+        out int documentFrequency)
+    {
+        var occurrences = new Dictionary<int, TermOccurrence>();
+        var isBookWithTerm = new bool[index.Books.Count];
+        documentFrequency = 0;
+
+        foreach (var termId in termIds)
+        {
+            foreach (var posting in index.Postings[termId])
+            {
+                var isFirstOccurrenceInBook = !isBookWithTerm[posting.BookId];
+                if (isFirstOccurrenceInBook)
+                {
+                    isBookWithTerm[posting.BookId] = true;
+                    documentFrequency++;
+                }
+
+                var isCandidate = candidates == null || candidates.ContainsKey(posting.BookId);
+                if (!isCandidate)
+                {
+                    continue;
+                }
+
+                var isKnownBook = occurrences.TryGetValue(posting.BookId, out var occurrence);
+                if (!isKnownBook)
+                {
+                    occurrence = new TermOccurrence();
+                    occurrences.Add(posting.BookId, occurrence);
+                }
+
+                occurrence!.Add(posting);
+            }
+        }
+
+        return occurrences;
+    }
+
+    /// <summary>
+    /// A query term, matching either exactly or as prefix
+    /// </summary>
+    private readonly record struct QueryTerm(string Term, bool IsPrefix);
+
+    /// <summary>
+    /// Occurrences of one query term in one book
+    /// </summary>
+    private sealed class TermOccurrence
+    {
+        public int MetadataFrequency { get; private set; }
+
+        public int PageFrequency { get; private set; }
+
+        public HashSet<int> Pages { get; } = new();
+
+        public void Add(IndexPosting posting)
+        {
+            if (posting.IsMetadata)
+            {
+                MetadataFrequency += posting.Frequency;
+                return;
+            }
+
+            PageFrequency += posting.Frequency;
+            Pages.Add(posting.Page);
+        }
+    }
+
+    /// <summary>
+    /// Score and matching pages of a book over the query terms seen so far
+    /// </summary>
+    private sealed class MatchAccumulator
+    {
+        private readonly Dictionary<int, int> _pageTermCounts = new();
+
+        public double Score { get; private set; }
+
+        public bool MatchesMetadata { get; private set; }
+
+        public void Add(TermOccurrence occurrence, double inverseDocumentFrequency, double lengthRatio)
+        {
+            var termFrequency = occurrence.PageFrequency + MetadataBoost * occurrence.MetadataFrequency;
+            var saturation = TermFrequencySaturation * (1 - LengthNormalization + LengthNormalization * lengthRatio);
+            Score += inverseDocumentFrequency * termFrequency * (TermFrequencySaturation + 1) / (termFrequency + saturation);
+            MatchesMetadata |= occurrence.MetadataFrequency > 0;
+
+            foreach (var page in occurrence.Pages)
+            {
+                _pageTermCounts[page] = _pageTermCounts.GetValueOrDefault(page) + 1;
+            }
+        }
+
+        public IReadOnlyList<int> GetBestPages(int maxPages)
+        {
+            return _pageTermCounts
+                .OrderByDescending(pageTermCount => pageTermCount.Value)
+                .ThenBy(pageTermCount => pageTermCount.Key)
+                .Take(maxPages)
+                .Select(pageTermCount => pageTermCount.Key)
+                .Order()
+                .ToList();
+        }
+    }
+}
@@ -0,0 +1,100 @@
+using System.Diagnostics;
+using System.Globalization;
+using System.Text;
+
+namespace Bookshelf.Application.Core.Search;
+
+/// <summary>
+/// Splits text into the normalized terms of the search index
+/// </summary>
+/// <remarks>
+/// A term is a run of letters and digits, lowercased and stripped of accents, so "Einführung" and "einfuhrung"
+/// are the same term. Single characters carry no meaning for a search and overly long runs are mostly extraction
+/// noise, so both are skipped. Queries go through the same normalization as the indexed text.
+/// </remarks>
+public static class SearchTokenizer
+{
+    /// <summary>
+    /// Length of the shortest indexed term
+    /// </summary>
+    public const int MinTermLength = 2;
+
+    /// <summary>
+    /// Length of the longest indexed term
+    /// </summary>
+    public const int MaxTermLength = 64;
+
+    /// <summary>
+    /// Splits text into normalized terms
+    /// </summary>
+    /// <param name="text">The text to split</param>
+    /// <returns>The terms in text order, repeated as often as they occur</returns>
+    public static IEnumerable<string> Tokenize(string? text)
+    {
+        if (string.IsNullOrEmpty(text))
+        {
+            yield break;
+        }
+
+        var start = -1;
+        for (var position = 0; position <= text.Length; position++)
+        {
+            var isTermCharacter = position < text.Length && char.IsLetterOrDigit(text[position]);
+            if (isTermCharacter)
+            {
+                if (start < 0)
+                {
+                    start = position;
+                }
+
+                continue;
+            }
+
+            if (start < 0)
+            {
+                continue;
+            }
+
+            var length = position - start;
+            var hasTermLength = length is >= MinTermLength and <= MaxTermLength;
+            if (hasTermLength)
+            {
+                yield return Normalize(text, start, length);
+            }
+
+            start = -1;
+        }
+    }
+
+    /// <summary>
+    /// Lowercases a run of letters and digits and strips its accents
+    /// </summary>
+    private static string Normalize(string text, int start, int length)
+    {
+        var term = text.AsSpan(start, length);
+
+        // Precondition
+        Debug.Assert(term.Length <= MaxTermLength, "Term must not exceed the maximum term length");
+
+        var isAscii = Ascii.IsValid(term);
+        if (isAscii)
+        {
+            Span<char> lowercased = stackalloc char[MaxTermLength];
+            Ascii.ToLower(term, lowercased, out var written);
+            return new string(lowercased[..written]);
+        }
+
+        var decomposed = term.ToString().ToLowerInvariant().Normalize(NormalizationForm.FormD);
+        var builder = new StringBuilder(decomposed.Length);
+        foreach (var character in decomposed)
+        {
+            var isAccent = CharUnicodeInfo.GetUnicodeCategory(character) == UnicodeCategory.NonSpacingMark;
+            if (!isAccent)
+            {
+                builder.Append(character);
+            }
+        }
+
+        return builder.ToString().Normalize(NormalizationForm.FormC);
+    }
+}
@@ -0,0 +1,23 @@
+namespace Bookshelf.Application.Core.ValueObjects;
+
+/// <summary>
+/// Identifies the bytes of a file by its size and content hash, with the size compared first so that
+/// only files of equal size ever compare their hashes
+/// </summary>
+/// <param name="SizeBytes">The file size in bytes</param>
+/// <param name="ContentHash">The hexadecimal SHA-256 hash of the file content</param>
+public readonly record struct ContentKey(long SizeBytes, string ContentHash)
+{
+    /// <inheritdoc />
+    public bool Equals(ContentKey other)
+    {
+        return SizeBytes == other.SizeBytes &&
+               string.Equals(ContentHash, other.ContentHash, StringComparison.OrdinalIgnoreCase);
+    }
+
+    /// <inheritdoc />
+    public override int GetHashCode()
+    {
+        return HashCode.Combine(SizeBytes, StringComparer.OrdinalIgnoreCase.GetHashCode(ContentHash));
+    }
+}
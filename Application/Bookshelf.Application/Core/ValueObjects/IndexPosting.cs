@@ -0,0 +1,20 @@
+namespace Bookshelf.Application.Core.ValueObjects;
+
+/// <summary>
+/// Occurrences of a term on one page of an indexed book
+/// </summary>
+/// <param name="BookId">The position of the book in the index</param>
+/// <param name="Page">The page number starting at 1, or <see cref="MetadataPage"/> for the title, author and subject</param>
+/// <param name="Frequency">How often the term occurs on the page</param>
+public readonly record struct IndexPosting(int BookId, int Page, int Frequency)
+{
+    /// <summary>
+    /// The page number of terms from the file name and the document information of a book
+    /// </summary>
+    public const int MetadataPage = 0;
+
+    /// <summary>
+    /// Gets whether the term occurs in the metadata rather than on a page
+    /// </summary>
+    public bool IsMetadata => Page == MetadataPage;
+}
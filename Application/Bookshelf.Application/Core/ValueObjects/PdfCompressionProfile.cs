@@ -0,0 +1,23 @@
+namespace Bookshelf.Application.Core.ValueObjects;
+
+/// <summary>
+/// Specifies how much effort is spent compressing merged PDFs
+/// </summary>
+public enum PdfCompressionProfile
+{
+    /// <summary>
+    /// Objects and streams are written as they are read from the sources
+    /// </summary>
+    None,
+
+    /// <summary>
+    /// Uncompressed streams such as page contents are Flate-compressed
+    /// </summary>
+    Standard,
+
+    /// <summary>
+    /// Like Standard, and all other objects are packed into compressed object streams
+    /// indexed by a cross-reference stream
+    /// </summary>
+    Maximum
+}
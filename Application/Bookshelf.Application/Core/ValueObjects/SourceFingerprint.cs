@@ -0,0 +1,45 @@
+namespace Bookshelf.Application.Core.ValueObjects;
+
+/// <summary>
+/// Identifies the state of a source PDF at the time it was consolidated
+/// </summary>
+public sealed record SourceFingerprint(
+    string Path,
+    long SizeBytes,
+    DateTime LastWriteTimeUtc,
+    string ContentHash)
+{
+    /// <summary>
+    /// Determines whether the file statistics still match, which allows reusing the content hash without reading the file
+    /// </summary>
+    /// <param name="path">The current file path</param>
+    /// <param name="sizeBytes">The current file size</param>
+    /// <param name="lastWriteTimeUtc">The current last write time in UTC</param>
+    /// <returns>True if path, size and last write time are unchanged</returns>
+    public bool HasSameFileStatistics(string path, long sizeBytes, DateTime lastWriteTimeUtc)
+    {
+        return string.Equals(Path, path, StringComparison.Ordinal) &&
+               SizeBytes == sizeBytes &&
+               LastWriteTimeUtc == lastWriteTimeUtc;
+    }
+
+    /// <summary>
+    /// Gets the key identifying the bytes of the file, or null if its content hash is unknown
+    /// </summary>
+    public ContentKey? ContentKey => string.IsNullOrEmpty(ContentHash)
+        ? null
+        : new ContentKey(SizeBytes, ContentHash);
+
+    /// <summary>
+    /// Determines whether the other fingerprint describes the same file with the same content
+    /// </summary>
+    /// <param name="other">The fingerprint to compare with</param>
+    /// <returns>True if path and a known content hash are equal</returns>
+    public bool HasSameContent(SourceFingerprint other)
+    {
+        var hasKnownContent = !string.IsNullOrEmpty(ContentHash);
+        return hasKnownContent &&
+               string.Equals(Path, other.Path, StringComparison.Ordinal) &&
+               string.Equals(ContentHash, other.ContentHash, StringComparison.OrdinalIgnoreCase);
+    }
+}
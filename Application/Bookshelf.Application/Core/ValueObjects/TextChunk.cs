@@ -0,0 +1,8 @@
+namespace Bookshelf.Application.Core.ValueObjects;
+
+/// <summary>
+/// A passage of a book that is embedded and retrieved as a whole
+/// </summary>
+/// <param name="Page">The page number of the passage starting at 1</param>
+/// <param name="Text">The text of the passage</param>
+public readonly record struct TextChunk(int Page, string Text);
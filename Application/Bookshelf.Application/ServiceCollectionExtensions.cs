@@ -1,7 +1,9 @@
 using Bookshelf.Application.Api;
 using Bookshelf.Application.Core.Plugins;
 using Bookshelf.Application.Services;
+using Bookshelf.Application.Spi;
 using Microsoft.Extensions.DependencyInjection;
+using Microsoft.Extensions.Logging;
 
 namespace Bookshelf.Application;
 
@@ -13,16 +15,41 @@ public static class ServiceCollectionExtensions
     /// <summary>
     /// Adds application services to the service collection
     /// </summary>
+    /// <remarks>
+    /// Services are registered with factories rather than implementation types, so the container neither inspects
+    /// constructors through reflection nor needs them preserved when the application is trimmed. Nothing is created
+    /// until a command resolves it, so the plugins are only built for a consolidation.
+    /// </remarks>
     /// <param name="services">The service collection</param>
     /// <returns>The service collection for chaining</returns>
     public static IServiceCollection AddApplicationServices(this IServiceCollection services)
     {
         // Register plugin factory as singleton (plugins are stateless)
-        services.AddSingleton<INamingPatternPluginFactory, NamingPatternPluginFactory>();
+        services.AddSingleton<INamingPatternPluginFactory>(_ => new NamingPatternPluginFactory());
         
         // Register application services
-        services.AddTransient<IBookshelfConsolidationService, BookshelfConsolidationService>();
-        services.AddTransient<IBookshelfListService, BookshelfListService>();
+        services.AddTransient<IBookshelfConsolidationService>(serviceProvider => new BookshelfConsolidationService(
+            serviceProvider.GetRequiredService<IPdfMerger>(),
+            serviceProvider.GetRequiredService<IFileSystemAdapter>(),
+            serviceProvider.GetRequiredService<ILogger<BookshelfConsolidationService>>(),
+            serviceProvider.GetRequiredService<INamingPatternPluginFactory>(),
+            serviceProvider.GetRequiredService<IConsolidationManifestStore>()));
+        services.AddTransient<IBookshelfListService>(serviceProvider => new BookshelfListService(
+            serviceProvider.GetRequiredService<IFileSystemAdapter>(),
+            serviceProvider.GetRequiredService<IPdfMerger>(),
+            serviceProvider.GetRequiredService<ILogger<BookshelfListService>>(),
+            serviceProvider.GetRequiredService<IBookMetadataCacheStore>()));
+        services.AddTransient<IBookshelfIndexService>(serviceProvider => new BookshelfIndexService(
+            serviceProvider.GetRequiredService<IFileSystemAdapter>(),
+            serviceProvider.GetRequiredService<IPdfTextExtractor>(),
+            serviceProvider.GetRequiredService<IBookIndexStore>(),
+            serviceProvider.GetRequiredService<ILogger<BookshelfIndexService>>()));
+        services.AddTransient<IBookshelfRetrievalService>(serviceProvider => new BookshelfRetrievalService(
+            serviceProvider.GetRequiredService<IFileSystemAdapter>(),
+            serviceProvider.GetRequiredService<IPdfTextExtractor>(),
+            serviceProvider.GetRequiredService<IEmbeddingGenerator>(),
+            serviceProvider.GetRequiredService<IVectorIndexStore>(),
+            serviceProvider.GetRequiredService<ILogger<BookshelfRetrievalService>>()));
         
         return services;
     }
@@ -1,5 +1,6 @@
 using Bookshelf.Application.Api;
 using Bookshelf.Application.Api.Dtos;
+using Bookshelf.Application.Core.Diagnostics;
 using Bookshelf.Application.Core.Entities;
 using Bookshelf.Application.Core.Plugins;
 using Bookshelf.Application.Core.ValueObjects;
@@ -19,6 +20,15 @@ public class BookshelfConsolidationService : IBookshelfConsolidationService
     private readonly IFileSystemAdapter _fileSystemAdapter;
     private readonly ILogger<BookshelfConsolidationService> _logger;
     private readonly INamingPatternPluginFactory _pluginFactory;
+    private readonly IConsolidationManifestStore _manifestStore;
+
+    /// <summary>
+    /// Comparer matching the case sensitivity of file names on the current platform
+    /// </summary>
+    private static readonly StringComparer FileNameComparer =
+        OperatingSystem.IsWindows() || OperatingSystem.IsMacOS()
+            ? StringComparer.OrdinalIgnoreCase
+            : StringComparer.Ordinal;
 
     /// <summary>
     /// Initializes a new instance of the BookshelfConsolidationService class
@@ -27,22 +37,26 @@ public class BookshelfConsolidationService : IBookshelfConsolidationService
     /// <param name="fileSystemAdapter">The file system adapter</param>
     /// <param name="logger">The logger</param>
     /// <param name="pluginFactory">The naming pattern plugin factory</param>
+    /// <param name="manifestStore">The store for the consolidation manifest of the target directory</param>
     public BookshelfConsolidationService(
         IPdfMerger pdfMerger,
         IFileSystemAdapter fileSystemAdapter,
         ILogger<BookshelfConsolidationService> logger,
-        INamingPatternPluginFactory pluginFactory)
+        INamingPatternPluginFactory pluginFactory,
+        IConsolidationManifestStore manifestStore)
     {
         _pdfMerger = pdfMerger ?? throw new ArgumentNullException(nameof(pdfMerger));
         _fileSystemAdapter = fileSystemAdapter ?? throw new ArgumentNullException(nameof(fileSystemAdapter));
         _logger = logger ?? throw new ArgumentNullException(nameof(logger));
         _pluginFactory = pluginFactory ?? throw new ArgumentNullException(nameof(pluginFactory));
+        _manifestStore = manifestStore ?? throw new ArgumentNullException(nameof(manifestStore));
     }
 
     /// <inheritdoc />
     public async Task<ConsolidationResult> ConsolidateAsync(
         ConsolidationRequest request,
-        IProgress<string>? progressCallback = null,
+        IProgress<ConsolidationProgress>? progressCallback = null,
+        IProgress<ConsolidatedBook>? bookCallback = null,
         CancellationToken cancellationToken = default)
     {
         // Guard clauses
@@ -61,6 +75,11 @@ public class BookshelfConsolidationService : IBookshelfConsolidationService
             throw new ArgumentException("Target directory cannot be null or whitespace", nameof(request));
         }
 
+        if (request.MaxParallelism < ConsolidationRequest.SequentialParallelism)
+        {
+            throw new ArgumentException("Max parallelism must be at least 1", nameof(request));
+        }
+
         var sourceDirectoryDoesNotExist = !_fileSystemAdapter.DirectoryExists(
             new DirectoryExistsRequest(request.SourceDirectory));
         if (sourceDirectoryDoesNotExist)
@@ -70,75 +89,221 @@ public class BookshelfConsolidationService : IBookshelfConsolidationService
 
         try
         {
-            _logger.LogInformation("Starting consolidation from {SourceDirectory} to {TargetDirectory}", 
-                request.SourceDirectory, request.TargetDirectory);
+            using var consolidateStage = BookshelfTelemetry.StartStage(
+                BookshelfTelemetry.Stages.Consolidate, request.SourceDirectory);
+
+            _logger.LogInformation("Starting consolidation from {SourceDirectory} to {TargetDirectory} with max parallelism {MaxParallelism}", 
+                request.SourceDirectory, request.TargetDirectory, request.MaxParallelism);
             
-            progressCallback?.Report("Starting consolidation...");
+            var progress = new ConsolidationProgressTracker(progressCallback);
+            progress.ReportActivity("Starting consolidation...");
 
             // Ensure target directory exists
             _fileSystemAdapter.EnsureDirectoryExists(new EnsureDirectoryExistsRequest(request.TargetDirectory));
 
-            var consolidatedBooks = new List<string>();
-            var namingConflicts = new List<string>();
-            var individualPdfsCopied = 0;
-            var collectionsMerged = 0;
+            var parallelOptions = new ParallelOptions
+            {
+                MaxDegreeOfParallelism = request.MaxParallelism,
+                CancellationToken = cancellationToken
+            };
 
-            // Process root PDFs
-            var rootPdfFiles = await _fileSystemAdapter.GetPdfFilesAsync(
-                new GetPdfFilesRequest(request.SourceDirectory));
-            foreach (var pdfFile in rootPdfFiles)
+            // Compare against the manifest of previous runs to skip unchanged books
+            ConsolidationManifest manifest;
+            using (BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Manifest, request.TargetDirectory))
             {
-                cancellationToken.ThrowIfCancellationRequested();
-                
-                var result = await ProcessIndividualPdfAsync(
-                    pdfFile, 
-                    request.TargetDirectory, 
-                    progressCallback, 
-                    namingConflicts);
-                
-                consolidatedBooks.Add(result.Path);
-                individualPdfsCopied++;
+                manifest = await _manifestStore.LoadManifestAsync(
+                    new LoadManifestRequest(request.TargetDirectory), cancellationToken);
             }
+            var sourceDirectory = Path.GetFullPath(request.SourceDirectory);
+
+            // Only the top level is ordered: output names are assigned in this order so that
+            // conflict suffixes do not depend on which worker finishes first
+            var sourceEntries = await GetOrderedSourceEntriesAsync(request.SourceDirectory, cancellationToken);
+            progress.SetTotalBooks(sourceEntries.Count);
 
-            // Process subdirectories (collections)
-            var subdirectories = await _fileSystemAdapter.GetSubdirectoriesAsync(
-                new GetSubdirectoriesRequest(request.SourceDirectory));
-            foreach (var subdirectory in subdirectories)
+            var fileNameIndex = await CreateFileNameIndexAsync(
+                request.TargetDirectory, manifest, sourceDirectory, cancellationToken);
+            var namingConflicts = new List<string>();
+            var consolidatedContents = new Dictionary<ContentKey, string>();
+            var namingTurns = CreateNamingTurns(sourceEntries.Count);
+            var plannedWorkItems = new ConsolidationWorkItem?[sourceEntries.Count];
+            var results = new CollectionProcessingResult?[sourceEntries.Count];
+
+            // Every book is planned, named and processed by the worker that picks it up, so the first
+            // collection is merged while later collections are still being walked
+            await Parallel.ForEachAsync(
+                Enumerable.Range(0, sourceEntries.Count),
+                parallelOptions,
+                async (index, workerCancellationToken) =>
+                {
+                    var planning = PlanSourceEntryAsync(
+                        sourceEntries[index], manifest, request, progress, workerCancellationToken);
+
+                    // The turn is awaited before anything can fail, so the next book is only named once this
+                    // book is done naming, even if planning it failed
+                    try
+                    {
+                        await namingTurns[index].Task.WaitAsync(workerCancellationToken);
+                    }
+                    catch (OperationCanceledException)
+                    {
+                        // The loop is stopping before this book's turn, so its planning is observed here instead
+                        await ObserveAbandonedPlanningAsync(planning, sourceEntries[index].FullPath);
+                        throw;
+                    }
+
+                    ConsolidationWorkItem? workItem;
+                    try
+                    {
+                        workItem = await planning;
+                        if (workItem != null && request.Deduplicate)
+                        {
+                            workItem = FindDuplicateBook(workItem, consolidatedContents);
+                        }
+
+                        var isUnique = workItem != null && workItem.DuplicateOf == null;
+                        if (isUnique)
+                        {
+                            workItem = AssignDestination(workItem!, request.TargetDirectory, manifest, namingConflicts, fileNameIndex);
+                        }
+                    }
+                    finally
+                    {
+                        namingTurns[index + 1].TrySetResult();
+                    }
+
+                    if (workItem == null)
+                    {
+                        progress.CompleteBook(0);
+                        return;
+                    }
+
+                    plannedWorkItems[index] = workItem;
+                    var result = await ProcessWorkItemAsync(
+                        workItem, request, progress, workerCancellationToken);
+                    results[index] = result;
+
+                    progress.CompleteBook(result.MergedSourceBytes + result.BytesCopied + result.BytesShared);
+                    bookCallback?.Report(CreateConsolidatedBook(workItem, result));
+                });
+
+            var consolidatedBooks = new List<string>();
+            var manifestEntries = new List<ManifestEntry>();
+            var individualPdfsCopied = 0;
+            var collectionsMerged = 0;
+            var newBooks = 0;
+            var updatedBooks = 0;
+            var skippedBooks = 0;
+            var bytesCopied = 0L;
+            var bytesShared = 0L;
+            var duplicateBooks = 0;
+            var bytesDeduplicated = 0L;
+            var mergedSourceBytes = 0L;
+            var mergedOutputBytes = 0L;
+            var compressionSavedBytes = 0L;
+            var mergeTime = TimeSpan.Zero;
+
+            for (var index = 0; index < plannedWorkItems.Length; index++)
             {
-                cancellationToken.ThrowIfCancellationRequested();
+                var workItem = plannedWorkItems[index];
+                if (workItem == null)
+                {
+                    continue;
+                }
 
-                var result = await ProcessCollectionAsync(
-                    subdirectory, 
-                    request.TargetDirectory, 
-                    progressCallback, 
-                    namingConflicts, 
-                    cancellationToken);
+                var result = results[index]!;
 
-                if (result.WasMerged)
+                if (result.WasDuplicate)
+                {
+                    bytesDeduplicated += workItem.DeduplicatedBytes;
+                    // Duplicates get no manifest entry so they are consolidated once the book they duplicate is gone
+                    duplicateBooks++;
+                    continue;
+                }
+
+                if (result.WasSkipped)
+                {
+                    skippedBooks++;
+                }
+                else if (result.WasMerged)
                 {
-                    consolidatedBooks.Add(result.OutputPath);
                     collectionsMerged++;
                 }
                 else if (result.WasCopied)
                 {
-                    consolidatedBooks.Add(result.OutputPath);
                     individualPdfsCopied++;
                 }
+                else
+                {
+                    // A failed book keeps the entry of its previous run, so its previous output stays its own and the
+                    // next run retries it as an update; a book that never succeeded gets no entry
+                    var previousEntry = manifest.FindEntry(workItem.SourcePath);
+                    if (previousEntry != null)
+                    {
+                        manifestEntries.Add(previousEntry);
+                    }
+
+                    continue;
+                }
+
+                if (workItem.RetiredOutputFileName != null)
+                {
+                    RetireOutput(request.TargetDirectory, workItem.RetiredOutputFileName);
+                }
+
+                if (workItem.Change == ConsolidationChangeKind.Updated)
+                {
+                    updatedBooks++;
+                }
+                else if (workItem.Change == ConsolidationChangeKind.New)
+                {
+                    newBooks++;
+                }
+
+                bytesCopied += result.BytesCopied;
+                bytesShared += result.BytesShared;
+                bytesDeduplicated += workItem.DeduplicatedBytes;
+                mergedSourceBytes += result.MergedSourceBytes;
+                mergedOutputBytes += result.MergedOutputBytes;
+                compressionSavedBytes += result.CompressionSavedBytes;
+                mergeTime += result.MergeTime;
+                consolidatedBooks.Add(result.OutputPath);
+                manifestEntries.Add(CreateManifestEntry(workItem));
+            }
+
+            using (BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Manifest, request.TargetDirectory))
+            {
+                await _manifestStore.SaveManifestAsync(
+                    new SaveManifestRequest(
+                        request.TargetDirectory,
+                        manifest.WithSourceDirectoryEntries(sourceDirectory, manifestEntries)),
+                    cancellationToken);
             }
 
-            var totalBooks = individualPdfsCopied + collectionsMerged;
-            progressCallback?.Report($"Consolidation complete! Total books: {totalBooks}");
+            var totalBooks = individualPdfsCopied + collectionsMerged + skippedBooks;
+            progress.ReportFinal($"Consolidation complete! Total books: {totalBooks}");
             
             _logger.LogInformation(
-                "Consolidation completed. Total: {Total}, Individual: {Individual}, Merged: {Merged}, Conflicts: {Conflicts}",
-                totalBooks, individualPdfsCopied, collectionsMerged, namingConflicts.Count);
+                "Consolidation completed. Total: {Total}, Individual: {Individual}, Merged: {Merged}, Conflicts: {Conflicts}, New: {New}, Updated: {Updated}, Skipped: {Skipped}, Bytes copied: {BytesCopied}, Bytes shared: {BytesShared}, Duplicates: {Duplicates}, Bytes deduplicated: {BytesDeduplicated}, Merged from {MergedSourceBytes} to {MergedOutputBytes} bytes in {MergeMilliseconds} ms with {CompressionProfile} compression saving {CompressionSavedBytes} bytes",
+                totalBooks, individualPdfsCopied, collectionsMerged, namingConflicts.Count, newBooks, updatedBooks, skippedBooks, bytesCopied, bytesShared, duplicateBooks, bytesDeduplicated, mergedSourceBytes, mergedOutputBytes, (long)mergeTime.TotalMilliseconds, request.CompressionProfile, compressionSavedBytes);
 
             return ConsolidationResult.CreateSuccess(
                 totalBooks,
                 individualPdfsCopied,
                 collectionsMerged,
                 consolidatedBooks,
-                namingConflicts);
+                namingConflicts,
+                newBooks,
+                updatedBooks,
+                skippedBooks,
+                bytesCopied,
+                bytesShared,
+                duplicateBooks,
+                bytesDeduplicated,
+                mergedSourceBytes,
+                mergedOutputBytes,
+                compressionSavedBytes,
+                mergeTime);
         }
         catch (OperationCanceledException)
         {
@@ -153,193 +318,636 @@ public class BookshelfConsolidationService : IBookshelfConsolidationService
     }
 
     /// <summary>
-    /// Gets all PDF files recursively from a directory
+    /// Gets the root PDFs followed by the collection directories of the source directory, each ordered by path
     /// </summary>
-    private async Task<List<string>> GetAllPdfsRecursivelyAsync(string directoryPath)
+    private async Task<List<DirectoryEntryResult>> GetOrderedSourceEntriesAsync(
+        string sourceDirectory,
+        CancellationToken cancellationToken)
     {
-        // Precondition: directory path must be valid
-        Debug.Assert(!string.IsNullOrWhiteSpace(directoryPath), "Directory path must not be null or whitespace");
-        Debug.Assert(_fileSystemAdapter.DirectoryExists(new DirectoryExistsRequest(directoryPath)), "Directory must exist");
-        
-        var allPdfs = new List<string>();
-        
-        // Get PDFs in current directory
-        var pdfs = await _fileSystemAdapter.GetPdfFilesAsync(new GetPdfFilesRequest(directoryPath));
-        allPdfs.AddRange(pdfs);
-
-        // Get PDFs from subdirectories
-        var subdirectories = await _fileSystemAdapter.GetSubdirectoriesAsync(
-            new GetSubdirectoriesRequest(directoryPath));
-        foreach (var subdirectory in subdirectories)
-        {
-            var subPdfs = await GetAllPdfsRecursivelyAsync(subdirectory);
-            allPdfs.AddRange(subPdfs);
-        }
-
-        // Sort to ensure consistent ordering
-        allPdfs.Sort(StringComparer.OrdinalIgnoreCase);
-        
-        // Postcondition: result should not be null and all paths should be valid
-        Debug.Assert(allPdfs != null, "Result list must not be null");
-        Debug.Assert(allPdfs.All(p => !string.IsNullOrWhiteSpace(p)), "All paths must be valid");
-        
-        return allPdfs;
+        // Precondition
+        Debug.Assert(!string.IsNullOrWhiteSpace(sourceDirectory), "Source directory must not be null");
+
+        using var enumerateStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Enumerate, sourceDirectory);
+
+        var sourceEntries = new List<DirectoryEntryResult>();
+        await foreach (var entry in _fileSystemAdapter.EnumerateEntriesAsync(
+            new EnumerateEntriesRequest(sourceDirectory), cancellationToken))
+        {
+            sourceEntries.Add(entry);
+        }
+
+        return sourceEntries
+            .OrderBy(e => e.IsDirectory)
+            .ThenBy(e => e.FullPath, StringComparer.OrdinalIgnoreCase)
+            .ToList();
     }
 
     /// <summary>
-    /// Processes an individual PDF file and copies it to the target directory
+    /// Creates the index of taken file names from a single listing of the target directory
     /// </summary>
-    private async Task<FileDestination> ProcessIndividualPdfAsync(
-        string pdfFile,
+    private async Task<TargetFileNameIndex> CreateFileNameIndexAsync(
         string targetDirectory,
-        IProgress<string>? progressCallback,
-        List<string> namingConflicts)
+        ConsolidationManifest manifest,
+        string sourceDirectory,
+        CancellationToken cancellationToken)
     {
-        // Precondition: parameters must be valid
-        Debug.Assert(!string.IsNullOrWhiteSpace(pdfFile), "PDF file path must not be null");
-        Debug.Assert(!string.IsNullOrWhiteSpace(targetDirectory), "Target directory must not be null");
+        var existingFileNames = await _fileSystemAdapter.GetFileNamesAsync(
+            new GetFileNamesRequest(targetDirectory), cancellationToken);
 
-        var fileName = Path.GetFileName(pdfFile);
-        progressCallback?.Report($"Copying individual PDF: {fileName}");
-        
-        var destinationPath = ResolveDestinationPath(targetDirectory, fileName, namingConflicts);
+        // Books consolidated before keep their output file, so their names stay taken even if the file was removed
+        var previousOutputFileNames = manifest.GetSourceDirectoryEntries(sourceDirectory).Select(e => e.OutputFileName);
+        var fileNameIndex = new TargetFileNameIndex(existingFileNames.Concat(previousOutputFileNames), FileNameComparer);
 
-        await _fileSystemAdapter.CopyFileAsync(
-            new CopyFileRequest(pdfFile, destinationPath, false));
-        _logger.LogDebug("Copied individual PDF: {FileName}", fileName);
-        
-        // Postcondition: destination file should exist
-        Debug.Assert(_fileSystemAdapter.FileExists(new FileExistsRequest(destinationPath)), 
-            "Destination file should exist after copy");
-        
-        var hadConflict = namingConflicts.Contains(fileName);
-        return new FileDestination(destinationPath, hadConflict);
+        _logger.LogDebug("Indexed {Count} taken file names in {TargetDirectory}", fileNameIndex.Count, targetDirectory);
+
+        return fileNameIndex;
+    }
+
+    /// <summary>
+    /// Creates one naming turn per book plus a final one, with the turn of the first book already granted
+    /// </summary>
+    private static TaskCompletionSource[] CreateNamingTurns(int count)
+    {
+        var namingTurns = Enumerable.Range(0, count + 1)
+            .Select(_ => new TaskCompletionSource(TaskCreationOptions.RunContinuationsAsynchronously))
+            .ToArray();
+        namingTurns[0].SetResult();
+
+        return namingTurns;
     }
 
     /// <summary>
-    /// Processes a collection directory by either copying a single PDF or merging multiple PDFs
+    /// Waits for the planning of a book that is not processed because consolidation is stopping, logging its failure
     /// </summary>
-    private async Task<CollectionProcessingResult> ProcessCollectionAsync(
+    private async Task ObserveAbandonedPlanningAsync(Task<ConsolidationWorkItem?> planning, string sourcePath)
+    {
+        try
+        {
+            await planning;
+        }
+        catch (OperationCanceledException)
+        {
+            // Planning stopped with the loop
+        }
+        catch (Exception ex)
+        {
+            _logger.LogWarning(ex, "Planning {SourcePath} failed while consolidation was stopping", sourcePath);
+        }
+    }
+
+    /// <summary>
+    /// Plans a root PDF or collection directory and compares its sources with the previous run
+    /// </summary>
+    /// <returns>The compared work item, or null if the entry has nothing to consolidate</returns>
+    private async Task<ConsolidationWorkItem?> PlanSourceEntryAsync(
+        DirectoryEntryResult sourceEntry,
+        ConsolidationManifest manifest,
+        ConsolidationRequest request,
+        ConsolidationProgressTracker progress,
+        CancellationToken cancellationToken)
+    {
+        var workItem = sourceEntry.IsDirectory
+            ? await PlanCollectionAsync(sourceEntry.FullPath, progress, cancellationToken)
+            : new ConsolidationWorkItem(
+                ConsolidationWorkKind.IndividualPdf,
+                sourceEntry.FullPath,
+                sourceEntry.Name,
+                [sourceEntry.FullPath],
+                sourceEntry.Name);
+
+        if (workItem == null)
+        {
+            return null;
+        }
+
+        var previousEntry = manifest.FindEntry(workItem.SourcePath);
+        var fingerprints = await CreateFingerprintsAsync(workItem, previousEntry, cancellationToken);
+        workItem = workItem with { Fingerprints = fingerprints };
+
+        var mergesDuplicateParts = request.Deduplicate && workItem.Kind == ConsolidationWorkKind.MultiPdfCollection;
+        if (mergesDuplicateParts)
+        {
+            workItem = RemoveDuplicateParts(workItem);
+        }
+
+        // A book whose desired name changed, for example a collection that grew from one PDF to several, is written
+        // under its new name like a new book, and its previous output is removed once it is written
+        var isRenamed = previousEntry != null && !TargetFileNameIndex.IsNameOrVariantOf(
+            previousEntry.OutputFileName, workItem.OutputFileName, FileNameComparer);
+        if (isRenamed)
+        {
+            _logger.LogInformation("Output of {Name} changes from {PreviousFileName} to {FileName}",
+                workItem.Name, previousEntry!.OutputFileName, workItem.OutputFileName);
+        }
+
+        var change = isRenamed
+            ? ConsolidationChangeKind.New
+            : DetermineChange(previousEntry, workItem.Fingerprints!, request.TargetDirectory, request.FullRebuild);
+
+        // Postcondition
+        Debug.Assert(workItem.SourcePdfs.Count > 0, "Every work item must have source PDFs");
+
+        return workItem with
+        {
+            Change = change,
+            RetiredOutputFileName = isRenamed ? previousEntry!.OutputFileName : null
+        };
+    }
+
+    /// <summary>
+    /// Gets all PDF files of a collection directory and its subdirectories, ordered by path
+    /// </summary>
+    private async Task<List<string>> GetCollectionPdfsAsync(
+        string directoryPath,
+        CancellationToken cancellationToken)
+    {
+        // Precondition: directory path must be valid
+        Debug.Assert(!string.IsNullOrWhiteSpace(directoryPath), "Directory path must not be null or whitespace");
+
+        using var enumerateStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Enumerate, directoryPath);
+
+        var collectionPdfs = new List<string>();
+        await foreach (var entry in _fileSystemAdapter.EnumerateEntriesAsync(
+            new EnumerateEntriesRequest(directoryPath, Recursive: true), cancellationToken))
+        {
+            if (!entry.IsDirectory)
+            {
+                collectionPdfs.Add(entry.FullPath);
+            }
+        }
+
+        // The walk yields files in file system order; one sort gives plugins a stable order to refine
+        collectionPdfs.Sort(StringComparer.OrdinalIgnoreCase);
+
+        return collectionPdfs;
+    }
+
+    /// <summary>
+    /// Plans a collection directory by either copying a single PDF or merging multiple PDFs
+    /// </summary>
+    /// <returns>The planned work item, or null if the collection has nothing to consolidate</returns>
+    private async Task<ConsolidationWorkItem?> PlanCollectionAsync(
         string subdirectory,
-        string targetDirectory,
-        IProgress<string>? progressCallback,
-        List<string> namingConflicts,
+        ConsolidationProgressTracker progress,
         CancellationToken cancellationToken)
     {
         // Precondition: parameters must be valid
         Debug.Assert(!string.IsNullOrWhiteSpace(subdirectory), "Subdirectory must not be null");
-        Debug.Assert(_fileSystemAdapter.DirectoryExists(new DirectoryExistsRequest(subdirectory)), 
-            "Subdirectory must exist");
 
         var collectionName = Path.GetFileName(subdirectory);
-        progressCallback?.Report($"Processing collection: {collectionName}");
+        progress.ReportActivity($"Processing collection: {collectionName}");
 
-        var collectionPdfs = await GetAllPdfsRecursivelyAsync(subdirectory);
+        var collectionPdfs = await GetCollectionPdfsAsync(subdirectory, cancellationToken);
 
         var hasNoPdfs = collectionPdfs.Count == 0;
         if (hasNoPdfs)
         {
             _logger.LogWarning("No PDFs found in collection: {CollectionName}", collectionName);
-            return new CollectionProcessingResult(string.Empty, false, false);
+            return null;
         }
 
         var isOnlyOnePdf = collectionPdfs.Count == 1;
         if (isOnlyOnePdf)
         {
-            return await ProcessSinglePdfCollectionAsync(
-                collectionPdfs[0], 
-                targetDirectory, 
-                namingConflicts);
+            return new ConsolidationWorkItem(
+                ConsolidationWorkKind.SinglePdfCollection,
+                Path.GetFullPath(subdirectory),
+                collectionName,
+                collectionPdfs,
+                Path.GetFileName(collectionPdfs[0]));
+        }
+
+        // Detect and apply naming pattern plugin for ordering
+        PluginDetectionResult detection;
+        using (BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.DetectPlugin, collectionName))
+        {
+            detection = _pluginFactory.Detect(collectionPdfs);
+        }
+
+        var plugin = detection.Plugin;
+        _logger.LogInformation(
+            "Using {PluginName} naming pattern plugin for collection {CollectionName} with confidence {Confidence:P0}, detected in {DetectionMilliseconds:F3} ms",
+            plugin.PluginName, collectionName, detection.Confidence, detection.Elapsed.TotalMilliseconds);
+        progress.ReportActivity($"Detected {plugin.PluginName} naming pattern");
+
+        // Filter and order files according to publisher pattern
+        var filteredFiles = plugin.FilterFiles(collectionPdfs);
+        var orderedFiles = plugin.OrderFiles(filteredFiles);
+
+        if (orderedFiles.Count == 0)
+        {
+            _logger.LogWarning("No files remaining after filtering for collection: {CollectionName}", collectionName);
+            return null;
         }
 
-        return await ProcessMultiPdfCollectionAsync(
-            collectionPdfs,
+        return new ConsolidationWorkItem(
+            ConsolidationWorkKind.MultiPdfCollection,
+            Path.GetFullPath(subdirectory),
             collectionName,
-            targetDirectory,
-            progressCallback,
-            namingConflicts,
-            cancellationToken);
+            orderedFiles,
+            $"{collectionName}.pdf");
     }
 
     /// <summary>
-    /// Processes a collection containing a single PDF
+    /// Creates the fingerprints of all sources of a work item, reusing recorded hashes of files whose statistics are unchanged
     /// </summary>
-    private async Task<CollectionProcessingResult> ProcessSinglePdfCollectionAsync(
-        string singlePdf,
-        string targetDirectory,
-        List<string> namingConflicts)
+    private async Task<List<SourceFingerprint>> CreateFingerprintsAsync(
+        ConsolidationWorkItem workItem,
+        ManifestEntry? previousEntry,
+        CancellationToken cancellationToken)
+    {
+        var previousFingerprints = (previousEntry?.Sources ?? Array.Empty<SourceFingerprint>())
+            .ToDictionary(f => f.Path, StringComparer.Ordinal);
+
+        var fingerprints = new List<SourceFingerprint>(workItem.SourcePdfs.Count);
+        foreach (var sourcePdf in workItem.SourcePdfs)
+        {
+            var sourcePath = Path.GetFullPath(sourcePdf);
+            var fileInfo = await _fileSystemAdapter.GetFileInfoAsync(new GetFileInfoRequest(sourcePdf));
+
+            var hasUnchangedStatistics =
+                previousFingerprints.TryGetValue(sourcePath, out var previousFingerprint) &&
+                previousFingerprint.HasSameFileStatistics(sourcePath, fileInfo.FileSizeBytes, fileInfo.LastWriteTimeUtc);
+            if (hasUnchangedStatistics)
+            {
+                fingerprints.Add(previousFingerprint!);
+                continue;
+            }
+
+            var contentHash = await ComputeContentHashSafelyAsync(sourcePdf, fileInfo.FileSizeBytes, cancellationToken);
+            fingerprints.Add(new SourceFingerprint(
+                sourcePath,
+                fileInfo.FileSizeBytes,
+                fileInfo.LastWriteTimeUtc,
+                contentHash));
+        }
+
+        // Postcondition
+        Debug.Assert(fingerprints.Count == workItem.SourcePdfs.Count, "Every source must be fingerprinted");
+
+        return fingerprints;
+    }
+
+    /// <summary>
+    /// Computes the content hash of a source PDF, returning an empty hash if the file cannot be read
+    /// </summary>
+    private async Task<string> ComputeContentHashSafelyAsync(
+        string sourcePdf,
+        long fileSizeBytes,
+        CancellationToken cancellationToken)
+    {
+        using var fingerprintStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Fingerprint, sourcePdf);
+
+        try
+        {
+            var contentHash = await _fileSystemAdapter.ComputeFileHashAsync(
+                new ComputeFileHashRequest(sourcePdf), cancellationToken);
+            BookshelfTelemetry.BytesRead.Add(fileSizeBytes);
+
+            return contentHash;
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException)
+        {
+            _logger.LogWarning(ex, "Unable to hash {SourcePdf}, it will be treated as changed", sourcePdf);
+            return string.Empty;
+        }
+    }
+
+    /// <summary>
+    /// Removes collection parts whose content equals an earlier part, keeping the first occurrence in merge order
+    /// </summary>
+    private ConsolidationWorkItem RemoveDuplicateParts(ConsolidationWorkItem workItem)
     {
         // Precondition
-        Debug.Assert(!string.IsNullOrWhiteSpace(singlePdf), "Single PDF path must not be null");
+        Debug.Assert(workItem.Fingerprints != null, "Fingerprints must be created");
+        Debug.Assert(workItem.Fingerprints!.Count == workItem.SourcePdfs.Count, "Every source must be fingerprinted");
 
-        var fileName = Path.GetFileName(singlePdf);
-        var destinationPath = ResolveDestinationPath(targetDirectory, fileName, namingConflicts);
+        var fingerprints = workItem.Fingerprints!;
+        var seenContents = new HashSet<ContentKey>();
+        var uniqueSourcePdfs = new List<string>(workItem.SourcePdfs.Count);
+        var uniqueFingerprints = new List<SourceFingerprint>(fingerprints.Count);
+        var deduplicatedBytes = 0L;
+
+        for (var index = 0; index < fingerprints.Count; index++)
+        {
+            var contentKey = fingerprints[index].ContentKey;
+            var isDuplicate = contentKey.HasValue && !seenContents.Add(contentKey.Value);
+            if (isDuplicate)
+            {
+                _logger.LogInformation("Skipping part {SourcePdf} of {CollectionName}, its content appears earlier in the collection",
+                    workItem.SourcePdfs[index], workItem.Name);
+                deduplicatedBytes += fingerprints[index].SizeBytes;
+                continue;
+            }
+
+            uniqueSourcePdfs.Add(workItem.SourcePdfs[index]);
+            uniqueFingerprints.Add(fingerprints[index]);
+        }
 
-        await _fileSystemAdapter.CopyFileAsync(
-            new CopyFileRequest(singlePdf, destinationPath, false));
-        
         // Postcondition
-        Debug.Assert(_fileSystemAdapter.FileExists(new FileExistsRequest(destinationPath)), 
-            "Destination file should exist after copy");
-        
-        return new CollectionProcessingResult(destinationPath, false, true);
+        Debug.Assert(uniqueSourcePdfs.Count > 0, "The first part is never a duplicate");
+
+        return workItem with
+        {
+            SourcePdfs = uniqueSourcePdfs,
+            Fingerprints = uniqueFingerprints,
+            DeduplicatedBytes = deduplicatedBytes
+        };
     }
 
     /// <summary>
-    /// Processes a collection containing multiple PDFs by merging them
+    /// Marks a new single-PDF book as duplicate if an earlier book has the same content, which must happen in planning order
     /// </summary>
-    private async Task<CollectionProcessingResult> ProcessMultiPdfCollectionAsync(
-        List<string> collectionPdfs,
-        string collectionName,
+    private ConsolidationWorkItem FindDuplicateBook(
+        ConsolidationWorkItem workItem,
+        Dictionary<ContentKey, string> consolidatedContents)
+    {
+        var contentKey = workItem.SourcePdfs.Count == 1
+            ? workItem.Fingerprints![0].ContentKey
+            : null;
+        if (contentKey == null)
+        {
+            return workItem;
+        }
+
+        // Books already on the shelf are kept up to date, so only new books can be left out
+        var isNew = workItem.Change == ConsolidationChangeKind.New;
+        if (consolidatedContents.TryGetValue(contentKey.Value, out var originalName) && isNew)
+        {
+            _logger.LogInformation("Skipping {Name}, its content is identical to {OriginalName}", workItem.Name, originalName);
+            return workItem with
+            {
+                DuplicateOf = originalName,
+                DeduplicatedBytes = workItem.DeduplicatedBytes + contentKey.Value.SizeBytes
+            };
+        }
+
+        consolidatedContents.TryAdd(contentKey.Value, workItem.Name);
+        return workItem;
+    }
+
+    /// <summary>
+    /// Determines how a work item relates to the previous run
+    /// </summary>
+    private ConsolidationChangeKind DetermineChange(
+        ManifestEntry? previousEntry,
+        IReadOnlyList<SourceFingerprint> fingerprints,
+        string targetDirectory,
+        bool fullRebuild)
+    {
+        var isNew = previousEntry == null;
+        if (isNew)
+        {
+            return ConsolidationChangeKind.New;
+        }
+
+        var isUnchanged = !fullRebuild &&
+            previousEntry!.HasSameSources(fingerprints) &&
+            _fileSystemAdapter.FileExists(new FileExistsRequest(Path.Combine(targetDirectory, previousEntry.OutputFileName)));
+
+        return isUnchanged ? ConsolidationChangeKind.Unchanged : ConsolidationChangeKind.Updated;
+    }
+
+    /// <summary>
+    /// Assigns the destination path of a work item, which must happen in planning order
+    /// </summary>
+    private ConsolidationWorkItem AssignDestination(
+        ConsolidationWorkItem workItem,
         string targetDirectory,
-        IProgress<string>? progressCallback,
+        ConsolidationManifest manifest,
         List<string> namingConflicts,
-        CancellationToken cancellationToken)
+        TargetFileNameIndex fileNameIndex)
     {
         // Precondition
-        Debug.Assert(collectionPdfs != null && collectionPdfs.Count > 1, "Must have multiple PDFs");
+        Debug.Assert(!string.IsNullOrWhiteSpace(targetDirectory), "Target directory must not be null");
 
-        progressCallback?.Report($"Merging collection: {collectionName}");
+        var keepsPreviousOutput = workItem.Change != ConsolidationChangeKind.New;
+        var destination = keepsPreviousOutput
+            ? new FileDestination(Path.Combine(targetDirectory, manifest.FindEntry(workItem.SourcePath)!.OutputFileName), false)
+            : ResolveDestinationPath(
+                targetDirectory,
+                workItem.OutputFileName,
+                namingConflicts,
+                fileNameIndex);
 
-        // Detect and apply naming pattern plugin for ordering
-        var plugin = _pluginFactory.DetectPlugin(collectionPdfs);
-        _logger.LogInformation("Using {PluginName} naming pattern plugin for collection {CollectionName}",
-            plugin.PluginName, collectionName);
-        progressCallback?.Report($"Detected {plugin.PluginName} naming pattern");
+        return workItem with { Destination = destination };
+    }
 
-        // Filter and order files according to publisher pattern
-        var filteredFiles = plugin.FilterFiles(collectionPdfs);
-        var orderedFiles = plugin.OrderFiles(filteredFiles.ToList()).ToList();
+    /// <summary>
+    /// Removes the output a book was written to by a previous run under a name it no longer has
+    /// </summary>
+    private void RetireOutput(string targetDirectory, string retiredOutputFileName)
+    {
+        var retiredOutputPath = Path.Combine(targetDirectory, retiredOutputFileName);
+        try
+        {
+            _fileSystemAdapter.DeleteFile(new DeleteFileRequest(retiredOutputPath));
+            _logger.LogInformation("Removed previous output {RetiredOutputPath}", retiredOutputPath);
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException)
+        {
+            _logger.LogWarning(ex, "Unable to remove previous output {RetiredOutputPath}", retiredOutputPath);
+        }
+    }
 
-        if (orderedFiles.Count == 0)
+    /// <summary>
+    /// Creates the report of a processed book
+    /// </summary>
+    private static ConsolidatedBook CreateConsolidatedBook(ConsolidationWorkItem workItem, CollectionProcessingResult result)
+    {
+        var status = result switch
         {
-            _logger.LogWarning("No files remaining after filtering for collection: {CollectionName}", collectionName);
+            { WasDuplicate: true } => ConsolidatedBookStatus.Duplicate,
+            { WasSkipped: true } => ConsolidatedBookStatus.Skipped,
+            { WasMerged: true } => ConsolidatedBookStatus.Merged,
+            { WasCopied: true } => ConsolidatedBookStatus.Copied,
+            _ => ConsolidatedBookStatus.Failed
+        };
+
+        var hasOutput = !string.IsNullOrEmpty(result.OutputPath);
+
+        return new ConsolidatedBook(
+            workItem.Name,
+            workItem.SourcePath,
+            hasOutput ? result.OutputPath : null,
+            status,
+            workItem.Change,
+            workItem.SourcePdfs.Count,
+            result.BytesCopied,
+            result.BytesShared,
+            workItem.DeduplicatedBytes,
+            workItem.DuplicateOf);
+    }
+
+    /// <summary>
+    /// Processes a single planned work item
+    /// </summary>
+    private async Task<CollectionProcessingResult> ProcessWorkItemAsync(
+        ConsolidationWorkItem workItem,
+        ConsolidationRequest request,
+        ConsolidationProgressTracker progress,
+        CancellationToken cancellationToken)
+    {
+        var isDuplicate = workItem.DuplicateOf != null;
+        if (isDuplicate)
+        {
+            return new CollectionProcessingResult(string.Empty, false, false, WasDuplicate: true);
+        }
+
+        var isUnchanged = workItem.Change == ConsolidationChangeKind.Unchanged;
+        if (isUnchanged)
+        {
+            _logger.LogDebug("Skipping unchanged book: {Name}", workItem.Name);
+            return new CollectionProcessingResult(workItem.Destination!.Path, false, false, true);
+        }
+
+        return workItem.Kind switch
+        {
+            ConsolidationWorkKind.IndividualPdf => await ProcessIndividualPdfAsync(
+                workItem, request.AllowHardLinks, progress, cancellationToken),
+            ConsolidationWorkKind.SinglePdfCollection => await ProcessSinglePdfCollectionAsync(
+                workItem, request.AllowHardLinks, cancellationToken),
+            _ => await ProcessMultiPdfCollectionAsync(
+                workItem, request.CompressionProfile, progress, cancellationToken)
+        };
+    }
+
+    /// <summary>
+    /// Processes an individual PDF file and copies it to the target directory
+    /// </summary>
+    private async Task<CollectionProcessingResult> ProcessIndividualPdfAsync(
+        ConsolidationWorkItem workItem,
+        bool allowHardLinks,
+        ConsolidationProgressTracker progress,
+        CancellationToken cancellationToken)
+    {
+        // Precondition: parameters must be valid
+        Debug.Assert(workItem.SourcePdfs.Count == 1, "Individual PDF must have exactly one source");
+        Debug.Assert(workItem.Destination != null, "Destination must be assigned");
+
+        progress.ReportActivity($"Copying individual PDF: {workItem.Name}");
+
+        return await CopySourcePdfAsync(workItem, allowHardLinks, cancellationToken);
+    }
+
+    /// <summary>
+    /// Processes a collection containing a single PDF
+    /// </summary>
+    private async Task<CollectionProcessingResult> ProcessSinglePdfCollectionAsync(
+        ConsolidationWorkItem workItem,
+        bool allowHardLinks,
+        CancellationToken cancellationToken)
+    {
+        // Precondition
+        Debug.Assert(workItem.SourcePdfs.Count == 1, "Single PDF collection must have exactly one source");
+        Debug.Assert(workItem.Destination != null, "Destination must be assigned");
+
+        return await CopySourcePdfAsync(workItem, allowHardLinks, cancellationToken);
+    }
+
+    /// <summary>
+    /// Copies the only source PDF of a work item to its destination
+    /// </summary>
+    private async Task<CollectionProcessingResult> CopySourcePdfAsync(
+        ConsolidationWorkItem workItem,
+        bool allowHardLinks,
+        CancellationToken cancellationToken)
+    {
+        var destinationPath = workItem.Destination!.Path;
+        var copyRequest = new CopyFileRequest(
+            workItem.SourcePdfs[0],
+            destinationPath,
+            workItem.Change == ConsolidationChangeKind.Updated,
+            allowHardLinks);
+
+        CopyFileResult copyResult;
+        using (BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Copy, workItem.Name))
+        {
+            copyResult = await _fileSystemAdapter.CopyFileAsync(copyRequest, cancellationToken);
+        }
+
+        if (!copyResult.Success)
+        {
+            _logger.LogError("Failed to copy {SourcePdf} to {DestinationPath}", workItem.SourcePdfs[0], destinationPath);
             return new CollectionProcessingResult(string.Empty, false, false);
         }
 
-        var outputFileName = $"{collectionName}.pdf";
-        var outputPath = ResolveDestinationPath(targetDirectory, outputFileName, namingConflicts);
+        _logger.LogDebug("Copied {FileName} by {CopyMethod}: {BytesCopied} bytes copied, {BytesShared} bytes shared",
+            workItem.Name, copyResult.Method, copyResult.BytesCopied, copyResult.BytesShared);
+        BookshelfTelemetry.BytesRead.Add(copyResult.BytesCopied);
+        BookshelfTelemetry.BytesWritten.Add(copyResult.BytesCopied);
+
+        // Postcondition: destination file should exist
+        Debug.Assert(_fileSystemAdapter.FileExists(new FileExistsRequest(destinationPath)),
+            "Destination file should exist after copy");
+
+        return new CollectionProcessingResult(
+            destinationPath,
+            false,
+            true,
+            BytesCopied: copyResult.BytesCopied,
+            BytesShared: copyResult.BytesShared);
+    }
+
+    /// <summary>
+    /// Processes a collection containing multiple PDFs by merging them
+    /// </summary>
+    private async Task<CollectionProcessingResult> ProcessMultiPdfCollectionAsync(
+        ConsolidationWorkItem workItem,
+        PdfCompressionProfile compressionProfile,
+        ConsolidationProgressTracker progress,
+        CancellationToken cancellationToken)
+    {
+        // Precondition
+        Debug.Assert(workItem.SourcePdfs.Count > 0, "Must have PDFs to merge");
+        Debug.Assert(workItem.Destination != null, "Destination must be assigned");
+
+        var collectionName = workItem.Name;
+        var orderedFiles = workItem.SourcePdfs;
+        var outputPath = workItem.Destination!.Path;
+        progress.ReportActivity($"Merging collection: {collectionName}");
 
-        var firstPdfMetadata = await _pdfMerger.ExtractMetadataAsync(
-            new ExtractMetadataRequest(orderedFiles[0]));
+        BookMetadata firstPdfMetadata;
+        using (BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.ExtractMetadata, orderedFiles[0]))
+        {
+            firstPdfMetadata = await _pdfMerger.ExtractMetadataAsync(
+                new ExtractMetadataRequest(orderedFiles[0]));
+        }
 
         var mergeRequest = new MergePdfsRequest(
             orderedFiles,
             outputPath,
-            firstPdfMetadata);
+            firstPdfMetadata,
+            CompressionProfile: compressionProfile);
 
-        var mergeSuccess = await _pdfMerger.MergePdfsAsync(mergeRequest, cancellationToken);
+        MergePdfsResult mergeResult;
+        using (BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Merge, collectionName))
+        {
+            mergeResult = await _pdfMerger.MergePdfsAsync(mergeRequest, cancellationToken);
+        }
 
-        if (mergeSuccess)
+        if (mergeResult.Success)
         {
-            _logger.LogInformation("Merged collection {CollectionName} with {Count} PDFs using {PluginName} pattern", 
-                collectionName, orderedFiles.Count, plugin.PluginName);
+            BookshelfTelemetry.BytesRead.Add(mergeResult.SourceBytes);
+            BookshelfTelemetry.BytesWritten.Add(mergeResult.OutputBytes);
+            BookshelfTelemetry.PagesMerged.Add(mergeResult.PageCount);
+
+            _logger.LogInformation(
+                "Merged collection {CollectionName} with {Count} PDFs from {SourceBytes} to {OutputBytes} bytes, sharing {SharedStreamCount} streams",
+                collectionName, orderedFiles.Count, mergeResult.SourceBytes, mergeResult.OutputBytes, mergeResult.SharedStreamCount);
             
             // Postcondition
             Debug.Assert(_fileSystemAdapter.FileExists(new FileExistsRequest(outputPath)), 
                 "Output file should exist after merge");
             
-            return new CollectionProcessingResult(outputPath, true, false);
+            return new CollectionProcessingResult(
+                outputPath,
+                true,
+                false,
+                MergedSourceBytes: mergeResult.SourceBytes,
+                MergedOutputBytes: mergeResult.OutputBytes,
+                CompressionSavedBytes: mergeResult.CompressionSavedBytes,
+                MergeTime: mergeResult.Elapsed);
         }
 
         _logger.LogError("Failed to merge collection: {CollectionName}", collectionName);
@@ -347,33 +955,46 @@ public class BookshelfConsolidationService : IBookshelfConsolidationService
     }
 
     /// <summary>
-    /// Resolves the destination path handling naming conflicts
+    /// Creates the manifest entry recording a consolidated work item
     /// </summary>
-    private string ResolveDestinationPath(
+    private static ManifestEntry CreateManifestEntry(ConsolidationWorkItem workItem)
+    {
+        // Precondition
+        Debug.Assert(workItem.Destination != null, "Destination must be assigned");
+        Debug.Assert(workItem.Fingerprints != null, "Fingerprints must be created");
+
+        return new ManifestEntry(
+            workItem.SourcePath,
+            Path.GetFileName(workItem.Destination!.Path),
+            workItem.Fingerprints!);
+    }
+
+    /// <summary>
+    /// Resolves the destination path handling naming conflicts with existing and reserved files
+    /// </summary>
+    private FileDestination ResolveDestinationPath(
         string targetDirectory,
         string fileName,
-        List<string> namingConflicts)
+        List<string> namingConflicts,
+        TargetFileNameIndex fileNameIndex)
     {
         // Precondition
         Debug.Assert(!string.IsNullOrWhiteSpace(targetDirectory), "Target directory must not be null");
         Debug.Assert(!string.IsNullOrWhiteSpace(fileName), "File name must not be null");
 
-        var destinationPath = Path.Combine(targetDirectory, fileName);
-        
-        var fileExists = _fileSystemAdapter.FileExists(new FileExistsRequest(destinationPath));
+        var destinationFileName = fileNameIndex.Reserve(fileName, out var fileExists);
         if (fileExists)
         {
-            var uniqueFileName = _fileSystemAdapter.GenerateUniqueFileName(
-                new GenerateUniqueFileNameRequest(targetDirectory, fileName));
-            destinationPath = Path.Combine(targetDirectory, uniqueFileName);
             namingConflicts.Add(fileName);
             _logger.LogWarning("Naming conflict detected for {FileName}, using {UniqueFileName}", 
-                fileName, uniqueFileName);
+                fileName, destinationFileName);
         }
 
+        var destinationPath = Path.Combine(targetDirectory, destinationFileName);
+
         // Postcondition
         Debug.Assert(!string.IsNullOrWhiteSpace(destinationPath), "Destination path must be valid");
 
-        return destinationPath;
+        return new FileDestination(destinationPath, fileExists);
     }
 }
@@ -0,0 +1,340 @@
+using Bookshelf.Application.Api;
+using Bookshelf.Application.Api.Dtos;
+using Bookshelf.Application.Core.Diagnostics;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Core.Indexing;
+using Bookshelf.Application.Core.Search;
+using Bookshelf.Application.Spi;
+using Bookshelf.Application.Spi.Dtos;
+using Microsoft.Extensions.Logging;
+using System.Diagnostics;
+
+namespace Bookshelf.Application.Services;
+
+/// <summary>
+/// Service for building the full-text index of a bookshelf and searching it
+/// </summary>
+public sealed class BookshelfIndexService : IBookshelfIndexService
+{
+    private readonly IFileSystemAdapter _fileSystemAdapter;
+    private readonly IPdfTextExtractor _textExtractor;
+    private readonly IBookIndexStore _indexStore;
+    private readonly ILogger<BookshelfIndexService> _logger;
+
+    /// <summary>
+    /// Initializes a new instance of the BookshelfIndexService class
+    /// </summary>
+    /// <param name="fileSystemAdapter">The file system adapter</param>
+    /// <param name="textExtractor">The extractor for the text of the books</param>
+    /// <param name="indexStore">The store for the persistent search index</param>
+    /// <param name="logger">The logger</param>
+    public BookshelfIndexService(
+        IFileSystemAdapter fileSystemAdapter,
+        IPdfTextExtractor textExtractor,
+        IBookIndexStore indexStore,
+        ILogger<BookshelfIndexService> logger)
+    {
+        _fileSystemAdapter = fileSystemAdapter ?? throw new ArgumentNullException(nameof(fileSystemAdapter));
+        _textExtractor = textExtractor ?? throw new ArgumentNullException(nameof(textExtractor));
+        _indexStore = indexStore ?? throw new ArgumentNullException(nameof(indexStore));
+        _logger = logger ?? throw new ArgumentNullException(nameof(logger));
+    }
+
+    /// <inheritdoc />
+    public async Task<IndexBuildResult> BuildIndexAsync(
+        BuildIndexRequest request,
+        IProgress<IndexProgress>? progressCallback = null,
+        CancellationToken cancellationToken = default)
+    {
+        // Guard clauses
+        if (request == null)
+        {
+            throw new ArgumentNullException(nameof(request));
+        }
+
+        if (string.IsNullOrWhiteSpace(request.BookshelfDirectory))
+        {
+            throw new ArgumentException("Bookshelf directory cannot be null or whitespace", nameof(request));
+        }
+
+        if (request.MaxParallelism < BuildIndexRequest.SequentialParallelism)
+        {
+            throw new ArgumentException("Max parallelism must be at least 1", nameof(request));
+        }
+
+        var directoryDoesNotExist = !_fileSystemAdapter.DirectoryExists(
+            new DirectoryExistsRequest(request.BookshelfDirectory));
+        if (directoryDoesNotExist)
+        {
+            return IndexBuildResult.CreateFailure($"Bookshelf directory does not exist: {request.BookshelfDirectory}");
+        }
+
+        try
+        {
+            using var indexStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Index, request.BookshelfDirectory);
+
+            _logger.LogInformation("Indexing books in {BookshelfDirectory}", request.BookshelfDirectory);
+
+            var pdfFiles = await _fileSystemAdapter.GetPdfFileEntriesByNameAsync(request.BookshelfDirectory, cancellationToken);
+            var previousIndex = request.Rebuild
+                ? BookIndex.Empty
+                : await LoadIndexAsync(request.BookshelfDirectory, cancellationToken) ?? BookIndex.Empty;
+
+            // Unchanged books keep their postings, so only new and changed books are read
+            var previousBookIds = previousIndex.Books
+                .Select((book, bookId) => (book, bookId))
+                .ToDictionary(indexed => indexed.book.FileName, indexed => indexed.bookId, StringComparer.Ordinal);
+
+            var reusedBookIds = new HashSet<int>();
+            var changedFiles = new List<FileInfoResult>();
+            foreach (var fileInfo in pdfFiles)
+            {
+                var isIndexed = previousBookIds.TryGetValue(fileInfo.FileName, out var bookId);
+                var isUnchanged = isIndexed
+                    && previousIndex.Books[bookId].HasSameFileStatistics(fileInfo.FileSizeBytes, fileInfo.LastWriteTimeUtc);
+                if (isUnchanged)
+                {
+                    reusedBookIds.Add(bookId);
+                }
+                else
+                {
+                    changedFiles.Add(fileInfo);
+                }
+            }
+
+            var currentFileNames = pdfFiles.Select(fileInfo => fileInfo.FileName).ToHashSet(StringComparer.Ordinal);
+            var removedBookCount = previousIndex.Books.Count(book => !currentFileNames.Contains(book.FileName));
+            var isUnchangedIndex = changedFiles.Count == 0 && removedBookCount == 0;
+            if (isUnchangedIndex)
+            {
+                _logger.LogInformation("Index of {BookshelfDirectory} is up to date", request.BookshelfDirectory);
+                return new IndexBuildResult(
+                    true, previousIndex.Books.Count, 0, reusedBookIds.Count, 0, 0, previousIndex.Terms.Count);
+            }
+
+            var builder = new BookIndexBuilder();
+            builder.AddIndexedBooks(previousIndex, reusedBookIds);
+
+            var failedBookCount = 0;
+            var completedBookCount = 0;
+            var extractions = IncrementalIndexing.ReadInOrderAsync(
+                changedFiles, request.MaxParallelism, ExtractTextSafelyAsync, cancellationToken);
+            await foreach (var extracted in extractions)
+            {
+                var isExtracted = extracted.Content != null;
+                if (!isExtracted)
+                {
+                    failedBookCount++;
+                }
+
+                AddBook(builder, extracted.FileInfo, extracted.Content);
+
+                completedBookCount++;
+                progressCallback?.Report(new IndexProgress(changedFiles.Count, completedBookCount, extracted.FileInfo.FileName));
+            }
+
+            var index = builder.Build();
+            await SaveIndexAsync(request.BookshelfDirectory, index, cancellationToken);
+
+            _logger.LogInformation(
+                "Indexed {BookCount} books with {TermCount} terms, extracting {ExtractedCount} and reusing {ReusedCount}",
+                index.Books.Count, index.Terms.Count, changedFiles.Count, reusedBookIds.Count);
+
+            return new IndexBuildResult(
+                true,
+                index.Books.Count,
+                changedFiles.Count,
+                reusedBookIds.Count,
+                removedBookCount,
+                failedBookCount,
+                index.Terms.Count);
+        }
+        catch (OperationCanceledException)
+        {
+            _logger.LogWarning("Indexing was cancelled");
+            return IndexBuildResult.CreateFailure("Indexing was cancelled");
+        }
+        catch (Exception ex)
+        {
+            _logger.LogError(ex, "Error indexing books in {BookshelfDirectory}", request.BookshelfDirectory);
+            return IndexBuildResult.CreateFailure($"Error indexing books: {ex.Message}");
+        }
+    }
+
+    /// <inheritdoc />
+    public async Task<BookSearchResult> SearchAsync(
+        SearchBooksRequest request,
+        CancellationToken cancellationToken = default)
+    {
+        // Guard clauses
+        if (request == null)
+        {
+            throw new ArgumentNullException(nameof(request));
+        }
+
+        if (string.IsNullOrWhiteSpace(request.BookshelfDirectory))
+        {
+            throw new ArgumentException("Bookshelf directory cannot be null or whitespace", nameof(request));
+        }
+
+        if (string.IsNullOrWhiteSpace(request.Query))
+        {
+            throw new ArgumentException("Query cannot be null or whitespace", nameof(request));
+        }
+
+        if (request.MaxResults < 1)
+        {
+            throw new ArgumentException("Max results must be at least 1", nameof(request));
+        }
+
+        if (request.MaxPagesPerHit < 0)
+        {
+            throw new ArgumentException("Max pages per hit cannot be negative", nameof(request));
+        }
+
+        var directoryDoesNotExist = !_fileSystemAdapter.DirectoryExists(
+            new DirectoryExistsRequest(request.BookshelfDirectory));
+        if (directoryDoesNotExist)
+        {
+            return BookSearchResult.CreateFailure($"Bookshelf directory does not exist: {request.BookshelfDirectory}");
+        }
+
+        try
+        {
+            var index = await LoadIndexAsync(request.BookshelfDirectory, cancellationToken);
+            if (index == null)
+            {
+                return BookSearchResult.CreateFailure(
+                    $"No readable search index in {request.BookshelfDirectory}, run 'bookshelf index' on the bookshelf first");
+            }
+
+            var pdfFiles = await _fileSystemAdapter.GetPdfFileEntriesByNameAsync(request.BookshelfDirectory, cancellationToken);
+            var staleBookCount = IncrementalIndexing.CountStaleBooks(index.Books, pdfFiles.GetFileStatistics());
+            if (staleBookCount > 0)
+            {
+                _logger.LogWarning("{StaleCount} books changed since the index of {BookshelfDirectory} was built",
+                    staleBookCount, request.BookshelfDirectory);
+            }
+
+            var startTimestamp = Stopwatch.GetTimestamp();
+            IReadOnlyList<BookIndexMatch> matches;
+            int totalMatches;
+            using (BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Search, request.Query))
+            {
+                matches = BookIndexSearcher.Search(
+                    index, request.Query, request.MaxResults, request.MaxPagesPerHit, out totalMatches);
+            }
+
+            var elapsed = Stopwatch.GetElapsedTime(startTimestamp);
+
+            var hits = matches
+                .Select(match => CreateSearchHit(request.BookshelfDirectory, index.Books[match.BookId], match))
+                .ToList();
+
+            _logger.LogInformation("Found {HitCount} books matching {Query} in {ElapsedMilliseconds} ms",
+                totalMatches, request.Query, elapsed.TotalMilliseconds);
+
+            return new BookSearchResult(true, hits, totalMatches, index.Books.Count, staleBookCount, elapsed);
+        }
+        catch (OperationCanceledException)
+        {
+            _logger.LogWarning("Search was cancelled");
+            return BookSearchResult.CreateFailure("Search was cancelled");
+        }
+        catch (Exception ex)
+        {
+            _logger.LogError(ex, "Error searching books in {BookshelfDirectory}", request.BookshelfDirectory);
+            return BookSearchResult.CreateFailure($"Error searching books: {ex.Message}");
+        }
+    }
+
+    /// <summary>
+    /// Loads the search index of the bookshelf
+    /// </summary>
+    private async Task<BookIndex?> LoadIndexAsync(string bookshelfDirectory, CancellationToken cancellationToken)
+    {
+        using var indexStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.SearchIndex, bookshelfDirectory);
+
+        return await _indexStore.LoadIndexAsync(new LoadBookIndexRequest(bookshelfDirectory), cancellationToken);
+    }
+
+    /// <summary>
+    /// Saves the search index of the bookshelf
+    /// </summary>
+    private async Task SaveIndexAsync(string bookshelfDirectory, BookIndex index, CancellationToken cancellationToken)
+    {
+        using var indexStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.SearchIndex, bookshelfDirectory);
+
+        var isSaved = await _indexStore.SaveIndexAsync(new SaveBookIndexRequest(bookshelfDirectory, index), cancellationToken);
+        if (!isSaved)
+        {
+            throw new IOException($"Unable to save the search index of {bookshelfDirectory}");
+        }
+    }
+
+    /// <summary>
+    /// Extracts the text of a book, returning no content if it cannot be read
+    /// </summary>
+    private async Task<(FileInfoResult FileInfo, PdfTextContent? Content)> ExtractTextSafelyAsync(
+        FileInfoResult fileInfo,
+        CancellationToken cancellationToken)
+    {
+        // Precondition
+        Debug.Assert(!string.IsNullOrWhiteSpace(fileInfo.FullPath), "PDF file path must not be null");
+
+        using var extractStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.ExtractText, fileInfo.FullPath);
+
+        var content = await _textExtractor.ExtractTextAsync(new ExtractPdfTextRequest(fileInfo.FullPath), cancellationToken);
+        if (content == null)
+        {
+            _logger.LogWarning("Unable to extract text from {PdfFile}, indexing its title only", fileInfo.FullPath);
+        }
+
+        return (fileInfo, content);
+    }
+
+    /// <summary>
+    /// Adds a book to the index, falling back to its file name if the PDF could not be read,
+    /// in which case the book is marked unread so it is not reused by the next index run
+    /// </summary>
+    private static void AddBook(BookIndexBuilder builder, FileInfoResult fileInfo, PdfTextContent? content)
+    {
+        var hasTitle = !string.IsNullOrWhiteSpace(content?.Title);
+        var title = hasTitle ? content!.Title!.Trim() : Path.GetFileNameWithoutExtension(fileInfo.FileName);
+        var hasAuthor = !string.IsNullOrWhiteSpace(content?.Author);
+        var author = hasAuthor ? content!.Author!.Trim() : null;
+
+        var metadataTexts = new[]
+        {
+            Path.GetFileNameWithoutExtension(fileInfo.FileName),
+            hasTitle ? title : string.Empty,
+            author ?? string.Empty,
+            content?.Subject ?? string.Empty,
+            content?.Keywords ?? string.Empty
+        };
+
+        var isExtracted = content != null;
+        builder.AddBook(
+            fileInfo.FileName,
+            isExtracted ? fileInfo.FileSizeBytes : IndexedBook.UnreadFileSizeBytes,
+            fileInfo.LastWriteTimeUtc,
+            title,
+            author,
+            metadataTexts,
+            content?.Pages ?? Array.Empty<string>());
+    }
+
+    /// <summary>
+    /// Creates a search hit from a match of the index
+    /// </summary>
+    private static BookSearchHit CreateSearchHit(string bookshelfDirectory, IndexedBook book, BookIndexMatch match)
+    {
+        return new BookSearchHit(
+            book.Title,
+            Path.Combine(bookshelfDirectory, book.FileName),
+            book.Author,
+            match.Score,
+            match.MatchesMetadata,
+            match.Pages);
+    }
+}
@@ -1,10 +1,12 @@
 using Bookshelf.Application.Api;
 using Bookshelf.Application.Api.Dtos;
+using Bookshelf.Application.Core.Diagnostics;
 using Bookshelf.Application.Core.Entities;
 using Bookshelf.Application.Spi;
 using Bookshelf.Application.Spi.Dtos;
 using Microsoft.Extensions.Logging;
 using System.Diagnostics;
+using System.Runtime.CompilerServices;
 
 namespace Bookshelf.Application.Services;
 
@@ -15,6 +17,7 @@ public sealed class BookshelfListService : IBookshelfListService
 {
     private readonly IFileSystemAdapter _fileSystemAdapter;
     private readonly IPdfMerger _pdfMerger;
+    private readonly IBookMetadataCacheStore _cacheStore;
     private readonly ILogger<BookshelfListService> _logger;
 
     /// <summary>
@@ -23,13 +26,16 @@ public sealed class BookshelfListService : IBookshelfListService
     /// <param name="fileSystemAdapter">The file system adapter</param>
     /// <param name="pdfMerger">The PDF merger for extracting page counts</param>
     /// <param name="logger">The logger</param>
+    /// <param name="cacheStore">The store for the persistent book metadata cache</param>
     public BookshelfListService(
         IFileSystemAdapter fileSystemAdapter,
         IPdfMerger pdfMerger,
-        ILogger<BookshelfListService> logger)
+        ILogger<BookshelfListService> logger,
+        IBookMetadataCacheStore cacheStore)
     {
         _fileSystemAdapter = fileSystemAdapter ?? throw new ArgumentNullException(nameof(fileSystemAdapter));
         _pdfMerger = pdfMerger ?? throw new ArgumentNullException(nameof(pdfMerger));
+        _cacheStore = cacheStore ?? throw new ArgumentNullException(nameof(cacheStore));
         _logger = logger ?? throw new ArgumentNullException(nameof(logger));
     }
 
@@ -49,6 +55,11 @@ public sealed class BookshelfListService : IBookshelfListService
             throw new ArgumentException("Bookshelf directory cannot be null or whitespace", nameof(request));
         }
 
+        if (request.MaxParallelism < ListBooksRequest.SequentialParallelism)
+        {
+            throw new ArgumentException("Max parallelism must be at least 1", nameof(request));
+        }
+
         var directoryDoesNotExist = !_fileSystemAdapter.DirectoryExists(
             new DirectoryExistsRequest(request.BookshelfDirectory));
         if (directoryDoesNotExist)
@@ -58,11 +69,12 @@ public sealed class BookshelfListService : IBookshelfListService
 
         try
         {
+            using var listStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.List, request.BookshelfDirectory);
+
             _logger.LogInformation("Listing books from {BookshelfDirectory}", request.BookshelfDirectory);
 
-            // Get all PDF files in the bookshelf directory
-            var pdfFiles = await _fileSystemAdapter.GetPdfFilesAsync(
-                new GetPdfFilesRequest(request.BookshelfDirectory));
+            // Get all PDF files in the bookshelf directory with their size and timestamps in one pass
+            var pdfFiles = await GetPdfFileEntriesAsync(request.BookshelfDirectory, cancellationToken);
 
             var hasNoBooks = pdfFiles.Count == 0;
             if (hasNoBooks)
@@ -71,25 +83,17 @@ public sealed class BookshelfListService : IBookshelfListService
                 return BookListResult.CreateSuccess(Array.Empty<BookInfo>());
             }
 
-            // Build book info list
-            var books = new List<BookInfo>();
-            foreach (var pdfFile in pdfFiles)
-            {
-                cancellationToken.ThrowIfCancellationRequested();
-
-                var bookInfo = await CreateBookInfoAsync(pdfFile, request.IncludeDetails);
-                books.Add(bookInfo);
-            }
-
-            // Apply title filter if specified
-            var hasFilter = !string.IsNullOrWhiteSpace(request.TitleFilter);
-            if (hasFilter)
-            {
-                books = ApplyTitleFilter(books, request.TitleFilter!);
-            }
+            // Build book info list, reusing cached metadata of unchanged books
+            var cache = await LoadCacheAsync(request, cancellationToken);
+            var cacheEntries = await CreateCacheEntriesAsync(pdfFiles, request, cache, cancellationToken);
+            await SaveCacheIfChangedAsync(request, cache, cacheEntries, cancellationToken);
 
-            // Apply sorting
-            books = ApplySorting(books, request.SortBy, request.SortDirection);
+            var bookComparer = CreateBookComparer(request.SortBy, request.SortDirection);
+            var books = cacheEntries
+                .Select(entry => CreateBookInfo(entry, request.IncludeDetails))
+                .Where(book => MatchesTitleFilter(book.Title, request.TitleFilter))
+                .OrderBy(book => book, bookComparer)
+                .ToList();
 
             _logger.LogInformation("Found {BookCount} books in bookshelf", books.Count);
 
@@ -107,41 +111,289 @@ public sealed class BookshelfListService : IBookshelfListService
         }
     }
 
+    /// <inheritdoc />
+    public async IAsyncEnumerable<BookInfo> StreamBooksAsync(
+        ListBooksRequest request,
+        [EnumeratorCancellation] CancellationToken cancellationToken = default)
+    {
+        // Guard clauses
+        if (request == null)
+        {
+            throw new ArgumentNullException(nameof(request));
+        }
+
+        if (string.IsNullOrWhiteSpace(request.BookshelfDirectory))
+        {
+            throw new ArgumentException("Bookshelf directory cannot be null or whitespace", nameof(request));
+        }
+
+        if (request.MaxParallelism < ListBooksRequest.SequentialParallelism)
+        {
+            throw new ArgumentException("Max parallelism must be at least 1", nameof(request));
+        }
+
+        var directoryDoesNotExist = !_fileSystemAdapter.DirectoryExists(
+            new DirectoryExistsRequest(request.BookshelfDirectory));
+        if (directoryDoesNotExist)
+        {
+            throw new DirectoryNotFoundException($"Bookshelf directory does not exist: {request.BookshelfDirectory}");
+        }
+
+        using var listStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.List, request.BookshelfDirectory);
+
+        _logger.LogInformation("Streaming books from {BookshelfDirectory}", request.BookshelfDirectory);
+
+        var pdfFiles = await GetPdfFileEntriesAsync(request.BookshelfDirectory, cancellationToken);
+        var cache = await LoadCacheAsync(request, cancellationToken);
+
+        // Title, size and creation date are known from the directory listing, so books are filtered and
+        // ordered before any details are read and each book can be yielded as soon as it is ready
+        // Page counts are unknown at this point, so sorting by page count keeps the file order
+        var bookComparer = CreateBookComparer(request.SortBy, request.SortDirection);
+        var orderedFiles = pdfFiles
+            .Select(fileInfo => (FileInfo: fileInfo, Book: CreateListedBook(fileInfo)))
+            .Where(listed => MatchesTitleFilter(listed.Book.Title, request.TitleFilter))
+            .OrderBy(listed => listed.Book, bookComparer)
+            .Select(listed => listed.FileInfo)
+            .ToList();
+        var readEntries = new List<BookMetadataCacheEntry>(orderedFiles.Count);
+
+        var isSortedByPageCount = request.SortBy == BookListSortField.PageCount;
+        if (isSortedByPageCount)
+        {
+            // Page counts are only known once every book is read
+            var books = new List<BookInfo>(orderedFiles.Count);
+            await foreach (var entry in ReadCacheEntriesInOrderAsync(orderedFiles, request, cache, cancellationToken))
+            {
+                readEntries.Add(entry);
+                books.Add(CreateBookInfo(entry, request.IncludeDetails));
+            }
+
+            foreach (var book in books.OrderBy(book => book, bookComparer))
+            {
+                yield return book;
+            }
+        }
+        else
+        {
+            await foreach (var entry in ReadCacheEntriesInOrderAsync(orderedFiles, request, cache, cancellationToken))
+            {
+                readEntries.Add(entry);
+                yield return CreateBookInfo(entry, request.IncludeDetails);
+            }
+        }
+
+        var cacheEntries = AddUnreadCacheEntries(readEntries, pdfFiles, cache);
+        await SaveCacheIfChangedAsync(request, cache, cacheEntries, cancellationToken);
+
+        _logger.LogInformation("Streamed {BookCount} books from bookshelf", readEntries.Count);
+    }
+
+    /// <summary>
+    /// Reads the cache entries of the PDF files with bounded parallelism, yielding them in the order of the files
+    /// </summary>
+    /// <remarks>
+    /// At most <see cref="ListBooksRequest.MaxParallelism"/> entries are read ahead of the consumer, so memory stays
+    /// bounded no matter how many books the bookshelf holds.
+    /// </remarks>
+    private async IAsyncEnumerable<BookMetadataCacheEntry> ReadCacheEntriesInOrderAsync(
+        IReadOnlyList<FileInfoResult> pdfFiles,
+        ListBooksRequest request,
+        BookMetadataCache cache,
+        [EnumeratorCancellation] CancellationToken cancellationToken)
+    {
+        var pendingEntries = new Queue<Task<BookMetadataCacheEntry>>(request.MaxParallelism);
+        foreach (var fileInfo in pdfFiles)
+        {
+            pendingEntries.Enqueue(CreateCacheEntryAsync(fileInfo, request.IncludeDetails, cache, cancellationToken));
+
+            var isReadAheadFull = pendingEntries.Count >= request.MaxParallelism;
+            if (isReadAheadFull)
+            {
+                yield return await pendingEntries.Dequeue();
+            }
+        }
+
+        while (pendingEntries.Count > 0)
+        {
+            yield return await pendingEntries.Dequeue();
+        }
+    }
+
+    /// <summary>
+    /// Adds the current cache entries of books that were filtered out, so a filtered listing keeps their cached metadata
+    /// </summary>
+    private static IReadOnlyList<BookMetadataCacheEntry> AddUnreadCacheEntries(
+        IReadOnlyList<BookMetadataCacheEntry> readEntries,
+        IReadOnlyList<FileInfoResult> pdfFiles,
+        BookMetadataCache cache)
+    {
+        var readFilePaths = readEntries.Select(entry => entry.FilePath).ToHashSet(StringComparer.Ordinal);
+        var unreadEntries = pdfFiles
+            .Where(fileInfo => !readFilePaths.Contains(fileInfo.FullPath))
+            .Select(fileInfo => cache.FindCurrentEntry(fileInfo.FullPath, fileInfo.FileSizeBytes, fileInfo.LastWriteTimeUtc))
+            .OfType<BookMetadataCacheEntry>();
+
+        return readEntries.Concat(unreadEntries).ToList();
+    }
+
+    /// <summary>
+    /// Gets all PDF files in the bookshelf directory with their size and timestamps
+    /// </summary>
+    private async Task<IReadOnlyList<FileInfoResult>> GetPdfFileEntriesAsync(
+        string bookshelfDirectory,
+        CancellationToken cancellationToken)
+    {
+        using var enumerateStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Enumerate, bookshelfDirectory);
+
+        return await _fileSystemAdapter.GetPdfFileEntriesAsync(
+            new GetPdfFileEntriesRequest(bookshelfDirectory), cancellationToken);
+    }
+
+    /// <summary>
+    /// Loads the metadata cache unless the request disables or rebuilds it
+    /// </summary>
+    private async Task<BookMetadataCache> LoadCacheAsync(ListBooksRequest request, CancellationToken cancellationToken)
+    {
+        var isCacheEnabled = request.CacheMode == BookMetadataCacheMode.Enabled;
+        if (!isCacheEnabled)
+        {
+            return BookMetadataCache.Empty;
+        }
+
+        using var cacheStage = BookshelfTelemetry.StartStage(
+            BookshelfTelemetry.Stages.MetadataCache, request.BookshelfDirectory);
+
+        return await _cacheStore.LoadCacheAsync(
+            new LoadBookMetadataCacheRequest(request.BookshelfDirectory), cancellationToken);
+    }
+
+    /// <summary>
+    /// Saves the metadata cache if any book was read from disk or removed since the cache was loaded
+    /// </summary>
+    private async Task SaveCacheIfChangedAsync(
+        ListBooksRequest request,
+        BookMetadataCache cache,
+        IReadOnlyList<BookMetadataCacheEntry> cacheEntries,
+        CancellationToken cancellationToken)
+    {
+        var isCacheDisabled = request.CacheMode == BookMetadataCacheMode.Disabled;
+        if (isCacheDisabled)
+        {
+            return;
+        }
+
+        var reusedEntryCount = cacheEntries.Count(entry => cache.Entries.GetValueOrDefault(entry.FilePath) == entry);
+        _logger.LogInformation("Reused cached metadata for {ReusedCount} of {BookCount} books",
+            reusedEntryCount, cacheEntries.Count);
+
+        var isUnchanged = reusedEntryCount == cacheEntries.Count && cache.Entries.Count == cacheEntries.Count;
+        if (isUnchanged)
+        {
+            return;
+        }
+
+        using var cacheStage = BookshelfTelemetry.StartStage(
+            BookshelfTelemetry.Stages.MetadataCache, request.BookshelfDirectory);
+
+        await _cacheStore.SaveCacheAsync(
+            new SaveBookMetadataCacheRequest(request.BookshelfDirectory, cache.WithEntries(cacheEntries)),
+            cancellationToken);
+    }
+
+    /// <summary>
+    /// Creates the cache entries of all books with bounded parallelism, keeping them in the order of the PDF files
+    /// </summary>
+    private async Task<BookMetadataCacheEntry[]> CreateCacheEntriesAsync(
+        IReadOnlyList<FileInfoResult> pdfFiles,
+        ListBooksRequest request,
+        BookMetadataCache cache,
+        CancellationToken cancellationToken)
+    {
+        var parallelOptions = new ParallelOptions
+        {
+            MaxDegreeOfParallelism = request.MaxParallelism,
+            CancellationToken = cancellationToken
+        };
+
+        var cacheEntries = new BookMetadataCacheEntry[pdfFiles.Count];
+        await Parallel.ForEachAsync(
+            Enumerable.Range(0, pdfFiles.Count),
+            parallelOptions,
+            async (index, itemCancellationToken) =>
+            {
+                cacheEntries[index] = await CreateCacheEntryAsync(
+                    pdfFiles[index], request.IncludeDetails, cache, itemCancellationToken);
+            });
+
+        return cacheEntries;
+    }
+
     /// <summary>
-    /// Creates a BookInfo from a PDF file path
+    /// Creates the cache entry of a PDF file, reusing the cached entry if the file is unchanged
     /// </summary>
-    private async Task<BookInfo> CreateBookInfoAsync(string pdfFile, bool includeDetails)
+    private async Task<BookMetadataCacheEntry> CreateCacheEntryAsync(
+        FileInfoResult fileInfo,
+        bool includeDetails,
+        BookMetadataCache cache,
+        CancellationToken cancellationToken)
     {
         // Precondition
-        Debug.Assert(!string.IsNullOrWhiteSpace(pdfFile), "PDF file path must not be null");
+        Debug.Assert(!string.IsNullOrWhiteSpace(fileInfo.FullPath), "PDF file path must not be null");
+
+        var cachedEntry = cache.FindCurrentEntry(fileInfo.FullPath, fileInfo.FileSizeBytes, fileInfo.LastWriteTimeUtc);
+        var isCacheHit = cachedEntry != null && (cachedEntry.HasDetails || !includeDetails);
+        if (isCacheHit)
+        {
+            return cachedEntry!;
+        }
 
-        var fileInfo = await _fileSystemAdapter.GetFileInfoAsync(new GetFileInfoRequest(pdfFile));
         var title = Path.GetFileNameWithoutExtension(fileInfo.FileName);
 
         int? pageCount = null;
         if (includeDetails)
         {
-            pageCount = await GetPageCountSafelyAsync(pdfFile);
+            pageCount = await GetPageCountSafelyAsync(fileInfo.FullPath, cancellationToken);
         }
 
-        return new BookInfo(
-            title,
+        // A page count that could not be read is not cached as a detail, so the next listing tries again
+        var hasDetails = pageCount != null;
+        return new BookMetadataCacheEntry(
             fileInfo.FullPath,
             fileInfo.FileSizeBytes,
+            fileInfo.LastWriteTimeUtc,
+            title,
             fileInfo.CreationTime,
-            pageCount);
+            hasDetails,
+            pageCount,
+            DateTime.UtcNow);
+    }
+
+    /// <summary>
+    /// Creates a BookInfo from a cache entry
+    /// </summary>
+    private static BookInfo CreateBookInfo(BookMetadataCacheEntry entry, bool includeDetails)
+    {
+        return new BookInfo(
+            entry.Title,
+            entry.FilePath,
+            entry.FileSizeBytes,
+            entry.CreationDate,
+            includeDetails ? entry.PageCount : null);
     }
 
     /// <summary>
     /// Gets the page count safely, returning null if unable to read
     /// </summary>
-    private async Task<int?> GetPageCountSafelyAsync(string pdfFile)
+    private async Task<int?> GetPageCountSafelyAsync(string pdfFile, CancellationToken cancellationToken)
     {
+        using var readStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.ReadPageCount, pdfFile);
+
         try
         {
-            return await _pdfMerger.GetPageCountAsync(new GetPdfPageCountRequest(pdfFile));
+            return await _pdfMerger.GetPageCountAsync(new GetPdfPageCountRequest(pdfFile), cancellationToken);
         }
-        catch (Exception ex)
+        catch (Exception ex) when (ex is not OperationCanceledException)
         {
             _logger.LogWarning(ex, "Unable to read page count for {PdfFile}", pdfFile);
             return null;
@@ -149,58 +401,58 @@ public sealed class BookshelfListService : IBookshelfListService
     }
 
     /// <summary>
-    /// Applies title filter to the book list
+    /// Creates the book of a PDF file from its directory entry, before its details are read
     /// </summary>
-    private static List<BookInfo> ApplyTitleFilter(List<BookInfo> books, string titleFilter)
+    private static BookInfo CreateListedBook(FileInfoResult fileInfo)
     {
-        // Precondition
-        Debug.Assert(!string.IsNullOrWhiteSpace(titleFilter), "Title filter must not be null");
-
-        return books
-            .Where(b => b.Title.Contains(titleFilter, StringComparison.OrdinalIgnoreCase))
-            .ToList();
+        return new BookInfo(
+            Path.GetFileNameWithoutExtension(fileInfo.FileName),
+            fileInfo.FullPath,
+            fileInfo.FileSizeBytes,
+            fileInfo.CreationTime);
     }
 
     /// <summary>
-    /// Applies sorting to the book list
+    /// Determines whether a book title contains the title filter, matching every book if there is no filter
     /// </summary>
-    private static List<BookInfo> ApplySorting(
-        List<BookInfo> books,
-        BookListSortField sortBy,
-        SortDirection direction)
-    {
-        IEnumerable<BookInfo> sorted = sortBy switch
-        {
-            BookListSortField.Title => direction == SortDirection.Ascending
-                ? books.OrderBy(b => b.Title, StringComparer.OrdinalIgnoreCase)
-                : books.OrderByDescending(b => b.Title, StringComparer.OrdinalIgnoreCase),
-            BookListSortField.FileSize => direction == SortDirection.Ascending
-                ? books.OrderBy(b => b.FileSizeBytes)
-                : books.OrderByDescending(b => b.FileSizeBytes),
-            BookListSortField.CreationDate => direction == SortDirection.Ascending
-                ? books.OrderBy(b => b.CreationDate)
-                : books.OrderByDescending(b => b.CreationDate),
-            BookListSortField.PageCount => SortByPageCount(books, direction),
-            _ => books.OrderBy(b => b.Title, StringComparer.OrdinalIgnoreCase)
-        };
-
-        return sorted.ToList();
+    private static bool MatchesTitleFilter(string title, string? titleFilter)
+    {
+        var hasFilter = !string.IsNullOrWhiteSpace(titleFilter);
+        return !hasFilter || title.Contains(titleFilter!, StringComparison.OrdinalIgnoreCase);
     }
 
     /// <summary>
-    /// Sorts books by page count, placing books with unknown page counts at the end
+    /// Creates the comparer that orders books by the sort field in the sort direction, used by both
+    /// the listing and the streaming path
     /// </summary>
-    private static IEnumerable<BookInfo> SortByPageCount(List<BookInfo> books, SortDirection direction)
+    private static IComparer<BookInfo> CreateBookComparer(BookListSortField sortBy, SortDirection direction)
     {
-        // Separate books with and without page counts
-        var booksWithPages = books.Where(b => b.PageCount.HasValue);
-        var booksWithoutPages = books.Where(b => !b.PageCount.HasValue);
+        var sign = direction == SortDirection.Ascending ? 1 : -1;
 
-        // Sort books with pages, keeping those without at the end
-        var sortedWithPages = direction == SortDirection.Ascending
-            ? booksWithPages.OrderBy(b => b.PageCount!.Value)
-            : booksWithPages.OrderByDescending(b => b.PageCount!.Value);
+        return sortBy switch
+        {
+            BookListSortField.FileSize => Comparer<BookInfo>.Create(
+                (left, right) => sign * left.FileSizeBytes.CompareTo(right.FileSizeBytes)),
+            BookListSortField.CreationDate => Comparer<BookInfo>.Create(
+                (left, right) => sign * left.CreationDate.CompareTo(right.CreationDate)),
+            BookListSortField.PageCount => Comparer<BookInfo>.Create(
+                (left, right) => ComparePageCounts(left.PageCount, right.PageCount, sign)),
+            _ => Comparer<BookInfo>.Create(
+                (left, right) => sign * StringComparer.OrdinalIgnoreCase.Compare(left.Title, right.Title))
+        };
+    }
 
-        return sortedWithPages.Concat(booksWithoutPages);
+    /// <summary>
+    /// Compares page counts in the sort direction, placing books with unknown page counts at the end
+    /// </summary>
+    private static int ComparePageCounts(int? left, int? right, int sign)
+    {
+        return (left, right) switch
+        {
+            (null, null) => 0,
+            (null, _) => 1,
+            (_, null) => -1,
+            _ => sign * left.Value.CompareTo(right.Value)
+        };
     }
 }
@@ -0,0 +1,441 @@
+using Bookshelf.Application.Api;
+using Bookshelf.Application.Api.Dtos;
+using Bookshelf.Application.Core.Diagnostics;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Core.Indexing;
+using Bookshelf.Application.Core.Retrieval;
+using Bookshelf.Application.Core.ValueObjects;
+using Bookshelf.Application.Spi;
+using Bookshelf.Application.Spi.Dtos;
+using Microsoft.Extensions.Logging;
+using System.Diagnostics;
+
+namespace Bookshelf.Application.Services;
+
+/// <summary>
+/// Service for embedding the passages of a bookshelf into a vector index and retrieving the passages that answer a
+/// question
+/// </summary>
+public sealed class BookshelfRetrievalService : IBookshelfRetrievalService
+{
+    /// <summary>
+    /// Number of passages embedded with one call of the embedding generator
+    /// </summary>
+    private const int EmbeddingBatchSize = 64;
+
+    private readonly IFileSystemAdapter _fileSystemAdapter;
+    private readonly IPdfTextExtractor _textExtractor;
+    private readonly IEmbeddingGenerator _embeddingGenerator;
+    private readonly IVectorIndexStore _indexStore;
+    private readonly ILogger<BookshelfRetrievalService> _logger;
+
+    /// <summary>
+    /// Initializes a new instance of the BookshelfRetrievalService class
+    /// </summary>
+    /// <param name="fileSystemAdapter">The file system adapter</param>
+    /// <param name="textExtractor">The extractor for the text of the books</param>
+    /// <param name="embeddingGenerator">The generator for the embeddings of passages and questions</param>
+    /// <param name="indexStore">The store for the persistent vector index</param>
+    /// <param name="logger">The logger</param>
+    public BookshelfRetrievalService(
+        IFileSystemAdapter fileSystemAdapter,
+        IPdfTextExtractor textExtractor,
+        IEmbeddingGenerator embeddingGenerator,
+        IVectorIndexStore indexStore,
+        ILogger<BookshelfRetrievalService> logger)
+    {
+        _fileSystemAdapter = fileSystemAdapter ?? throw new ArgumentNullException(nameof(fileSystemAdapter));
+        _textExtractor = textExtractor ?? throw new ArgumentNullException(nameof(textExtractor));
+        _embeddingGenerator = embeddingGenerator ?? throw new ArgumentNullException(nameof(embeddingGenerator));
+        _indexStore = indexStore ?? throw new ArgumentNullException(nameof(indexStore));
+        _logger = logger ?? throw new ArgumentNullException(nameof(logger));
+    }
+
+    /// <inheritdoc />
+    public async Task<VectorIndexBuildResult> BuildVectorIndexAsync(
+        BuildVectorIndexRequest request,
+        IProgress<IndexProgress>? progressCallback = null,
+        CancellationToken cancellationToken = default)
+    {
+        // Guard clauses
+        if (request == null)
+        {
+            throw new ArgumentNullException(nameof(request));
+        }
+
+        if (string.IsNullOrWhiteSpace(request.BookshelfDirectory))
+        {
+            throw new ArgumentException("Bookshelf directory cannot be null or whitespace", nameof(request));
+        }
+
+        if (request.MaxParallelism < BuildVectorIndexRequest.SequentialParallelism)
+        {
+            throw new ArgumentException("Max parallelism must be at least 1", nameof(request));
+        }
+
+        var directoryDoesNotExist = !_fileSystemAdapter.DirectoryExists(
+            new DirectoryExistsRequest(request.BookshelfDirectory));
+        if (directoryDoesNotExist)
+        {
+            return VectorIndexBuildResult.CreateFailure($"Bookshelf directory does not exist: {request.BookshelfDirectory}");
+        }
+
+        try
+        {
+            using var embedStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Embed, request.BookshelfDirectory);
+
+            _logger.LogInformation("Embedding books in {BookshelfDirectory} with {ModelId}",
+                request.BookshelfDirectory, _embeddingGenerator.ModelId);
+
+            var pdfFiles = await _fileSystemAdapter.GetPdfFileEntriesByNameAsync(request.BookshelfDirectory, cancellationToken);
+            var builder = new VectorIndexBuilder(_embeddingGenerator.ModelId, _embeddingGenerator.Dimensions);
+            var changedFiles = new List<FileInfoResult>();
+            int reusedBookCount;
+            int removedBookCount;
+
+            using (var previousIndex = request.Rebuild ? null : await OpenIndexAsync(request.BookshelfDirectory, cancellationToken))
+            {
+                var isCompatible = previousIndex != null && IsEmbeddedWithCurrentModel(previousIndex);
+                if (previousIndex != null && !isCompatible)
+                {
+                    _logger.LogInformation("Vector index of {BookshelfDirectory} was embedded with {PreviousModelId}, embedding every book again",
+                        request.BookshelfDirectory, previousIndex.ModelId);
+                }
+
+                // Unchanged books keep their passages and vectors, so only new and changed books are read and embedded
+                var previousBooks = isCompatible
+                    ? previousIndex!.Books.ToDictionary(book => book.FileName, StringComparer.Ordinal)
+                    : new Dictionary<string, VectorIndexBook>(StringComparer.Ordinal);
+
+                var reusedBooks = new List<VectorIndexBook>();
+                foreach (var fileInfo in pdfFiles)
+                {
+                    var isUnchanged = previousBooks.TryGetValue(fileInfo.FileName, out var book)
+                        && book.HasSameFileStatistics(fileInfo.FileSizeBytes, fileInfo.LastWriteTimeUtc);
+                    if (isUnchanged)
+                    {
+                        reusedBooks.Add(book!);
+                    }
+                    else
+                    {
+                        changedFiles.Add(fileInfo);
+                    }
+                }
+
+                var currentFileNames = pdfFiles.Select(fileInfo => fileInfo.FileName).ToHashSet(StringComparer.Ordinal);
+                reusedBookCount = reusedBooks.Count;
+                removedBookCount = previousBooks.Values.Count(book => !currentFileNames.Contains(book.FileName));
+
+                var isUnchangedIndex = isCompatible && changedFiles.Count == 0 && removedBookCount == 0;
+                if (isUnchangedIndex)
+                {
+                    _logger.LogInformation("Vector index of {BookshelfDirectory} is up to date", request.BookshelfDirectory);
+                    return new VectorIndexBuildResult(
+                        true, reusedBookCount, 0, reusedBookCount, 0, 0, previousIndex!.ChunkCount, previousIndex.GetView().ClusterCount);
+                }
+
+                if (isCompatible)
+                {
+                    AddReusedBooks(builder, previousIndex!, reusedBooks);
+                }
+            }
+
+            var failedBookCount = 0;
+            var completedBookCount = 0;
+            var embeddings = IncrementalIndexing.ReadInOrderAsync(
+                changedFiles, request.MaxParallelism, EmbedBookAsync, cancellationToken);
+            await foreach (var embedded in embeddings)
+            {
+                var isExtracted = embedded.IsExtracted;
+                if (!isExtracted)
+                {
+                    failedBookCount++;
+                }
+
+                // A book that could not be read is recorded as unread, so the next run embeds it again
+                builder.AddBook(
+                    embedded.FileInfo.FileName,
+                    isExtracted ? embedded.FileInfo.FileSizeBytes : VectorIndexBook.UnreadFileSizeBytes,
+                    embedded.FileInfo.LastWriteTimeUtc,
+                    embedded.Title,
+                    embedded.Chunks,
+                    embedded.Vectors);
+
+                completedBookCount++;
+                progressCallback?.Report(new IndexProgress(changedFiles.Count, completedBookCount, embedded.FileInfo.FileName));
+            }
+
+            var content = builder.Build(request.MaxParallelism);
+            await SaveIndexAsync(request.BookshelfDirectory, content, cancellationToken);
+
+            _logger.LogInformation(
+                "Embedded {ChunkCount} passages of {BookCount} books in {ClusterCount} lists, embedding {EmbeddedCount} and reusing {ReusedCount}",
+                content.Chunks.Count, content.Books.Count, content.Clusters.Count, changedFiles.Count, reusedBookCount);
+
+            return new VectorIndexBuildResult(
+                true,
+                content.Books.Count,
+                changedFiles.Count,
+                reusedBookCount,
+                removedBookCount,
+                failedBookCount,
+                content.Chunks.Count,
+                content.Clusters.Count);
+        }
+        catch (OperationCanceledException)
+        {
+            _logger.LogWarning("Embedding was cancelled");
+            return VectorIndexBuildResult.CreateFailure("Embedding was cancelled");
+        }
+        catch (Exception ex)
+        {
+            _logger.LogError(ex, "Error embedding books in {BookshelfDirectory}", request.BookshelfDirectory);
+            return VectorIndexBuildResult.CreateFailure($"Error embedding books: {ex.Message}");
+        }
+    }
+
+    /// <inheritdoc />
+    public async Task<PassageRetrievalResult> RetrievePassagesAsync(
+        RetrievePassagesRequest request,
+        CancellationToken cancellationToken = default)
+    {
+        // Guard clauses
+        if (request == null)
+        {
+            throw new ArgumentNullException(nameof(request));
+        }
+
+        if (string.IsNullOrWhiteSpace(request.BookshelfDirectory))
+        {
+            throw new ArgumentException("Bookshelf directory cannot be null or whitespace", nameof(request));
+        }
+
+        if (string.IsNullOrWhiteSpace(request.Question))
+        {
+            throw new ArgumentException("Question cannot be null or whitespace", nameof(request));
+        }
+
+        if (request.MaxPassages < 1)
+        {
+            throw new ArgumentException("Max passages must be at least 1", nameof(request));
+        }
+
+        if (request.MinScore is < -1 or > 1 || double.IsNaN(request.MinScore))
+        {
+            throw new ArgumentException("Min score must be between -1 and 1", nameof(request));
+        }
+
+        if (request.Probes < 1)
+        {
+            throw new ArgumentException("Probes must be at least 1", nameof(request));
+        }
+
+        var directoryDoesNotExist = !_fileSystemAdapter.DirectoryExists(
+            new DirectoryExistsRequest(request.BookshelfDirectory));
+        if (directoryDoesNotExist)
+        {
+            return PassageRetrievalResult.CreateFailure($"Bookshelf directory does not exist: {request.BookshelfDirectory}");
+        }
+
+        try
+        {
+            using var index = await OpenIndexAsync(request.BookshelfDirectory, cancellationToken);
+            if (index == null)
+            {
+                return PassageRetrievalResult.CreateFailure(
+                    $"No readable vector index in {request.BookshelfDirectory}, run 'bookshelf embed' on the bookshelf first");
+            }
+
+            var isCompatible = IsEmbeddedWithCurrentModel(index);
+            if (!isCompatible)
+            {
+                return PassageRetrievalResult.CreateFailure(
+                    $"Vector index of {request.BookshelfDirectory} was embedded with {index.ModelId}, not " +
+                    $"{_embeddingGenerator.ModelId}; run 'bookshelf embed --rebuild' on the bookshelf first");
+            }
+
+            var pdfFiles = await _fileSystemAdapter.GetPdfFileEntriesByNameAsync(request.BookshelfDirectory, cancellationToken);
+            var staleBookCount = IncrementalIndexing.CountStaleBooks(index.Books, pdfFiles.GetFileStatistics());
+            if (staleBookCount > 0)
+            {
+                _logger.LogWarning("{StaleCount} books changed since the vector index of {BookshelfDirectory} was built",
+                    staleBookCount, request.BookshelfDirectory);
+            }
+
+            var startTimestamp = Stopwatch.GetTimestamp();
+            var queryVectors = await GenerateEmbeddingsAsync(new[] { request.Question }, cancellationToken);
+
+            IReadOnlyList<VectorMatch> matches;
+            using (BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Retrieve, request.Question))
+            {
+                matches = VectorIndexSearcher.Search(index.GetView(), queryVectors[0], request.MaxPassages, request.Probes);
+            }
+
+            var passages = matches
+                .Where(match => match.Score >= request.MinScore)
+                .Select(match => CreatePassage(request.BookshelfDirectory, index, match))
+                .ToList();
+
+            var elapsed = Stopwatch.GetElapsedTime(startTimestamp);
+
+            _logger.LogInformation("Retrieved {PassageCount} passages for {Question} in {ElapsedMilliseconds} ms",
+                passages.Count, request.Question, elapsed.TotalMilliseconds);
+
+            return new PassageRetrievalResult(true, passages, index.Books.Count, index.ChunkCount, staleBookCount, elapsed);
+        }
+        catch (OperationCanceledException)
+        {
+            _logger.LogWarning("Retrieval was cancelled");
+            return PassageRetrievalResult.CreateFailure("Retrieval was cancelled");
+        }
+        catch (Exception ex)
+        {
+            _logger.LogError(ex, "Error retrieving passages in {BookshelfDirectory}", request.BookshelfDirectory);
+            return PassageRetrievalResult.CreateFailure($"Error retrieving passages: {ex.Message}");
+        }
+    }
+
+    /// <summary>
+    /// Opens the vector index of the bookshelf
+    /// </summary>
+    private async Task<IVectorIndex?> OpenIndexAsync(string bookshelfDirectory, CancellationToken cancellationToken)
+    {
+        using var indexStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.VectorIndex, bookshelfDirectory);
+
+        return await _indexStore.OpenIndexAsync(new OpenVectorIndexRequest(bookshelfDirectory), cancellationToken);
+    }
+
+    /// <summary>
+    /// Saves the vector index of the bookshelf
+    /// </summary>
+    private async Task SaveIndexAsync(string bookshelfDirectory, VectorIndexContent content, CancellationToken cancellationToken)
+    {
+        using var indexStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.VectorIndex, bookshelfDirectory);
+
+        var isSaved = await _indexStore.SaveIndexAsync(new SaveVectorIndexRequest(bookshelfDirectory, content), cancellationToken);
+        if (!isSaved)
+        {
+            throw new IOException($"Unable to save the vector index of {bookshelfDirectory}");
+        }
+    }
+
+    /// <summary>
+    /// Checks whether an index was embedded with the model of the embedding generator, so its vectors are comparable
+    /// with new ones
+    /// </summary>
+    private bool IsEmbeddedWithCurrentModel(IVectorIndex index)
+    {
+        return string.Equals(index.ModelId, _embeddingGenerator.ModelId, StringComparison.Ordinal)
+               && index.Dimensions == _embeddingGenerator.Dimensions;
+    }
+
+    /// <summary>
+    /// Copies the passages and vectors of unchanged books from the previous index
+    /// </summary>
+    private static void AddReusedBooks(
+        VectorIndexBuilder builder,
+        IVectorIndex previousIndex,
+        IReadOnlyList<VectorIndexBook> reusedBooks)
+    {
+        var view = previousIndex.GetView();
+        foreach (var book in reusedBooks)
+        {
+            var chunks = new TextChunk[book.ChunkCount];
+            for (var chunkIndex = 0; chunkIndex < chunks.Length; chunkIndex++)
+            {
+                var chunk = previousIndex.GetChunk(book.FirstChunkId + chunkIndex);
+                chunks[chunkIndex] = new TextChunk(chunk.Page, chunk.Text);
+            }
+
+            var vectors = view.Vectors.Slice(book.FirstChunkId * view.Dimensions, book.ChunkCount * view.Dimensions);
+            builder.AddBook(book.FileName, book.FileSizeBytes, book.LastWriteTimeUtc, book.Title, chunks, vectors);
+        }
+    }
+
+    /// <summary>
+    /// Extracts the text of a book, splits it into passages and embeds them, keeping a book that cannot be read
+    /// without passages
+    /// </summary>
+    private async Task<EmbeddedBook> EmbedBookAsync(FileInfoResult fileInfo, CancellationToken cancellationToken)
+    {
+        // Precondition
+        Debug.Assert(!string.IsNullOrWhiteSpace(fileInfo.FullPath), "PDF file path must not be null");
+
+        PdfTextContent? content;
+        using (BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.ExtractText, fileInfo.FullPath))
+        {
+            content = await _textExtractor.ExtractTextAsync(new ExtractPdfTextRequest(fileInfo.FullPath), cancellationToken);
+        }
+
+        var hasTitle = !string.IsNullOrWhiteSpace(content?.Title);
+        var title = hasTitle ? content!.Title!.Trim() : Path.GetFileNameWithoutExtension(fileInfo.FileName);
+        if (content == null)
+        {
+            _logger.LogWarning("Unable to extract text from {PdfFile}, keeping it without passages", fileInfo.FullPath);
+            return new EmbeddedBook(fileInfo, title, Array.Empty<TextChunk>(), Array.Empty<float>(), false);
+        }
+
+        var chunks = TextChunker.ChunkPages(content.Pages).ToList();
+        var dimensions = _embeddingGenerator.Dimensions;
+        var vectors = new float[chunks.Count * dimensions];
+        for (var batchStart = 0; batchStart < chunks.Count; batchStart += EmbeddingBatchSize)
+        {
+            var batchTexts = chunks
+                .Skip(batchStart)
+                .Take(EmbeddingBatchSize)
+                .Select(chunk => chunk.Text)
+                .ToList();
+
+            var batchVectors = await GenerateEmbeddingsAsync(batchTexts, cancellationToken);
+            for (var batchIndex = 0; batchIndex < batchVectors.Count; batchIndex++)
+            {
+                batchVectors[batchIndex].CopyTo(vectors, (batchStart + batchIndex) * dimensions);
+            }
+        }
+
+        return new EmbeddedBook(fileInfo, title, chunks, vectors, true);
+    }
+
+    /// <summary>
+    /// Embeds texts, checking that the generator returned one vector of the announced dimensions per text
+    /// </summary>
+    private async Task<IReadOnlyList<float[]>> GenerateEmbeddingsAsync(
+        IReadOnlyList<string> texts,
+        CancellationToken cancellationToken)
+    {
+        using var embedStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.GenerateEmbeddings);
+
+        var vectors = await _embeddingGenerator.GenerateEmbeddingsAsync(new GenerateEmbeddingsRequest(texts), cancellationToken);
+
+        var hasVectorPerText = vectors.Count == texts.Count;
+        var hasDimensions = vectors.All(vector => vector.Length == _embeddingGenerator.Dimensions);
+        if (!hasVectorPerText || !hasDimensions)
+        {
+            throw new InvalidOperationException(
+                $"Embedding generator {_embeddingGenerator.ModelId} did not return one vector of " +
+                $"{_embeddingGenerator.Dimensions} dimensions per text");
+        }
+
+        return vectors;
+    }
+
+    /// <summary>
+    /// Creates a retrieved passage from a match of the index
+    /// </summary>
+    private static RetrievedPassage CreatePassage(string bookshelfDirectory, IVectorIndex index, VectorMatch match)
+    {
+        var chunk = index.GetChunk(match.ChunkId);
+        var book = index.Books[chunk.BookId];
+        return new RetrievedPassage(book.Title, Path.Combine(bookshelfDirectory, book.FileName), chunk.Page, chunk.Text, match.Score);
+    }
+
+    /// <summary>
+    /// A book with its passages and their vectors, ready to be added to the index
+    /// </summary>
+    private sealed record EmbeddedBook(
+        FileInfoResult FileInfo,
+        string Title,
+        IReadOnlyList<TextChunk> Chunks,
+        float[] Vectors,
+        bool IsExtracted);
+}
@@ -0,0 +1,6 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to compute the content hash of a file
+/// </summary>
+public sealed record ComputeFileHashRequest(string FilePath);
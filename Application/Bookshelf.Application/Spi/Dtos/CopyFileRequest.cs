@@ -3,7 +3,12 @@ namespace Bookshelf.Application.Spi.Dtos;
 /// <summary>
 /// Request to copy a file
 /// </summary>
+/// <param name="SourcePath">The file to copy</param>
+/// <param name="DestinationPath">The path of the copy</param>
+/// <param name="Overwrite">Whether an existing destination file is replaced</param>
+/// <param name="AllowHardLink">Whether the destination may be a hard link sharing the source's data and future edits</param>
 public sealed record CopyFileRequest(
     string SourcePath,
     string DestinationPath,
-    bool Overwrite = false);
+    bool Overwrite = false,
+    bool AllowHardLink = false);
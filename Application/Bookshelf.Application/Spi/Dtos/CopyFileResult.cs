@@ -0,0 +1,41 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// How the data of a copied file reached its destination
+/// </summary>
+public enum FileCopyMethod
+{
+    /// <summary>
+    /// The data was read and written to the destination
+    /// </summary>
+    Copied,
+
+    /// <summary>
+    /// The destination shares the source's data blocks copy-on-write (reflink)
+    /// </summary>
+    Cloned,
+
+    /// <summary>
+    /// The destination is a hard link to the source
+    /// </summary>
+    HardLinked
+}
+
+/// <summary>
+/// Result of copying a file
+/// </summary>
+/// <param name="Success">Whether the destination file was created</param>
+/// <param name="Method">How the data reached the destination</param>
+/// <param name="BytesCopied">The number of bytes read and written</param>
+/// <param name="BytesShared">The number of bytes shared with the source without being written</param>
+public sealed record CopyFileResult(
+    bool Success,
+    FileCopyMethod Method,
+    long BytesCopied,
+    long BytesShared)
+{
+    /// <summary>
+    /// Creates the result of a failed copy
+    /// </summary>
+    public static CopyFileResult Failed => new CopyFileResult(false, FileCopyMethod.Copied, 0, 0);
+}
@@ -0,0 +1,6 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to delete a file
+/// </summary>
+public sealed record DeleteFileRequest(string FilePath);
@@ -0,0 +1,12 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// A subdirectory or PDF file discovered while enumerating a directory
+/// </summary>
+public sealed record DirectoryEntryResult(
+    string Name,
+    string FullPath,
+    bool IsDirectory,
+    long FileSizeBytes,
+    DateTime CreationTime,
+    DateTime LastWriteTimeUtc);
@@ -0,0 +1,10 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to enumerate the subdirectories and PDF files of a directory
+/// </summary>
+/// <param name="DirectoryPath">The directory to enumerate</param>
+/// <param name="Recursive">Whether to descend into subdirectories</param>
+public sealed record EnumerateEntriesRequest(
+    string DirectoryPath,
+    bool Recursive = false);
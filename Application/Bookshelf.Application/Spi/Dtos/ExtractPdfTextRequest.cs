@@ -0,0 +1,6 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to extract the document information and page text of a PDF
+/// </summary>
+public sealed record ExtractPdfTextRequest(string PdfPath);
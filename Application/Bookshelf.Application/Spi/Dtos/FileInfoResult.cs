@@ -7,4 +7,5 @@ public sealed record FileInfoResult(
     string FileName,
     string FullPath,
     long FileSizeBytes,
-    DateTime CreationTime);
+    DateTime CreationTime,
+    DateTime LastWriteTimeUtc);
@@ -0,0 +1,7 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to embed a batch of texts
+/// </summary>
+/// <param name="Texts">The texts to embed</param>
+public sealed record GenerateEmbeddingsRequest(IReadOnlyList<string> Texts);
@@ -0,0 +1,7 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to get the names of all entries in a directory
+/// </summary>
+/// <param name="DirectoryPath">The directory to list</param>
+public sealed record GetFileNamesRequest(string DirectoryPath);
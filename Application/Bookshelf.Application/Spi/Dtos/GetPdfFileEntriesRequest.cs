@@ -0,0 +1,6 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to get the PDF files of a directory together with their file information
+/// </summary>
+public sealed record GetPdfFileEntriesRequest(string DirectoryPath);
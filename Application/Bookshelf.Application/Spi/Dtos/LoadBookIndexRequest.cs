@@ -0,0 +1,6 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to load the search index of a bookshelf directory
+/// </summary>
+public sealed record LoadBookIndexRequest(string BookshelfDirectory);
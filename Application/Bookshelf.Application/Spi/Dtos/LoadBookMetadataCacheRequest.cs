@@ -0,0 +1,6 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to load the metadata cache of a bookshelf directory
+/// </summary>
+public sealed record LoadBookMetadataCacheRequest(string BookshelfDirectory);
@@ -0,0 +1,6 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to load the consolidation manifest of a target directory
+/// </summary>
+public sealed record LoadManifestRequest(string TargetDirectory);
@@ -2,10 +2,33 @@ using Bookshelf.Application.Core.ValueObjects;
 
 namespace Bookshelf.Application.Spi.Dtos;
 
+/// <summary>
+/// Specifies how merged pages are written to the output file
+/// </summary>
+public enum PdfMergeMode
+{
+    /// <summary>
+    /// Pages are written to the output file as each source is imported, keeping memory bounded
+    /// </summary>
+    Streaming,
+
+    /// <summary>
+    /// All pages are collected in one in-memory document that is saved at the end
+    /// </summary>
+    InMemory
+}
+
 /// <summary>
 /// Request to merge PDF files
 /// </summary>
+/// <param name="SourcePdfPaths">The source PDFs in merge order</param>
+/// <param name="OutputPdfPath">The path of the merged PDF</param>
+/// <param name="Metadata">Optional metadata for the merged PDF</param>
+/// <param name="MergeMode">How merged pages are written to the output file</param>
+/// <param name="CompressionProfile">How much effort is spent compressing the merged PDF</param>
 public sealed record MergePdfsRequest(
     IEnumerable<string> SourcePdfPaths,
     string OutputPdfPath,
-    BookMetadata? Metadata = null);
+    BookMetadata? Metadata = null,
+    PdfMergeMode MergeMode = PdfMergeMode.Streaming,
+    PdfCompressionProfile CompressionProfile = PdfCompressionProfile.None);
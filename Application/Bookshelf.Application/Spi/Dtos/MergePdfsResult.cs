@@ -0,0 +1,28 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Result of merging PDF files
+/// </summary>
+/// <param name="Success">Whether the merged PDF was written</param>
+/// <param name="SourceBytes">The total size of the merged source PDFs</param>
+/// <param name="OutputBytes">The size of the merged PDF</param>
+/// <param name="SharedStreamCount">The number of stream objects written once and shared by several sources</param>
+/// <param name="DeduplicatedBytes">The stream data not written again because an identical stream was already written</param>
+/// <param name="CompressionSavedBytes">The bytes saved by the compression profile</param>
+/// <param name="Elapsed">The time spent merging</param>
+/// <param name="PageCount">The number of pages of the merged PDF</param>
+public sealed record MergePdfsResult(
+    bool Success,
+    long SourceBytes,
+    long OutputBytes,
+    int SharedStreamCount = 0,
+    long DeduplicatedBytes = 0,
+    long CompressionSavedBytes = 0,
+    TimeSpan Elapsed = default,
+    int PageCount = 0)
+{
+    /// <summary>
+    /// Creates the result of a failed merge
+    /// </summary>
+    public static MergePdfsResult Failed => new MergePdfsResult(false, 0, 0);
+}
@@ -0,0 +1,6 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to open the vector index of a bookshelf directory
+/// </summary>
+public sealed record OpenVectorIndexRequest(string BookshelfDirectory);
@@ -0,0 +1,16 @@
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Document information and text of a PDF
+/// </summary>
+/// <param name="Title">The title from the document information, or null if it has none</param>
+/// <param name="Author">The author from the document information, or null if it has none</param>
+/// <param name="Subject">The subject from the document information, or null if it has none</param>
+/// <param name="Keywords">The keywords from the document information, or null if it has none</param>
+/// <param name="Pages">The text of every page in page order, empty for pages without extractable text</param>
+public sealed record PdfTextContent(
+    string? Title,
+    string? Author,
+    string? Subject,
+    string? Keywords,
+    IReadOnlyList<string> Pages);
@@ -0,0 +1,10 @@
+using Bookshelf.Application.Core.Entities;
+
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to save the search index of a bookshelf directory
+/// </summary>
+public sealed record SaveBookIndexRequest(
+    string BookshelfDirectory,
+    BookIndex Index);
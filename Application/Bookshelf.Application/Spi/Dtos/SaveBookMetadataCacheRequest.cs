@@ -0,0 +1,10 @@
+using Bookshelf.Application.Core.Entities;
+
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to save the metadata cache of a bookshelf directory
+/// </summary>
+public sealed record SaveBookMetadataCacheRequest(
+    string BookshelfDirectory,
+    BookMetadataCache Cache);
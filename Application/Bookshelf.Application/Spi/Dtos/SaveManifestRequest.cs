@@ -0,0 +1,10 @@
+using Bookshelf.Application.Core.Entities;
+
+namespace Bookshelf.Application.Spi.Dtos;
+
+/// <summary>
+/// Request to save the consolidation manifest of a target directory
+/// </summary>
+public sealed record SaveManifestRequest(
+    string TargetDirectory,
+    ConsolidationManifest Manifest);
@@ -0,0 +1,30 @@
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Spi.Dtos;
+
+namespace Bookshelf.Application.Spi;
+
+/// <summary>
+/// Interface for persisting the search index of a bookshelf directory
+/// </summary>
+public interface IBookIndexStore
+{
+    /// <summary>
+    /// Loads the search index of a bookshelf directory
+    /// </summary>
+    /// <param name="request">The request containing the bookshelf directory</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The stored index, or null if none exists or it cannot be read</returns>
+    Task<BookIndex?> LoadIndexAsync(
+        LoadBookIndexRequest request,
+        CancellationToken cancellationToken = default);
+
+    /// <summary>
+    /// Saves the search index of a bookshelf directory, replacing any previous index
+    /// </summary>
+    /// <param name="request">The request containing the bookshelf directory and the index</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>True if the index was saved</returns>
+    Task<bool> SaveIndexAsync(
+        SaveBookIndexRequest request,
+        CancellationToken cancellationToken = default);
+}
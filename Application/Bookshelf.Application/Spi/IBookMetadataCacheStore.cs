@@ -0,0 +1,30 @@
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Spi.Dtos;
+
+namespace Bookshelf.Application.Spi;
+
+/// <summary>
+/// Interface for persisting the book metadata cache of a bookshelf directory
+/// </summary>
+public interface IBookMetadataCacheStore
+{
+    /// <summary>
+    /// Loads the metadata cache of a bookshelf directory
+    /// </summary>
+    /// <param name="request">The request containing the bookshelf directory</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The stored cache, or an empty cache if none exists or it cannot be read</returns>
+    Task<BookMetadataCache> LoadCacheAsync(
+        LoadBookMetadataCacheRequest request,
+        CancellationToken cancellationToken = default);
+
+    /// <summary>
+    /// Saves the metadata cache of a bookshelf directory, replacing any previous cache
+    /// </summary>
+    /// <param name="request">The request containing the bookshelf directory and the cache</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>True if the cache was saved</returns>
+    Task<bool> SaveCacheAsync(
+        SaveBookMetadataCacheRequest request,
+        CancellationToken cancellationToken = default);
+}
@@ -0,0 +1,30 @@
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Spi.Dtos;
+
+namespace Bookshelf.Application.Spi;
+
+/// <summary>
+/// Interface for persisting the consolidation manifest of a target directory
+/// </summary>
+public interface IConsolidationManifestStore
+{
+    /// <summary>
+    /// Loads the manifest of a target directory
+    /// </summary>
+    /// <param name="request">The request containing the target directory</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The stored manifest, or an empty manifest if none exists or it cannot be read</returns>
+    Task<ConsolidationManifest> LoadManifestAsync(
+        LoadManifestRequest request,
+        CancellationToken cancellationToken = default);
+
+    /// <summary>
+    /// Saves the manifest of a target directory, replacing any previous manifest
+    /// </summary>
+    /// <param name="request">The request containing the target directory and the manifest</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>True if the manifest was saved</returns>
+    Task<bool> SaveManifestAsync(
+        SaveManifestRequest request,
+        CancellationToken cancellationToken = default);
+}
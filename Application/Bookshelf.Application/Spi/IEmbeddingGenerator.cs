@@ -0,0 +1,29 @@
+using Bookshelf.Application.Spi.Dtos;
+
+namespace Bookshelf.Application.Spi;
+
+/// <summary>
+/// Interface for turning texts into embedding vectors whose cosine similarity reflects how related the texts are
+/// </summary>
+public interface IEmbeddingGenerator
+{
+    /// <summary>
+    /// Gets the identifier of the embedding model; vectors of different models cannot be compared
+    /// </summary>
+    string ModelId { get; }
+
+    /// <summary>
+    /// Gets the number of dimensions of the embeddings
+    /// </summary>
+    int Dimensions { get; }
+
+    /// <summary>
+    /// Embeds a batch of texts
+    /// </summary>
+    /// <param name="request">The request containing the texts</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>One normalized vector of <see cref="Dimensions"/> values per text, in text order</returns>
+    Task<IReadOnlyList<float[]>> GenerateEmbeddingsAsync(
+        GenerateEmbeddingsRequest request,
+        CancellationToken cancellationToken = default);
+}
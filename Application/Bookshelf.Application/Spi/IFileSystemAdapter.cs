@@ -8,25 +8,42 @@ namespace Bookshelf.Application.Spi;
 public interface IFileSystemAdapter
 {
     /// <summary>
-    /// Gets all PDF files in a directory (non-recursive for root level, recursive for subdirectories)
+    /// Gets all PDF files in a directory with their size and timestamps, reading the directory only once
     /// </summary>
     /// <param name="request">The request containing the directory path</param>
-    /// <returns>List of PDF file paths</returns>
-    Task<IReadOnlyList<string>> GetPdfFilesAsync(GetPdfFilesRequest request);
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>File information of the PDF files, ordered by path</returns>
+    Task<IReadOnlyList<FileInfoResult>> GetPdfFileEntriesAsync(
+        GetPdfFileEntriesRequest request,
+        CancellationToken cancellationToken = default);
 
     /// <summary>
-    /// Gets all subdirectories in a directory
+    /// Gets the names of all files and subdirectories in a directory with a single enumeration
     /// </summary>
     /// <param name="request">The request containing the directory path</param>
-    /// <returns>List of subdirectory paths</returns>
-    Task<IReadOnlyList<string>> GetSubdirectoriesAsync(GetSubdirectoriesRequest request);
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The entry names, or an empty list if the directory does not exist or cannot be read</returns>
+    Task<IReadOnlyList<string>> GetFileNamesAsync(
+        GetFileNamesRequest request,
+        CancellationToken cancellationToken = default);
 
     /// <summary>
-    /// Copies a file from source to destination
+    /// Enumerates the subdirectories and PDF files of a directory, yielding each entry as soon as it is discovered
     /// </summary>
-    /// <param name="request">The request containing source path, destination path, and overwrite flag</param>
-    /// <returns>True if the copy was successful</returns>
-    Task<bool> CopyFileAsync(CopyFileRequest request);
+    /// <param name="request">The request containing the directory path and whether to recurse</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The entries in file system order, which is not sorted</returns>
+    IAsyncEnumerable<DirectoryEntryResult> EnumerateEntriesAsync(
+        EnumerateEntriesRequest request,
+        CancellationToken cancellationToken = default);
+
+    /// <summary>
+    /// Copies a file from source to destination, sharing its data with the source where the file system allows
+    /// </summary>
+    /// <param name="request">The request containing source path, destination path, overwrite and hard link flags</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The result telling whether and how the file was copied</returns>
+    Task<CopyFileResult> CopyFileAsync(CopyFileRequest request, CancellationToken cancellationToken = default);
 
     /// <summary>
     /// Checks if a directory exists
@@ -49,11 +66,10 @@ public interface IFileSystemAdapter
     bool FileExists(FileExistsRequest request);
 
     /// <summary>
-    /// Generates a unique file name if the file already exists
+    /// Deletes a file, doing nothing if it does not exist
     /// </summary>
-    /// <param name="request">The request containing directory path and desired file name</param>
-    /// <returns>A unique file name</returns>
-    string GenerateUniqueFileName(GenerateUniqueFileNameRequest request);
+    /// <param name="request">The request containing the file path</param>
+    void DeleteFile(DeleteFileRequest request);
 
     /// <summary>
     /// Gets file information for a specified file
@@ -61,4 +77,14 @@ public interface IFileSystemAdapter
     /// <param name="request">The request containing the file path</param>
     /// <returns>File information including size and creation date</returns>
     Task<FileInfoResult> GetFileInfoAsync(GetFileInfoRequest request);
+
+    /// <summary>
+    /// Computes a content hash of a file by streaming its bytes
+    /// </summary>
+    /// <param name="request">The request containing the file path</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The hexadecimal SHA-256 hash of the file content</returns>
+    Task<string> ComputeFileHashAsync(
+        ComputeFileHashRequest request,
+        CancellationToken cancellationToken = default);
 }
@@ -13,8 +13,8 @@ public interface IPdfMerger
     /// </summary>
     /// <param name="request">The request containing source PDF paths, output path, and metadata</param>
     /// <param name="cancellationToken">Cancellation token</param>
-    /// <returns>True if the merge was successful, false otherwise</returns>
-    Task<bool> MergePdfsAsync(
+    /// <returns>The result of the merge including the sizes of the sources and of the merged PDF</returns>
+    Task<MergePdfsResult> MergePdfsAsync(
         MergePdfsRequest request,
         CancellationToken cancellationToken = default);
 
@@ -29,6 +29,9 @@ public interface IPdfMerger
     /// Gets the page count of a PDF file
     /// </summary>
     /// <param name="request">The request containing the PDF path</param>
+    /// <param name="cancellationToken">Cancellation token</param>
     /// <returns>The number of pages in the PDF, or null if unable to read</returns>
-    Task<int?> GetPageCountAsync(GetPdfPageCountRequest request);
+    Task<int?> GetPageCountAsync(
+        GetPdfPageCountRequest request,
+        CancellationToken cancellationToken = default);
 }
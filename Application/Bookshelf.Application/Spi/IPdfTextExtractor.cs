@@ -0,0 +1,19 @@
+using Bookshelf.Application.Spi.Dtos;
+
+namespace Bookshelf.Application.Spi;
+
+/// <summary>
+/// Interface for extracting the searchable text of a PDF
+/// </summary>
+public interface IPdfTextExtractor
+{
+    /// <summary>
+    /// Extracts the document information and the text of every page of a PDF
+    /// </summary>
+    /// <param name="request">The request containing the PDF path</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The text content, or null if the PDF cannot be read</returns>
+    Task<PdfTextContent?> ExtractTextAsync(
+        ExtractPdfTextRequest request,
+        CancellationToken cancellationToken = default);
+}
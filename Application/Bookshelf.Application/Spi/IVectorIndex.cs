@@ -0,0 +1,46 @@
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Core.Retrieval;
+
+namespace Bookshelf.Application.Spi;
+
+/// <summary>
+/// An open vector index of a bookshelf, whose vectors and passages are read on demand
+/// </summary>
+/// <remarks>
+/// The spans of <see cref="GetView"/> are only valid until the index is disposed.
+/// </remarks>
+public interface IVectorIndex : IDisposable
+{
+    /// <summary>
+    /// Gets the embedding model the passages were embedded with
+    /// </summary>
+    string ModelId { get; }
+
+    /// <summary>
+    /// Gets the number of dimensions of the embeddings
+    /// </summary>
+    int Dimensions { get; }
+
+    /// <summary>
+    /// Gets the embedded books; the position of a book is its id in the passages
+    /// </summary>
+    IReadOnlyList<VectorIndexBook> Books { get; }
+
+    /// <summary>
+    /// Gets the number of passages of all books
+    /// </summary>
+    int ChunkCount { get; }
+
+    /// <summary>
+    /// Reads a passage
+    /// </summary>
+    /// <param name="chunkId">The passage id</param>
+    /// <returns>The passage with its book and page</returns>
+    VectorIndexChunk GetChunk(int chunkId);
+
+    /// <summary>
+    /// Gets the vectors and the inverted file lists without copying them
+    /// </summary>
+    /// <returns>A view of the vectors and lists</returns>
+    VectorIndexView GetView();
+}
@@ -0,0 +1,29 @@
+using Bookshelf.Application.Spi.Dtos;
+
+namespace Bookshelf.Application.Spi;
+
+/// <summary>
+/// Interface for persisting the vector index of a bookshelf directory
+/// </summary>
+public interface IVectorIndexStore
+{
+    /// <summary>
+    /// Opens the vector index of a bookshelf directory
+    /// </summary>
+    /// <param name="request">The request containing the bookshelf directory</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The open index, to be disposed by the caller, or null if none exists or it cannot be read</returns>
+    Task<IVectorIndex?> OpenIndexAsync(
+        OpenVectorIndexRequest request,
+        CancellationToken cancellationToken = default);
+
+    /// <summary>
+    /// Saves the vector index of a bookshelf directory, replacing any previous index
+    /// </summary>
+    /// <param name="request">The request containing the bookshelf directory and the index content</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>True if the index was saved</returns>
+    Task<bool> SaveIndexAsync(
+        SaveVectorIndexRequest request,
+        CancellationToken cancellationToken = default);
+}
@@ -0,0 +1,41 @@
+using Bookshelf.Application.Core.Diagnostics;
+using Bookshelf.Application.Spi.Dtos;
+
+namespace Bookshelf.Application.Spi;
+
+/// <summary>
+/// Extension methods for enumerating the PDF files of a bookshelf and comparing them with its indexes
+/// </summary>
+internal static class PdfFileEntryExtensions
+{
+    /// <summary>
+    /// Gets all PDF files in the bookshelf directory with their size and timestamps, in file name order
+    /// </summary>
+    /// <param name="fileSystemAdapter">The file system adapter</param>
+    /// <param name="bookshelfDirectory">The bookshelf directory</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>File information of the PDF files, ordered by file name</returns>
+    public static async Task<IReadOnlyList<FileInfoResult>> GetPdfFileEntriesByNameAsync(
+        this IFileSystemAdapter fileSystemAdapter,
+        string bookshelfDirectory,
+        CancellationToken cancellationToken)
+    {
+        using var enumerateStage = BookshelfTelemetry.StartStage(BookshelfTelemetry.Stages.Enumerate, bookshelfDirectory);
+
+        var pdfFiles = await fileSystemAdapter.GetPdfFileEntriesAsync(
+            new GetPdfFileEntriesRequest(bookshelfDirectory), cancellationToken);
+
+        return pdfFiles.OrderBy(fileInfo => fileInfo.FileName, StringComparer.Ordinal).ToList();
+    }
+
+    /// <summary>
+    /// Gets the file name, size and modification time of PDF files, to compare them with the books of an index
+    /// </summary>
+    /// <param name="pdfFiles">The PDF files</param>
+    /// <returns>The statistics of the files in the same order</returns>
+    public static IReadOnlyList<(string FileName, long FileSizeBytes, DateTime LastWriteTimeUtc)> GetFileStatistics(
+        this IReadOnlyList<FileInfoResult> pdfFiles)
+    {
+        return pdfFiles.Select(fileInfo => (fileInfo.FileName, fileInfo.FileSizeBytes, fileInfo.LastWriteTimeUtc)).ToList();
+    }
+}
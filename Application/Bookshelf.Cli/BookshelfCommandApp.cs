@@ -0,0 +1,105 @@
+using Bookshelf.Cli.Commands;
+using Spectre.Console.Cli;
+
+namespace Bookshelf.Cli;
+
+/// <summary>
+/// Creates the command app with the commands of the bookshelf CLI
+/// </summary>
+public static class BookshelfCommandApp
+{
+    private static readonly string[] HelpOptions = ["-h", "--help", "-?"];
+
+    /// <summary>
+    /// Creates the command app resolving its commands from the service provider
+    /// </summary>
+    /// <param name="serviceProvider">The service provider the commands are resolved from</param>
+    /// <param name="ownsServiceProvider">
+    /// Whether the service provider is disposed after a command ran; the server runs many commands with one provider
+    /// </param>
+    /// <returns>The configured command app</returns>
+    public static CommandApp Create(IServiceProvider serviceProvider, bool ownsServiceProvider = true)
+    {
+        var app = new CommandApp(new TypeRegistrar(serviceProvider, ownsServiceProvider));
+
+        app.Configure(config =>
+        {
+            config.SetApplicationName("bookshelf");
+
+            config.AddCommand<ConsolidateCommand>("consolidate")
+                .WithDescription("Consolidate scattered PDF files into a single bookshelf")
+                .WithExample("consolidate", "/path/to/source", "/path/to/bookshelf")
+                .WithExample("consolidate", "/path/to/source", "/path/to/bookshelf", "--max-parallelism", "4")
+                .WithExample("consolidate", "/path/to/source", "/path/to/bookshelf", "--hard-link")
+                .WithExample("consolidate", "/path/to/source", "/path/to/bookshelf", "--dedup")
+                .WithExample("consolidate", "/path/to/source", "/path/to/bookshelf", "--compression", "maximum")
+                .WithExample("consolidate", "/path/to/source", "/path/to/bookshelf", "--output", "ndjson")
+                .WithExample("consolidate", "/path/to/source", "/path/to/bookshelf", "--metrics", "metrics.json")
+                .WithExample("consolidate", "/path/to/source", "/path/to/bookshelf", "--log-level", "debug", "--log-overflow", "block");
+
+            config.AddCommand<ListCommand>("list")
+                .WithDescription("List all books in a bookshelf")
+                .WithExample("list", "/path/to/bookshelf")
+                .WithExample("list", "/path/to/bookshelf", "--details")
+                .WithExample("list", "/path/to/bookshelf", "--filter", "Python")
+                .WithExample("list", "/path/to/bookshelf", "--sort", "size", "--reverse")
+                .WithExample("list", "/path/to/bookshelf", "--details", "--max-parallelism", "8")
+                .WithExample("list", "/path/to/bookshelf", "--details", "--output", "json")
+                .WithExample("list", "/path/to/bookshelf", "--details", "--metrics")
+                .WithExample("list", "/path/to/bookshelf", "--quiet")
+                .WithExample("list", "/path/to/bookshelf", "--server");
+
+            config.AddCommand<IndexCommand>("index")
+                .WithDescription("Build or update the full-text search index of a bookshelf")
+                .WithExample("index", "/path/to/bookshelf")
+                .WithExample("index", "/path/to/bookshelf", "--max-parallelism", "4")
+                .WithExample("index", "/path/to/bookshelf", "--rebuild")
+                .WithExample("index", "/path/to/bookshelf", "--output", "ndjson");
+
+            config.AddCommand<SearchCommand>("search")
+                .WithDescription("Search the titles and contents of the indexed books")
+                .WithExample("search", "/path/to/bookshelf", "dependency injection")
+                .WithExample("search", "/path/to/bookshelf", "kube*", "--limit", "5")
+                .WithExample("search", "/path/to/bookshelf", "refactoring", "--output", "json")
+                .WithExample("search", "/path/to/bookshelf", "refactoring", "--server");
+
+            config.AddCommand<EmbedCommand>("embed")
+                .WithDescription("Build or update the vector index of passages from which questions are answered")
+                .WithExample("embed", "/path/to/bookshelf")
+                .WithExample("embed", "/path/to/bookshelf", "--max-parallelism", "4")
+                .WithExample("embed", "/path/to/bookshelf", "--rebuild")
+                .WithExample("embed", "/path/to/bookshelf", "--output", "ndjson");
+
+            config.AddCommand<RetrieveCommand>("retrieve")
+                .WithDescription("Find the passages of the embedded books that answer a question, with book and page")
+                .WithExample("retrieve", "/path/to/bookshelf", "How do pods find each other?")
+                .WithExample("retrieve", "/path/to/bookshelf", "What makes a function clean?", "--limit", "10")
+                .WithExample("retrieve", "/path/to/bookshelf", "What makes a function clean?", "--output", "json")
+                .WithExample("retrieve", "/path/to/bookshelf", "What makes a function clean?", "--server");
+
+            config.AddCommand<ServeCommand>("serve")
+                .WithDescription("Keep the bookshelf services running and run commands forwarded with --server")
+                .WithExample("serve")
+                .WithExample("serve", "--socket", "/tmp/bookshelf.sock");
+        });
+
+        return app;
+    }
+
+    /// <summary>
+    /// Determines whether the command line only asks for help or the version, so no command will run
+    /// </summary>
+    /// <param name="args">The command line arguments</param>
+    /// <returns>True if no command is given or help is requested</returns>
+    public static bool IsHelpOrVersionRequest(IReadOnlyList<string> args)
+    {
+        // Without a command, Spectre prints the help, the version or an error
+        var hasCommand = args.Count > 0 && !args[0].StartsWith('-');
+        if (!hasCommand)
+        {
+            return true;
+        }
+
+        return args.Any(arg => HelpOptions.Contains(arg));
+    }
+}
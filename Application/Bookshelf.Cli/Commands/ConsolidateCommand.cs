@@ -1,6 +1,12 @@
 using System.ComponentModel;
+using System.Text.Json;
 using Bookshelf.Application.Api;
 using Bookshelf.Application.Api.Dtos;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Core.ValueObjects;
+using Bookshelf.Cli.Diagnostics;
+using Bookshelf.Cli.Logging;
+using Bookshelf.Cli.Output;
 using Spectre.Console;
 using Spectre.Console.Cli;
 
@@ -9,7 +15,7 @@ namespace Bookshelf.Cli.Commands;
 /// <summary>
 /// Command settings for the consolidate command
 /// </summary>
-public sealed class ConsolidateSettings : CommandSettings
+public sealed class ConsolidateSettings : LoggingSettings
 {
     /// <summary>
     /// Gets or sets the source directory containing PDF files to consolidate
@@ -25,8 +31,69 @@ public sealed class ConsolidateSettings : CommandSettings
     [Description("The target bookshelf directory where consolidated books will be placed")]
     public string TargetDirectory { get; set; } = string.Empty;
 
+    /// <summary>
+    /// Gets or sets the maximum number of books processed concurrently
+    /// </summary>
+    [CommandOption("-p|--max-parallelism <COUNT>")]
+    [Description("Maximum number of books copied or merged concurrently (1 processes books sequentially)")]
+    [DefaultValue(ConsolidationRequest.SequentialParallelism)]
+    public int MaxParallelism { get; set; } = ConsolidationRequest.SequentialParallelism;
+
+    /// <summary>
+    /// Gets or sets whether to reprocess every book regardless of the consolidation manifest
+    /// </summary>
+    [CommandOption("--full")]
+    [Description("Reprocess every book even if its sources are unchanged since the last consolidation")]
+    [DefaultValue(false)]
+    public bool FullRebuild { get; set; }
+
+    /// <summary>
+    /// Gets or sets whether copied books may be hard links to their source PDFs
+    /// </summary>
+    [CommandOption("--hard-link")]
+    [Description("Hard-link single PDFs into the bookshelf instead of copying them when both are on the same file system")]
+    [DefaultValue(false)]
+    public bool HardLink { get; set; }
+
+    /// <summary>
+    /// Gets or sets whether byte-identical books and collection parts are consolidated only once
+    /// </summary>
+    [CommandOption("--dedup")]
+    [Description("Skip new books and collection parts whose content is identical to one already consolidated")]
+    [DefaultValue(false)]
+    public bool Deduplicate { get; set; }
+
+    /// <summary>
+    /// Gets or sets the compression profile for merged collections
+    /// </summary>
+    [CommandOption("-c|--compression <PROFILE>")]
+    [Description("Compression of merged collections: none, standard (compress uncompressed streams), or maximum (also object and cross-reference streams)")]
+    [DefaultValue("none")]
+    public string CompressionProfile { get; set; } = "none";
+
+    /// <summary>
+    /// Gets or sets the output format
+    /// </summary>
+    [CommandOption("-o|--output <FORMAT>")]
+    [Description("Output format: text, json (one JSON document streamed while books are consolidated), or ndjson (one JSON record per line)")]
+    [DefaultValue("text")]
+    public string Output { get; set; } = "text";
+
+    /// <summary>
+    /// Gets or sets whether to print the time spent per stage, with an optional file to export it to
+    /// </summary>
+    [CommandOption("--metrics [FILE]")]
+    [Description("Print the time spent per stage at the end of the run, and export it as JSON if a file is given")]
+    public FlagValue<string>? Metrics { get; set; }
+
     public override ValidationResult Validate()
     {
+        var loggingValidation = base.Validate();
+        if (!loggingValidation.Successful)
+        {
+            return loggingValidation;
+        }
+
         if (string.IsNullOrWhiteSpace(SourceDirectory))
         {
             return ValidationResult.Error("Source directory is required");
@@ -42,8 +109,53 @@ public sealed class ConsolidateSettings : CommandSettings
             return ValidationResult.Error($"Source directory does not exist: {SourceDirectory}");
         }
 
+        if (MaxParallelism < ConsolidationRequest.SequentialParallelism)
+        {
+            return ValidationResult.Error($"Max parallelism must be at least 1: {MaxParallelism}");
+        }
+
+        var validCompressionProfiles = new[] { "none", "standard", "maximum" };
+        var isValidCompressionProfile = validCompressionProfiles.Contains(CompressionProfile.ToLowerInvariant());
+        if (!isValidCompressionProfile)
+        {
+            return ValidationResult.Error($"Invalid compression profile: {CompressionProfile}. Valid options: none, standard, maximum");
+        }
+
+        var validOutputFormats = new[] { "text", "json", "ndjson" };
+        var isValidOutputFormat = validOutputFormats.Contains(Output.ToLowerInvariant());
+        if (!isValidOutputFormat)
+        {
+            return ValidationResult.Error($"Invalid output format: {Output}. Valid options: text, json, ndjson");
+        }
+
         return ValidationResult.Success();
     }
+
+    /// <summary>
+    /// Gets the compression profile enum value from string
+    /// </summary>
+    public PdfCompressionProfile GetCompressionProfileEnum()
+    {
+        return CompressionProfile.ToLowerInvariant() switch
+        {
+            "standard" => PdfCompressionProfile.Standard,
+            "maximum" => PdfCompressionProfile.Maximum,
+            _ => PdfCompressionProfile.None
+        };
+    }
+
+    /// <summary>
+    /// Gets the output format enum value from string
+    /// </summary>
+    public OutputFormat GetOutputFormat()
+    {
+        return Output.ToLowerInvariant() switch
+        {
+            "json" => OutputFormat.Json,
+            "ndjson" => OutputFormat.Ndjson,
+            _ => OutputFormat.Text
+        };
+    }
 }
 
 /// <summary>
@@ -64,6 +176,41 @@ public sealed class ConsolidateCommand : AsyncCommand<ConsolidateSettings>
 
     public override async Task<int> ExecuteAsync(CommandContext context, ConsolidateSettings settings, CancellationToken cancellationToken)
     {
+        var collectsMetrics = settings.Metrics?.IsSet == true;
+        using var metricsCollector = collectsMetrics ? new StageMetricsCollector() : null;
+
+        var exitCode = await ConsolidateAsync(settings, cancellationToken);
+
+        if (metricsCollector != null)
+        {
+            var isMachineReadable = settings.GetOutputFormat() != OutputFormat.Text;
+            StageMetricsReporter.Report(metricsCollector.CreateReport(), settings.Metrics!.Value, isMachineReadable);
+        }
+
+        return exitCode;
+    }
+
+    /// <summary>
+    /// Consolidates the books and renders the results in the requested output format
+    /// </summary>
+    private async Task<int> ConsolidateAsync(ConsolidateSettings settings, CancellationToken cancellationToken)
+    {
+        var request = new ConsolidationRequest(
+            settings.SourceDirectory,
+            settings.TargetDirectory,
+            settings.MaxParallelism,
+            settings.FullRebuild,
+            settings.HardLink,
+            settings.Deduplicate,
+            settings.GetCompressionProfileEnum());
+
+        var outputFormat = settings.GetOutputFormat();
+        var isMachineReadable = outputFormat != OutputFormat.Text;
+        if (isMachineReadable)
+        {
+            return await WriteConsolidationRecordsAsync(request, outputFormat, cancellationToken);
+        }
+
         var panel = new Panel("[bold]Bookshelf Consolidation[/]")
             .Border(BoxBorder.Rounded)
             .BorderColor(Color.Blue);
@@ -73,6 +220,8 @@ public sealed class ConsolidateCommand : AsyncCommand<ConsolidateSettings>
 
         AnsiConsole.MarkupLine($"[grey]Source:[/] [cyan]{settings.SourceDirectory}[/]");
         AnsiConsole.MarkupLine($"[grey]Target:[/] [cyan]{settings.TargetDirectory}[/]");
+        AnsiConsole.MarkupLine($"[grey]Max parallelism:[/] [cyan]{settings.MaxParallelism}[/]");
+        AnsiConsole.MarkupLine($"[grey]Compression:[/] [cyan]{settings.GetCompressionProfileEnum()}[/]");
         AnsiConsole.WriteLine();
 
         var result = await AnsiConsole.Progress()
@@ -80,25 +229,22 @@ public sealed class ConsolidateCommand : AsyncCommand<ConsolidateSettings>
             .Columns(
                 new TaskDescriptionColumn(),
                 new ProgressBarColumn(),
+                new PercentageColumn(),
+                new ElapsedTimeColumn(),
                 new SpinnerColumn())
             .StartAsync(async ctx =>
             {
                 var task = ctx.AddTask("[green]Consolidating books...[/]");
                 task.IsIndeterminate = true;
 
-                var progressReporter = new Progress<string>(message =>
-                {
-                    task.Description = $"[green]{message}[/]";
-                });
-
-                var request = new ConsolidationRequest(
-                    settings.SourceDirectory,
-                    settings.TargetDirectory);
+                // Snapshots are already throttled by the service, so they are applied on the reporting thread in order
+                var progressReporter = new SynchronousProgress<ConsolidationProgress>(
+                    progress => UpdateProgressTask(task, progress));
 
                 return await _consolidationService.ConsolidateAsync(
                     request,
                     progressReporter,
-                    cancellationToken);
+                    cancellationToken: cancellationToken);
             });
 
         AnsiConsole.WriteLine();
@@ -115,6 +261,17 @@ public sealed class ConsolidateCommand : AsyncCommand<ConsolidateSettings>
             table.AddRow("Individual PDFs Copied", result.IndividualPdfsCopied.ToString());
             table.AddRow("Collections Merged", result.CollectionsMerged.ToString());
             table.AddRow("Naming Conflicts Resolved", result.NamingConflicts.Count.ToString());
+            table.AddRow("New Books", result.NewBooks.ToString());
+            table.AddRow("Updated Books", result.UpdatedBooks.ToString());
+            table.AddRow("Unchanged Books Skipped", result.SkippedBooks.ToString());
+            table.AddRow("Data Copied", FormatMegabytes(result.BytesCopied));
+            table.AddRow("Data Shared (Reflink or Hard Link)", FormatMegabytes(result.BytesShared));
+            table.AddRow("Merged Collections Before", FormatMegabytes(result.MergedSourceBytes));
+            table.AddRow("Merged Collections After", FormatMegabytes(result.MergedOutputBytes));
+            table.AddRow("Data Saved by Compression", FormatMegabytes(result.CompressionSavedBytes));
+            table.AddRow("Merge Time", $"{result.MergeTime.TotalSeconds:F1} s");
+            table.AddRow("Duplicate Books Skipped", result.DuplicateBooks.ToString());
+            table.AddRow("Data Saved by Deduplication", FormatMegabytes(result.BytesDeduplicated));
 
             AnsiConsole.Write(table);
             AnsiConsole.WriteLine();
@@ -138,4 +295,114 @@ public sealed class ConsolidateCommand : AsyncCommand<ConsolidateSettings>
             return 1;
         }
     }
+
+    /// <summary>
+    /// Shows the completed books, the current activity, throughput and estimated remaining time of a snapshot
+    /// </summary>
+    private static void UpdateProgressTask(ProgressTask task, ConsolidationProgress progress)
+    {
+        var hasTotal = progress.TotalBooks > 0;
+        if (hasTotal)
+        {
+            task.IsIndeterminate = false;
+            task.MaxValue = progress.TotalBooks;
+            task.Value = progress.CompletedBooks;
+        }
+
+        var estimatedRemaining = progress.EstimatedRemaining.HasValue
+            ? FormatDuration(progress.EstimatedRemaining.Value)
+            : "--:--:--";
+
+        task.Description =
+            $"[green]{Markup.Escape(progress.CurrentActivity)}[/] " +
+            $"[grey]{progress.CompletedBooks}/{progress.TotalBooks} books, " +
+            $"{progress.BytesPerSecond / (1024.0 * 1024.0):F1} MB/s, ETA {estimatedRemaining}[/]";
+    }
+
+    /// <summary>
+    /// Formats a duration as hours, minutes and seconds, with hours beyond a day
+    /// </summary>
+    private static string FormatDuration(TimeSpan duration)
+    {
+        return $"{(int)duration.TotalHours:00}:{duration.Minutes:00}:{duration.Seconds:00}";
+    }
+
+    /// <summary>
+    /// Streams one JSON record per book to standard output as soon as the book is consolidated, followed by a summary,
+    /// without rendering panels, progress or tables
+    /// </summary>
+    private async Task<int> WriteConsolidationRecordsAsync(
+        ConsolidationRequest request,
+        OutputFormat outputFormat,
+        CancellationToken cancellationToken)
+    {
+        using var writer = new JsonRecordWriter(StandardStreams.OpenOutput(), outputFormat);
+        writer.WriteStart("books");
+
+        var bookReporter = new SynchronousProgress<ConsolidatedBook>(book =>
+            writer.WriteRecord("book", json => WriteBookProperties(json, book)));
+
+        var result = await _consolidationService.ConsolidateAsync(
+            request,
+            bookCallback: bookReporter,
+            cancellationToken: cancellationToken);
+
+        writer.WriteEnd("summary", json => WriteSummaryProperties(json, result));
+        return result.Success ? 0 : 1;
+    }
+
+    /// <summary>
+    /// Writes the properties of a consolidated book record
+    /// </summary>
+    private static void WriteBookProperties(Utf8JsonWriter json, ConsolidatedBook book)
+    {
+        json.WriteString("name", book.Name);
+        json.WriteString("sourcePath", book.SourcePath);
+        json.WriteString("outputPath", book.OutputPath);
+        json.WriteString("status", book.Status.ToString().ToLowerInvariant());
+        json.WriteString("change", book.Change.ToString().ToLowerInvariant());
+        json.WriteNumber("sourcePdfCount", book.SourcePdfCount);
+        json.WriteNumber("bytesCopied", book.BytesCopied);
+        json.WriteNumber("bytesShared", book.BytesShared);
+        json.WriteNumber("bytesDeduplicated", book.DeduplicatedBytes);
+        json.WriteString("duplicateOf", book.DuplicateOf);
+    }
+
+    /// <summary>
+    /// Writes the properties of the consolidation summary record
+    /// </summary>
+    private static void WriteSummaryProperties(Utf8JsonWriter json, ConsolidationResult result)
+    {
+        json.WriteBoolean("success", result.Success);
+        json.WriteString("errorMessage", result.ErrorMessage);
+        json.WriteNumber("totalBooksProcessed", result.TotalBooksProcessed);
+        json.WriteNumber("individualPdfsCopied", result.IndividualPdfsCopied);
+        json.WriteNumber("collectionsMerged", result.CollectionsMerged);
+        json.WriteNumber("newBooks", result.NewBooks);
+        json.WriteNumber("updatedBooks", result.UpdatedBooks);
+        json.WriteNumber("skippedBooks", result.SkippedBooks);
+        json.WriteNumber("duplicateBooks", result.DuplicateBooks);
+        json.WriteNumber("bytesCopied", result.BytesCopied);
+        json.WriteNumber("bytesShared", result.BytesShared);
+        json.WriteNumber("bytesDeduplicated", result.BytesDeduplicated);
+        json.WriteNumber("mergedSourceBytes", result.MergedSourceBytes);
+        json.WriteNumber("mergedOutputBytes", result.MergedOutputBytes);
+        json.WriteNumber("compressionSavedBytes", result.CompressionSavedBytes);
+        json.WriteNumber("mergeTimeMilliseconds", (long)result.MergeTime.TotalMilliseconds);
+
+        json.WriteStartArray("namingConflicts");
+        foreach (var conflict in result.NamingConflicts)
+        {
+            json.WriteStringValue(conflict);
+        }
+        json.WriteEndArray();
+    }
+
+    /// <summary>
+    /// Formats a byte count in megabytes
+    /// </summary>
+    private static string FormatMegabytes(long bytes)
+    {
+        return $"{bytes / (1024.0 * 1024.0):F1} MB";
+    }
 }
@@ -0,0 +1,91 @@
+using System.ComponentModel;
+using System.Text.Json;
+using Bookshelf.Application.Api;
+using Bookshelf.Application.Api.Dtos;
+using Bookshelf.Application.Core.Entities;
+using Spectre.Console;
+using Spectre.Console.Cli;
+
+namespace Bookshelf.Cli.Commands;
+
+/// <summary>
+/// Command settings for the embed command
+/// </summary>
+public sealed class EmbedSettings : IndexBuildSettings
+{
+    /// <summary>
+    /// Gets or sets the maximum number of books that are extracted and embedded concurrently
+    /// </summary>
+    [CommandOption("-p|--max-parallelism <COUNT>")]
+    [Description("Maximum number of books that are extracted and embedded concurrently (1 embeds books sequentially)")]
+    [DefaultValue(BuildVectorIndexRequest.SequentialParallelism)]
+    public override int MaxParallelism { get; set; } = BuildVectorIndexRequest.SequentialParallelism;
+
+    /// <summary>
+    /// Gets or sets whether to discard the existing vector index and embed every book again
+    /// </summary>
+    [CommandOption("--rebuild")]
+    [Description("Discard the existing vector index and embed every book again")]
+    [DefaultValue(false)]
+    public override bool Rebuild { get; set; }
+}
+
+/// <summary>
+/// Command for building or updating the vector index of a bookshelf, from which passages are retrieved
+/// </summary>
+public sealed class EmbedCommand : IndexBuildCommand<EmbedSettings, VectorIndexBuildResult>
+{
+    private readonly IBookshelfRetrievalService _retrievalService;
+
+    /// <summary>
+    /// Initializes a new instance of the EmbedCommand class
+    /// </summary>
+    /// <param name="retrievalService">The retrieval service</param>
+    public EmbedCommand(IBookshelfRetrievalService retrievalService)
+    {
+        _retrievalService = retrievalService ?? throw new ArgumentNullException(nameof(retrievalService));
+    }
+
+    /// <inheritdoc />
+    protected override string Title => "Bookshelf Embeddings";
+
+    /// <inheritdoc />
+    protected override string IndexName => "Vector index";
+
+    /// <inheritdoc />
+    protected override string Activity => "Embedding";
+
+    /// <inheritdoc />
+    protected override Task<VectorIndexBuildResult> BuildAsync(
+        EmbedSettings settings,
+        IProgress<IndexProgress> progressCallback,
+        CancellationToken cancellationToken)
+    {
+        var request = new BuildVectorIndexRequest(settings.BookshelfDirectory, settings.MaxParallelism, settings.Rebuild);
+        return _retrievalService.BuildVectorIndexAsync(request, progressCallback, cancellationToken);
+    }
+
+    /// <inheritdoc />
+    protected override void AddResultRows(Table table, VectorIndexBuildResult result)
+    {
+        table.AddRow("Indexed Books", result.BookCount.ToString());
+        table.AddRow("Books Embedded", result.EmbeddedBookCount.ToString());
+        table.AddRow("Unchanged Books Reused", result.ReusedBookCount.ToString());
+        table.AddRow("Removed Books", result.RemovedBookCount.ToString());
+        table.AddRow("Books Without Readable Text", result.FailedBookCount.ToString());
+        table.AddRow("Passages", result.ChunkCount.ToString());
+        table.AddRow("Passage Clusters", result.ClusterCount.ToString());
+    }
+
+    /// <inheritdoc />
+    protected override void WriteSummaryCounts(Utf8JsonWriter json, VectorIndexBuildResult result)
+    {
+        json.WriteNumber("bookCount", result.BookCount);
+        json.WriteNumber("embeddedBooks", result.EmbeddedBookCount);
+        json.WriteNumber("reusedBooks", result.ReusedBookCount);
+        json.WriteNumber("removedBooks", result.RemovedBookCount);
+        json.WriteNumber("failedBooks", result.FailedBookCount);
+        json.WriteNumber("chunkCount", result.ChunkCount);
+        json.WriteNumber("clusterCount", result.ClusterCount);
+    }
+}
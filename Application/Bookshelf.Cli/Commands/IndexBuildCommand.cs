@@ -0,0 +1,292 @@
+using System.ComponentModel;
+using System.Text.Json;
+using Bookshelf.Application.Api.Dtos;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Cli.Diagnostics;
+using Bookshelf.Cli.Logging;
+using Bookshelf.Cli.Output;
+using Spectre.Console;
+using Spectre.Console.Cli;
+
+namespace Bookshelf.Cli.Commands;
+
+/// <summary>
+/// Command settings shared by the commands that build or update an index of a bookshelf
+/// </summary>
+public abstract class IndexBuildSettings : LoggingSettings
+{
+    /// <summary>
+    /// Gets or sets the bookshelf directory to index
+    /// </summary>
+    [CommandArgument(0, "<BOOKSHELF>")]
+    [Description("The bookshelf directory containing PDF files")]
+    public string BookshelfDirectory { get; set; } = string.Empty;
+
+    /// <summary>
+    /// Gets or sets the maximum number of books that are read concurrently
+    /// </summary>
+    public abstract int MaxParallelism { get; set; }
+
+    /// <summary>
+    /// Gets or sets whether to discard the existing index and read every book again
+    /// </summary>
+    public abstract bool Rebuild { get; set; }
+
+    /// <summary>
+    /// Gets or sets the output format
+    /// </summary>
+    [CommandOption("-o|--output <FORMAT>")]
+    [Description("Output format: text, json (one JSON document with the books read and a summary), or ndjson (one JSON record per line)")]
+    [DefaultValue("text")]
+    public string Output { get; set; } = "text";
+
+    /// <summary>
+    /// Gets or sets whether to print the time spent per stage, with an optional file to export it to
+    /// </summary>
+    [CommandOption("--metrics [FILE]")]
+    [Description("Print the time spent per stage at the end of the run, and export it as JSON if a file is given")]
+    public FlagValue<string>? Metrics { get; set; }
+
+    /// <summary>
+    /// Validates the command settings
+    /// </summary>
+    public override ValidationResult Validate()
+    {
+        var loggingValidation = base.Validate();
+        if (!loggingValidation.Successful)
+        {
+            return loggingValidation;
+        }
+
+        if (string.IsNullOrWhiteSpace(BookshelfDirectory))
+        {
+            return ValidationResult.Error("Bookshelf directory is required");
+        }
+
+        if (!Directory.Exists(BookshelfDirectory))
+        {
+            return ValidationResult.Error($"Bookshelf directory does not exist: {BookshelfDirectory}");
+        }
+
+        if (MaxParallelism < 1)
+        {
+            return ValidationResult.Error($"Max parallelism must be at least 1: {MaxParallelism}");
+        }
+
+        var validOutputFormats = new[] { "text", "json", "ndjson" };
+        var isValidOutputFormat = validOutputFormats.Contains(Output.ToLowerInvariant());
+        if (!isValidOutputFormat)
+        {
+            return ValidationResult.Error($"Invalid output format: {Output}. Valid options: text, json, ndjson");
+        }
+
+        return ValidationResult.Success();
+    }
+
+    /// <summary>
+    /// Gets the output format enum value from string
+    /// </summary>
+    public OutputFormat GetOutputFormat()
+    {
+        return Output.ToLowerInvariant() switch
+        {
+            "json" => OutputFormat.Json,
+            "ndjson" => OutputFormat.Ndjson,
+            _ => OutputFormat.Text
+        };
+    }
+}
+
+/// <summary>
+/// Base class of the commands that build or update an index of a bookshelf, rendering the progress and the result
+/// as text or streaming them as JSON records
+/// </summary>
+/// <typeparam name="TSettings">The type of the command settings</typeparam>
+/// <typeparam name="TResult">The type of the result of building the index</typeparam>
+public abstract class IndexBuildCommand<TSettings, TResult> : AsyncCommand<TSettings>
+    where TSettings : IndexBuildSettings
+    where TResult : IIndexBuildResult
+{
+    /// <summary>
+    /// Gets the title of the panel shown before the progress, such as "Bookshelf Index"
+    /// </summary>
+    protected abstract string Title { get; }
+
+    /// <summary>
+    /// Gets the name of the index in the final message, such as "Index"
+    /// </summary>
+    protected abstract string IndexName { get; }
+
+    /// <summary>
+    /// Gets the activity shown in the progress and failure messages, such as "Indexing"
+    /// </summary>
+    protected abstract string Activity { get; }
+
+    /// <summary>
+    /// Executes the command
+    /// </summary>
+    public override async Task<int> ExecuteAsync(CommandContext context, TSettings settings, CancellationToken cancellationToken)
+    {
+        var collectsMetrics = settings.Metrics?.IsSet == true;
+        using var metricsCollector = collectsMetrics ? new StageMetricsCollector() : null;
+
+        var exitCode = await BuildAndRenderAsync(settings, cancellationToken);
+
+        if (metricsCollector != null)
+        {
+            var isMachineReadable = settings.GetOutputFormat() != OutputFormat.Text;
+            StageMetricsReporter.Report(metricsCollector.CreateReport(), settings.Metrics!.Value, isMachineReadable);
+        }
+
+        return exitCode;
+    }
+
+    /// <summary>
+    /// Builds or updates the index
+    /// </summary>
+    /// <param name="settings">The command settings</param>
+    /// <param name="progressCallback">Receives a snapshot after every book that was read</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The result of building the index</returns>
+    protected abstract Task<TResult> BuildAsync(
+        TSettings settings,
+        IProgress<IndexProgress> progressCallback,
+        CancellationToken cancellationToken);
+
+    /// <summary>
+    /// Adds the counts of a successful result to the result table
+    /// </summary>
+    protected abstract void AddResultRows(Table table, TResult result);
+
+    /// <summary>
+    /// Writes the counts of the result to the summary record, after its success and error message
+    /// </summary>
+    protected abstract void WriteSummaryCounts(Utf8JsonWriter json, TResult result);
+
+    /// <summary>
+    /// Builds the index and renders the results in the requested output format
+    /// </summary>
+    private async Task<int> BuildAndRenderAsync(TSettings settings, CancellationToken cancellationToken)
+    {
+        var outputFormat = settings.GetOutputFormat();
+        var isMachineReadable = outputFormat != OutputFormat.Text;
+        if (isMachineReadable)
+        {
+            return await WriteBookRecordsAsync(settings, outputFormat, cancellationToken);
+        }
+
+        var panel = new Panel($"[bold]{Title}[/]")
+            .Border(BoxBorder.Rounded)
+            .BorderColor(Color.Blue);
+
+        AnsiConsole.Write(panel);
+        AnsiConsole.WriteLine();
+
+        AnsiConsole.MarkupLine($"[grey]Bookshelf:[/] [cyan]{settings.BookshelfDirectory}[/]");
+        AnsiConsole.MarkupLine($"[grey]Max parallelism:[/] [cyan]{settings.MaxParallelism}[/]");
+        AnsiConsole.WriteLine();
+
+        var result = await AnsiConsole.Progress()
+            .AutoClear(false)
+            .Columns(
+                new TaskDescriptionColumn(),
+                new ProgressBarColumn(),
+                new PercentageColumn(),
+                new ElapsedTimeColumn(),
+                new SpinnerColumn())
+            .StartAsync(async ctx =>
+            {
+                var task = ctx.AddTask($"[green]{Activity} books...[/]");
+                task.IsIndeterminate = true;
+
+                var progressReporter = new SynchronousProgress<IndexProgress>(
+                    progress => UpdateProgressTask(task, progress));
+
+                var buildResult = await BuildAsync(settings, progressReporter, cancellationToken);
+
+                // An up to date index reports no progress, so the bar is completed here
+                task.IsIndeterminate = false;
+                task.Value = task.MaxValue;
+                return buildResult;
+            });
+
+        AnsiConsole.WriteLine();
+
+        if (!result.Success)
+        {
+            AnsiConsole.MarkupLine($"[red]✗ {Activity} failed: {Markup.Escape(result.ErrorMessage ?? string.Empty)}[/]");
+            return 1;
+        }
+
+        var table = new Table()
+            .Border(TableBorder.Rounded)
+            .BorderColor(Color.Green)
+            .AddColumn("[bold]Metric[/]")
+            .AddColumn("[bold]Count[/]");
+
+        AddResultRows(table, result);
+
+        AnsiConsole.Write(table);
+        AnsiConsole.WriteLine();
+
+        var message = result.IsUnchanged
+            ? $"[green]✓ {IndexName} is up to date[/]"
+            : $"[green]✓ {IndexName} updated successfully![/]";
+        AnsiConsole.MarkupLine(message);
+        return 0;
+    }
+
+    /// <summary>
+    /// Shows the books read of a snapshot
+    /// </summary>
+    private static void UpdateProgressTask(ProgressTask task, IndexProgress progress)
+    {
+        task.IsIndeterminate = false;
+        task.MaxValue = progress.TotalBooks;
+        task.Value = progress.CompletedBooks;
+        task.Description =
+            $"[green]{Markup.Escape(progress.CurrentBook)}[/] " +
+            $"[grey]{progress.CompletedBooks}/{progress.TotalBooks} books[/]";
+    }
+
+    /// <summary>
+    /// Streams one JSON record per book read to standard output, followed by a summary, without rendering panels,
+    /// progress or tables
+    /// </summary>
+    private async Task<int> WriteBookRecordsAsync(
+        TSettings settings,
+        OutputFormat outputFormat,
+        CancellationToken cancellationToken)
+    {
+        using var writer = new JsonRecordWriter(StandardStreams.OpenOutput(), outputFormat);
+        writer.WriteStart("books");
+
+        var progressReporter = new SynchronousProgress<IndexProgress>(progress =>
+            writer.WriteRecord("book", json => WriteBookProperties(json, progress)));
+
+        var result = await BuildAsync(settings, progressReporter, cancellationToken);
+
+        writer.WriteEnd("summary", json => WriteSummaryProperties(json, result));
+        return result.Success ? 0 : 1;
+    }
+
+    /// <summary>
+    /// Writes the properties of a book record
+    /// </summary>
+    private static void WriteBookProperties(Utf8JsonWriter json, IndexProgress progress)
+    {
+        json.WriteString("fileName", progress.CurrentBook);
+        json.WriteNumber("completedBooks", progress.CompletedBooks);
+        json.WriteNumber("totalBooks", progress.TotalBooks);
+    }
+
+    /// <summary>
+    /// Writes the properties of the summary record
+    /// </summary>
+    private void WriteSummaryProperties(Utf8JsonWriter json, TResult result)
+    {
+        json.WriteBoolean("success", result.Success);
+        json.WriteString("errorMessage", result.ErrorMessage);
+        WriteSummaryCounts(json, result);
+    }
+}
@@ -0,0 +1,89 @@
+using System.ComponentModel;
+using System.Text.Json;
+using Bookshelf.Application.Api;
+using Bookshelf.Application.Api.Dtos;
+using Bookshelf.Application.Core.Entities;
+using Spectre.Console;
+using Spectre.Console.Cli;
+
+namespace Bookshelf.Cli.Commands;
+
+/// <summary>
+/// Command settings for the index command
+/// </summary>
+public sealed class IndexSettings : IndexBuildSettings
+{
+    /// <summary>
+    /// Gets or sets the maximum number of books whose text is extracted concurrently
+    /// </summary>
+    [CommandOption("-p|--max-parallelism <COUNT>")]
+    [Description("Maximum number of books whose text is extracted concurrently (1 extracts books sequentially)")]
+    [DefaultValue(BuildIndexRequest.SequentialParallelism)]
+    public override int MaxParallelism { get; set; } = BuildIndexRequest.SequentialParallelism;
+
+    /// <summary>
+    /// Gets or sets whether to discard the existing index and extract every book again
+    /// </summary>
+    [CommandOption("--rebuild")]
+    [Description("Discard the existing index and extract the text of every book again")]
+    [DefaultValue(false)]
+    public override bool Rebuild { get; set; }
+}
+
+/// <summary>
+/// Command for building or updating the full-text search index of a bookshelf
+/// </summary>
+public sealed class IndexCommand : IndexBuildCommand<IndexSettings, IndexBuildResult>
+{
+    private readonly IBookshelfIndexService _indexService;
+
+    /// <summary>
+    /// Initializes a new instance of the IndexCommand class
+    /// </summary>
+    /// <param name="indexService">The index service</param>
+    public IndexCommand(IBookshelfIndexService indexService)
+    {
+        _indexService = indexService ?? throw new ArgumentNullException(nameof(indexService));
+    }
+
+    /// <inheritdoc />
+    protected override string Title => "Bookshelf Index";
+
+    /// <inheritdoc />
+    protected override string IndexName => "Index";
+
+    /// <inheritdoc />
+    protected override string Activity => "Indexing";
+
+    /// <inheritdoc />
+    protected override Task<IndexBuildResult> BuildAsync(
+        IndexSettings settings,
+        IProgress<IndexProgress> progressCallback,
+        CancellationToken cancellationToken)
+    {
+        var request = new BuildIndexRequest(settings.BookshelfDirectory, settings.MaxParallelism, settings.Rebuild);
+        return _indexService.BuildIndexAsync(request, progressCallback, cancellationToken);
+    }
+
+    /// <inheritdoc />
+    protected override void AddResultRows(Table table, IndexBuildResult result)
+    {
+        table.AddRow("Indexed Books", result.BookCount.ToString());
+        table.AddRow("Books Extracted", result.ExtractedBookCount.ToString());
+        table.AddRow("Unchanged Books Reused", result.ReusedBookCount.ToString());
+        table.AddRow("Removed Books", result.RemovedBookCount.ToString());
+        table.AddRow("Books Indexed by Title Only", result.FailedBookCount.ToString());
+        table.AddRow("Distinct Terms", result.TermCount.ToString());
+    }
+
+    /// <inheritdoc />
+    protected override void WriteSummaryCounts(Utf8JsonWriter json, IndexBuildResult result)
+    {
+        json.WriteNumber("bookCount", result.BookCount);
+        json.WriteNumber("extractedBooks", result.ExtractedBookCount);
+        json.WriteNumber("reusedBooks", result.ReusedBookCount);
+        json.WriteNumber("removedBooks", result.RemovedBookCount);
+        json.WriteNumber("failedBooks", result.FailedBookCount);
+        json.WriteNumber("termCount", result.TermCount);
+    }
+}
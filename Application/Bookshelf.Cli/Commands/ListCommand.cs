@@ -1,7 +1,11 @@
 using System.ComponentModel;
+using System.Text.Json;
 using Bookshelf.Application.Api;
 using Bookshelf.Application.Api.Dtos;
 using Bookshelf.Application.Core.Entities;
+using Bookshelf.Cli.Diagnostics;
+using Bookshelf.Cli.Logging;
+using Bookshelf.Cli.Output;
 using Spectre.Console;
 using Spectre.Console.Cli;
 
@@ -10,7 +14,7 @@ namespace Bookshelf.Cli.Commands;
 /// <summary>
 /// Command settings for the list command
 /// </summary>
-public sealed class ListSettings : CommandSettings
+public sealed class ListSettings : LoggingSettings
 {
     /// <summary>
     /// Gets or sets the bookshelf directory to list books from
@@ -50,11 +54,56 @@ public sealed class ListSettings : CommandSettings
     [DefaultValue(false)]
     public bool ReverseSort { get; set; }
 
+    /// <summary>
+    /// Gets or sets the maximum number of books whose details are read concurrently
+    /// </summary>
+    [CommandOption("-p|--max-parallelism <COUNT>")]
+    [Description("Maximum number of books whose details are read concurrently (1 reads books sequentially)")]
+    [DefaultValue(ListBooksRequest.SequentialParallelism)]
+    public int MaxParallelism { get; set; } = ListBooksRequest.SequentialParallelism;
+
+    /// <summary>
+    /// Gets or sets whether to bypass the persistent metadata cache
+    /// </summary>
+    [CommandOption("--no-cache")]
+    [Description("Read all book metadata from disk without using or updating the metadata cache")]
+    [DefaultValue(false)]
+    public bool NoCache { get; set; }
+
+    /// <summary>
+    /// Gets or sets whether to discard and rebuild the persistent metadata cache
+    /// </summary>
+    [CommandOption("--rebuild-cache")]
+    [Description("Discard the metadata cache and rebuild it from disk")]
+    [DefaultValue(false)]
+    public bool RebuildCache { get; set; }
+
+    /// <summary>
+    /// Gets or sets the output format
+    /// </summary>
+    [CommandOption("-o|--output <FORMAT>")]
+    [Description("Output format: text, json (one JSON array streamed while books are read), or ndjson (one JSON record per line)")]
+    [DefaultValue("text")]
+    public string Output { get; set; } = "text";
+
+    /// <summary>
+    /// Gets or sets whether to print the time spent per stage, with an optional file to export it to
+    /// </summary>
+    [CommandOption("--metrics [FILE]")]
+    [Description("Print the time spent per stage at the end of the run, and export it as JSON if a file is given")]
+    public FlagValue<string>? Metrics { get; set; }
+
     /// <summary>
     /// Validates the command settings
     /// </summary>
     public override ValidationResult Validate()
     {
+        var loggingValidation = base.Validate();
+        if (!loggingValidation.Successful)
+        {
+            return loggingValidation;
+        }
+
         if (string.IsNullOrWhiteSpace(BookshelfDirectory))
         {
             return ValidationResult.Error("Bookshelf directory is required");
@@ -72,6 +121,24 @@ public sealed class ListSettings : CommandSettings
             return ValidationResult.Error($"Invalid sort field: {SortField}. Valid options: title, size, date, pages");
         }
 
+        if (MaxParallelism < ListBooksRequest.SequentialParallelism)
+        {
+            return ValidationResult.Error($"Max parallelism must be at least 1: {MaxParallelism}");
+        }
+
+        var hasConflictingCacheOptions = NoCache && RebuildCache;
+        if (hasConflictingCacheOptions)
+        {
+            return ValidationResult.Error("The --no-cache and --rebuild-cache options cannot be combined");
+        }
+
+        var validOutputFormats = new[] { "text", "json", "ndjson" };
+        var isValidOutputFormat = validOutputFormats.Contains(Output.ToLowerInvariant());
+        if (!isValidOutputFormat)
+        {
+            return ValidationResult.Error($"Invalid output format: {Output}. Valid options: text, json, ndjson");
+        }
+
         return ValidationResult.Success();
     }
 
@@ -97,6 +164,32 @@ public sealed class ListSettings : CommandSettings
     {
         return ReverseSort ? SortDirection.Descending : SortDirection.Ascending;
     }
+
+    /// <summary>
+    /// Gets the metadata cache mode
+    /// </summary>
+    public BookMetadataCacheMode GetCacheMode()
+    {
+        if (NoCache)
+        {
+            return BookMetadataCacheMode.Disabled;
+        }
+
+        return RebuildCache ? BookMetadataCacheMode.Rebuild : BookMetadataCacheMode.Enabled;
+    }
+
+    /// <summary>
+    /// Gets the output format enum value from string
+    /// </summary>
+    public OutputFormat GetOutputFormat()
+    {
+        return Output.ToLowerInvariant() switch
+        {
+            "json" => OutputFormat.Json,
+            "ndjson" => OutputFormat.Ndjson,
+            _ => OutputFormat.Text
+        };
+    }
 }
 
 /// <summary>
@@ -125,6 +218,41 @@ public sealed class ListCommand : AsyncCommand<ListSettings>
     /// </summary>
     public override async Task<int> ExecuteAsync(CommandContext context, ListSettings settings, CancellationToken cancellationToken)
     {
+        var collectsMetrics = settings.Metrics?.IsSet == true;
+        using var metricsCollector = collectsMetrics ? new StageMetricsCollector() : null;
+
+        var exitCode = await ListBooksAsync(settings, cancellationToken);
+
+        if (metricsCollector != null)
+        {
+            var isMachineReadable = settings.GetOutputFormat() != OutputFormat.Text;
+            StageMetricsReporter.Report(metricsCollector.CreateReport(), settings.Metrics!.Value, isMachineReadable);
+        }
+
+        return exitCode;
+    }
+
+    /// <summary>
+    /// Lists the books and renders the results in the requested output format
+    /// </summary>
+    private async Task<int> ListBooksAsync(ListSettings settings, CancellationToken cancellationToken)
+    {
+        var request = new ListBooksRequest(
+            settings.BookshelfDirectory,
+            settings.TitleFilter,
+            settings.ShowDetails,
+            settings.GetSortFieldEnum(),
+            settings.GetSortDirection(),
+            settings.MaxParallelism,
+            settings.GetCacheMode());
+
+        var outputFormat = settings.GetOutputFormat();
+        var isMachineReadable = outputFormat != OutputFormat.Text;
+        if (isMachineReadable)
+        {
+            return await WriteBookRecordsAsync(request, outputFormat, cancellationToken);
+        }
+
         var panel = new Panel("[bold]Bookshelf Listing[/]")
             .Border(BoxBorder.Rounded)
             .BorderColor(Color.Blue);
@@ -142,13 +270,6 @@ public sealed class ListCommand : AsyncCommand<ListSettings>
         
         AnsiConsole.WriteLine();
 
-        var request = new ListBooksRequest(
-            settings.BookshelfDirectory,
-            settings.TitleFilter,
-            settings.ShowDetails,
-            settings.GetSortFieldEnum(),
-            settings.GetSortDirection());
-
         var result = await _listService.ListBooksAsync(request, cancellationToken);
 
         if (!result.Success)
@@ -167,6 +288,59 @@ public sealed class ListCommand : AsyncCommand<ListSettings>
         return 0;
     }
 
+    /// <summary>
+    /// Streams one JSON record per book to standard output as soon as the book is read, without rendering panels or tables
+    /// </summary>
+    private async Task<int> WriteBookRecordsAsync(
+        ListBooksRequest request,
+        OutputFormat outputFormat,
+        CancellationToken cancellationToken)
+    {
+        using var writer = new JsonRecordWriter(StandardStreams.OpenOutput(), outputFormat);
+
+        try
+        {
+            writer.WriteStart();
+            await foreach (var book in _listService.StreamBooksAsync(request, cancellationToken))
+            {
+                writer.WriteRecord("book", json => WriteBookProperties(json, book));
+            }
+
+            writer.WriteEnd();
+            return 0;
+        }
+        catch (OperationCanceledException)
+        {
+            await Console.Error.WriteLineAsync("Error: Book listing was cancelled");
+            return 1;
+        }
+        catch (Exception ex)
+        {
+            await Console.Error.WriteLineAsync($"Error: {ex.Message}");
+            return 1;
+        }
+    }
+
+    /// <summary>
+    /// Writes the properties of a book record
+    /// </summary>
+    private static void WriteBookProperties(Utf8JsonWriter json, BookInfo book)
+    {
+        json.WriteString("title", book.Title);
+        json.WriteString("path", book.FullPath);
+        json.WriteNumber("sizeBytes", book.FileSizeBytes);
+        json.WriteString("creationDate", book.CreationDate);
+
+        if (book.PageCount.HasValue)
+        {
+            json.WriteNumber("pageCount", book.PageCount.Value);
+        }
+        else
+        {
+            json.WriteNull("pageCount");
+        }
+    }
+
     /// <summary>
     /// Displays a message when the bookshelf is empty
     /// </summary>
@@ -0,0 +1,284 @@
+using System.ComponentModel;
+using System.Text.Json;
+using Bookshelf.Application.Api;
+using Bookshelf.Application.Api.Dtos;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Cli.Diagnostics;
+using Bookshelf.Cli.Logging;
+using Bookshelf.Cli.Output;
+using Spectre.Console;
+using Spectre.Console.Cli;
+
+namespace Bookshelf.Cli.Commands;
+
+/// <summary>
+/// Command settings for the retrieve command
+/// </summary>
+public sealed class RetrieveSettings : LoggingSettings
+{
+    /// <summary>
+    /// Gets or sets the bookshelf directory to retrieve passages from
+    /// </summary>
+    [CommandArgument(0, "<BOOKSHELF>")]
+    [Description("The bookshelf directory whose vector index is searched")]
+    public string BookshelfDirectory { get; set; } = string.Empty;
+
+    /// <summary>
+    /// Gets or sets the question
+    /// </summary>
+    [CommandArgument(1, "<QUESTION>")]
+    [Description("The question the passages should answer")]
+    public string Question { get; set; } = string.Empty;
+
+    /// <summary>
+    /// Gets or sets the maximum number of passages shown
+    /// </summary>
+    [CommandOption("-n|--limit <COUNT>")]
+    [Description("Maximum number of passages shown, most similar first")]
+    [DefaultValue(RetrievePassagesRequest.DefaultMaxPassages)]
+    public int Limit { get; set; } = RetrievePassagesRequest.DefaultMaxPassages;
+
+    /// <summary>
+    /// Gets or sets the lowest similarity of a passage shown
+    /// </summary>
+    [CommandOption("--min-score <SCORE>")]
+    [Description("Lowest cosine similarity between the question and a passage shown, from -1 to 1")]
+    [DefaultValue(RetrievePassagesRequest.DefaultMinScore)]
+    public double MinScore { get; set; } = RetrievePassagesRequest.DefaultMinScore;
+
+    /// <summary>
+    /// Gets or sets the number of passage clusters searched
+    /// </summary>
+    [CommandOption("--probes <COUNT>")]
+    [Description("Number of passage clusters searched in large indexes; more clusters find more passages but take longer")]
+    [DefaultValue(RetrievePassagesRequest.DefaultProbes)]
+    public int Probes { get; set; } = RetrievePassagesRequest.DefaultProbes;
+
+    /// <summary>
+    /// Gets or sets the output format
+    /// </summary>
+    [CommandOption("-o|--output <FORMAT>")]
+    [Description("Output format: text, json (one JSON document with the passages and a summary), or ndjson (one JSON record per line)")]
+    [DefaultValue("text")]
+    public string Output { get; set; } = "text";
+
+    /// <summary>
+    /// Gets or sets whether to print the time spent per stage, with an optional file to export it to
+    /// </summary>
+    [CommandOption("--metrics [FILE]")]
+    [Description("Print the time spent per stage at the end of the run, and export it as JSON if a file is given")]
+    public FlagValue<string>? Metrics { get; set; }
+
+    /// <summary>
+    /// Validates the command settings
+    /// </summary>
+    public override ValidationResult Validate()
+    {
+        var loggingValidation = base.Validate();
+        if (!loggingValidation.Successful)
+        {
+            return loggingValidation;
+        }
+
+        if (string.IsNullOrWhiteSpace(BookshelfDirectory))
+        {
+            return ValidationResult.Error("Bookshelf directory is required");
+        }
+
+        if (!Directory.Exists(BookshelfDirectory))
+        {
+            return ValidationResult.Error($"Bookshelf directory does not exist: {BookshelfDirectory}");
+        }
+
+        if (string.IsNullOrWhiteSpace(Question))
+        {
+            return ValidationResult.Error("Question is required");
+        }
+
+        if (Limit < 1)
+        {
+            return ValidationResult.Error($"Limit must be at least 1: {Limit}");
+        }
+
+        var isValidMinScore = MinScore is >= -1 and <= 1;
+        if (!isValidMinScore)
+        {
+            return ValidationResult.Error($"Min score must be between -1 and 1: {MinScore}");
+        }
+
+        if (Probes < 1)
+        {
+            return ValidationResult.Error($"Probes must be at least 1: {Probes}");
+        }
+
+        var validOutputFormats = new[] { "text", "json", "ndjson" };
+        var isValidOutputFormat = validOutputFormats.Contains(Output.ToLowerInvariant());
+        if (!isValidOutputFormat)
+        {
+            return ValidationResult.Error($"Invalid output format: {Output}. Valid options: text, json, ndjson");
+        }
+
+        return ValidationResult.Success();
+    }
+
+    /// <summary>
+    /// Gets the output format enum value from string
+    /// </summary>
+    public OutputFormat GetOutputFormat()
+    {
+        return Output.ToLowerInvariant() switch
+        {
+            "json" => OutputFormat.Json,
+            "ndjson" => OutputFormat.Ndjson,
+            _ => OutputFormat.Text
+        };
+    }
+}
+
+/// <summary>
+/// Command for retrieving the passages of a bookshelf that answer a question, with the book and page to cite
+/// </summary>
+public sealed class RetrieveCommand : AsyncCommand<RetrieveSettings>
+{
+    /// <summary>
+    /// Number of characters of a passage shown in text output; machine-readable output has the whole passage
+    /// </summary>
+    private const int ExcerptLength = 400;
+
+    private readonly IBookshelfRetrievalService _retrievalService;
+
+    /// <summary>
+    /// Initializes a new instance of the RetrieveCommand class
+    /// </summary>
+    /// <param name="retrievalService">The retrieval service</param>
+    public RetrieveCommand(IBookshelfRetrievalService retrievalService)
+    {
+        _retrievalService = retrievalService ?? throw new ArgumentNullException(nameof(retrievalService));
+    }
+
+    /// <summary>
+    /// Executes the retrieve command
+    /// </summary>
+    public override async Task<int> ExecuteAsync(CommandContext context, RetrieveSettings settings, CancellationToken cancellationToken)
+    {
+        var collectsMetrics = settings.Metrics?.IsSet == true;
+        using var metricsCollector = collectsMetrics ? new StageMetricsCollector() : null;
+
+        var exitCode = await RetrieveAsync(settings, cancellationToken);
+
+        if (metricsCollector != null)
+        {
+            var isMachineReadable = settings.GetOutputFormat() != OutputFormat.Text;
+            StageMetricsReporter.Report(metricsCollector.CreateReport(), settings.Metrics!.Value, isMachineReadable);
+        }
+
+        return exitCode;
+    }
+
+    /// <summary>
+    /// Retrieves the passages and renders them in the requested output format
+    /// </summary>
+    private async Task<int> RetrieveAsync(RetrieveSettings settings, CancellationToken cancellationToken)
+    {
+        var request = new RetrievePassagesRequest(
+            settings.BookshelfDirectory, settings.Question, settings.Limit, settings.MinScore, settings.Probes);
+        var result = await _retrievalService.RetrievePassagesAsync(request, cancellationToken);
+
+        var outputFormat = settings.GetOutputFormat();
+        var isMachineReadable = outputFormat != OutputFormat.Text;
+        if (isMachineReadable)
+        {
+            WritePassageRecords(result, outputFormat);
+            return result.Success ? 0 : 1;
+        }
+
+        if (!result.Success)
+        {
+            AnsiConsole.MarkupLine($"[red]✗ Error: {Markup.Escape(result.ErrorMessage ?? string.Empty)}[/]");
+            return 1;
+        }
+
+        if (result.IsIndexStale)
+        {
+            AnsiConsole.MarkupLine(
+                $"[yellow]⚠ {result.StaleBookCount} books changed since the vector index was built, " +
+                "run the embed command to update it[/]");
+            AnsiConsole.WriteLine();
+        }
+
+        if (result.IsEmpty)
+        {
+            AnsiConsole.MarkupLine($"[yellow]No passages answer[/] [cyan]{Markup.Escape(settings.Question)}[/]");
+            return 0;
+        }
+
+        DisplayPassages(result);
+
+        AnsiConsole.MarkupLine(
+            $"[green]{result.Passages.Count} passages from {result.IndexedChunkCount} passages of " +
+            $"{result.IndexedBookCount} books[/] [grey]({result.Elapsed.TotalMilliseconds:F1} ms)[/]");
+        return 0;
+    }
+
+    /// <summary>
+    /// Displays every passage with its book and page, most similar first
+    /// </summary>
+    private static void DisplayPassages(PassageRetrievalResult result)
+    {
+        var rank = 1;
+        foreach (var passage in result.Passages)
+        {
+            AnsiConsole.MarkupLine(
+                $"[bold]{rank}. {Markup.Escape(passage.Title)}[/], page {passage.Page} " +
+                $"[grey](score {passage.Score:F2})[/]");
+
+            var isTruncated = passage.Text.Length > ExcerptLength;
+            var excerpt = isTruncated ? passage.Text[..ExcerptLength] + "…" : passage.Text;
+            AnsiConsole.MarkupLine($"   [grey]{Markup.Escape(excerpt)}[/]");
+            AnsiConsole.WriteLine();
+            rank++;
+        }
+    }
+
+    /// <summary>
+    /// Writes one JSON record per passage to standard output, followed by a summary
+    /// </summary>
+    private static void WritePassageRecords(PassageRetrievalResult result, OutputFormat outputFormat)
+    {
+        using var writer = new JsonRecordWriter(StandardStreams.OpenOutput(), outputFormat);
+        writer.WriteStart("passages");
+
+        foreach (var passage in result.Passages)
+        {
+            writer.WriteRecord("passage", json => WritePassageProperties(json, passage));
+        }
+
+        writer.WriteEnd("summary", json => WriteSummaryProperties(json, result));
+    }
+
+    /// <summary>
+    /// Writes the properties of a passage record
+    /// </summary>
+    private static void WritePassageProperties(Utf8JsonWriter json, RetrievedPassage passage)
+    {
+        json.WriteString("title", passage.Title);
+        json.WriteString("path", passage.FullPath);
+        json.WriteNumber("page", passage.Page);
+        json.WriteNumber("score", Math.Round(passage.Score, 4));
+        json.WriteString("text", passage.Text);
+    }
+
+    /// <summary>
+    /// Writes the properties of the retrieval summary record
+    /// </summary>
+    private static void WriteSummaryProperties(Utf8JsonWriter json, PassageRetrievalResult result)
+    {
+        json.WriteBoolean("success", result.Success);
+        json.WriteString("errorMessage", result.ErrorMessage);
+        json.WriteNumber("passageCount", result.Passages.Count);
+        json.WriteNumber("indexedBooks", result.IndexedBookCount);
+        json.WriteNumber("indexedPassages", result.IndexedChunkCount);
+        json.WriteNumber("staleBooks", result.StaleBookCount);
+        json.WriteNumber("elapsedMilliseconds", Math.Round(result.Elapsed.TotalMilliseconds, 3));
+    }
+}
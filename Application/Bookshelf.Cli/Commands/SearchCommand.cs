@@ -0,0 +1,264 @@
+using System.ComponentModel;
+using System.Text.Json;
+using Bookshelf.Application.Api;
+using Bookshelf.Application.Api.Dtos;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Cli.Diagnostics;
+using Bookshelf.Cli.Logging;
+using Bookshelf.Cli.Output;
+using Spectre.Console;
+using Spectre.Console.Cli;
+
+namespace Bookshelf.Cli.Commands;
+
+/// <summary>
+/// Command settings for the search command
+/// </summary>
+public sealed class SearchSettings : LoggingSettings
+{
+    /// <summary>
+    /// Gets or sets the bookshelf directory to search
+    /// </summary>
+    [CommandArgument(0, "<BOOKSHELF>")]
+    [Description("The bookshelf directory whose index is searched")]
+    public string BookshelfDirectory { get; set; } = string.Empty;
+
+    /// <summary>
+    /// Gets or sets the query
+    /// </summary>
+    [CommandArgument(1, "<QUERY>")]
+    [Description("Words every matching book must contain; end a word with * to match every word starting with it")]
+    public string Query { get; set; } = string.Empty;
+
+    /// <summary>
+    /// Gets or sets the maximum number of books shown
+    /// </summary>
+    [CommandOption("-n|--limit <COUNT>")]
+    [Description("Maximum number of books shown, best matches first")]
+    [DefaultValue(SearchBooksRequest.DefaultMaxResults)]
+    public int Limit { get; set; } = SearchBooksRequest.DefaultMaxResults;
+
+    /// <summary>
+    /// Gets or sets the output format
+    /// </summary>
+    [CommandOption("-o|--output <FORMAT>")]
+    [Description("Output format: text, json (one JSON document with the hits and a summary), or ndjson (one JSON record per line)")]
+    [DefaultValue("text")]
+    public string Output { get; set; } = "text";
+
+    /// <summary>
+    /// Gets or sets whether to print the time spent per stage, with an optional file to export it to
+    /// </summary>
+    [CommandOption("--metrics [FILE]")]
+    [Description("Print the time spent per stage at the end of the run, and export it as JSON if a file is given")]
+    public FlagValue<string>? Metrics { get; set; }
+
+    /// <summary>
+    /// Validates the command settings
+    /// </summary>
+    public override ValidationResult Validate()
+    {
+        var loggingValidation = base.Validate();
+        if (!loggingValidation.Successful)
+        {
+            return loggingValidation;
+        }
+
+        if (string.IsNullOrWhiteSpace(BookshelfDirectory))
+        {
+            return ValidationResult.Error("Bookshelf directory is required");
+        }
+
+        if (!Directory.Exists(BookshelfDirectory))
+        {
+            return ValidationResult.Error($"Bookshelf directory does not exist: {BookshelfDirectory}");
+        }
+
+        if (string.IsNullOrWhiteSpace(Query))
+        {
+            return ValidationResult.Error("Query is required");
+        }
+
+        if (Limit < 1)
+        {
+            return ValidationResult.Error($"Limit must be at least 1: {Limit}");
+        }
+
+        var validOutputFormats = new[] { "text", "json", "ndjson" };
+        var isValidOutputFormat = validOutputFormats.Contains(Output.ToLowerInvariant());
+        if (!isValidOutputFormat)
+        {
+            return ValidationResult.Error($"Invalid output format: {Output}. Valid options: text, json, ndjson");
+        }
+
+        return ValidationResult.Success();
+    }
+
+    /// <summary>
+    /// Gets the output format enum value from string
+    /// </summary>
+    public OutputFormat GetOutputFormat()
+    {
+        return Output.ToLowerInvariant() switch
+        {
+            "json" => OutputFormat.Json,
+            "ndjson" => OutputFormat.Ndjson,
+            _ => OutputFormat.Text
+        };
+    }
+}
+
+/// <summary>
+/// Command for searching the full-text index of a bookshelf
+/// </summary>
+public sealed class SearchCommand : AsyncCommand<SearchSettings>
+{
+    private readonly IBookshelfIndexService _indexService;
+
+    /// <summary>
+    /// Initializes a new instance of the SearchCommand class
+    /// </summary>
+    /// <param name="indexService">The index service</param>
+    public SearchCommand(IBookshelfIndexService indexService)
+    {
+        _indexService = indexService ?? throw new ArgumentNullException(nameof(indexService));
+    }
+
+    /// <summary>
+    /// Executes the search command
+    /// </summary>
+    public override async Task<int> ExecuteAsync(CommandContext context, SearchSettings settings, CancellationToken cancellationToken)
+    {
+        var collectsMetrics = settings.Metrics?.IsSet == true;
+        using var metricsCollector = collectsMetrics ? new StageMetricsCollector() : null;
+
+        var exitCode = await SearchAsync(settings, cancellationToken);
+
+        if (metricsCollector != null)
+        {
+            var isMachineReadable = settings.GetOutputFormat() != OutputFormat.Text;
+            StageMetricsReporter.Report(metricsCollector.CreateReport(), settings.Metrics!.Value, isMachineReadable);
+        }
+
+        return exitCode;
+    }
+
+    /// <summary>
+    /// Searches the index and renders the hits in the requested output format
+    /// </summary>
+    private async Task<int> SearchAsync(SearchSettings settings, CancellationToken cancellationToken)
+    {
+        var request = new SearchBooksRequest(settings.BookshelfDirectory, settings.Query, settings.Limit);
+        var result = await _indexService.SearchAsync(request, cancellationToken);
+
+        var outputFormat = settings.GetOutputFormat();
+        var isMachineReadable = outputFormat != OutputFormat.Text;
+        if (isMachineReadable)
+        {
+            WriteSearchRecords(result, outputFormat);
+            return result.Success ? 0 : 1;
+        }
+
+        if (!result.Success)
+        {
+            AnsiConsole.MarkupLine($"[red]✗ Error: {Markup.Escape(result.ErrorMessage ?? string.Empty)}[/]");
+            return 1;
+        }
+
+        if (result.IsIndexStale)
+        {
+            AnsiConsole.MarkupLine(
+                $"[yellow]⚠ {result.StaleBookCount} books changed since the index was built, " +
+                "run the index command to update it[/]");
+            AnsiConsole.WriteLine();
+        }
+
+        var hasNoHits = result.Hits.Count == 0;
+        if (hasNoHits)
+        {
+            AnsiConsole.MarkupLine($"[yellow]No books match[/] [cyan]{Markup.Escape(settings.Query)}[/]");
+            return 0;
+        }
+
+        DisplayHits(result);
+
+        AnsiConsole.WriteLine();
+        AnsiConsole.MarkupLine(
+            $"[green]{result.TotalHits} of {result.IndexedBookCount} books match[/] " +
+            $"[grey]({result.Elapsed.TotalMilliseconds:F1} ms)[/]");
+        return 0;
+    }
+
+    /// <summary>
+    /// Displays the hits as a table in rank order
+    /// </summary>
+    private static void DisplayHits(BookSearchResult result)
+    {
+        var table = new Table()
+            .Border(TableBorder.Rounded)
+            .BorderColor(Color.Blue)
+            .AddColumn("[bold]#[/]")
+            .AddColumn("[bold]Title[/]")
+            .AddColumn("[bold]Score[/]")
+            .AddColumn("[bold]Pages[/]");
+
+        var rank = 1;
+        foreach (var hit in result.Hits)
+        {
+            var title = hit.MatchesMetadata ? $"[bold]{Markup.Escape(hit.Title)}[/]" : Markup.Escape(hit.Title);
+            var pages = hit.Pages.Count > 0 ? string.Join(", ", hit.Pages) : "-";
+            table.AddRow(rank.ToString(), title, hit.Score.ToString("F2"), pages);
+            rank++;
+        }
+
+        AnsiConsole.Write(table);
+    }
+
+    /// <summary>
+    /// Writes one JSON record per hit to standard output, followed by a summary, without rendering tables
+    /// </summary>
+    private static void WriteSearchRecords(BookSearchResult result, OutputFormat outputFormat)
+    {
+        using var writer = new JsonRecordWriter(StandardStreams.OpenOutput(), outputFormat);
+        writer.WriteStart("hits");
+
+        foreach (var hit in result.Hits)
+        {
+            writer.WriteRecord("hit", json => WriteHitProperties(json, hit));
+        }
+
+        writer.WriteEnd("summary", json => WriteSummaryProperties(json, result));
+    }
+
+    /// <summary>
+    /// Writes the properties of a hit record
+    /// </summary>
+    private static void WriteHitProperties(Utf8JsonWriter json, BookSearchHit hit)
+    {
+        json.WriteString("title", hit.Title);
+        json.WriteString("path", hit.FullPath);
+        json.WriteString("author", hit.Author);
+        json.WriteNumber("score", Math.Round(hit.Score, 4));
+        json.WriteBoolean("matchesMetadata", hit.MatchesMetadata);
+
+        json.WriteStartArray("pages");
+        foreach (var page in hit.Pages)
+        {
+            json.WriteNumberValue(page);
+        }
+        json.WriteEndArray();
+    }
+
+    /// <summary>
+    /// Writes the properties of the search summary record
+    /// </summary>
+    private static void WriteSummaryProperties(Utf8JsonWriter json, BookSearchResult result)
+    {
+        json.WriteBoolean("success", result.Success);
+        json.WriteString("errorMessage", result.ErrorMessage);
+        json.WriteNumber("totalHits", result.TotalHits);
+        json.WriteNumber("indexedBooks", result.IndexedBookCount);
+        json.WriteNumber("staleBooks", result.StaleBookCount);
+        json.WriteNumber("elapsedMilliseconds", Math.Round(result.Elapsed.TotalMilliseconds, 3));
+    }
+}
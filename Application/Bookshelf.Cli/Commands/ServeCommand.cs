@@ -0,0 +1,88 @@
+using System.ComponentModel;
+using System.Net.Sockets;
+using System.Runtime.InteropServices;
+using Bookshelf.Cli.Logging;
+using Bookshelf.Cli.Server;
+using Spectre.Console;
+using Spectre.Console.Cli;
+
+namespace Bookshelf.Cli.Commands;
+
+/// <summary>
+/// Command settings for the serve command
+/// </summary>
+public sealed class ServeSettings : LoggingSettings
+{
+    /// <summary>
+    /// Gets or sets the path of the Unix domain socket to listen on
+    /// </summary>
+    [CommandOption("--socket <PATH>")]
+    [Description("Unix domain socket to listen on (default: $BOOKSHELF_SERVER, or a per-user socket in the runtime or temp directory)")]
+    public string? SocketPath { get; set; }
+
+    /// <summary>
+    /// Gets the socket to listen on, which is the one clients forward to without <c>--server=PATH</c>
+    /// </summary>
+    public string GetSocketPath()
+    {
+        var hasSocketPath = !string.IsNullOrWhiteSpace(SocketPath);
+        if (hasSocketPath)
+        {
+            return SocketPath!;
+        }
+
+        var environmentSocketPath = Environment.GetEnvironmentVariable(ServerProtocol.SocketEnvironmentVariable);
+        var hasEnvironmentSocketPath = !string.IsNullOrWhiteSpace(environmentSocketPath);
+        return hasEnvironmentSocketPath ? environmentSocketPath! : ServerProtocol.GetDefaultSocketPath();
+    }
+}
+
+/// <summary>
+/// Command keeping the bookshelf services alive and running the commands that clients forward to them
+/// </summary>
+public sealed class ServeCommand : AsyncCommand<ServeSettings>
+{
+    private readonly BookshelfServer _server;
+
+    /// <summary>
+    /// Initializes a new instance of the ServeCommand class
+    /// </summary>
+    /// <param name="server">The server</param>
+    public ServeCommand(BookshelfServer server)
+    {
+        _server = server ?? throw new ArgumentNullException(nameof(server));
+    }
+
+    /// <summary>
+    /// Executes the serve command until Ctrl+C or SIGTERM
+    /// </summary>
+    public override async Task<int> ExecuteAsync(CommandContext context, ServeSettings settings, CancellationToken cancellationToken)
+    {
+        using var stopping = CancellationTokenSource.CreateLinkedTokenSource(cancellationToken);
+        void Stop(PosixSignalContext signal)
+        {
+            signal.Cancel = true;
+            stopping.Cancel();
+        }
+
+        using var interruptRegistration = PosixSignalRegistration.Create(PosixSignal.SIGINT, Stop);
+        using var terminateRegistration = PosixSignalRegistration.Create(PosixSignal.SIGTERM, Stop);
+
+        var socketPath = settings.GetSocketPath();
+        AnsiConsole.MarkupLine($"[green]Serving bookshelf commands on[/] [cyan]{Markup.Escape(socketPath)}[/]");
+        AnsiConsole.MarkupLine(
+            $"[grey]Forward commands with --server=PATH or {ServerProtocol.SocketEnvironmentVariable}=PATH, " +
+            "press Ctrl+C to stop[/]");
+
+        try
+        {
+            await _server.RunAsync(socketPath, stopping.Token);
+            return 0;
+        }
+        catch (Exception ex) when (ex is InvalidOperationException or SocketException or IOException or UnauthorizedAccessException)
+        {
+            AnsiConsole.MarkupLine($"[red]✗ Error: {Markup.Escape(ex.Message)}[/]");
+            return 1;
+        }
+    }
+}
@@ -0,0 +1,20 @@
+namespace Bookshelf.Cli.Diagnostics;
+
+/// <summary>
+/// Aggregated durations of one stage of a run
+/// </summary>
+/// <param name="Stage">The stage name</param>
+/// <param name="Count">How often the stage ran</param>
+/// <param name="TotalMilliseconds">The summed duration of all runs, which exceeds the wall time when books are processed concurrently</param>
+/// <param name="MaxMilliseconds">The duration of the longest run</param>
+public sealed record StageMetrics(
+    string Stage,
+    long Count,
+    double TotalMilliseconds,
+    double MaxMilliseconds)
+{
+    /// <summary>
+    /// Gets the mean duration of a run
+    /// </summary>
+    public double MeanMilliseconds => Count == 0 ? 0 : TotalMilliseconds / Count;
+}
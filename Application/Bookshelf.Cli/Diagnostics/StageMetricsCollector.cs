@@ -0,0 +1,127 @@
+using System.Diagnostics;
+using System.Diagnostics.Metrics;
+using Bookshelf.Application.Core.Diagnostics;
+
+namespace Bookshelf.Cli.Diagnostics;
+
+/// <summary>
+/// Collects the stage durations and counters that the bookshelf services report while a command runs
+/// </summary>
+public sealed class StageMetricsCollector : IDisposable
+{
+    private readonly object _syncRoot = new();
+    private readonly MeterListener _listener;
+    private readonly Dictionary<string, StageMetrics> _stages = new(StringComparer.Ordinal);
+    private readonly Dictionary<string, long> _counters = new(StringComparer.Ordinal);
+    private readonly long _startTimestamp;
+
+    /// <summary>
+    /// Initializes a new instance of the StageMetricsCollector class and starts listening
+    /// </summary>
+    public StageMetricsCollector()
+    {
+        _startTimestamp = Stopwatch.GetTimestamp();
+        _listener = new MeterListener
+        {
+            InstrumentPublished = (instrument, listener) =>
+            {
+                var isBookshelfInstrument = instrument.Meter.Name == BookshelfTelemetry.SourceName;
+                if (isBookshelfInstrument)
+                {
+                    listener.EnableMeasurementEvents(instrument);
+                }
+            }
+        };
+        _listener.SetMeasurementEventCallback<double>(OnStageDuration);
+        _listener.SetMeasurementEventCallback<long>(OnCount);
+        _listener.Start();
+    }
+
+    /// <summary>
+    /// Creates the stage breakdown of everything measured so far
+    /// </summary>
+    /// <returns>The stage breakdown</returns>
+    public StageMetricsReport CreateReport()
+    {
+        lock (_syncRoot)
+        {
+            var stages = _stages.Values
+                .OrderByDescending(stage => stage.TotalMilliseconds)
+                .ToList();
+
+            return new StageMetricsReport(
+                Stopwatch.GetElapsedTime(_startTimestamp),
+                stages,
+                _counters.GetValueOrDefault(BookshelfTelemetry.BytesReadName),
+                _counters.GetValueOrDefault(BookshelfTelemetry.BytesWrittenName),
+                _counters.GetValueOrDefault(BookshelfTelemetry.PagesMergedName));
+        }
+    }
+
+    /// <summary>
+    /// Stops listening
+    /// </summary>
+    public void Dispose()
+    {
+        _listener.Dispose();
+    }
+
+    /// <summary>
+    /// Adds a stage duration to the stage it is tagged with
+    /// </summary>
+    private void OnStageDuration(
+        Instrument instrument,
+        double milliseconds,
+        ReadOnlySpan<KeyValuePair<string, object?>> tags,
+        object? state)
+    {
+        var stage = FindStage(tags);
+        if (stage == null)
+        {
+            return;
+        }
+
+        lock (_syncRoot)
+        {
+            var metrics = _stages.GetValueOrDefault(stage) ?? new StageMetrics(stage, 0, 0, 0);
+            _stages[stage] = metrics with
+            {
+                Count = metrics.Count + 1,
+                TotalMilliseconds = metrics.TotalMilliseconds + milliseconds,
+                MaxMilliseconds = Math.Max(metrics.MaxMilliseconds, milliseconds)
+            };
+        }
+    }
+
+    /// <summary>
+    /// Adds a counter increment to the total of its counter
+    /// </summary>
+    private void OnCount(
+        Instrument instrument,
+        long increment,
+        ReadOnlySpan<KeyValuePair<string, object?>> tags,
+        object? state)
+    {
+        lock (_syncRoot)
+        {
+            _counters[instrument.Name] = _counters.GetValueOrDefault(instrument.Name) + increment;
+        }
+    }
+
+    /// <summary>
+    /// Finds the stage tag of a measurement
+    /// </summary>
+    private static string? FindStage(ReadOnlySpan<KeyValuePair<string, object?>> tags)
+    {
+        foreach (var tag in tags)
+        {
+            var isStageTag = tag.Key == BookshelfTelemetry.StageTagName;
+            if (isStageTag)
+            {
+                return tag.Value as string;
+            }
+        }
+
+        return null;
+    }
+}
@@ -0,0 +1,16 @@
+namespace Bookshelf.Cli.Diagnostics;
+
+/// <summary>
+/// Stage breakdown of a run
+/// </summary>
+/// <param name="Elapsed">The wall time of the run</param>
+/// <param name="Stages">The stages, ordered by total duration with the longest first</param>
+/// <param name="BytesRead">The bytes read from source files</param>
+/// <param name="BytesWritten">The bytes written to the bookshelf</param>
+/// <param name="PagesMerged">The pages written to merged collections</param>
+public sealed record StageMetricsReport(
+    TimeSpan Elapsed,
+    IReadOnlyList<StageMetrics> Stages,
+    long BytesRead,
+    long BytesWritten,
+    long PagesMerged);
@@ -0,0 +1,130 @@
+using System.Diagnostics;
+using System.Text.Json;
+using Spectre.Console;
+
+namespace Bookshelf.Cli.Diagnostics;
+
+/// <summary>
+/// Prints the stage breakdown of a run and exports it to a file
+/// </summary>
+public static class StageMetricsReporter
+{
+    /// <summary>
+    /// Prints the stage breakdown and exports it if a file is given
+    /// </summary>
+    /// <param name="report">The stage breakdown</param>
+    /// <param name="filePath">The path of the export file, or null to only print the breakdown</param>
+    /// <param name="isMachineReadable">Whether standard output holds JSON records, in which case the breakdown goes to standard error</param>
+    public static void Report(StageMetricsReport report, string? filePath, bool isMachineReadable)
+    {
+        var console = isMachineReadable
+            ? AnsiConsole.Create(new AnsiConsoleSettings { Out = new AnsiConsoleOutput(Console.Error) })
+            : AnsiConsole.Console;
+
+        console.WriteLine();
+        Render(console, report);
+
+        var hasExportFile = !string.IsNullOrWhiteSpace(filePath);
+        if (!hasExportFile)
+        {
+            return;
+        }
+
+        try
+        {
+            Export(filePath!, report);
+            console.MarkupLine($"[grey]Metrics exported to[/] [cyan]{Markup.Escape(filePath!)}[/]");
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException)
+        {
+            console.MarkupLine($"[yellow]⚠ Unable to export metrics: {Markup.Escape(ex.Message)}[/]");
+        }
+    }
+
+    /// <summary>
+    /// Renders the stage breakdown as a table
+    /// </summary>
+    /// <param name="console">The console to render to</param>
+    /// <param name="report">The stage breakdown</param>
+    public static void Render(IAnsiConsole console, StageMetricsReport report)
+    {
+        var table = new Table()
+            .Border(TableBorder.Rounded)
+            .BorderColor(Color.Grey)
+            .Title("[bold]Stage Timings[/]")
+            .AddColumn("[bold]Stage[/]")
+            .AddColumn("[bold]Count[/]", column => column.RightAligned())
+            .AddColumn("[bold]Total[/]", column => column.RightAligned())
+            .AddColumn("[bold]Mean[/]", column => column.RightAligned())
+            .AddColumn("[bold]Max[/]", column => column.RightAligned());
+
+        foreach (var stage in report.Stages)
+        {
+            table.AddRow(
+                stage.Stage,
+                stage.Count.ToString(),
+                FormatMilliseconds(stage.TotalMilliseconds),
+                FormatMilliseconds(stage.MeanMilliseconds),
+                FormatMilliseconds(stage.MaxMilliseconds));
+        }
+
+        console.Write(table);
+        console.MarkupLine($"[grey]Wall time:[/] {report.Elapsed.TotalSeconds:F2} s  " +
+            $"[grey]Read:[/] {FormatMegabytes(report.BytesRead)}  " +
+            $"[grey]Written:[/] {FormatMegabytes(report.BytesWritten)}  " +
+            $"[grey]Pages merged:[/] {report.PagesMerged}");
+        console.MarkupLine("[grey]Totals add up the time of all workers, so they exceed the wall time when books are processed concurrently.[/]");
+    }
+
+    /// <summary>
+    /// Exports the stage breakdown as a JSON file
+    /// </summary>
+    /// <param name="filePath">The path of the file, which is replaced if it exists</param>
+    /// <param name="report">The stage breakdown</param>
+    public static void Export(string filePath, StageMetricsReport report)
+    {
+        // Precondition
+        Debug.Assert(!string.IsNullOrWhiteSpace(filePath), "File path must not be null");
+
+        using var stream = File.Create(filePath);
+        using var json = new Utf8JsonWriter(stream, new JsonWriterOptions { Indented = true });
+
+        json.WriteStartObject();
+        json.WriteNumber("elapsedMilliseconds", report.Elapsed.TotalMilliseconds);
+        json.WriteNumber("bytesRead", report.BytesRead);
+        json.WriteNumber("bytesWritten", report.BytesWritten);
+        json.WriteNumber("pagesMerged", report.PagesMerged);
+
+        json.WriteStartArray("stages");
+        foreach (var stage in report.Stages)
+        {
+            json.WriteStartObject();
+            json.WriteString("stage", stage.Stage);
+            json.WriteNumber("count", stage.Count);
+            json.WriteNumber("totalMilliseconds", stage.TotalMilliseconds);
+            json.WriteNumber("meanMilliseconds", stage.MeanMilliseconds);
+            json.WriteNumber("maxMilliseconds", stage.MaxMilliseconds);
+            json.WriteEndObject();
+        }
+        json.WriteEndArray();
+
+        json.WriteEndObject();
+    }
+
+    /// <summary>
+    /// Formats a duration in milliseconds, switching to seconds for long durations
+    /// </summary>
+    private static string FormatMilliseconds(double milliseconds)
+    {
+        var isSecondsRange = milliseconds >= 1000;
+        return isSecondsRange ? $"{milliseconds / 1000:F2} s" : $"{milliseconds:F1} ms";
+    }
+
+    /// <summary>
+    /// Formats a byte count in megabytes
+    /// </summary>
+    private static string FormatMegabytes(long bytes)
+    {
+        return $"{bytes / (1024.0 * 1024.0):F1} MB";
+    }
+}
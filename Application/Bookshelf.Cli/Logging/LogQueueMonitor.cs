@@ -0,0 +1,28 @@
+using Serilog.Sinks.Async;
+
+namespace Bookshelf.Cli.Logging;
+
+/// <summary>
+/// Observes the background log queue to report events dropped because the queue was full
+/// </summary>
+public sealed class LogQueueMonitor : IAsyncLogEventSinkMonitor
+{
+    private IAsyncLogEventSinkInspector? _inspector;
+
+    /// <summary>
+    /// Gets the number of log events dropped so far
+    /// </summary>
+    public long DroppedEventCount => _inspector?.DroppedMessagesCount ?? 0;
+
+    /// <inheritdoc />
+    public void StartMonitoring(IAsyncLogEventSinkInspector inspector)
+    {
+        _inspector = inspector;
+    }
+
+    /// <inheritdoc />
+    public void StopMonitoring(IAsyncLogEventSinkInspector inspector)
+    {
+        // The inspector keeps its counts after the queue is closed, so they can still be reported
+    }
+}
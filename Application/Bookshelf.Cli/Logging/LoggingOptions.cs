@@ -0,0 +1,188 @@
+using Microsoft.Extensions.Logging;
+using Serilog;
+using Serilog.Core;
+using Serilog.Events;
+using Serilog.Sinks.Async;
+
+namespace Bookshelf.Cli.Logging;
+
+/// <summary>
+/// Logging options read from the command line before it is parsed into command settings
+/// </summary>
+/// <remarks>
+/// The logger has to exist before the commands are resolved, so the options declared by <see cref="LoggingSettings"/>
+/// and the output format are looked up in the raw arguments. Invalid values fall back to the defaults here and are
+/// reported by the settings validation.
+/// </remarks>
+/// <param name="MinimumLevel">The minimum level of log events that are written</param>
+/// <param name="BufferSize">The number of log events queued for the background writer</param>
+/// <param name="BlockWhenFull">Whether logging waits for the background writer when the queue is full instead of dropping events</param>
+/// <param name="LogsToStandardError">Whether console logs go to standard error because standard output holds JSON records</param>
+/// <param name="IsServing">Whether the process serves forwarded commands, which each set their own minimum level</param>
+public sealed record LoggingOptions(
+    LogEventLevel MinimumLevel = LoggingOptions.DefaultLevel,
+    int BufferSize = LoggingOptions.DefaultBufferSize,
+    bool BlockWhenFull = false,
+    bool LogsToStandardError = false,
+    bool IsServing = false)
+{
+    /// <summary>
+    /// Level logged without <c>--log-level</c>
+    /// </summary>
+    public const LogEventLevel DefaultLevel = LogEventLevel.Information;
+
+    /// <summary>
+    /// Level logged with <c>--quiet</c>
+    /// </summary>
+    public const LogEventLevel QuietLevel = LogEventLevel.Warning;
+
+    /// <summary>
+    /// Number of log events queued without <c>--log-buffer</c>
+    /// </summary>
+    public const int DefaultBufferSize = 10_000;
+
+    /// <summary>
+    /// Names of the levels accepted by <c>--log-level</c>
+    /// </summary>
+    public const string LevelNames = "verbose, debug, information, warning, error, fatal";
+
+    /// <summary>
+    /// Gets the minimum level for Microsoft.Extensions.Logging, which filters events before they reach Serilog
+    /// </summary>
+    /// <remarks>
+    /// A server lets every event through, since the level switch of the logger changes with each forwarded command.
+    /// </remarks>
+    public LogLevel MicrosoftMinimumLevel => IsServing ? LogLevel.Trace : MinimumLevel switch
+    {
+        LogEventLevel.Verbose => LogLevel.Trace,
+        LogEventLevel.Debug => LogLevel.Debug,
+        LogEventLevel.Information => LogLevel.Information,
+        LogEventLevel.Warning => LogLevel.Warning,
+        LogEventLevel.Error => LogLevel.Error,
+        _ => LogLevel.Critical
+    };
+
+    /// <summary>
+    /// Reads the logging options from the command line arguments
+    /// </summary>
+    /// <param name="args">The command line arguments</param>
+    /// <returns>The logging options</returns>
+    public static LoggingOptions FromArgs(IReadOnlyList<string> args)
+    {
+        var isQuiet = args.Any(arg => arg is "-q" or "--quiet");
+
+        var minimumLevel = DefaultLevel;
+        var levelValue = FindOptionValue(args, "--log-level");
+        if (isQuiet)
+        {
+            minimumLevel = QuietLevel;
+        }
+        else if (levelValue != null && TryParseLevel(levelValue, out var level))
+        {
+            minimumLevel = level;
+        }
+
+        var bufferValue = FindOptionValue(args, "--log-buffer");
+        var hasValidBufferSize = int.TryParse(bufferValue, out var bufferSize) && bufferSize > 0;
+
+        var overflowValue = FindOptionValue(args, "--log-overflow");
+        var blocksWhenFull = string.Equals(overflowValue, "block", StringComparison.OrdinalIgnoreCase);
+
+        var outputValue = FindOptionValue(args, "-o") ?? FindOptionValue(args, "--output");
+        var isMachineReadableOutput = string.Equals(outputValue, "json", StringComparison.OrdinalIgnoreCase)
+            || string.Equals(outputValue, "ndjson", StringComparison.OrdinalIgnoreCase);
+
+        // A server cannot know whether a forwarded command writes JSON records, so it keeps standard output clear
+        var isServing = args.Count > 0 && args[0] == "serve";
+
+        return new LoggingOptions(
+            minimumLevel,
+            hasValidBufferSize ? bufferSize : DefaultBufferSize,
+            blocksWhenFull,
+            isMachineReadableOutput || isServing,
+            isServing);
+    }
+
+    /// <summary>
+    /// Parses a level name accepted by <c>--log-level</c>
+    /// </summary>
+    /// <param name="value">The level name</param>
+    /// <param name="level">The parsed level</param>
+    /// <returns>True if the name is a valid level</returns>
+    public static bool TryParseLevel(string value, out LogEventLevel level)
+    {
+        LogEventLevel? parsedLevel = value.ToLowerInvariant() switch
+        {
+            "verbose" => LogEventLevel.Verbose,
+            "debug" => LogEventLevel.Debug,
+            "information" => LogEventLevel.Information,
+            "warning" => LogEventLevel.Warning,
+            "error" => LogEventLevel.Error,
+            "fatal" => LogEventLevel.Fatal,
+            _ => null
+        };
+
+        level = parsedLevel ?? DefaultLevel;
+        return parsedLevel.HasValue;
+    }
+
+    /// <summary>
+    /// Creates the logger, writing to the console and the log file from a bounded background queue
+    /// </summary>
+    /// <remarks>
+    /// Callers only enqueue events; formatting and console and file I/O happen on the queue's worker thread, so
+    /// logging does not compete with merging for the calling threads.
+    /// </remarks>
+    /// <param name="queueMonitor">The monitor observing the queue</param>
+    /// <param name="levelSwitch">The switch controlling the minimum level, starting at <see cref="MinimumLevel"/></param>
+    /// <returns>The configured logger</returns>
+    public Serilog.ILogger CreateLogger(IAsyncLogEventSinkMonitor queueMonitor, LoggingLevelSwitch levelSwitch)
+    {
+        LogEventLevel? standardErrorFromLevel = LogsToStandardError ? LogEventLevel.Verbose : null;
+
+        return new LoggerConfiguration()
+            .MinimumLevel.ControlledBy(levelSwitch)
+            .MinimumLevel.Override("Microsoft", LogEventLevel.Information)
+            .Enrich.FromLogContext()
+            .WriteTo.Async(
+                sinks =>
+                {
+                    sinks.Console(
+                        outputTemplate: "[{Timestamp:HH:mm:ss} {Level:u3}] {Message:lj}{NewLine}{Exception}",
+                        standardErrorFromLevel: standardErrorFromLevel);
+                    sinks.File(
+                        path: "logs/bookshelf-.log",
+                        rollingInterval: RollingInterval.Day,
+                        outputTemplate: "{Timestamp:yyyy-MM-dd HH:mm:ss.fff zzz} [{Level:u3}] {Message:lj}{NewLine}{Exception}");
+                },
+                bufferSize: BufferSize,
+                blockWhenFull: BlockWhenFull,
+                monitor: queueMonitor)
+            .CreateLogger();
+    }
+
+    /// <summary>
+    /// Finds the value of an option given as <c>name value</c> or <c>name=value</c>
+    /// </summary>
+    private static string? FindOptionValue(IReadOnlyList<string> args, string optionName)
+    {
+        var valuePrefix = optionName + "=";
+
+        for (var index = 0; index < args.Count; index++)
+        {
+            var arg = args[index];
+            var isOption = arg == optionName;
+            if (isOption && index + 1 < args.Count)
+            {
+                return args[index + 1];
+            }
+
+            if (arg.StartsWith(valuePrefix, StringComparison.Ordinal))
+            {
+                return arg[valuePrefix.Length..];
+            }
+        }
+
+        return null;
+    }
+}
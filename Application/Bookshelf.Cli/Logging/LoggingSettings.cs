@@ -0,0 +1,73 @@
+using System.ComponentModel;
+using Spectre.Console;
+using Spectre.Console.Cli;
+
+namespace Bookshelf.Cli.Logging;
+
+/// <summary>
+/// Command settings controlling the log output, shared by all commands
+/// </summary>
+/// <remarks>
+/// The logger is created from <see cref="LoggingOptions.FromArgs"/> before these settings are bound; they declare and
+/// validate the options so that they appear in the help and invalid values are reported.
+/// </remarks>
+public abstract class LoggingSettings : CommandSettings
+{
+    /// <summary>
+    /// Gets or sets the minimum level of log events
+    /// </summary>
+    [CommandOption("--log-level <LEVEL>")]
+    [Description("Minimum level of log events: verbose, debug, information, warning, error, or fatal")]
+    [DefaultValue("information")]
+    public string LogLevel { get; set; } = "information";
+
+    /// <summary>
+    /// Gets or sets whether only warnings and errors are logged
+    /// </summary>
+    [CommandOption("-q|--quiet")]
+    [Description("Only log warnings and errors, dropping per-file events before they are formatted (overrides --log-level)")]
+    [DefaultValue(false)]
+    public bool Quiet { get; set; }
+
+    /// <summary>
+    /// Gets or sets the number of log events queued for the background writer
+    /// </summary>
+    [CommandOption("--log-buffer <COUNT>")]
+    [Description("Number of log events queued for the background log writer")]
+    [DefaultValue(LoggingOptions.DefaultBufferSize)]
+    public int LogBufferSize { get; set; } = LoggingOptions.DefaultBufferSize;
+
+    /// <summary>
+    /// Gets or sets what happens when the log queue is full
+    /// </summary>
+    [CommandOption("--log-overflow <POLICY>")]
+    [Description("When the log queue is full: drop (discard new events) or block (wait for the log writer)")]
+    [DefaultValue("drop")]
+    public string LogOverflow { get; set; } = "drop";
+
+    /// <summary>
+    /// Validates the logging settings
+    /// </summary>
+    public override ValidationResult Validate()
+    {
+        var isValidLogLevel = LoggingOptions.TryParseLevel(LogLevel, out _);
+        if (!isValidLogLevel)
+        {
+            return ValidationResult.Error($"Invalid log level: {LogLevel}. Valid options: {LoggingOptions.LevelNames}");
+        }
+
+        if (LogBufferSize < 1)
+        {
+            return ValidationResult.Error($"Log buffer must hold at least 1 event: {LogBufferSize}");
+        }
+
+        var validOverflowPolicies = new[] { "drop", "block" };
+        var isValidOverflowPolicy = validOverflowPolicies.Contains(LogOverflow.ToLowerInvariant());
+        if (!isValidOverflowPolicy)
+        {
+            return ValidationResult.Error($"Invalid log overflow policy: {LogOverflow}. Valid options: drop, block");
+        }
+
+        return ValidationResult.Success();
+    }
+}
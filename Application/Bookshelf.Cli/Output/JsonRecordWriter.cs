@@ -0,0 +1,148 @@
+using System.Diagnostics;
+using System.Text.Encodings.Web;
+using System.Text.Json;
+
+namespace Bookshelf.Cli.Output;
+
+/// <summary>
+/// Writes machine-readable records to a stream as soon as they are produced
+/// </summary>
+/// <remarks>
+/// In <see cref="OutputFormat.Json"/> mode the records form one JSON document that is written incrementally, in
+/// <see cref="OutputFormat.Ndjson"/> mode every record is a line of its own with a <c>type</c> property.
+/// Each record is flushed right away, so consumers can process the first records while later ones are still
+/// produced and no record is held in memory after it is written.
+/// </remarks>
+public sealed class JsonRecordWriter : IDisposable
+{
+    private static readonly byte[] RecordSeparator = "\n"u8.ToArray();
+
+    private readonly object _syncRoot = new();
+    private readonly Stream _output;
+    private readonly Utf8JsonWriter _writer;
+    private readonly bool _isNdjson;
+    private bool _isEnclosedInObject;
+
+    /// <summary>
+    /// Initializes a new instance of the JsonRecordWriter class
+    /// </summary>
+    /// <param name="output">The stream the records are written to, which is not disposed with the writer</param>
+    /// <param name="format">The machine-readable output format</param>
+    public JsonRecordWriter(Stream output, OutputFormat format)
+    {
+        // Precondition
+        Debug.Assert(format != OutputFormat.Text, "Text output is not written as records");
+
+        _output = output ?? throw new ArgumentNullException(nameof(output));
+        _isNdjson = format == OutputFormat.Ndjson;
+        _writer = new Utf8JsonWriter(output, new JsonWriterOptions
+        {
+            Encoder = JavaScriptEncoder.UnsafeRelaxedJsonEscaping
+        });
+    }
+
+    /// <summary>
+    /// Starts the records, as a top-level array or as an array property of a top-level object if a name is given
+    /// </summary>
+    /// <param name="recordsPropertyName">The name of the records property, or null for a top-level array</param>
+    public void WriteStart(string? recordsPropertyName = null)
+    {
+        if (_isNdjson)
+        {
+            return;
+        }
+
+        lock (_syncRoot)
+        {
+            var hasRecordsProperty = recordsPropertyName != null;
+            if (hasRecordsProperty)
+            {
+                _writer.WriteStartObject();
+                _writer.WritePropertyName(recordsPropertyName!);
+                _isEnclosedInObject = true;
+            }
+
+            _writer.WriteStartArray();
+            _writer.Flush();
+        }
+    }
+
+    /// <summary>
+    /// Writes a record and flushes it to the stream; may be called from several threads
+    /// </summary>
+    /// <param name="recordType">The record type, written as the <c>type</c> property in NDJSON mode</param>
+    /// <param name="writeProperties">Writes the properties of the record</param>
+    public void WriteRecord(string recordType, Action<Utf8JsonWriter> writeProperties)
+    {
+        lock (_syncRoot)
+        {
+            _writer.WriteStartObject();
+            if (_isNdjson)
+            {
+                _writer.WriteString("type", recordType);
+            }
+
+            writeProperties(_writer);
+            _writer.WriteEndObject();
+            _writer.Flush();
+
+            if (_isNdjson)
+            {
+                // Every line is a JSON document of its own
+                _output.Write(RecordSeparator);
+                _writer.Reset();
+            }
+
+            _output.Flush();
+        }
+    }
+
+    /// <summary>
+    /// Ends the records, followed by an optional closing record such as a summary
+    /// </summary>
+    /// <param name="closingRecordType">The closing record type, used as property name in JSON mode</param>
+    /// <param name="writeClosingProperties">Writes the properties of the closing record, or null for none</param>
+    public void WriteEnd(string? closingRecordType = null, Action<Utf8JsonWriter>? writeClosingProperties = null)
+    {
+        var hasClosingRecord = closingRecordType != null && writeClosingProperties != null;
+        if (_isNdjson)
+        {
+            if (hasClosingRecord)
+            {
+                WriteRecord(closingRecordType!, writeClosingProperties!);
+            }
+
+            return;
+        }
+
+        lock (_syncRoot)
+        {
+            // Precondition
+            Debug.Assert(!hasClosingRecord || _isEnclosedInObject, "A closing record requires a records property");
+
+            _writer.WriteEndArray();
+            if (_isEnclosedInObject)
+            {
+                if (hasClosingRecord)
+                {
+                    _writer.WritePropertyName(closingRecordType!);
+                    _writer.WriteStartObject();
+                    writeClosingProperties!(_writer);
+                    _writer.WriteEndObject();
+                }
+
+                _writer.WriteEndObject();
+            }
+
+            _writer.Flush();
+            _output.Write(RecordSeparator);
+            _output.Flush();
+        }
+    }
+
+    /// <inheritdoc />
+    public void Dispose()
+    {
+        _writer.Dispose();
+    }
+}
@@ -0,0 +1,22 @@
+namespace Bookshelf.Cli.Output;
+
+/// <summary>
+/// Specifies how a command writes its results
+/// </summary>
+public enum OutputFormat
+{
+    /// <summary>
+    /// Panels and tables for reading in a terminal
+    /// </summary>
+    Text,
+
+    /// <summary>
+    /// One JSON document that is written incrementally while results are produced
+    /// </summary>
+    Json,
+
+    /// <summary>
+    /// Newline-delimited JSON with one record per line
+    /// </summary>
+    Ndjson
+}
@@ -0,0 +1,32 @@
+namespace Bookshelf.Cli.Output;
+
+/// <summary>
+/// Gives commands the stream behind standard output, which the server redirects to the client of a request
+/// </summary>
+/// <remarks>
+/// <see cref="Console.SetOut"/> only redirects text written through <see cref="Console.Out"/>, while
+/// <see cref="Console.OpenStandardOutput()"/> always returns the standard output of the process. Commands writing
+/// bytes open standard output here, so their output reaches the client when they run in the server.
+/// </remarks>
+public static class StandardStreams
+{
+    private static Stream? _redirectedOutput;
+
+    /// <summary>
+    /// Opens standard output for writing bytes
+    /// </summary>
+    /// <returns>The redirected stream if there is one, otherwise the standard output of the process</returns>
+    public static Stream OpenOutput()
+    {
+        return _redirectedOutput ?? Console.OpenStandardOutput();
+    }
+
+    /// <summary>
+    /// Redirects standard output to a stream, or restores the standard output of the process
+    /// </summary>
+    /// <param name="output">The stream receiving the output, or null to restore the standard output of the process</param>
+    public static void RedirectOutput(Stream? output)
+    {
+        _redirectedOutput = output;
+    }
+}
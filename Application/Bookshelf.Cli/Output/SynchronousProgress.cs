@@ -0,0 +1,29 @@
+namespace Bookshelf.Cli.Output;
+
+/// <summary>
+/// Reports progress on the calling thread
+/// </summary>
+/// <remarks>
+/// Unlike <see cref="Progress{T}"/>, which posts every report to the thread pool, a report has been handled when
+/// <see cref="Report"/> returns, so records written by the handler cannot arrive after the command has finished.
+/// </remarks>
+/// <typeparam name="T">The type of the progress value</typeparam>
+public sealed class SynchronousProgress<T> : IProgress<T>
+{
+    private readonly Action<T> _handler;
+
+    /// <summary>
+    /// Initializes a new instance of the SynchronousProgress class
+    /// </summary>
+    /// <param name="handler">The handler called for every reported value</param>
+    public SynchronousProgress(Action<T> handler)
+    {
+        _handler = handler ?? throw new ArgumentNullException(nameof(handler));
+    }
+
+    /// <inheritdoc />
+    public void Report(T value)
+    {
+        _handler(value);
+    }
+}
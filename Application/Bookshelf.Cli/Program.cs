@@ -1,23 +1,42 @@
 ﻿using Bookshelf.Application;
+using Bookshelf.Application.Api;
+using Bookshelf.Cli;
 using Bookshelf.Cli.Commands;
+using Bookshelf.Cli.Logging;
+using Bookshelf.Cli.Server;
 using Bookshelf.Infrastructure;
 using Microsoft.Extensions.DependencyInjection;
+using Microsoft.Extensions.Logging;
 using Serilog;
-using Serilog.Events;
+using Serilog.Core;
 using Spectre.Console.Cli;
 
-// Configure Serilog
-Log.Logger = new LoggerConfiguration()
-    .MinimumLevel.Debug()
-    .MinimumLevel.Override("Microsoft", LogEventLevel.Information)
-    .Enrich.FromLogContext()
-    .WriteTo.Console(
-        outputTemplate: "[{Timestamp:HH:mm:ss} {Level:u3}] {Message:lj}{NewLine}{Exception}")
-    .WriteTo.File(
-        path: "logs/bookshelf-.log",
-        rollingInterval: RollingInterval.Day,
-        outputTemplate: "{Timestamp:yyyy-MM-dd HH:mm:ss.fff zzz} [{Level:u3}] {Message:lj}{NewLine}{Exception}")
-    .CreateLogger();
+// Forward the command to a running server if one is configured, before anything else is set up
+var forwardsCommand = BookshelfClient.TryGetServerSocket(args, out var serverSocketPath, out var commandArgs);
+if (forwardsCommand)
+{
+    var forwardedExitCode = await BookshelfClient.RunAsync(serverSocketPath, commandArgs);
+    if (forwardedExitCode.HasValue)
+    {
+        return forwardedExitCode.Value;
+    }
+
+    await Console.Error.WriteLineAsync(
+        $"Warning: No bookshelf server is listening on {serverSocketPath}, running the command in this process");
+}
+
+args = commandArgs;
+
+// Configure Serilog with the logging options of the command line, writing from a background queue. Help and version
+// output run no command, so they keep the silent default logger and skip the queue thread and the log file.
+var loggingOptions = LoggingOptions.FromArgs(args);
+var logQueueMonitor = new LogQueueMonitor();
+var logLevelSwitch = new LoggingLevelSwitch(loggingOptions.MinimumLevel);
+var runsCommand = !BookshelfCommandApp.IsHelpOrVersionRequest(args);
+if (runsCommand)
+{
+    Log.Logger = loggingOptions.CreateLogger(logQueueMonitor, logLevelSwitch);
+}
 
 try
 {
@@ -29,38 +48,40 @@ try
     // Register logging
     services.AddLogging(loggingBuilder =>
     {
+        loggingBuilder.SetMinimumLevel(loggingOptions.MicrosoftMinimumLevel);
         loggingBuilder.AddSerilog(dispose: true);
     });
+    services.AddSingleton(logLevelSwitch);
     
     // Register application and infrastructure services
     services.AddApplicationServices();
     services.AddInfrastructureServices();
     
-    // Register commands
-    services.AddTransient<ConsolidateCommand>();
-    services.AddTransient<ListCommand>();
+    // Register commands with factories, so resolving them needs no reflection
+    services.AddTransient(serviceProvider => new ConsolidateCommand(
+        serviceProvider.GetRequiredService<IBookshelfConsolidationService>()));
+    services.AddTransient(serviceProvider => new ListCommand(
+        serviceProvider.GetRequiredService<IBookshelfListService>()));
+    services.AddTransient(serviceProvider => new IndexCommand(
+        serviceProvider.GetRequiredService<IBookshelfIndexService>()));
+    services.AddTransient(serviceProvider => new SearchCommand(
+        serviceProvider.GetRequiredService<IBookshelfIndexService>()));
+    services.AddTransient(serviceProvider => new EmbedCommand(
+        serviceProvider.GetRequiredService<IBookshelfRetrievalService>()));
+    services.AddTransient(serviceProvider => new RetrieveCommand(
+        serviceProvider.GetRequiredService<IBookshelfRetrievalService>()));
+    services.AddTransient(serviceProvider => new ServeCommand(
+        serviceProvider.GetRequiredService<BookshelfServer>()));
+    services.AddSingleton(serviceProvider => new BookshelfServer(
+        serviceProvider,
+        serviceProvider.GetRequiredService<LoggingLevelSwitch>(),
+        serviceProvider.GetRequiredService<ILogger<BookshelfServer>>()));
     
     // Build service provider
     var serviceProvider = services.BuildServiceProvider();
 
     // Create and configure the command app
-    var app = new CommandApp(new TypeRegistrar(serviceProvider));
-    
-    app.Configure(config =>
-    {
-        config.SetApplicationName("bookshelf");
-        
-        config.AddCommand<ConsolidateCommand>("consolidate")
-            .WithDescription("Consolidate scattered PDF files into a single bookshelf")
-            .WithExample("consolidate", "/path/to/source", "/path/to/bookshelf");
-
-        config.AddCommand<ListCommand>("list")
-            .WithDescription("List all books in a bookshelf")
-            .WithExample("list", "/path/to/bookshelf")
-            .WithExample("list", "/path/to/bookshelf", "--details")
-            .WithExample("list", "/path/to/bookshelf", "--filter", "Python")
-            .WithExample("list", "/path/to/bookshelf", "--sort", "size", "--reverse");
-    });
+    var app = BookshelfCommandApp.Create(serviceProvider);
 
     return await app.RunAsync(args);
 }
@@ -72,6 +93,14 @@ catch (Exception ex)
 finally
 {
     await Log.CloseAndFlushAsync();
+
+    var hasDroppedLogEvents = logQueueMonitor.DroppedEventCount > 0;
+    if (hasDroppedLogEvents)
+    {
+        await Console.Error.WriteLineAsync(
+            $"Warning: {logQueueMonitor.DroppedEventCount} log events were dropped because the log queue was full; " +
+            "raise --log-buffer or use --log-overflow block to keep them");
+    }
 }
 
 /// <summary>
@@ -80,15 +109,17 @@ finally
 internal sealed class TypeRegistrar : ITypeRegistrar
 {
     private readonly IServiceProvider _serviceProvider;
+    private readonly bool _ownsServiceProvider;
 
-    public TypeRegistrar(IServiceProvider serviceProvider)
+    public TypeRegistrar(IServiceProvider serviceProvider, bool ownsServiceProvider = true)
     {
         _serviceProvider = serviceProvider;
+        _ownsServiceProvider = ownsServiceProvider;
     }
 
     public ITypeResolver Build()
     {
-        return new TypeResolver(_serviceProvider);
+        return new TypeResolver(_serviceProvider, _ownsServiceProvider);
     }
 
     public void Register(Type service, Type implementation)
@@ -113,10 +144,12 @@ internal sealed class TypeRegistrar : ITypeRegistrar
 internal sealed class TypeResolver : ITypeResolver
 {
     private readonly IServiceProvider _serviceProvider;
+    private readonly bool _ownsServiceProvider;
 
-    public TypeResolver(IServiceProvider serviceProvider)
+    public TypeResolver(IServiceProvider serviceProvider, bool ownsServiceProvider)
     {
         _serviceProvider = serviceProvider;
+        _ownsServiceProvider = ownsServiceProvider;
     }
 
     public object? Resolve(Type? type)
@@ -126,7 +159,8 @@ internal sealed class TypeResolver : ITypeResolver
 
     public void Dispose()
     {
-        if (_serviceProvider is IDisposable disposable)
+        // Spectre disposes the resolver after every command, which must not end a server's shared provider
+        if (_ownsServiceProvider && _serviceProvider is IDisposable disposable)
         {
             disposable.Dispose();
         }
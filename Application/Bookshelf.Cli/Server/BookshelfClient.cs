@@ -0,0 +1,184 @@
+using System.Net.Sockets;
+using System.Text.Json;
+
+namespace Bookshelf.Cli.Server;
+
+/// <summary>
+/// Thin client forwarding a command to a running server and relaying its output and exit code
+/// </summary>
+/// <remarks>
+/// The client runs before the services are registered, so a forwarded command skips building the service
+/// provider, configuring the commands and loading the application assemblies.
+/// </remarks>
+public static class BookshelfClient
+{
+    /// <summary>
+    /// Option forwarding the command to the server on the default socket, or on the socket given as <c>--server=PATH</c>
+    /// </summary>
+    public const string ServerOption = "--server";
+
+    /// <summary>
+    /// Finds the socket of the server the command should be forwarded to
+    /// </summary>
+    /// <remarks>
+    /// Commands are forwarded when <c>--server</c> is given or <see cref="ServerProtocol.SocketEnvironmentVariable"/> is
+    /// set. The serve command itself always runs in this process.
+    /// </remarks>
+    /// <param name="args">The command line arguments</param>
+    /// <param name="socketPath">The socket of the server, if the command is forwarded</param>
+    /// <param name="commandArgs">The arguments without the server option</param>
+    /// <returns>True if the command should be forwarded</returns>
+    public static bool TryGetServerSocket(IReadOnlyList<string> args, out string socketPath, out string[] commandArgs)
+    {
+        var valuePrefix = ServerOption + "=";
+        bool IsServerOption(string arg) => arg == ServerOption || arg.StartsWith(valuePrefix, StringComparison.Ordinal);
+
+        var serverOptions = args.Where(IsServerOption).ToList();
+        commandArgs = args.Where(arg => !IsServerOption(arg)).ToArray();
+        socketPath = string.Empty;
+
+        var isServeCommand = commandArgs.Length > 0 && commandArgs[0] == "serve";
+        if (isServeCommand)
+        {
+            return false;
+        }
+
+        var environmentSocketPath = Environment.GetEnvironmentVariable(ServerProtocol.SocketEnvironmentVariable);
+        var hasEnvironmentSocketPath = !string.IsNullOrWhiteSpace(environmentSocketPath);
+        var hasServerOption = serverOptions.Count > 0;
+        if (!hasServerOption && !hasEnvironmentSocketPath)
+        {
+            return false;
+        }
+
+        var optionSocketPath = serverOptions
+            .LastOrDefault(arg => arg.StartsWith(valuePrefix, StringComparison.Ordinal))?[valuePrefix.Length..];
+        var hasOptionSocketPath = !string.IsNullOrWhiteSpace(optionSocketPath);
+
+        socketPath = hasOptionSocketPath ? optionSocketPath!
+            : hasEnvironmentSocketPath ? environmentSocketPath!
+            : ServerProtocol.GetDefaultSocketPath();
+        return true;
+    }
+
+    /// <summary>
+    /// Forwards a command to the server and relays its output until it exits
+    /// </summary>
+    /// <remarks>
+    /// The first Ctrl+C asks the server to cancel the command and keeps relaying its output, a second one ends the client.
+    /// </remarks>
+    /// <param name="socketPath">The socket of the server</param>
+    /// <param name="commandArgs">The command line arguments of the command</param>
+    /// <returns>The exit code of the command, or null if no server listens on the socket</returns>
+    public static async Task<int?> RunAsync(string socketPath, IReadOnlyList<string> commandArgs)
+    {
+        using var socket = new Socket(AddressFamily.Unix, SocketType.Stream, ProtocolType.Unspecified);
+        try
+        {
+            await socket.ConnectAsync(new UnixDomainSocketEndPoint(socketPath));
+        }
+        catch (SocketException)
+        {
+            return null;
+        }
+
+        await using var connection = new NetworkStream(socket, ownsSocket: false);
+        var request = new ServerRequest(
+            commandArgs,
+            Environment.CurrentDirectory,
+            Console.IsOutputRedirected,
+            GetTerminalWidth(),
+            !string.IsNullOrEmpty(Environment.GetEnvironmentVariable("NO_COLOR")));
+
+        var cancelRequested = 0;
+        void RequestCancellation(object? sender, ConsoleCancelEventArgs e)
+        {
+            var isFirstCancel = Interlocked.Exchange(ref cancelRequested, 1) == 0;
+            if (isFirstCancel)
+            {
+                e.Cancel = true;
+                _ = SendCancelAsync(connection);
+            }
+        }
+
+        try
+        {
+            await ServerProtocol.WriteFrameAsync(
+                connection, FrameType.Request, JsonSerializer.SerializeToUtf8Bytes(request, ServerJsonContext.Default.ServerRequest));
+
+            // Only listen for Ctrl+C once the request is sent, so the cancel frame cannot interleave with it
+            Console.CancelKeyPress += RequestCancellation;
+
+            await using var standardOutput = Console.OpenStandardOutput();
+            await using var standardError = Console.OpenStandardError();
+
+            while (true)
+            {
+                var frame = await ServerProtocol.ReadFrameAsync(connection);
+                if (frame == null)
+                {
+                    await Console.Error.WriteLineAsync($"Error: The bookshelf server on {socketPath} closed the connection");
+                    return 1;
+                }
+
+                switch (frame.Type)
+                {
+                    case FrameType.StandardOutput:
+                        await standardOutput.WriteAsync(frame.Payload);
+                        await standardOutput.FlushAsync();
+                        break;
+                    case FrameType.StandardError:
+                        await standardError.WriteAsync(frame.Payload);
+                        await standardError.FlushAsync();
+                        break;
+                    case FrameType.ExitCode:
+                        return ServerProtocol.DecodeExitCode(frame);
+                }
+            }
+        }
+        catch (Exception ex) when (ex is IOException or SocketException or InvalidDataException)
+        {
+            await Console.Error.WriteLineAsync($"Error: Lost the connection to the bookshelf server on {socketPath}: {ex.Message}");
+            return 1;
+        }
+        finally
+        {
+            Console.CancelKeyPress -= RequestCancellation;
+        }
+    }
+
+    /// <summary>
+    /// Asks the server to cancel the running command
+    /// </summary>
+    private static async Task SendCancelAsync(Stream connection)
+    {
+        try
+        {
+            await ServerProtocol.WriteFrameAsync(connection, FrameType.Cancel, ReadOnlyMemory<byte>.Empty);
+        }
+        catch (Exception ex) when (ex is IOException or SocketException or ObjectDisposedException)
+        {
+            // The command ended while the cancellation was sent
+        }
+    }
+
+    /// <summary>
+    /// Gets the width of the terminal, or 0 if standard output is not a terminal
+    /// </summary>
+    private static int GetTerminalWidth()
+    {
+        if (Console.IsOutputRedirected)
+        {
+            return 0;
+        }
+
+        try
+        {
+            return Console.WindowWidth;
+        }
+        catch (IOException)
+        {
+            return 0;
+        }
+    }
+}
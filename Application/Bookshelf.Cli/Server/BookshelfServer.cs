@@ -0,0 +1,350 @@
+using System.Net.Sockets;
+using System.Text;
+using System.Text.Json;
+using Bookshelf.Cli.Logging;
+using Bookshelf.Cli.Output;
+using Microsoft.Extensions.Logging;
+using Serilog.Core;
+using Spectre.Console;
+using Spectre.Console.Cli;
+
+namespace Bookshelf.Cli.Server;
+
+/// <summary>
+/// Long-lived server running the commands that clients forward over a Unix domain socket
+/// </summary>
+/// <remarks>
+/// The server keeps the service provider, the plugin factory, the loaded metadata caches and the JIT-compiled code
+/// alive between commands, so a forwarded command only pays for its own work. Commands run one at a time, because
+/// the console, the working directory and the log level they run with belong to the whole process.
+/// </remarks>
+public sealed class BookshelfServer
+{
+    private const UnixFileMode OwnerOnlyDirectoryMode =
+        UnixFileMode.UserRead | UnixFileMode.UserWrite | UnixFileMode.UserExecute;
+
+    private static readonly UTF8Encoding OutputEncoding = new(encoderShouldEmitUTF8Identifier: false);
+
+    private readonly CommandApp _app;
+    private readonly LoggingLevelSwitch _levelSwitch;
+    private readonly ILogger<BookshelfServer> _logger;
+    private readonly SemaphoreSlim _commandLock = new(1, 1);
+
+    /// <summary>
+    /// Initializes a new instance of the BookshelfServer class
+    /// </summary>
+    /// <param name="serviceProvider">The service provider shared by all forwarded commands</param>
+    /// <param name="levelSwitch">The switch controlling the minimum level of the logger</param>
+    /// <param name="logger">The logger</param>
+    public BookshelfServer(
+        IServiceProvider serviceProvider,
+        LoggingLevelSwitch levelSwitch,
+        ILogger<BookshelfServer> logger)
+    {
+        if (serviceProvider == null)
+        {
+            throw new ArgumentNullException(nameof(serviceProvider));
+        }
+
+        _app = BookshelfCommandApp.Create(serviceProvider, ownsServiceProvider: false);
+        _levelSwitch = levelSwitch ?? throw new ArgumentNullException(nameof(levelSwitch));
+        _logger = logger ?? throw new ArgumentNullException(nameof(logger));
+    }
+
+    /// <summary>
+    /// Listens on the socket and runs forwarded commands until cancelled
+    /// </summary>
+    /// <param name="socketPath">The path of the Unix domain socket</param>
+    /// <param name="cancellationToken">Cancellation token stopping the server</param>
+    /// <exception cref="InvalidOperationException">
+    /// Another server is already listening on the socket, or other users may write to the socket directory
+    /// </exception>
+    public async Task RunAsync(string socketPath, CancellationToken cancellationToken)
+    {
+        PrepareSocketPath(socketPath);
+
+        using var listener = new Socket(AddressFamily.Unix, SocketType.Stream, ProtocolType.Unspecified);
+        BindToCurrentUser(listener, socketPath);
+        listener.Listen();
+
+        _logger.LogInformation("Serving bookshelf commands on {SocketPath}", socketPath);
+
+        var connections = new List<Task>();
+        try
+        {
+            while (true)
+            {
+                var socket = await listener.AcceptAsync(cancellationToken);
+                connections.RemoveAll(connection => connection.IsCompleted);
+                connections.Add(HandleConnectionAsync(socket, cancellationToken));
+            }
+        }
+        catch (OperationCanceledException) when (cancellationToken.IsCancellationRequested)
+        {
+            _logger.LogInformation("Stopping bookshelf server on {SocketPath}", socketPath);
+        }
+        finally
+        {
+            await Task.WhenAll(connections);
+            File.Delete(socketPath);
+        }
+    }
+
+    /// <summary>
+    /// Creates the directory of the socket and removes a socket file left behind by a server that did not stop cleanly
+    /// </summary>
+    private static void PrepareSocketPath(string socketPath)
+    {
+        var socketDirectory = Path.GetDirectoryName(Path.GetFullPath(socketPath))!;
+        var isMissingDirectory = !Directory.Exists(socketDirectory);
+        if (isMissingDirectory)
+        {
+            // Only the current user may reach the socket through a directory the server creates
+            if (OperatingSystem.IsWindows())
+            {
+                Directory.CreateDirectory(socketDirectory);
+            }
+            else
+            {
+                Directory.CreateDirectory(socketDirectory, OwnerOnlyDirectoryMode);
+            }
+        }
+        else
+        {
+            EnsureOthersCannotReplaceSocket(socketDirectory);
+        }
+
+        var hasSocketFile = File.Exists(socketPath);
+        if (!hasSocketFile)
+        {
+            return;
+        }
+
+        using var probe = new Socket(AddressFamily.Unix, SocketType.Stream, ProtocolType.Unspecified);
+        try
+        {
+            probe.Connect(new UnixDomainSocketEndPoint(socketPath));
+        }
+        catch (SocketException)
+        {
+            File.Delete(socketPath);
+            return;
+        }
+
+        throw new InvalidOperationException($"A bookshelf server is already listening on {socketPath}");
+    }
+
+    /// <summary>
+    /// Refuses an existing socket directory in which other users could remove or replace the socket, which a
+    /// shared directory such as /tmp only prevents with its sticky bit
+    /// </summary>
+    private static void EnsureOthersCannotReplaceSocket(string socketDirectory)
+    {
+        if (OperatingSystem.IsWindows())
+        {
+            return;
+        }
+
+        var mode = File.GetUnixFileMode(socketDirectory);
+        var isWritableByOthers = (mode & (UnixFileMode.GroupWrite | UnixFileMode.OtherWrite)) != 0;
+        var isSticky = (mode & UnixFileMode.StickyBit) != 0;
+        if (isWritableByOthers && !isSticky)
+        {
+            throw new InvalidOperationException(
+                $"Other users can replace the socket in {socketDirectory}, choose a directory only you can write to");
+        }
+    }
+
+    /// <summary>
+    /// Binds the listener to the socket path so that only the current user can connect, since a forwarded command
+    /// runs with the rights of the server
+    /// </summary>
+    /// <remarks>
+    /// Binding creates the socket file with the process umask, so the socket is bound inside a private directory,
+    /// restricted there and only then renamed to its path. Other users never see it with wider permissions.
+    /// </remarks>
+    private static void BindToCurrentUser(Socket listener, string socketPath)
+    {
+        if (OperatingSystem.IsWindows())
+        {
+            listener.Bind(new UnixDomainSocketEndPoint(socketPath));
+            return;
+        }
+
+        var socketDirectory = Path.GetDirectoryName(Path.GetFullPath(socketPath))!;
+        var bindDirectory = Path.Combine(socketDirectory, $".bookshelf-{Guid.NewGuid():N}");
+        Directory.CreateDirectory(bindDirectory, OwnerOnlyDirectoryMode);
+        try
+        {
+            var bindPath = Path.Combine(bindDirectory, "server.sock");
+            listener.Bind(new UnixDomainSocketEndPoint(bindPath));
+            File.SetUnixFileMode(bindPath, UnixFileMode.UserRead | UnixFileMode.UserWrite);
+
+            // A listening socket stays reachable under the path it is renamed to
+            File.Move(bindPath, socketPath, overwrite: false);
+        }
+        finally
+        {
+            Directory.Delete(bindDirectory, recursive: true);
+        }
+    }
+
+    /// <summary>
+    /// Reads the request of a connection, runs its command and sends the exit code
+    /// </summary>
+    private async Task HandleConnectionAsync(Socket socket, CancellationToken cancellationToken)
+    {
+        try
+        {
+            await using var connection = new NetworkStream(socket, ownsSocket: true);
+
+            var frame = await ServerProtocol.ReadFrameAsync(connection, cancellationToken);
+            var isRequest = frame?.Type == FrameType.Request;
+            var request = isRequest ? JsonSerializer.Deserialize(frame!.Payload, ServerJsonContext.Default.ServerRequest) : null;
+            if (request == null)
+            {
+                _logger.LogWarning("Ignoring a connection that did not send a request");
+                return;
+            }
+
+            using var requestCancellation = CancellationTokenSource.CreateLinkedTokenSource(cancellationToken);
+            var cancellationWatch = WatchForCancellationAsync(connection, requestCancellation);
+
+            var writeLock = new object();
+            var exitCode = await RunCommandAsync(request, connection, writeLock, requestCancellation.Token);
+
+            lock (writeLock)
+            {
+                ServerProtocol.WriteFrame(connection, FrameType.ExitCode, ServerProtocol.EncodeExitCode(exitCode));
+            }
+
+            // The client closes the connection once it has the exit code, which ends the watch
+            await cancellationWatch;
+        }
+        catch (Exception ex) when (ex is IOException or SocketException or InvalidDataException or JsonException)
+        {
+            _logger.LogWarning(ex, "Bookshelf client connection failed");
+        }
+        catch (OperationCanceledException) when (cancellationToken.IsCancellationRequested)
+        {
+            // The server is stopping
+        }
+    }
+
+    /// <summary>
+    /// Cancels the command of a request when the client asks for it or goes away
+    /// </summary>
+    private static async Task WatchForCancellationAsync(
+        Stream connection,
+        CancellationTokenSource requestCancellation)
+    {
+        try
+        {
+            while (true)
+            {
+                var frame = await ServerProtocol.ReadFrameAsync(connection, requestCancellation.Token);
+                var isCancelled = frame == null || frame.Type == FrameType.Cancel;
+                if (isCancelled)
+                {
+                    requestCancellation.Cancel();
+                    return;
+                }
+            }
+        }
+        catch (Exception ex) when (ex is IOException or SocketException or InvalidDataException or OperationCanceledException)
+        {
+            // The connection ended or the server is stopping; either way nothing is left to cancel
+        }
+    }
+
+    /// <summary>
+    /// Runs the command of a request with its console output sent to the client
+    /// </summary>
+    private async Task<int> RunCommandAsync(
+        ServerRequest request,
+        Stream connection,
+        object writeLock,
+        CancellationToken cancellationToken)
+    {
+        using var standardOutput = new FrameWriterStream(connection, FrameType.StandardOutput, writeLock);
+        using var standardError = new FrameWriterStream(connection, FrameType.StandardError, writeLock);
+        using var outputWriter = new StreamWriter(standardOutput, OutputEncoding, bufferSize: 1024, leaveOpen: true);
+        using var errorWriter = new StreamWriter(standardError, OutputEncoding, bufferSize: 1024, leaveOpen: true);
+        outputWriter.AutoFlush = true;
+        errorWriter.AutoFlush = true;
+
+        var isServeCommand = request.Arguments.Count > 0 && request.Arguments[0] == "serve";
+        if (isServeCommand)
+        {
+            await errorWriter.WriteLineAsync("Error: The serve command cannot be forwarded to a server");
+            return 1;
+        }
+
+        try
+        {
+            await _commandLock.WaitAsync(cancellationToken);
+        }
+        catch (OperationCanceledException)
+        {
+            await errorWriter.WriteLineAsync("Error: The command was cancelled while waiting for the server");
+            return 1;
+        }
+
+        var originalOutput = Console.Out;
+        var originalError = Console.Error;
+        var originalConsole = AnsiConsole.Console;
+        var originalDirectory = Environment.CurrentDirectory;
+        var originalLevel = _levelSwitch.MinimumLevel;
+
+        try
+        {
+            Environment.CurrentDirectory = request.WorkingDirectory;
+            Console.SetOut(outputWriter);
+            Console.SetError(errorWriter);
+            StandardStreams.RedirectOutput(standardOutput);
+            AnsiConsole.Console = CreateConsole(request, outputWriter);
+            _levelSwitch.MinimumLevel = LoggingOptions.FromArgs(request.Arguments).MinimumLevel;
+
+            _logger.LogDebug("Running forwarded command: {Arguments}", string.Join(' ', request.Arguments));
+            return await _app.RunAsync(request.Arguments, cancellationToken);
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException)
+        {
+            await errorWriter.WriteLineAsync($"Error: {ex.Message}");
+            return 1;
+        }
+        finally
+        {
+            _levelSwitch.MinimumLevel = originalLevel;
+            AnsiConsole.Console = originalConsole;
+            StandardStreams.RedirectOutput(null);
+            Console.SetError(originalError);
+            Console.SetOut(originalOutput);
+            Environment.CurrentDirectory = originalDirectory;
+            _commandLock.Release();
+        }
+    }
+
+    /// <summary>
+    /// Creates a console that renders for the terminal of the client
+    /// </summary>
+    private static IAnsiConsole CreateConsole(ServerRequest request, TextWriter output)
+    {
+        var isTerminal = !request.IsOutputRedirected;
+        var console = AnsiConsole.Create(new AnsiConsoleSettings
+        {
+            Ansi = isTerminal ? AnsiSupport.Yes : AnsiSupport.No,
+            ColorSystem = isTerminal && !request.NoColor ? ColorSystemSupport.Standard : ColorSystemSupport.NoColors,
+            Interactive = isTerminal ? InteractionSupport.Yes : InteractionSupport.No,
+            Out = new AnsiConsoleOutput(output)
+        });
+
+        var hasWidth = request.Width > 0;
+        if (hasWidth)
+        {
+            console.Profile.Width = request.Width;
+        }
+
+        return console;
+    }
+}
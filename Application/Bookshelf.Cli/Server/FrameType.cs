@@ -0,0 +1,32 @@
+namespace Bookshelf.Cli.Server;
+
+/// <summary>
+/// Specifies what a frame exchanged between the client and the server carries
+/// </summary>
+public enum FrameType : byte
+{
+    /// <summary>
+    /// The command a client asks the server to run, sent once as JSON
+    /// </summary>
+    Request = 1,
+
+    /// <summary>
+    /// Bytes the command wrote to standard output
+    /// </summary>
+    StandardOutput = 2,
+
+    /// <summary>
+    /// Bytes the command wrote to standard error
+    /// </summary>
+    StandardError = 3,
+
+    /// <summary>
+    /// The client asks the server to cancel the running command
+    /// </summary>
+    Cancel = 4,
+
+    /// <summary>
+    /// The exit code of the command as a little-endian 32-bit integer, the last frame of a request
+    /// </summary>
+    ExitCode = 5
+}
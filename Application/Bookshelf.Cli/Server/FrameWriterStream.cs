@@ -0,0 +1,108 @@
+namespace Bookshelf.Cli.Server;
+
+/// <summary>
+/// Write-only stream sending everything written to it as frames of one type over a server connection
+/// </summary>
+/// <remarks>
+/// Standard output and standard error of a request share the connection, so all streams of a connection take the
+/// same lock around each frame. Writes larger than <see cref="ServerProtocol.MaxPayloadLength"/> are split across
+/// frames. Disposing the stream leaves the connection open.
+/// </remarks>
+public sealed class FrameWriterStream : Stream
+{
+    private readonly Stream _connection;
+    private readonly FrameType _frameType;
+    private readonly object _writeLock;
+
+    /// <summary>
+    /// Initializes a new instance of the FrameWriterStream class
+    /// </summary>
+    /// <param name="connection">The connection stream</param>
+    /// <param name="frameType">The type of the frames written</param>
+    /// <param name="writeLock">The lock shared by all writers of the connection</param>
+    public FrameWriterStream(Stream connection, FrameType frameType, object writeLock)
+    {
+        _connection = connection ?? throw new ArgumentNullException(nameof(connection));
+        _frameType = frameType;
+        _writeLock = writeLock ?? throw new ArgumentNullException(nameof(writeLock));
+    }
+
+    /// <inheritdoc />
+    public override bool CanRead => false;
+
+    /// <inheritdoc />
+    public override bool CanSeek => false;
+
+    /// <inheritdoc />
+    public override bool CanWrite => true;
+
+    /// <inheritdoc />
+    public override long Length => throw new NotSupportedException();
+
+    /// <inheritdoc />
+    public override long Position
+    {
+        get => throw new NotSupportedException();
+        set => throw new NotSupportedException();
+    }
+
+    /// <inheritdoc />
+    public override void Write(byte[] buffer, int offset, int count)
+    {
+        Write(buffer.AsSpan(offset, count));
+    }
+
+    /// <inheritdoc />
+    public override void Write(ReadOnlySpan<byte> buffer)
+    {
+        lock (_writeLock)
+        {
+            while (!buffer.IsEmpty)
+            {
+                var payloadLength = Math.Min(buffer.Length, ServerProtocol.MaxPayloadLength);
+                ServerProtocol.WriteFrame(_connection, _frameType, buffer[..payloadLength]);
+                buffer = buffer[payloadLength..];
+            }
+        }
+    }
+
+    /// <inheritdoc />
+    public override Task WriteAsync(byte[] buffer, int offset, int count, CancellationToken cancellationToken)
+    {
+        cancellationToken.ThrowIfCancellationRequested();
+        Write(buffer, offset, count);
+        return Task.CompletedTask;
+    }
+
+    /// <inheritdoc />
+    public override ValueTask WriteAsync(ReadOnlyMemory<byte> buffer, CancellationToken cancellationToken = default)
+    {
+        cancellationToken.ThrowIfCancellationRequested();
+        Write(buffer.Span);
+        return ValueTask.CompletedTask;
+    }
+
+    /// <inheritdoc />
+    public override void Flush()
+    {
+        // Every frame is flushed when it is written
+    }
+
+    /// <inheritdoc />
+    public override int Read(byte[] buffer, int offset, int count)
+    {
+        throw new NotSupportedException();
+    }
+
+    /// <inheritdoc />
+    public override long Seek(long offset, SeekOrigin origin)
+    {
+        throw new NotSupportedException();
+    }
+
+    /// <inheritdoc />
+    public override void SetLength(long value)
+    {
+        throw new NotSupportedException();
+    }
+}
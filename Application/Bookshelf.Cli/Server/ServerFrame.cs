@@ -0,0 +1,8 @@
+namespace Bookshelf.Cli.Server;
+
+/// <summary>
+/// A frame exchanged between the client and the server
+/// </summary>
+/// <param name="Type">What the frame carries</param>
+/// <param name="Payload">The content of the frame</param>
+public sealed record ServerFrame(FrameType Type, byte[] Payload);
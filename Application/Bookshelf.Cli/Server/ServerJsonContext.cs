@@ -0,0 +1,11 @@
+using System.Text.Json.Serialization;
+
+namespace Bookshelf.Cli.Server;
+
+/// <summary>
+/// Serialization metadata of the request frame, generated at compile time so forwarding a command needs no reflection
+/// </summary>
+[JsonSerializable(typeof(ServerRequest))]
+internal sealed partial class ServerJsonContext : JsonSerializerContext
+{
+}
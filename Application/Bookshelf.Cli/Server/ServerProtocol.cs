@@ -0,0 +1,165 @@
+using System.Buffers.Binary;
+using System.Diagnostics;
+
+namespace Bookshelf.Cli.Server;
+
+/// <summary>
+/// Frames exchanged between the client and the server over a Unix domain socket
+/// </summary>
+/// <remarks>
+/// A frame is a <see cref="FrameType"/> byte, the payload length as a little-endian 32-bit integer and the payload.
+/// The client sends a <see cref="FrameType.Request"/> frame and optionally a <see cref="FrameType.Cancel"/> frame;
+/// the server answers with output frames and ends with an <see cref="FrameType.ExitCode"/> frame.
+/// </remarks>
+public static class ServerProtocol
+{
+    /// <summary>
+    /// Environment variable naming the socket of the server that commands are forwarded to
+    /// </summary>
+    public const string SocketEnvironmentVariable = "BOOKSHELF_SERVER";
+
+    /// <summary>
+    /// Largest payload of a single frame, larger output is split across frames
+    /// </summary>
+    public const int MaxPayloadLength = 64 * 1024;
+
+    /// <summary>
+    /// Length of the frame header
+    /// </summary>
+    public const int HeaderLength = 5;
+
+    /// <summary>
+    /// Gets the socket path used when neither the command line nor the environment names one
+    /// </summary>
+    /// <returns>A per-user socket in the runtime directory, or in the temporary directory if there is none</returns>
+    public static string GetDefaultSocketPath()
+    {
+        var runtimeDirectory = Environment.GetEnvironmentVariable("XDG_RUNTIME_DIR");
+        var hasRuntimeDirectory = !string.IsNullOrWhiteSpace(runtimeDirectory);
+        var directory = hasRuntimeDirectory ? runtimeDirectory! : Path.GetTempPath();
+
+        return Path.Combine(directory, $"bookshelf-{Environment.UserName}.sock");
+    }
+
+    /// <summary>
+    /// Writes the frame header for a payload of the given length
+    /// </summary>
+    /// <param name="header">The buffer receiving the header, at least <see cref="HeaderLength"/> bytes long</param>
+    /// <param name="type">The frame type</param>
+    /// <param name="payloadLength">The payload length</param>
+    private static void WriteHeader(Span<byte> header, FrameType type, int payloadLength)
+    {
+        // Precondition
+        Debug.Assert(payloadLength is >= 0 and <= MaxPayloadLength, "Payload must fit in a frame");
+
+        header[0] = (byte)type;
+        BinaryPrimitives.WriteInt32LittleEndian(header[1..HeaderLength], payloadLength);
+    }
+
+    /// <summary>
+    /// Writes a frame
+    /// </summary>
+    /// <param name="stream">The connection stream</param>
+    /// <param name="type">The frame type</param>
+    /// <param name="payload">The payload, at most <see cref="MaxPayloadLength"/> bytes</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    public static async Task WriteFrameAsync(
+        Stream stream,
+        FrameType type,
+        ReadOnlyMemory<byte> payload,
+        CancellationToken cancellationToken = default)
+    {
+        var frame = new byte[HeaderLength + payload.Length];
+        WriteHeader(frame, type, payload.Length);
+        payload.CopyTo(frame.AsMemory(HeaderLength));
+
+        await stream.WriteAsync(frame, cancellationToken);
+        await stream.FlushAsync(cancellationToken);
+    }
+
+    /// <summary>
+    /// Writes a frame synchronously, for writers that cannot await such as console output
+    /// </summary>
+    /// <param name="stream">The connection stream</param>
+    /// <param name="type">The frame type</param>
+    /// <param name="payload">The payload, at most <see cref="MaxPayloadLength"/> bytes</param>
+    public static void WriteFrame(Stream stream, FrameType type, ReadOnlySpan<byte> payload)
+    {
+        Span<byte> header = stackalloc byte[HeaderLength];
+        WriteHeader(header, type, payload.Length);
+
+        stream.Write(header);
+        stream.Write(payload);
+        stream.Flush();
+    }
+
+    /// <summary>
+    /// Encodes the payload of an exit code frame
+    /// </summary>
+    /// <param name="exitCode">The exit code of the command</param>
+    /// <returns>The exit code as a little-endian 32-bit integer</returns>
+    public static byte[] EncodeExitCode(int exitCode)
+    {
+        var payload = new byte[sizeof(int)];
+        BinaryPrimitives.WriteInt32LittleEndian(payload, exitCode);
+        return payload;
+    }
+
+    /// <summary>
+    /// Decodes the payload of an exit code frame
+    /// </summary>
+    /// <param name="frame">The exit code frame</param>
+    /// <returns>The exit code of the command</returns>
+    public static int DecodeExitCode(ServerFrame frame)
+    {
+        // Precondition
+        Debug.Assert(frame.Type == FrameType.ExitCode, "Frame must be an exit code frame");
+
+        return BinaryPrimitives.ReadInt32LittleEndian(frame.Payload);
+    }
+
+    /// <summary>
+    /// Reads the next frame
+    /// </summary>
+    /// <param name="stream">The connection stream</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The frame, or null if the other side closed the connection between frames</returns>
+    /// <exception cref="InvalidDataException">The frame is malformed</exception>
+    /// <exception cref="EndOfStreamException">The connection was closed within a frame</exception>
+    public static async Task<ServerFrame?> ReadFrameAsync(Stream stream, CancellationToken cancellationToken = default)
+    {
+        var header = new byte[HeaderLength];
+        var headerLength = await stream.ReadAtLeastAsync(
+            header, HeaderLength, throwOnEndOfStream: false, cancellationToken);
+
+        var isClosed = headerLength == 0;
+        if (isClosed)
+        {
+            return null;
+        }
+
+        if (headerLength < HeaderLength)
+        {
+            throw new EndOfStreamException("Connection closed within a frame header");
+        }
+
+        var type = (FrameType)header[0];
+        var isKnownType = Enum.IsDefined(type);
+        if (!isKnownType)
+        {
+            throw new InvalidDataException($"Unknown frame type: {header[0]}");
+        }
+
+        var payloadLength = BinaryPrimitives.ReadInt32LittleEndian(header.AsSpan(1));
+        var isValidLength = payloadLength is >= 0 and <= MaxPayloadLength;
+        if (!isValidLength)
+        {
+            throw new InvalidDataException($"Invalid frame length: {payloadLength}");
+        }
+
+        var payload = new byte[payloadLength];
+        await stream.ReadExactlyAsync(payload, cancellationToken);
+
+        return new ServerFrame(type, payload);
+    }
+}
@@ -0,0 +1,16 @@
+namespace Bookshelf.Cli.Server;
+
+/// <summary>
+/// A command forwarded by the client, with the parts of its environment the server needs to run it in its place
+/// </summary>
+/// <param name="Arguments">The command line arguments, without the server option</param>
+/// <param name="WorkingDirectory">The working directory of the client, which relative paths are resolved against</param>
+/// <param name="IsOutputRedirected">Whether the standard output of the client is redirected rather than a terminal</param>
+/// <param name="Width">The width of the terminal of the client in columns, or 0 if unknown</param>
+/// <param name="NoColor">Whether the client disabled colors through the NO_COLOR environment variable</param>
+public sealed record ServerRequest(
+    IReadOnlyList<string> Arguments,
+    string WorkingDirectory,
+    bool IsOutputRedirected,
+    int Width,
+    bool NoColor);
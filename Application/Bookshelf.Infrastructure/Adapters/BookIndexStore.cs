@@ -0,0 +1,318 @@
+using System.Collections.Concurrent;
+using System.Text;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Core.ValueObjects;
+using Bookshelf.Application.Spi;
+using Bookshelf.Application.Spi.Dtos;
+using Microsoft.Extensions.Logging;
+
+namespace Bookshelf.Infrastructure.Adapters;
+
+/// <summary>
+/// Search index store persisting the index in a compact binary format inside the bookshelf directory
+/// </summary>
+/// <remarks>
+/// <para>
+/// The file starts with the <see cref="Magic"/> bytes and the format version, followed by the books and the terms.
+/// Terms are stored in order with the length of the prefix they share with the previous term, and every posting as
+/// the distance to the book of the previous posting, the page (relative to the previous page of the same book) and the
+/// frequency, all as 7-bit encoded integers. Most of these numbers fit in a single byte.
+/// </para>
+/// <para>
+/// Like the metadata cache store, the store is a singleton and keeps the last index loaded or saved for each
+/// bookshelf, so the server answers repeated searches without reading the index again.
+/// </para>
+/// </remarks>
+public class BookIndexStore : IBookIndexStore
+{
+    /// <summary>
+    /// Bytes identifying a search index file
+    /// </summary>
+    public static ReadOnlySpan<byte> Magic => "BSIX"u8;
+
+    private const int FileBufferSize = 64 * 1024;
+
+    private readonly ILogger<BookIndexStore> _logger;
+    private readonly ConcurrentDictionary<string, LoadedIndex> _loadedIndexes = new(StringComparer.Ordinal);
+
+    /// <summary>
+    /// Initializes a new instance of the BookIndexStore class
+    /// </summary>
+    /// <param name="logger">The logger</param>
+    public BookIndexStore(ILogger<BookIndexStore> logger)
+    {
+        _logger = logger ?? throw new ArgumentNullException(nameof(logger));
+    }
+
+    /// <inheritdoc />
+    public async Task<BookIndex?> LoadIndexAsync(
+        LoadBookIndexRequest request,
+        CancellationToken cancellationToken = default)
+    {
+        var indexPath = GetIndexPath(request.BookshelfDirectory);
+        var indexFile = new FileInfo(indexPath);
+
+        var indexDoesNotExist = !indexFile.Exists;
+        if (indexDoesNotExist)
+        {
+            _loadedIndexes.TryRemove(indexFile.FullName, out _);
+            return null;
+        }
+
+        var isLoaded = _loadedIndexes.TryGetValue(indexFile.FullName, out var loadedIndex) &&
+                       loadedIndex.HasSameFileStatistics(indexFile);
+        if (isLoaded)
+        {
+            _logger.LogDebug("Reusing loaded search index {IndexPath}", indexPath);
+            return loadedIndex!.Index;
+        }
+
+        try
+        {
+            var index = await Task.Run(() => ReadIndex(indexPath, cancellationToken), cancellationToken);
+            if (index == null)
+            {
+                _logger.LogWarning("Ignoring search index with unsupported version: {IndexPath}", indexPath);
+                return null;
+            }
+
+            _loadedIndexes[indexFile.FullName] = new LoadedIndex(indexFile.Length, indexFile.LastWriteTimeUtc, index);
+            return index;
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException or InvalidDataException)
+        {
+            _logger.LogWarning(ex, "Unable to read search index {IndexPath}", indexPath);
+            return null;
+        }
+    }
+
+    /// <inheritdoc />
+    public async Task<bool> SaveIndexAsync(
+        SaveBookIndexRequest request,
+        CancellationToken cancellationToken = default)
+    {
+        var indexPath = GetIndexPath(request.BookshelfDirectory);
+        var temporaryPath = indexPath + ".tmp";
+
+        try
+        {
+            // Write to a temporary file first so an interrupted build never leaves a truncated index
+            await Task.Run(() => WriteIndex(temporaryPath, request.Index, cancellationToken), cancellationToken);
+            File.Move(temporaryPath, indexPath, overwrite: true);
+
+            var indexFile = new FileInfo(indexPath);
+            _loadedIndexes[indexFile.FullName] = new LoadedIndex(indexFile.Length, indexFile.LastWriteTimeUtc, request.Index);
+            return true;
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException)
+        {
+            _logger.LogWarning(ex, "Unable to write search index {IndexPath}", indexPath);
+            return false;
+        }
+    }
+
+    /// <summary>
+    /// Gets the index path inside a bookshelf directory
+    /// </summary>
+    private static string GetIndexPath(string bookshelfDirectory)
+    {
+        return Path.Combine(bookshelfDirectory, BookIndex.FileName);
+    }
+
+    /// <summary>
+    /// Writes an index to a file
+    /// </summary>
+    private static void WriteIndex(string path, BookIndex index, CancellationToken cancellationToken)
+    {
+        using var stream = new FileStream(path, FileMode.Create, FileAccess.Write, FileShare.None, FileBufferSize);
+        using var writer = new BinaryWriter(stream, Encoding.UTF8);
+
+        writer.Write(Magic);
+        writer.Write(index.Version);
+
+        writer.Write7BitEncodedInt(index.Books.Count);
+        foreach (var book in index.Books)
+        {
+            writer.Write(book.FileName);
+            writer.Write7BitEncodedInt64(book.FileSizeBytes);
+            writer.Write(book.LastWriteTimeUtc.Ticks);
+            writer.Write(book.Title);
+            writer.Write(book.Author != null);
+            writer.Write(book.Author ?? string.Empty);
+            writer.Write7BitEncodedInt(book.PageCount);
+            writer.Write7BitEncodedInt(book.TokenCount);
+        }
+
+        writer.Write7BitEncodedInt(index.Terms.Count);
+        var previousTerm = string.Empty;
+        for (var termId = 0; termId < index.Terms.Count; termId++)
+        {
+            cancellationToken.ThrowIfCancellationRequested();
+
+            var term = index.Terms[termId];
+            var sharedPrefixLength = term.AsSpan().CommonPrefixLength(previousTerm);
+            writer.Write7BitEncodedInt(sharedPrefixLength);
+            writer.Write(term[sharedPrefixLength..]);
+            previousTerm = term;
+
+            var postings = index.Postings[termId];
+            writer.Write7BitEncodedInt(postings.Length);
+            var previousPosting = new IndexPosting(0, 0, 0);
+            foreach (var posting in postings)
+            {
+                var bookDelta = posting.BookId - previousPosting.BookId;
+                var isSameBook = bookDelta == 0;
+                writer.Write7BitEncodedInt(bookDelta);
+                writer.Write7BitEncodedInt(isSameBook ? posting.Page - previousPosting.Page : posting.Page);
+                writer.Write7BitEncodedInt(posting.Frequency);
+                previousPosting = posting;
+            }
+        }
+    }
+
+    /// <summary>
+    /// Reads an index from a file
+    /// </summary>
+    /// <returns>The index, or null if it was written in another format version</returns>
+    /// <exception cref="InvalidDataException">The file is not a valid search index</exception>
+    private static BookIndex? ReadIndex(string path, CancellationToken cancellationToken)
+    {
+        using var stream = new FileStream(path, FileMode.Open, FileAccess.Read, FileShare.Read, FileBufferSize);
+        using var reader = new BinaryReader(stream, Encoding.UTF8);
+
+        try
+        {
+            Span<byte> magic = stackalloc byte[Magic.Length];
+            reader.BaseStream.ReadExactly(magic);
+            var isIndexFile = magic.SequenceEqual(Magic);
+            if (!isIndexFile)
+            {
+                throw new InvalidDataException("File is not a search index");
+            }
+
+            var version = reader.ReadInt32();
+            var isCurrentVersion = version == BookIndex.CurrentVersion;
+            if (!isCurrentVersion)
+            {
+                return null;
+            }
+
+            var books = new IndexedBook[ReadLength(reader)];
+            for (var bookId = 0; bookId < books.Length; bookId++)
+            {
+                var fileName = reader.ReadString();
+                var fileSizeBytes = reader.Read7BitEncodedInt64();
+                var lastWriteTimeUtc = new DateTime(reader.ReadInt64(), DateTimeKind.Utc);
+                var title = reader.ReadString();
+                var hasAuthor = reader.ReadBoolean();
+                var author = reader.ReadString();
+                var pageCount = ReadCount(reader);
+                var tokenCount = ReadCount(reader);
+
+                books[bookId] = new IndexedBook(
+                    fileName, fileSizeBytes, lastWriteTimeUtc, title, hasAuthor ? author : null, pageCount, tokenCount);
+            }
+
+            var terms = new string[ReadLength(reader)];
+            var postings = new IndexPosting[terms.Length][];
+            var previousTerm = string.Empty;
+            for (var termId = 0; termId < terms.Length; termId++)
+            {
+                cancellationToken.ThrowIfCancellationRequested();
+
+                var sharedPrefixLength = reader.Read7BitEncodedInt();
+                var isValidPrefix = sharedPrefixLength >= 0 && sharedPrefixLength <= previousTerm.Length;
+                if (!isValidPrefix)
+                {
+                    throw new InvalidDataException($"Invalid shared prefix length of term {termId}");
+                }
+
+                terms[termId] = string.Concat(previousTerm.AsSpan(0, sharedPrefixLength), reader.ReadString());
+                previousTerm = terms[termId];
+
+                postings[termId] = ReadPostings(reader, books.Length);
+            }
+
+            return new BookIndex(version, books, terms, postings);
+        }
+        catch (EndOfStreamException ex)
+        {
+            throw new InvalidDataException("Search index is truncated", ex);
+        }
+        catch (FormatException ex)
+        {
+            throw new InvalidDataException("Search index is malformed", ex);
+        }
+    }
+
+    /// <summary>
+    /// Reads the delta-encoded postings of a term
+    /// </summary>
+    private static IndexPosting[] ReadPostings(BinaryReader reader, int bookCount)
+    {
+        var postings = new IndexPosting[ReadLength(reader)];
+        var previousPosting = new IndexPosting(0, 0, 0);
+        for (var postingIndex = 0; postingIndex < postings.Length; postingIndex++)
+        {
+            var bookDelta = ReadCount(reader);
+            var isSameBook = bookDelta == 0;
+            var bookId = previousPosting.BookId + bookDelta;
+            var page = ReadCount(reader) + (isSameBook ? previousPosting.Page : 0);
+            var frequency = ReadCount(reader);
+
+            var isKnownBook = bookId < bookCount;
+            if (!isKnownBook)
+            {
+                throw new InvalidDataException($"Posting refers to unknown book {bookId}");
+            }
+
+            previousPosting = new IndexPosting(bookId, page, frequency);
+            postings[postingIndex] = previousPosting;
+        }
+
+        return postings;
+    }
+
+    /// <summary>
+    /// Reads a 7-bit encoded count or number that cannot be negative
+    /// </summary>
+    private static int ReadCount(BinaryReader reader)
+    {
+        var count = reader.Read7BitEncodedInt();
+        if (count < 0)
+        {
+            throw new InvalidDataException($"Invalid count in search index: {count}");
+        }
+
+        return count;
+    }
+
+    /// <summary>
+    /// Reads the length of a section, which cannot exceed the remaining bytes since every element takes at least one
+    /// </summary>
+    private static int ReadLength(BinaryReader reader)
+    {
+        var length = ReadCount(reader);
+        var remainingBytes = reader.BaseStream.Length - reader.BaseStream.Position;
+        if (length > remainingBytes)
+        {
+            throw new InvalidDataException($"Invalid length in search index: {length}");
+        }
+
+        return length;
+    }
+
+    /// <summary>
+    /// An index as it was loaded or saved, with the statistics of its file at that time
+    /// </summary>
+    private sealed record LoadedIndex(long FileSizeBytes, DateTime LastWriteTimeUtc, BookIndex Index)
+    {
+        /// <summary>
+        /// Checks whether the index file still has the statistics it had when the index was loaded or saved
+        /// </summary>
+        public bool HasSameFileStatistics(FileInfo indexFile)
+        {
+            return indexFile.Length == FileSizeBytes && indexFile.LastWriteTimeUtc == LastWriteTimeUtc;
+        }
+    }
+}
@@ -0,0 +1,12 @@
+using System.Text.Json.Serialization;
+using Bookshelf.Application.Core.Entities;
+
+namespace Bookshelf.Infrastructure.Adapters;
+
+/// <summary>
+/// Serialization metadata of the metadata cache, generated at compile time so loading the cache needs no reflection
+/// </summary>
+[JsonSerializable(typeof(BookMetadataCache))]
+internal sealed partial class BookMetadataCacheJsonContext : JsonSerializerContext
+{
+}
@@ -0,0 +1,128 @@
+using System.Collections.Concurrent;
+using System.Text.Json;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Spi;
+using Bookshelf.Application.Spi.Dtos;
+using Microsoft.Extensions.Logging;
+
+namespace Bookshelf.Infrastructure.Adapters;
+
+/// <summary>
+/// Book metadata cache store persisting the cache as compact JSON inside the bookshelf directory
+/// </summary>
+/// <remarks>
+/// The store is a singleton and keeps the last cache loaded or saved for each bookshelf, so a long-lived process
+/// such as the server only parses a cache file again after it was changed by someone else.
+/// </remarks>
+public class BookMetadataCacheStore : IBookMetadataCacheStore
+{
+    private readonly ILogger<BookMetadataCacheStore> _logger;
+    private readonly ConcurrentDictionary<string, LoadedCache> _loadedCaches = new(StringComparer.Ordinal);
+
+    /// <summary>
+    /// Initializes a new instance of the BookMetadataCacheStore class
+    /// </summary>
+    /// <param name="logger">The logger</param>
+    public BookMetadataCacheStore(ILogger<BookMetadataCacheStore> logger)
+    {
+        _logger = logger ?? throw new ArgumentNullException(nameof(logger));
+    }
+
+    /// <inheritdoc />
+    public async Task<BookMetadataCache> LoadCacheAsync(
+        LoadBookMetadataCacheRequest request,
+        CancellationToken cancellationToken = default)
+    {
+        var cachePath = GetCachePath(request.BookshelfDirectory);
+        var cacheFile = new FileInfo(cachePath);
+
+        var cacheDoesNotExist = !cacheFile.Exists;
+        if (cacheDoesNotExist)
+        {
+            _loadedCaches.TryRemove(cacheFile.FullName, out _);
+            return BookMetadataCache.Empty;
+        }
+
+        var isLoaded = _loadedCaches.TryGetValue(cacheFile.FullName, out var loadedCache) &&
+                       loadedCache.HasSameFileStatistics(cacheFile);
+        if (isLoaded)
+        {
+            _logger.LogDebug("Reusing loaded metadata cache {CachePath}", cachePath);
+            return loadedCache!.Cache;
+        }
+
+        try
+        {
+            await using var stream = File.OpenRead(cachePath);
+            var cache = await JsonSerializer.DeserializeAsync(
+                stream, BookMetadataCacheJsonContext.Default.BookMetadataCache, cancellationToken);
+
+            var isCurrentVersion = cache?.Version == BookMetadataCache.CurrentVersion;
+            if (!isCurrentVersion)
+            {
+                _logger.LogWarning("Ignoring metadata cache with unsupported version: {CachePath}", cachePath);
+                return BookMetadataCache.Empty;
+            }
+
+            _loadedCaches[cacheFile.FullName] = new LoadedCache(cacheFile.Length, cacheFile.LastWriteTimeUtc, cache!);
+            return cache!;
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException or JsonException)
+        {
+            _logger.LogWarning(ex, "Unable to read metadata cache {CachePath}, starting from scratch", cachePath);
+            return BookMetadataCache.Empty;
+        }
+    }
+
+    /// <inheritdoc />
+    public async Task<bool> SaveCacheAsync(
+        SaveBookMetadataCacheRequest request,
+        CancellationToken cancellationToken = default)
+    {
+        var cachePath = GetCachePath(request.BookshelfDirectory);
+        var temporaryPath = cachePath + ".tmp";
+
+        try
+        {
+            // Write to a temporary file first so an interrupted listing never leaves a truncated cache
+            await using (var stream = File.Create(temporaryPath))
+            {
+                await JsonSerializer.SerializeAsync(
+                    stream, request.Cache, BookMetadataCacheJsonContext.Default.BookMetadataCache, cancellationToken);
+            }
+
+            File.Move(temporaryPath, cachePath, overwrite: true);
+
+            var cacheFile = new FileInfo(cachePath);
+            _loadedCaches[cacheFile.FullName] = new LoadedCache(cacheFile.Length, cacheFile.LastWriteTimeUtc, request.Cache);
+            return true;
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException or NotSupportedException)
+        {
+            _logger.LogWarning(ex, "Unable to write metadata cache {CachePath}", cachePath);
+            return false;
+        }
+    }
+
+    /// <summary>
+    /// Gets the cache path inside a bookshelf directory
+    /// </summary>
+    private static string GetCachePath(string bookshelfDirectory)
+    {
+        return Path.Combine(bookshelfDirectory, BookMetadataCache.FileName);
+    }
+
+    /// <summary>
+    /// A cache as it was loaded or saved, with the statistics of its file at that time
+    /// </summary>
+    private sealed record LoadedCache(long FileSizeBytes, DateTime LastWriteTimeUtc, BookMetadataCache Cache)
+    {
+        /// <summary>
+        /// Checks whether the cache file still has the statistics it had when the cache was loaded or saved
+        /// </summary>
+        public bool HasSameFileStatistics(FileInfo cacheFile)
+        {
+            return cacheFile.Length == FileSizeBytes && cacheFile.LastWriteTimeUtc == LastWriteTimeUtc;
+        }
+    }
+}
@@ -0,0 +1,14 @@
+using System.Text.Json.Serialization;
+using Bookshelf.Application.Core.Entities;
+
+namespace Bookshelf.Infrastructure.Adapters;
+
+/// <summary>
+/// Serialization metadata of the consolidation manifest, generated at compile time so loading the manifest needs no
+/// reflection
+/// </summary>
+[JsonSourceGenerationOptions(WriteIndented = true)]
+[JsonSerializable(typeof(ConsolidationManifest))]
+internal sealed partial class ConsolidationManifestJsonContext : JsonSerializerContext
+{
+}
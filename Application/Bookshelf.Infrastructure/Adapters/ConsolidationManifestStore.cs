@@ -0,0 +1,94 @@
+using System.Text.Json;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Spi;
+using Bookshelf.Application.Spi.Dtos;
+using Microsoft.Extensions.Logging;
+
+namespace Bookshelf.Infrastructure.Adapters;
+
+/// <summary>
+/// Consolidation manifest store persisting the manifest as JSON inside the target directory
+/// </summary>
+public class ConsolidationManifestStore : IConsolidationManifestStore
+{
+    private readonly ILogger<ConsolidationManifestStore> _logger;
+
+    /// <summary>
+    /// Initializes a new instance of the ConsolidationManifestStore class
+    /// </summary>
+    /// <param name="logger">The logger</param>
+    public ConsolidationManifestStore(ILogger<ConsolidationManifestStore> logger)
+    {
+        _logger = logger ?? throw new ArgumentNullException(nameof(logger));
+    }
+
+    /// <inheritdoc />
+    public async Task<ConsolidationManifest> LoadManifestAsync(
+        LoadManifestRequest request,
+        CancellationToken cancellationToken = default)
+    {
+        var manifestPath = GetManifestPath(request.TargetDirectory);
+
+        var manifestDoesNotExist = !File.Exists(manifestPath);
+        if (manifestDoesNotExist)
+        {
+            return ConsolidationManifest.Empty;
+        }
+
+        try
+        {
+            await using var stream = File.OpenRead(manifestPath);
+            var manifest = await JsonSerializer.DeserializeAsync(
+                stream, ConsolidationManifestJsonContext.Default.ConsolidationManifest, cancellationToken);
+
+            var isCurrentVersion = manifest?.Version == ConsolidationManifest.CurrentVersion;
+            if (!isCurrentVersion)
+            {
+                _logger.LogWarning("Ignoring consolidation manifest with unsupported version: {ManifestPath}", manifestPath);
+                return ConsolidationManifest.Empty;
+            }
+
+            return manifest!;
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException or JsonException)
+        {
+            _logger.LogWarning(ex, "Unable to read consolidation manifest {ManifestPath}, starting from scratch", manifestPath);
+            return ConsolidationManifest.Empty;
+        }
+    }
+
+    /// <inheritdoc />
+    public async Task<bool> SaveManifestAsync(
+        SaveManifestRequest request,
+        CancellationToken cancellationToken = default)
+    {
+        var manifestPath = GetManifestPath(request.TargetDirectory);
+        var temporaryPath = manifestPath + ".tmp";
+
+        try
+        {
+            // Write to a temporary file first so an interrupted run never leaves a truncated manifest
+            await using (var stream = File.Create(temporaryPath))
+            {
+                await JsonSerializer.SerializeAsync(
+                    stream, request.Manifest, ConsolidationManifestJsonContext.Default.ConsolidationManifest, cancellationToken);
+            }
+
+            File.Move(temporaryPath, manifestPath, overwrite: true);
+            return true;
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException or NotSupportedException)
+        {
+            _logger.LogError(ex, "Unable to write consolidation manifest {ManifestPath}", manifestPath);
+            return false;
+        }
+    }
+
+    /// <summary>
+    /// Gets the manifest path inside a target directory
+    /// </summary>
+    private static string GetManifestPath(string targetDirectory)
+    {
+        return Path.Combine(targetDirectory, ConsolidationManifest.FileName);
+    }
+}
@@ -1,3 +1,7 @@
+using System.IO.Enumeration;
+using System.Runtime.CompilerServices;
+using System.Security.Cryptography;
+using System.Threading.Channels;
 using Bookshelf.Application.Spi;
 using Bookshelf.Application.Spi.Dtos;
 
@@ -8,33 +12,84 @@ namespace Bookshelf.Infrastructure.Adapters;
 /// </summary>
 public class FileSystemAdapter : IFileSystemAdapter
 {
+    /// <summary>
+    /// Buffer size used when streaming file content for hashing
+    /// </summary>
+    private const int HashBufferSize = 1024 * 1024;
+
+    /// <summary>
+    /// Buffer size used for copying file contents
+    /// </summary>
+    private const int CopyBufferSize = 1024 * 1024;
+
+    /// <summary>
+    /// Number of discovered entries buffered ahead of a consumer of the tree walker
+    /// </summary>
+    private const int EnumerationBufferCapacity = 256;
+
+    /// <summary>
+    /// Enumeration options that, like Directory.GetFiles, include hidden files and skip inaccessible directories
+    /// </summary>
+    private static readonly EnumerationOptions TopDirectoryOptions = new()
+    {
+        AttributesToSkip = 0,
+        IgnoreInaccessible = true
+    };
+
+    /// <summary>
+    /// Enumeration options for walking a whole directory tree
+    /// </summary>
+    private static readonly EnumerationOptions RecursiveOptions = new()
+    {
+        AttributesToSkip = 0,
+        IgnoreInaccessible = true,
+        RecurseSubdirectories = true
+    };
+
     /// <inheritdoc />
-    public Task<IReadOnlyList<string>> GetPdfFilesAsync(GetPdfFilesRequest request)
+    public Task<IReadOnlyList<FileInfoResult>> GetPdfFileEntriesAsync(
+        GetPdfFileEntriesRequest request,
+        CancellationToken cancellationToken = default)
     {
-        return Task.Run<IReadOnlyList<string>>(() =>
+        return Task.Run<IReadOnlyList<FileInfoResult>>(() =>
         {
             try
             {
                 var directoryDoesNotExist = !Directory.Exists(request.DirectoryPath);
                 if (directoryDoesNotExist)
                 {
-                    return Array.Empty<string>();
+                    return Array.Empty<FileInfoResult>();
                 }
 
-                return Directory.GetFiles(request.DirectoryPath, "*.pdf", SearchOption.TopDirectoryOnly)
-                    .OrderBy(f => f, StringComparer.OrdinalIgnoreCase)
+                // Size and timestamps come from the directory entries themselves, so no file is stat'ed again
+                var entries = new FileSystemEnumerable<FileInfoResult>(
+                    request.DirectoryPath,
+                    (ref FileSystemEntry entry) => new FileInfoResult(
+                        entry.FileName.ToString(),
+                        entry.ToFullPath(),
+                        entry.Length,
+                        entry.CreationTimeUtc.LocalDateTime,
+                        entry.LastWriteTimeUtc.UtcDateTime),
+                    TopDirectoryOptions)
+                {
+                    ShouldIncludePredicate = (ref FileSystemEntry entry) => !entry.IsDirectory && IsPdfFile(ref entry)
+                };
+
+                return entries
+                    .OrderBy(e => e.FullPath, StringComparer.OrdinalIgnoreCase)
                     .ToList();
             }
             catch (Exception ex) when (ex is UnauthorizedAccessException or IOException)
             {
-                // Log the error and return empty list
-                return Array.Empty<string>();
+                return Array.Empty<FileInfoResult>();
             }
-        });
+        }, cancellationToken);
     }
 
     /// <inheritdoc />
-    public Task<IReadOnlyList<string>> GetSubdirectoriesAsync(GetSubdirectoriesRequest request)
+    public Task<IReadOnlyList<string>> GetFileNamesAsync(
+        GetFileNamesRequest request,
+        CancellationToken cancellationToken = default)
     {
         return Task.Run<IReadOnlyList<string>>(() =>
         {
@@ -46,31 +101,73 @@ public class FileSystemAdapter : IFileSystemAdapter
                     return Array.Empty<string>();
                 }
 
-                return Directory.GetDirectories(request.DirectoryPath)
-                    .OrderBy(d => d, StringComparer.OrdinalIgnoreCase)
-                    .ToList();
+                var entries = new FileSystemEnumerable<string>(
+                    request.DirectoryPath,
+                    (ref FileSystemEntry entry) => entry.FileName.ToString(),
+                    TopDirectoryOptions);
+
+                return entries.ToList();
             }
             catch (Exception ex) when (ex is UnauthorizedAccessException or IOException)
             {
                 return Array.Empty<string>();
             }
+        }, cancellationToken);
+    }
+
+    /// <inheritdoc />
+    public async IAsyncEnumerable<DirectoryEntryResult> EnumerateEntriesAsync(
+        EnumerateEntriesRequest request,
+        [EnumeratorCancellation] CancellationToken cancellationToken = default)
+    {
+        var directoryDoesNotExist = !Directory.Exists(request.DirectoryPath);
+        if (directoryDoesNotExist)
+        {
+            yield break;
+        }
+
+        var channel = Channel.CreateBounded<DirectoryEntryResult>(new BoundedChannelOptions(EnumerationBufferCapacity)
+        {
+            SingleReader = true,
+            SingleWriter = true
         });
+
+        // Directory enumeration is synchronous, so the walk runs on the thread pool and hands entries over as it finds them
+        using var walkCancellation = CancellationTokenSource.CreateLinkedTokenSource(cancellationToken);
+        var walk = Task.Run(() => WalkEntriesAsync(request, channel.Writer, walkCancellation.Token));
+
+        try
+        {
+            await foreach (var entry in channel.Reader.ReadAllAsync(cancellationToken))
+            {
+                yield return entry;
+            }
+        }
+        finally
+        {
+            // Stops the walk when the consumer finishes early
+            walkCancellation.Cancel();
+            await walk;
+        }
     }
 
     /// <inheritdoc />
-    public async Task<bool> CopyFileAsync(CopyFileRequest request)
+    public async Task<CopyFileResult> CopyFileAsync(CopyFileRequest request, CancellationToken cancellationToken = default)
     {
         try
         {
-            await Task.Run(() =>
+            var isHardLinked = request.AllowHardLink && TryCreateHardLink(request);
+            if (isHardLinked)
             {
-                File.Copy(request.SourcePath, request.DestinationPath, request.Overwrite);
-            });
-            return true;
+                var fileSizeBytes = new FileInfo(request.DestinationPath).Length;
+                return new CopyFileResult(true, FileCopyMethod.HardLinked, 0, fileSizeBytes);
+            }
+
+            return await CloneOrCopyFileAsync(request, cancellationToken);
         }
         catch (Exception ex) when (ex is UnauthorizedAccessException or IOException)
         {
-            return false;
+            return CopyFileResult.Failed;
         }
     }
 
@@ -97,24 +194,9 @@ public class FileSystemAdapter : IFileSystemAdapter
     }
 
     /// <inheritdoc />
-    public string GenerateUniqueFileName(GenerateUniqueFileNameRequest request)
+    public void DeleteFile(DeleteFileRequest request)
     {
-        var nameWithoutExtension = Path.GetFileNameWithoutExtension(request.FileName);
-        var extension = Path.GetExtension(request.FileName);
-        var counter = 1;
-
-        string candidateFileName;
-        string candidatePath;
-
-        do
-        {
-            candidateFileName = $"{nameWithoutExtension}_{counter}{extension}";
-            candidatePath = Path.Combine(request.DirectoryPath, candidateFileName);
-            counter++;
-        }
-        while (File.Exists(candidatePath));
-
-        return candidateFileName;
+        File.Delete(request.FilePath);
     }
 
     /// <inheritdoc />
@@ -127,7 +209,8 @@ public class FileSystemAdapter : IFileSystemAdapter
                 fileInfo.Name,
                 fileInfo.FullName,
                 fileInfo.Length,
-                fileInfo.CreationTime));
+                fileInfo.CreationTime,
+                fileInfo.LastWriteTimeUtc));
         }
         catch (Exception ex) when (ex is UnauthorizedAccessException or IOException or FileNotFoundException)
         {
@@ -136,7 +219,172 @@ public class FileSystemAdapter : IFileSystemAdapter
                 Path.GetFileName(request.FilePath),
                 request.FilePath,
                 0,
+                DateTime.MinValue,
                 DateTime.MinValue));
         }
     }
+
+    /// <inheritdoc />
+    public async Task<string> ComputeFileHashAsync(
+        ComputeFileHashRequest request,
+        CancellationToken cancellationToken = default)
+    {
+        await using var stream = new FileStream(
+            request.FilePath,
+            FileMode.Open,
+            FileAccess.Read,
+            FileShare.Read,
+            HashBufferSize,
+            FileOptions.Asynchronous | FileOptions.SequentialScan);
+
+        var hash = await SHA256.HashDataAsync(stream, cancellationToken);
+        return Convert.ToHexString(hash);
+    }
+
+    /// <summary>
+    /// Replaces the destination with a hard link to the source
+    /// </summary>
+    private static bool TryCreateHardLink(CopyFileRequest request)
+    {
+        var destinationExists = File.Exists(request.DestinationPath);
+        if (!destinationExists)
+        {
+            return NativeFileOperations.TryCreateHardLink(request.SourcePath, request.DestinationPath);
+        }
+
+        if (!request.Overwrite)
+        {
+            return false;
+        }
+
+        // A link cannot replace a file, so it is created next to it and moved over it
+        var linkPath = $"{request.DestinationPath}.{Guid.NewGuid():N}.tmp";
+        var isLinked = NativeFileOperations.TryCreateHardLink(request.SourcePath, linkPath);
+        if (isLinked)
+        {
+            File.Move(linkPath, request.DestinationPath, overwrite: true);
+        }
+
+        return isLinked;
+    }
+
+    /// <summary>
+    /// Clones the source into the destination copy-on-write, or copies it with large asynchronous reads and writes
+    /// </summary>
+    private static async Task<CopyFileResult> CloneOrCopyFileAsync(
+        CopyFileRequest request,
+        CancellationToken cancellationToken)
+    {
+        // The copy is written next to the destination and renamed over it, because an existing destination
+        // may be a hard link to the source, and truncating it would also truncate the source
+        var temporaryPath = $"{request.DestinationPath}.{Guid.NewGuid():N}.tmp";
+        CopyFileResult result;
+
+        try
+        {
+            await using (var source = new FileStream(
+                request.SourcePath,
+                FileMode.Open,
+                FileAccess.Read,
+                FileShare.Read,
+                bufferSize: 0,
+                FileOptions.Asynchronous | FileOptions.SequentialScan))
+            await using (var destination = new FileStream(
+                temporaryPath,
+                FileMode.CreateNew,
+                FileAccess.Write,
+                FileShare.None,
+                bufferSize: 0,
+                FileOptions.Asynchronous))
+            {
+                var isCloned = NativeFileOperations.TryCloneFile(source.SafeFileHandle, destination.SafeFileHandle);
+                if (isCloned)
+                {
+                    result = new CopyFileResult(true, FileCopyMethod.Cloned, 0, source.Length);
+                }
+                else
+                {
+                    await source.CopyToAsync(destination, CopyBufferSize, cancellationToken);
+                    result = new CopyFileResult(true, FileCopyMethod.Copied, destination.Length, 0);
+                }
+            }
+
+            // Like File.Copy, the copy keeps the modification time of the source
+            File.SetLastWriteTimeUtc(temporaryPath, File.GetLastWriteTimeUtc(request.SourcePath));
+            File.Move(temporaryPath, request.DestinationPath, request.Overwrite);
+        }
+        catch
+        {
+            // An interrupted copy must not leave a truncated book behind
+            TryDeleteFile(temporaryPath);
+            throw;
+        }
+
+        return result;
+    }
+
+    /// <summary>
+    /// Deletes a file, ignoring failures
+    /// </summary>
+    private static void TryDeleteFile(string filePath)
+    {
+        try
+        {
+            File.Delete(filePath);
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException)
+        {
+            // The caller reports the original failure
+        }
+    }
+
+    /// <summary>
+    /// Walks a directory and writes its subdirectories and PDF files to a channel
+    /// </summary>
+    private static async Task WalkEntriesAsync(
+        EnumerateEntriesRequest request,
+        ChannelWriter<DirectoryEntryResult> writer,
+        CancellationToken cancellationToken)
+    {
+        try
+        {
+            var entries = new FileSystemEnumerable<DirectoryEntryResult>(
+                request.DirectoryPath,
+                (ref FileSystemEntry entry) => new DirectoryEntryResult(
+                    entry.FileName.ToString(),
+                    entry.ToFullPath(),
+                    entry.IsDirectory,
+                    entry.IsDirectory ? 0 : entry.Length,
+                    entry.CreationTimeUtc.LocalDateTime,
+                    entry.LastWriteTimeUtc.UtcDateTime),
+                request.Recursive ? RecursiveOptions : TopDirectoryOptions)
+            {
+                ShouldIncludePredicate = (ref FileSystemEntry entry) => entry.IsDirectory || IsPdfFile(ref entry)
+            };
+
+            foreach (var entry in entries)
+            {
+                await writer.WriteAsync(entry, cancellationToken);
+            }
+
+            writer.Complete();
+        }
+        catch (Exception ex) when (ex is UnauthorizedAccessException or IOException)
+        {
+            // Like the other enumeration operations, an unreadable directory yields what was found so far
+            writer.Complete();
+        }
+        catch (Exception ex)
+        {
+            writer.Complete(ex);
+        }
+    }
+
+    /// <summary>
+    /// Determines whether a directory entry is a PDF file, ignoring case where the platform does
+    /// </summary>
+    private static bool IsPdfFile(ref FileSystemEntry entry)
+    {
+        return FileSystemName.MatchesSimpleExpression("*.pdf", entry.FileName, OperatingSystem.IsWindows());
+    }
 }
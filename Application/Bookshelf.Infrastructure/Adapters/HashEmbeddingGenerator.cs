@@ -0,0 +1,107 @@
+using Bookshelf.Application.Core.Retrieval;
+using Bookshelf.Application.Core.Search;
+using Bookshelf.Application.Spi;
+using Bookshelf.Application.Spi.Dtos;
+
+namespace Bookshelf.Infrastructure.Adapters;
+
+/// <summary>
+/// Embedding generator hashing the normalized terms of a text into a fixed number of dimensions, so retrieval works
+/// offline and without a model
+/// </summary>
+/// <remarks>
+/// <para>
+/// Every term of the search tokenizer is hashed with 64-bit FNV-1a to a dimension and a sign, weighted with
+/// 1 + ln(term frequency), and the vector is normalized. Two texts are similar when they share terms, so the
+/// embeddings are lexical rather than semantic: a question finds passages using its words, not their synonyms.
+/// </para>
+/// <para>
+/// The embeddings are deterministic and the model id names the dimensions and the hashing scheme, so an index built
+/// with another generator, or another version of this one, is recognized and embedded again.
+/// </para>
+/// </remarks>
+public class HashEmbeddingGenerator : IEmbeddingGenerator
+{
+    /// <summary>
+    /// Default number of dimensions of the embeddings
+    /// </summary>
+    public const int DefaultDimensions = 384;
+
+    private const ulong FnvOffsetBasis = 14695981039346656037;
+    private const ulong FnvPrime = 1099511628211;
+
+    /// <summary>
+    /// Initializes a new instance of the HashEmbeddingGenerator class
+    /// </summary>
+    /// <param name="dimensions">The number of dimensions of the embeddings</param>
+    public HashEmbeddingGenerator(int dimensions = DefaultDimensions)
+    {
+        if (dimensions < 1)
+        {
+            throw new ArgumentOutOfRangeException(nameof(dimensions), dimensions, "Dimensions must be at least 1");
+        }
+
+        Dimensions = dimensions;
+        ModelId = $"hash-{dimensions}-v1";
+    }
+
+    /// <inheritdoc />
+    public string ModelId { get; }
+
+    /// <inheritdoc />
+    public int Dimensions { get; }
+
+    /// <inheritdoc />
+    public Task<IReadOnlyList<float[]>> GenerateEmbeddingsAsync(
+        GenerateEmbeddingsRequest request,
+        CancellationToken cancellationToken = default)
+    {
+        var embeddings = new float[request.Texts.Count][];
+        for (var textIndex = 0; textIndex < embeddings.Length; textIndex++)
+        {
+            cancellationToken.ThrowIfCancellationRequested();
+            embeddings[textIndex] = Embed(request.Texts[textIndex]);
+        }
+
+        return Task.FromResult<IReadOnlyList<float[]>>(embeddings);
+    }
+
+    /// <summary>
+    /// Embeds a text into a normalized vector, the zero vector if it has no terms
+    /// </summary>
+    private float[] Embed(string text)
+    {
+        var termFrequencies = new Dictionary<string, int>(StringComparer.Ordinal);
+        foreach (var term in SearchTokenizer.Tokenize(text))
+        {
+            termFrequencies[term] = termFrequencies.GetValueOrDefault(term) + 1;
+        }
+
+        var vector = new float[Dimensions];
+        foreach (var (term, frequency) in termFrequencies)
+        {
+            var hash = HashTerm(term);
+            var dimension = (int)(hash % (ulong)Dimensions);
+            var isNegative = (hash >> 63) != 0;
+            var weight = 1 + MathF.Log(frequency);
+            vector[dimension] += isNegative ? -weight : weight;
+        }
+
+        VectorMath.Normalize(vector);
+        return vector;
+    }
+
+    /// <summary>
+    /// Hashes the characters of a term with 64-bit FNV-1a
+    /// </summary>
+    private static ulong HashTerm(string term)
+    {
+        var hash = FnvOffsetBasis;
+        foreach (var character in term)
+        {
+            hash = (hash ^ character) * FnvPrime;
+        }
+
+        return hash;
+    }
+}
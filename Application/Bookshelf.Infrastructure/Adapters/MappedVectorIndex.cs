@@ -0,0 +1,310 @@
+using System.Buffers.Binary;
+using System.IO.MemoryMappedFiles;
+using System.Runtime.InteropServices;
+using System.Text;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Core.Retrieval;
+using Bookshelf.Application.Spi;
+
+namespace Bookshelf.Infrastructure.Adapters;
+
+/// <summary>
+/// Vector index reading the file written by <see cref="VectorIndexStore"/> through a read-only memory mapping
+/// </summary>
+/// <remarks>
+/// The header and the section boundaries are checked when the index is opened, so the spans handed out never reach
+/// beyond the mapping. The file is shared for deletion, so a new index can replace it while it is open.
+/// </remarks>
+internal sealed unsafe class MappedVectorIndex : IVectorIndex
+{
+    private readonly MemoryMappedFile _file;
+    private readonly MemoryMappedViewAccessor _accessor;
+    private readonly byte* _pointer;
+    private readonly long _length;
+    private readonly long _chunksOffset;
+    private readonly long _textsOffset;
+    private readonly long _vectorsOffset;
+    private readonly long _centroidsOffset;
+    private readonly long _listsOffset;
+    private readonly int _clusterCount;
+    private bool _isDisposed;
+
+    /// <summary>
+    /// Initializes a new instance of the MappedVectorIndex class over a mapped file, taking ownership of it
+    /// </summary>
+    private MappedVectorIndex(MemoryMappedFile file, MemoryMappedViewAccessor accessor, long length)
+    {
+        _file = file;
+        _accessor = accessor;
+        _length = length;
+
+        byte* pointer = null;
+        _accessor.SafeMemoryMappedViewHandle.AcquirePointer(ref pointer);
+        _pointer = pointer + _accessor.PointerOffset;
+
+        try
+        {
+            var header = ReadBytes(0, VectorIndexStore.HeaderSize);
+            var isIndexFile = header[..VectorIndexStore.Magic.Length].SequenceEqual(VectorIndexStore.Magic);
+            if (!isIndexFile)
+            {
+                throw new InvalidDataException("File is not a vector index");
+            }
+
+            Version = BinaryPrimitives.ReadInt32LittleEndian(header[4..]);
+            Dimensions = BinaryPrimitives.ReadInt32LittleEndian(header[8..]);
+            var bookCount = BinaryPrimitives.ReadInt32LittleEndian(header[12..]);
+            ChunkCount = BinaryPrimitives.ReadInt32LittleEndian(header[16..]);
+            _clusterCount = BinaryPrimitives.ReadInt32LittleEndian(header[20..]);
+            var booksOffset = BinaryPrimitives.ReadInt64LittleEndian(header[24..]);
+            _chunksOffset = BinaryPrimitives.ReadInt64LittleEndian(header[32..]);
+            _textsOffset = BinaryPrimitives.ReadInt64LittleEndian(header[40..]);
+            _vectorsOffset = BinaryPrimitives.ReadInt64LittleEndian(header[48..]);
+            _centroidsOffset = BinaryPrimitives.ReadInt64LittleEndian(header[56..]);
+            _listsOffset = BinaryPrimitives.ReadInt64LittleEndian(header[64..]);
+
+            var isCurrentVersion = Version == VectorIndexContent.CurrentVersion;
+            if (!isCurrentVersion)
+            {
+                ModelId = string.Empty;
+                Books = Array.Empty<VectorIndexBook>();
+                return;
+            }
+
+            ValidateSections(bookCount, booksOffset);
+            (ModelId, Books) = ReadBooks(booksOffset, bookCount);
+            ValidateLists();
+        }
+        catch
+        {
+            Dispose();
+            throw;
+        }
+    }
+
+    /// <summary>
+    /// Gets the format version of the file
+    /// </summary>
+    public int Version { get; }
+
+    /// <inheritdoc />
+    public string ModelId { get; }
+
+    /// <inheritdoc />
+    public int Dimensions { get; }
+
+    /// <inheritdoc />
+    public IReadOnlyList<VectorIndexBook> Books { get; }
+
+    /// <inheritdoc />
+    public int ChunkCount { get; }
+
+    /// <summary>
+    /// Opens and maps an index file
+    /// </summary>
+    /// <param name="path">The index file path</param>
+    /// <returns>The open index, or null if it was written in another format version</returns>
+    /// <exception cref="InvalidDataException">The file is not a valid vector index</exception>
+    public static MappedVectorIndex? Open(string path)
+    {
+        using var stream = new FileStream(path, FileMode.Open, FileAccess.Read, FileShare.Read | FileShare.Delete);
+        var length = stream.Length;
+        var isTooShort = length < VectorIndexStore.HeaderSize;
+        if (isTooShort)
+        {
+            throw new InvalidDataException("Vector index is truncated");
+        }
+
+        var file = MemoryMappedFile.CreateFromFile(
+            stream, null, 0, MemoryMappedFileAccess.Read, HandleInheritability.None, leaveOpen: false);
+        MemoryMappedViewAccessor accessor;
+        try
+        {
+            accessor = file.CreateViewAccessor(0, length, MemoryMappedFileAccess.Read);
+        }
+        catch
+        {
+            file.Dispose();
+            throw;
+        }
+
+        var index = new MappedVectorIndex(file, accessor, length);
+        var isCurrentVersion = index.Version == VectorIndexContent.CurrentVersion;
+        if (!isCurrentVersion)
+        {
+            index.Dispose();
+            return null;
+        }
+
+        return index;
+    }
+
+    /// <inheritdoc />
+    public VectorIndexChunk GetChunk(int chunkId)
+    {
+        ObjectDisposedException.ThrowIf(_isDisposed, this);
+        ArgumentOutOfRangeException.ThrowIfNegative(chunkId);
+        ArgumentOutOfRangeException.ThrowIfGreaterThanOrEqual(chunkId, ChunkCount);
+
+        var record = ReadBytes(_chunksOffset + (long)chunkId * VectorIndexStore.ChunkRecordSize, VectorIndexStore.ChunkRecordSize);
+        var bookId = BinaryPrimitives.ReadInt32LittleEndian(record);
+        var page = BinaryPrimitives.ReadInt32LittleEndian(record[4..]);
+        var textOffset = BinaryPrimitives.ReadInt64LittleEndian(record[8..]);
+        var textLength = BinaryPrimitives.ReadInt32LittleEndian(record[16..]);
+
+        var isValidText = textOffset >= 0 && textLength >= 0 && textOffset + textLength <= _vectorsOffset - _textsOffset;
+        if (!isValidText)
+        {
+            throw new InvalidDataException($"Passage {chunkId} refers to text outside the vector index");
+        }
+
+        var text = Encoding.UTF8.GetString(ReadBytes(_textsOffset + textOffset, textLength));
+        return new VectorIndexChunk(bookId, page, text);
+    }
+
+    /// <inheritdoc />
+    public VectorIndexView GetView()
+    {
+        ObjectDisposedException.ThrowIf(_isDisposed, this);
+
+        var vectorLength = ChunkCount * Dimensions;
+        var listOffsetCount = _clusterCount > 0 ? _clusterCount + 1 : 0;
+        var listChunkIdCount = _clusterCount > 0 ? ChunkCount : 0;
+
+        return new VectorIndexView(
+            Dimensions,
+            MemoryMarshal.Cast<byte, float>(ReadBytes(_vectorsOffset, vectorLength * sizeof(float))),
+            MemoryMarshal.Cast<byte, float>(ReadBytes(_centroidsOffset, _clusterCount * Dimensions * sizeof(float))),
+            MemoryMarshal.Cast<byte, int>(ReadBytes(_listsOffset, listOffsetCount * sizeof(int))),
+            MemoryMarshal.Cast<byte, int>(ReadBytes(_listsOffset + listOffsetCount * sizeof(int), listChunkIdCount * sizeof(int))));
+    }
+
+    /// <inheritdoc />
+    public void Dispose()
+    {
+        if (_isDisposed)
+        {
+            return;
+        }
+
+        _isDisposed = true;
+        _accessor.SafeMemoryMappedViewHandle.ReleasePointer();
+        _accessor.Dispose();
+        _file.Dispose();
+    }
+
+    /// <summary>
+    /// Gets a span over a part of the mapped file
+    /// </summary>
+    private ReadOnlySpan<byte> ReadBytes(long offset, int length)
+    {
+        return new ReadOnlySpan<byte>(_pointer + offset, length);
+    }
+
+    /// <summary>
+    /// Checks that the counts fit the dimensions and that every section lies in order within the file
+    /// </summary>
+    private void ValidateSections(int bookCount, long booksOffset)
+    {
+        var hasValidCounts = Dimensions > 0 && bookCount >= 0 && ChunkCount >= 0 && _clusterCount >= 0
+                             && (long)ChunkCount * Dimensions * sizeof(float) <= int.MaxValue
+                             && (long)_clusterCount * Dimensions * sizeof(float) <= int.MaxValue;
+        if (!hasValidCounts)
+        {
+            throw new InvalidDataException("Vector index has invalid counts");
+        }
+
+        var listLength = _clusterCount > 0 ? ((long)_clusterCount + 1 + ChunkCount) * sizeof(int) : 0;
+        var hasValidSections = booksOffset == VectorIndexStore.HeaderSize
+                               && _chunksOffset >= booksOffset
+                               && _textsOffset == _chunksOffset + (long)ChunkCount * VectorIndexStore.ChunkRecordSize
+                               && _vectorsOffset >= _textsOffset
+                               && _vectorsOffset % VectorIndexStore.SectionAlignment == 0
+                               && _centroidsOffset >= _vectorsOffset + (long)ChunkCount * Dimensions * sizeof(float)
+                               && _centroidsOffset % VectorIndexStore.SectionAlignment == 0
+                               && _listsOffset == _centroidsOffset + (long)_clusterCount * Dimensions * sizeof(float)
+                               && _listsOffset + listLength <= _length;
+        if (!hasValidSections)
+        {
+            throw new InvalidDataException("Vector index is truncated or has invalid section offsets");
+        }
+    }
+
+    /// <summary>
+    /// Reads the model id and the books, checking that their passages lie within the index
+    /// </summary>
+    private (string ModelId, VectorIndexBook[] Books) ReadBooks(long booksOffset, int bookCount)
+    {
+        using var stream = new UnmanagedMemoryStream(_pointer + booksOffset, _chunksOffset - booksOffset);
+        using var reader = new BinaryReader(stream, Encoding.UTF8);
+
+        try
+        {
+            var modelId = reader.ReadString();
+            var books = new VectorIndexBook[bookCount];
+            for (var bookId = 0; bookId < books.Length; bookId++)
+            {
+                var fileName = reader.ReadString();
+                var fileSizeBytes = reader.Read7BitEncodedInt64();
+                var lastWriteTimeUtc = new DateTime(reader.ReadInt64(), DateTimeKind.Utc);
+                var title = reader.ReadString();
+                var firstChunkId = reader.Read7BitEncodedInt();
+                var chunkCount = reader.Read7BitEncodedInt();
+
+                var hasValidChunks = firstChunkId >= 0 && chunkCount >= 0 && (long)firstChunkId + chunkCount <= ChunkCount;
+                if (!hasValidChunks)
+                {
+                    throw new InvalidDataException($"Book {bookId} refers to passages outside the vector index");
+                }
+
+                books[bookId] = new VectorIndexBook(fileName, fileSizeBytes, lastWriteTimeUtc, title, firstChunkId, chunkCount);
+            }
+
+            return (modelId, books);
+        }
+        catch (EndOfStreamException ex)
+        {
+            throw new InvalidDataException("Vector index is truncated", ex);
+        }
+        catch (FormatException ex)
+        {
+            throw new InvalidDataException("Vector index is malformed", ex);
+        }
+        catch (ArgumentOutOfRangeException ex)
+        {
+            throw new InvalidDataException("Vector index is malformed", ex);
+        }
+    }
+
+    /// <summary>
+    /// Checks that the inverted file lists are ordered and only hold passage ids of the index
+    /// </summary>
+    private void ValidateLists()
+    {
+        var view = GetView();
+        var listOffsets = view.ListOffsets;
+        for (var clusterId = 0; clusterId < view.ClusterCount; clusterId++)
+        {
+            var isOrdered = listOffsets[clusterId] <= listOffsets[clusterId + 1];
+            if (!isOrdered)
+            {
+                throw new InvalidDataException($"List {clusterId} of the vector index has invalid bounds");
+            }
+        }
+
+        var hasValidBounds = view.ClusterCount == 0 || (listOffsets[0] == 0 && listOffsets[^1] == ChunkCount);
+        if (!hasValidBounds)
+        {
+            throw new InvalidDataException("Lists of the vector index do not cover every passage");
+        }
+
+        foreach (var chunkId in view.ListChunkIds)
+        {
+            var isKnownChunk = (uint)chunkId < (uint)ChunkCount;
+            if (!isKnownChunk)
+            {
+                throw new InvalidDataException($"List of the vector index refers to unknown passage {chunkId}");
+            }
+        }
+    }
+}
@@ -0,0 +1,71 @@
+using System.Runtime.InteropServices;
+using Microsoft.Win32.SafeHandles;
+
+namespace Bookshelf.Infrastructure.Adapters;
+
+/// <summary>
+/// File system operations that .NET does not expose: copy-on-write clones and hard links
+/// </summary>
+internal static partial class NativeFileOperations
+{
+    /// <summary>
+    /// The FICLONE ioctl request, _IOW(0x94, 9, int) in linux/fs.h
+    /// </summary>
+    private const ulong FicloneRequest = 0x40049409;
+
+    /// <summary>
+    /// Makes an empty destination file share the data blocks of the source (reflink on Btrfs, XFS and similar)
+    /// </summary>
+    /// <param name="source">The open source file</param>
+    /// <param name="destination">The open, empty destination file on the same file system</param>
+    /// <returns>True if the file was cloned, false if cloning is not supported here</returns>
+    public static bool TryCloneFile(SafeFileHandle source, SafeFileHandle destination)
+    {
+        if (!OperatingSystem.IsLinux())
+        {
+            return false;
+        }
+
+        try
+        {
+            var sourceDescriptor = (int)source.DangerousGetHandle();
+            var destinationDescriptor = (int)destination.DangerousGetHandle();
+            return Ioctl(destinationDescriptor, FicloneRequest, sourceDescriptor) == 0;
+        }
+        catch (Exception ex) when (ex is DllNotFoundException or EntryPointNotFoundException)
+        {
+            return false;
+        }
+    }
+
+    /// <summary>
+    /// Creates a hard link to an existing file
+    /// </summary>
+    /// <param name="existingPath">The file to link to</param>
+    /// <param name="linkPath">The path of the new link, which must not exist</param>
+    /// <returns>True if the link was created, false if linking failed or is not supported here</returns>
+    public static bool TryCreateHardLink(string existingPath, string linkPath)
+    {
+        try
+        {
+            return OperatingSystem.IsWindows()
+                ? CreateHardLink(linkPath, existingPath, IntPtr.Zero)
+                : Link(existingPath, linkPath) == 0;
+        }
+        catch (Exception ex) when (ex is DllNotFoundException or EntryPointNotFoundException)
+        {
+            return false;
+        }
+    }
+
+    // The marshalling code is generated at compile time, so the first call does not build it at runtime
+    [LibraryImport("libc", EntryPoint = "ioctl", SetLastError = true)]
+    private static partial int Ioctl(int fileDescriptor, ulong request, int sourceFileDescriptor);
+
+    [LibraryImport("libc", EntryPoint = "link", StringMarshalling = StringMarshalling.Utf8, SetLastError = true)]
+    private static partial int Link(string existingPath, string linkPath);
+
+    [LibraryImport("kernel32.dll", EntryPoint = "CreateHardLinkW", StringMarshalling = StringMarshalling.Utf16, SetLastError = true)]
+    [return: MarshalAs(UnmanagedType.Bool)]
+    private static partial bool CreateHardLink(string fileName, string existingFileName, IntPtr securityAttributes);
+}
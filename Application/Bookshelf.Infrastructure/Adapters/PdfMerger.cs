@@ -1,3 +1,4 @@
+using System.Diagnostics;
 using Bookshelf.Application.Core.ValueObjects;
 using Bookshelf.Application.Spi;
 using Bookshelf.Application.Spi.Dtos;
@@ -12,6 +13,9 @@ namespace Bookshelf.Infrastructure.Adapters;
 /// </summary>
 public class PdfMerger : IPdfMerger
 {
+    private const int OutputBufferSize = 1024 * 1024;
+    private const double BytesPerMegabyte = 1024 * 1024;
+
     private readonly ILogger<PdfMerger> _logger;
 
     /// <summary>
@@ -24,7 +28,7 @@ public class PdfMerger : IPdfMerger
     }
 
     /// <inheritdoc />
-    public async Task<bool> MergePdfsAsync(
+    public async Task<MergePdfsResult> MergePdfsAsync(
         MergePdfsRequest request,
         CancellationToken cancellationToken = default)
     {
@@ -32,22 +36,25 @@ public class PdfMerger : IPdfMerger
         {
             return await Task.Run(() =>
             {
+                var stopwatch = Stopwatch.StartNew();
                 var sourcePathsList = request.SourcePdfPaths.ToList();
                 
                 var hasNoSourcePdfs = !sourcePathsList.Any();
                 if (hasNoSourcePdfs)
                 {
                     _logger.LogWarning("No source PDFs provided for merging");
-                    return false;
+                    return MergePdfsResult.Failed;
                 }
 
-                // Create output PDF document
-                using var outputDocument = new PdfDocument();
-                
-                SetMetadataIfProvided(outputDocument, request.Metadata);
-                MergeAllSourcePdfs(sourcePathsList, outputDocument, cancellationToken);
+                var isStreaming = request.MergeMode == PdfMergeMode.Streaming;
+                var mergeResult = isStreaming
+                    ? MergeStreaming(sourcePathsList, request, cancellationToken)
+                    : MergeInMemory(sourcePathsList, request, cancellationToken);
+                mergeResult = mergeResult with { Elapsed = stopwatch.Elapsed };
 
-                return SaveMergedDocument(outputDocument, request.OutputPdfPath);
+                LogPeakWorkingSet(request.OutputPdfPath);
+                LogSizes(request.OutputPdfPath, mergeResult);
+                return mergeResult;
             }, cancellationToken);
         }
         catch (OperationCanceledException)
@@ -58,7 +65,7 @@ public class PdfMerger : IPdfMerger
         catch (Exception ex)
         {
             _logger.LogError(ex, "Error during PDF merge to {OutputPath}", request.OutputPdfPath);
-            return false;
+            return MergePdfsResult.Failed;
         }
     }
 
@@ -100,6 +107,206 @@ public class PdfMerger : IPdfMerger
         }
     }
 
+    /// <summary>
+    /// Merges the source PDFs by writing each source's pages to the output file as soon as it is imported,
+    /// writing stream objects shared by several sources only once
+    /// </summary>
+    private MergePdfsResult MergeStreaming(
+        List<string> sourcePathsList,
+        MergePdfsRequest request,
+        CancellationToken cancellationToken)
+    {
+        int pageCount;
+        var sourceBytes = 0L;
+        long outputBytes;
+        int sharedStreamCount;
+        long deduplicatedBytes;
+        long compressionSavedBytes;
+        var temporaryPath = CreateTemporaryOutputPath(request.OutputPdfPath);
+        try
+        {
+            using var outputStream = new FileStream(
+                temporaryPath, FileMode.CreateNew, FileAccess.Write, FileShare.None, OutputBufferSize);
+            var writer = new StreamingPdfWriter(outputStream, request.CompressionProfile);
+
+            foreach (var sourcePath in sourcePathsList)
+            {
+                cancellationToken.ThrowIfCancellationRequested();
+
+                var fileDoesNotExist = !File.Exists(sourcePath);
+                if (fileDoesNotExist)
+                {
+                    _logger.LogWarning("Source PDF not found: {SourcePath}", sourcePath);
+                    continue;
+                }
+
+                sourceBytes += new FileInfo(sourcePath).Length;
+                TryAppendSinglePdf(sourcePath, writer, cancellationToken);
+            }
+
+            pageCount = writer.PageCount;
+            var hasPages = pageCount > 0;
+            if (hasPages)
+            {
+                writer.Complete(request.Metadata);
+            }
+
+            outputBytes = writer.Length;
+            sharedStreamCount = writer.SharedStreamCount;
+            deduplicatedBytes = writer.DeduplicatedBytes;
+            compressionSavedBytes = writer.CompressionSavedBytes;
+        }
+        catch
+        {
+            DeleteIncompleteOutput(temporaryPath);
+            throw;
+        }
+
+        var hasNoPages = pageCount == 0;
+        if (hasNoPages)
+        {
+            _logger.LogWarning("No pages to save in merged PDF");
+            DeleteIncompleteOutput(temporaryPath);
+            return MergePdfsResult.Failed;
+        }
+
+        ReplaceOutput(temporaryPath, request.OutputPdfPath);
+
+        return new MergePdfsResult(
+            true,
+            sourceBytes,
+            outputBytes,
+            sharedStreamCount,
+            deduplicatedBytes,
+            compressionSavedBytes,
+            PageCount: pageCount);
+    }
+
+    /// <summary>
+    /// Attempts to append a single PDF to the streaming output, closing the source right afterwards
+    /// </summary>
+    private void TryAppendSinglePdf(string sourcePath, StreamingPdfWriter writer, CancellationToken cancellationToken)
+    {
+        try
+        {
+            using var sourceDocument = PdfReader.Open(sourcePath, PdfDocumentOpenMode.Import);
+            var appendedPageCount = writer.AppendDocument(sourceDocument, cancellationToken);
+
+            _logger.LogDebug("Merged PDF: {SourcePath} ({PageCount} pages)",
+                sourcePath, appendedPageCount);
+        }
+        catch (Exception ex) when (ex is not OperationCanceledException)
+        {
+            _logger.LogError(ex, "Error merging PDF: {SourcePath}", sourcePath);
+            // Continue with other PDFs
+        }
+    }
+
+    /// <summary>
+    /// Merges the source PDFs into one in-memory document that is saved at the end
+    /// </summary>
+    private MergePdfsResult MergeInMemory(
+        List<string> sourcePathsList,
+        MergePdfsRequest request,
+        CancellationToken cancellationToken)
+    {
+        using var outputDocument = new PdfDocument();
+
+        // PdfSharp compresses content streams but writes no object streams, so both profiles map to the same option
+        outputDocument.Options.CompressContentStreams = request.CompressionProfile != PdfCompressionProfile.None;
+
+        SetMetadataIfProvided(outputDocument, request.Metadata);
+        MergeAllSourcePdfs(sourcePathsList, outputDocument, cancellationToken);
+
+        var wasSaved = SaveMergedDocument(outputDocument, request.OutputPdfPath);
+        if (!wasSaved)
+        {
+            return MergePdfsResult.Failed;
+        }
+
+        var sourceBytes = sourcePathsList
+            .Where(File.Exists)
+            .Sum(sourcePath => new FileInfo(sourcePath).Length);
+
+        return new MergePdfsResult(
+            true,
+            sourceBytes,
+            new FileInfo(request.OutputPdfPath).Length,
+            PageCount: outputDocument.PageCount);
+    }
+
+    /// <summary>
+    /// Returns a unique path next to the output that the merged PDF is written to before it replaces the output
+    /// </summary>
+    private static string CreateTemporaryOutputPath(string outputPdfPath)
+    {
+        return $"{outputPdfPath}.{Guid.NewGuid():N}.tmp";
+    }
+
+    /// <summary>
+    /// Moves a completely written PDF over the output
+    /// </summary>
+    private void ReplaceOutput(string temporaryPath, string outputPdfPath)
+    {
+        // An existing output may be a hard link to one of the sources, so it is replaced by renaming
+        // rather than truncated, which would also truncate the source
+        try
+        {
+            File.Move(temporaryPath, outputPdfPath, overwrite: true);
+        }
+        catch
+        {
+            DeleteIncompleteOutput(temporaryPath);
+            throw;
+        }
+    }
+
+    /// <summary>
+    /// Deletes a partially written output file, ignoring errors
+    /// </summary>
+    private void DeleteIncompleteOutput(string outputPdfPath)
+    {
+        try
+        {
+            File.Delete(outputPdfPath);
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException)
+        {
+            _logger.LogWarning(ex, "Could not delete incomplete merged PDF: {OutputPath}", outputPdfPath);
+        }
+    }
+
+    /// <summary>
+    /// Logs the peak working set of the process after a merge
+    /// </summary>
+    private void LogPeakWorkingSet(string outputPdfPath)
+    {
+        using var process = Process.GetCurrentProcess();
+        _logger.LogInformation("Merged {OutputPath} with a peak working set of {PeakWorkingSetMegabytes:F1} MB",
+            outputPdfPath, process.PeakWorkingSet64 / BytesPerMegabyte);
+    }
+
+    /// <summary>
+    /// Logs the size of the sources against the size of the merged PDF
+    /// </summary>
+    private void LogSizes(string outputPdfPath, MergePdfsResult mergeResult)
+    {
+        if (!mergeResult.Success)
+        {
+            return;
+        }
+
+        _logger.LogInformation(
+            "Merged {OutputPath} from {SourceMegabytes:F1} MB of sources into {OutputMegabytes:F1} MB in {ElapsedMilliseconds} ms, {SharedStreamCount} shared streams saved {DeduplicatedMegabytes:F1} MB, compression saved {CompressionSavedMegabytes:F1} MB",
+            outputPdfPath,
+            mergeResult.SourceBytes / BytesPerMegabyte,
+            mergeResult.OutputBytes / BytesPerMegabyte,
+            (long)mergeResult.Elapsed.TotalMilliseconds,
+            mergeResult.SharedStreamCount,
+            mergeResult.DeduplicatedBytes / BytesPerMegabyte,
+            mergeResult.CompressionSavedBytes / BytesPerMegabyte);
+    }
+
     /// <summary>
     /// Sets metadata on the PDF document if provided
     /// </summary>
@@ -181,7 +388,18 @@ public class PdfMerger : IPdfMerger
         var hasPages = outputDocument.PageCount > 0;
         if (hasPages)
         {
-            outputDocument.Save(outputPdfPath);
+            var temporaryPath = CreateTemporaryOutputPath(outputPdfPath);
+            try
+            {
+                outputDocument.Save(temporaryPath);
+            }
+            catch
+            {
+                DeleteIncompleteOutput(temporaryPath);
+                throw;
+            }
+
+            ReplaceOutput(temporaryPath, outputPdfPath);
             return true;
         }
 
@@ -207,33 +425,54 @@ public class PdfMerger : IPdfMerger
     }
 
     /// <inheritdoc />
-    /// <inheritdoc />
-    public Task<int?> GetPageCountAsync(GetPdfPageCountRequest request)
+    public async Task<int?> GetPageCountAsync(
+        GetPdfPageCountRequest request,
+        CancellationToken cancellationToken = default)
     {
         try
         {
-            var fileDoesNotExist = !File.Exists(request.FilePath);
-            if (fileDoesNotExist)
-            {
-                _logger.LogWarning("PDF file not found: {FilePath}", request.FilePath);
-                return Task.FromResult<int?>(null);
-            }
-
-            try
-            {
-                using var document = PdfReader.Open(request.FilePath, PdfDocumentOpenMode.Import);
-                return Task.FromResult<int?>(document.PageCount);
-            }
-            catch (Exception ex)
-            {
-                _logger.LogWarning(ex, "Error reading page count from {FilePath}", request.FilePath);
-                return Task.FromResult<int?>(null);
-            }
+            // PdfSharp only parses synchronously, so the parse runs on the thread pool instead of the caller's thread
+            return await Task.Run(() => ReadPageCount(request.FilePath), cancellationToken);
+        }
+        catch (OperationCanceledException)
+        {
+            throw;
         }
         catch (Exception ex)
         {
             _logger.LogError(ex, "Error getting page count from {FilePath}", request.FilePath);
-            return Task.FromResult<int?>(null);
+            return null;
+        }
+    }
+
+    /// <summary>
+    /// Reads the page count from the page tree root, falling back to opening the whole document
+    /// </summary>
+    private int? ReadPageCount(string filePath)
+    {
+        var fileDoesNotExist = !File.Exists(filePath);
+        if (fileDoesNotExist)
+        {
+            _logger.LogWarning("PDF file not found: {FilePath}", filePath);
+            return null;
+        }
+
+        var pageCount = PdfPageCountReader.TryReadPageCount(filePath);
+        if (pageCount.HasValue)
+        {
+            return pageCount;
+        }
+
+        _logger.LogDebug("Falling back to a full parse to read the page count of {FilePath}", filePath);
+        try
+        {
+            using var document = PdfReader.Open(filePath, PdfDocumentOpenMode.Import);
+            return document.PageCount;
+        }
+        catch (Exception ex)
+        {
+            _logger.LogWarning(ex, "Error reading page count from {FilePath}", filePath);
+            return null;
         }
     }
 }
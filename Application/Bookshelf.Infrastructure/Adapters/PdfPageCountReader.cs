@@ -0,0 +1,967 @@
+using System.Globalization;
+using System.IO.Compression;
+using System.IO.MemoryMappedFiles;
+using System.Text;
+
+namespace Bookshelf.Infrastructure.Adapters;
+
+/// <summary>
+/// Reads the page count of a PDF from the /Count entry of its page tree root. Only the trailer,
+/// the cross-reference data and the objects on the path to the page tree root are read from a
+/// memory-mapped view of the file, instead of parsing the whole document.
+/// </summary>
+internal static class PdfPageCountReader
+{
+    /// <summary>
+    /// Reads the page count of a PDF file without parsing the whole document
+    /// </summary>
+    /// <param name="filePath">The PDF file path</param>
+    /// <returns>The page count, or null if it cannot be determined this way</returns>
+    public static int? TryReadPageCount(string filePath)
+    {
+        try
+        {
+            using var fileStream = new FileStream(filePath, FileMode.Open, FileAccess.Read, FileShare.ReadWrite);
+            var fileLength = fileStream.Length;
+            var isEmpty = fileLength == 0;
+            if (isEmpty)
+            {
+                return null;
+            }
+
+            using var mappedFile = MemoryMappedFile.CreateFromFile(
+                fileStream, null, 0, MemoryMappedFileAccess.Read, HandleInheritability.None, leaveOpen: true);
+            using var accessor = mappedFile.CreateViewAccessor(0, fileLength, MemoryMappedFileAccess.Read);
+
+            return new MappedPdfDocument(accessor, fileLength).ReadPageCount();
+        }
+        catch (Exception ex) when (ex is not OperationCanceledException)
+        {
+            // Any file this reader does not understand, however malformed, is left to the full parser
+            return null;
+        }
+    }
+
+    /// <summary>
+    /// Resolves objects of a memory-mapped PDF through its cross-reference sections
+    /// </summary>
+    private sealed class MappedPdfDocument
+    {
+        private const int WindowSize = 4096;
+        private const int StartXrefSearchLength = 1024;
+        private const int MaxCrossReferenceSections = 64;
+        private const int ClassicEntryLength = 20;
+        private const int MaxResolveDepth = 32;
+
+        private readonly MemoryMappedViewAccessor _accessor;
+        private readonly long _length;
+        private readonly PdfSyntaxReader _reader;
+        private readonly byte[] _window = new byte[WindowSize];
+        private readonly List<CrossReferenceSection> _sections = [];
+        private readonly HashSet<long> _visitedSectionOffsets = [];
+        private readonly Dictionary<int, ObjectStream> _objectStreams = new();
+        private long _windowStart = -1;
+        private int _windowLength;
+        private long? _nextSectionOffset;
+        private int _resolveDepth;
+
+        /// <summary>
+        /// Initializes a new instance of the MappedPdfDocument class
+        /// </summary>
+        public MappedPdfDocument(MemoryMappedViewAccessor accessor, long length)
+        {
+            _accessor = accessor;
+            _length = length;
+            _reader = new PdfSyntaxReader(ReadByteAt);
+        }
+
+        /// <summary>
+        /// Follows trailer, catalog and page tree root to the page count
+        /// </summary>
+        public int? ReadPageCount()
+        {
+            _nextSectionOffset = FindStartXref();
+
+            var newestSection = GetSection(0) ?? throw new InvalidDataException("No cross-reference section");
+            var catalog = Resolve(newestSection.Trailer.GetValueOrDefault("/Root")) as Dictionary<string, object?>;
+            var pageTreeRoot = Resolve(catalog?.GetValueOrDefault("/Pages")) as Dictionary<string, object?>;
+            var count = Resolve(pageTreeRoot?.GetValueOrDefault("/Count")) as long?;
+
+            var isValidCount = count is >= 0 and <= int.MaxValue;
+            return isValidCount ? (int)count!.Value : null;
+        }
+
+        /// <summary>
+        /// Reads the offset of the newest cross-reference section from the end of the file
+        /// </summary>
+        private long FindStartXref()
+        {
+            var tailLength = (int)Math.Min(StartXrefSearchLength, _length);
+            var tail = ReadBytes(_length - tailLength, tailLength);
+            var keywordIndex = tail.AsSpan().LastIndexOf("startxref"u8);
+            if (keywordIndex < 0)
+            {
+                throw new InvalidDataException("startxref not found");
+            }
+
+            var tailReader = new PdfSyntaxReader(position => position < tail.Length ? tail[position] : -1);
+            long position = keywordIndex + "startxref".Length;
+            return tailReader.ParseInteger(ref position);
+        }
+
+        /// <summary>
+        /// Resolves a reference to the referenced value, returning direct values unchanged
+        /// </summary>
+        private object? Resolve(object? value)
+        {
+            return value is ObjectReference reference ? ReadObject(reference.ObjectNumber) : value;
+        }
+
+        /// <summary>
+        /// Reads the value of an indirect object
+        /// </summary>
+        private object? ReadObject(int objectNumber)
+        {
+            // Indirect stream lengths and object streams can refer to further objects, and a crafted
+            // file could chain them deep enough to overflow the stack
+            var isTooDeep = _resolveDepth >= MaxResolveDepth;
+            if (isTooDeep)
+            {
+                throw new InvalidDataException($"Object {objectNumber} is nested too deeply");
+            }
+
+            _resolveDepth++;
+            try
+            {
+                var entry = FindEntry(objectNumber) ?? throw new InvalidDataException($"Object {objectNumber} not found");
+
+                return entry.Kind == CrossReferenceEntryKind.Compressed
+                    ? ReadCompressedObject((int)entry.Value, objectNumber)
+                    : ParseIndirectObjectAt(entry.Value, objectNumber).Value;
+            }
+            finally
+            {
+                _resolveDepth--;
+            }
+        }
+
+        /// <summary>
+        /// Finds the newest cross-reference entry of an object, loading older sections only when needed
+        /// </summary>
+        private CrossReferenceEntry? FindEntry(int objectNumber)
+        {
+            for (var sectionIndex = 0; ; sectionIndex++)
+            {
+                var section = GetSection(sectionIndex);
+                if (section == null)
+                {
+                    return null;
+                }
+
+                var entry = FindEntryInSection(section, objectNumber);
+                if (entry != null)
+                {
+                    return entry.Value.Kind == CrossReferenceEntryKind.Free ? null : entry;
+                }
+            }
+        }
+
+        /// <summary>
+        /// Looks up an object in one cross-reference section
+        /// </summary>
+        private CrossReferenceEntry? FindEntryInSection(CrossReferenceSection section, int objectNumber)
+        {
+            if (section.StreamEntries.TryGetValue(objectNumber, out var streamEntry))
+            {
+                return streamEntry;
+            }
+
+            foreach (var subsection in section.Subsections)
+            {
+                var isInSubsection = objectNumber >= subsection.FirstObjectNumber &&
+                                     objectNumber < subsection.FirstObjectNumber + subsection.Count;
+                if (isInSubsection)
+                {
+                    var entryOffset = subsection.EntriesOffset +
+                                      (long)(objectNumber - subsection.FirstObjectNumber) * ClassicEntryLength;
+                    return ParseClassicEntry(entryOffset);
+                }
+            }
+
+            return null;
+        }
+
+        /// <summary>
+        /// Parses one fixed-width entry of a classic cross-reference table
+        /// </summary>
+        private CrossReferenceEntry ParseClassicEntry(long entryOffset)
+        {
+            var entry = Encoding.ASCII.GetString(ReadBytes(entryOffset, ClassicEntryLength - 2));
+            var offset = long.Parse(entry.AsSpan(0, 10), NumberStyles.None, CultureInfo.InvariantCulture);
+
+            return entry[17] switch
+            {
+                'n' => new CrossReferenceEntry(CrossReferenceEntryKind.Uncompressed, offset),
+                'f' => new CrossReferenceEntry(CrossReferenceEntryKind.Free, 0),
+                _ => throw new InvalidDataException($"Malformed cross-reference entry at {entryOffset}")
+            };
+        }
+
+        /// <summary>
+        /// Gets a cross-reference section by age, newest first, loading it on first access
+        /// </summary>
+        private CrossReferenceSection? GetSection(int sectionIndex)
+        {
+            while (_sections.Count <= sectionIndex)
+            {
+                if (_nextSectionOffset == null)
+                {
+                    return null;
+                }
+
+                var section = LoadSection(_nextSectionOffset.Value);
+                _sections.Add(section);
+
+                // Hybrid files keep additional entries in an xref stream referenced from the classic trailer
+                if (section.Trailer.GetValueOrDefault("/XRefStm") is long hybridStreamOffset)
+                {
+                    _sections.Add(LoadSection(hybridStreamOffset));
+                }
+
+                _nextSectionOffset = section.Trailer.GetValueOrDefault("/Prev") as long?;
+            }
+
+            return _sections[sectionIndex];
+        }
+
+        /// <summary>
+        /// Loads a classic cross-reference table or a cross-reference stream
+        /// </summary>
+        private CrossReferenceSection LoadSection(long offset)
+        {
+            var isNewSection = _visitedSectionOffsets.Add(offset);
+            var isWithinLimit = _visitedSectionOffsets.Count <= MaxCrossReferenceSections;
+            if (!isNewSection || !isWithinLimit)
+            {
+                throw new InvalidDataException("Cyclic or excessive cross-reference sections");
+            }
+
+            var position = offset;
+            var isClassicTable = _reader.MatchKeyword(ref position, "xref");
+            return isClassicTable ? LoadClassicSection(position) : LoadStreamSection(offset);
+        }
+
+        /// <summary>
+        /// Loads the subsection headers and trailer of a classic table without reading its entries
+        /// </summary>
+        private CrossReferenceSection LoadClassicSection(long position)
+        {
+            var subsections = new List<ClassicSubsection>();
+            while (!_reader.MatchKeyword(ref position, "trailer"))
+            {
+                var firstObjectNumber = checked((int)_reader.ParseInteger(ref position));
+                var count = checked((int)_reader.ParseInteger(ref position));
+                _reader.SkipWhitespace(ref position);
+
+                subsections.Add(new ClassicSubsection(firstObjectNumber, count, position));
+                position += (long)count * ClassicEntryLength;
+            }
+
+            var trailer = _reader.ParseObject(ref position) as Dictionary<string, object?>
+                          ?? throw new InvalidDataException("Malformed trailer");
+
+            return new CrossReferenceSection(trailer, subsections, new Dictionary<int, CrossReferenceEntry>());
+        }
+
+        /// <summary>
+        /// Loads and decodes a cross-reference stream
+        /// </summary>
+        private CrossReferenceSection LoadStreamSection(long offset)
+        {
+            var streamObject = ParseIndirectObjectAt(offset, null);
+            if (streamObject.Value is not Dictionary<string, object?> dictionary ||
+                streamObject.StreamData == null ||
+                dictionary.GetValueOrDefault("/Type") as string != "/XRef")
+            {
+                throw new InvalidDataException($"No cross-reference data at {offset}");
+            }
+
+            var widths = ToIntegers(dictionary.GetValueOrDefault("/W"));
+            var size = ToInteger(dictionary.GetValueOrDefault("/Size"));
+            var index = dictionary.GetValueOrDefault("/Index") is List<object?> indexArray
+                ? ToIntegers(indexArray)
+                : [0, size];
+            if (widths.Count != 3 || index.Count % 2 != 0)
+            {
+                throw new InvalidDataException("Malformed cross-reference stream dictionary");
+            }
+
+            var data = DecodeStream(dictionary, streamObject.StreamData!);
+            var entryLength = widths[0] + widths[1] + widths[2];
+            var entries = new Dictionary<int, CrossReferenceEntry>();
+            var dataPosition = 0;
+
+            for (var rangeIndex = 0; rangeIndex < index.Count; rangeIndex += 2)
+            {
+                for (var objectNumber = index[rangeIndex]; objectNumber < index[rangeIndex] + index[rangeIndex + 1]; objectNumber++)
+                {
+                    if (dataPosition + entryLength > data.Length)
+                    {
+                        throw new InvalidDataException("Truncated cross-reference stream");
+                    }
+
+                    var type = widths[0] == 0 ? 1 : ReadBigEndian(data, dataPosition, widths[0]);
+                    var field2 = ReadBigEndian(data, dataPosition + widths[0], widths[1]);
+                    dataPosition += entryLength;
+
+                    CrossReferenceEntry? entry = type switch
+                    {
+                        0 => new CrossReferenceEntry(CrossReferenceEntryKind.Free, 0),
+                        1 => new CrossReferenceEntry(CrossReferenceEntryKind.Uncompressed, field2),
+                        2 => new CrossReferenceEntry(CrossReferenceEntryKind.Compressed, field2),
+                        _ => null
+                    };
+                    if (entry != null)
+                    {
+                        entries.TryAdd(objectNumber, entry.Value);
+                    }
+                }
+            }
+
+            return new CrossReferenceSection(dictionary, [], entries);
+        }
+
+        /// <summary>
+        /// Reads an object stored in an object stream
+        /// </summary>
+        private object? ReadCompressedObject(int objectStreamNumber, int objectNumber)
+        {
+            // Catalog and page tree root usually share one object stream, so it is decoded only once
+            if (!_objectStreams.TryGetValue(objectStreamNumber, out var objectStream))
+            {
+                objectStream = LoadObjectStream(objectStreamNumber);
+                _objectStreams[objectStreamNumber] = objectStream;
+            }
+
+            var data = objectStream.Data;
+            var dataReader = new PdfSyntaxReader(position => position < data.Length ? data[position] : -1);
+            var headerPosition = 0L;
+
+            for (var pairIndex = 0; pairIndex < objectStream.ObjectCount; pairIndex++)
+            {
+                var storedObjectNumber = dataReader.ParseInteger(ref headerPosition);
+                var relativeOffset = dataReader.ParseInteger(ref headerPosition);
+                if (storedObjectNumber == objectNumber)
+                {
+                    var objectPosition = objectStream.First + relativeOffset;
+                    return dataReader.ParseObject(ref objectPosition);
+                }
+            }
+
+            throw new InvalidDataException($"Object {objectNumber} not found in object stream {objectStreamNumber}");
+        }
+
+        /// <summary>
+        /// Loads and decodes an object stream
+        /// </summary>
+        private ObjectStream LoadObjectStream(int objectStreamNumber)
+        {
+            var streamEntry = FindEntry(objectStreamNumber);
+            if (streamEntry?.Kind != CrossReferenceEntryKind.Uncompressed)
+            {
+                throw new InvalidDataException($"Object stream {objectStreamNumber} not found");
+            }
+
+            var streamObject = ParseIndirectObjectAt(streamEntry.Value.Value, objectStreamNumber);
+            var dictionary = streamObject.Value as Dictionary<string, object?>;
+            if (dictionary == null || streamObject.StreamData == null)
+            {
+                throw new InvalidDataException($"Object {objectStreamNumber} is not an object stream");
+            }
+
+            return new ObjectStream(
+                DecodeStream(dictionary, streamObject.StreamData),
+                ToInteger(dictionary.GetValueOrDefault("/First")),
+                ToInteger(dictionary.GetValueOrDefault("/N")));
+        }
+
+        /// <summary>
+        /// Parses an indirect object and the raw data of its stream, if any
+        /// </summary>
+        private IndirectObject ParseIndirectObjectAt(long offset, int? expectedObjectNumber)
+        {
+            var position = offset;
+            var objectNumber = _reader.ParseInteger(ref position);
+            _reader.ParseInteger(ref position);
+
+            var isObject = _reader.MatchKeyword(ref position, "obj");
+            var isExpectedObject = expectedObjectNumber == null || objectNumber == expectedObjectNumber;
+            if (!isObject || !isExpectedObject)
+            {
+                throw new InvalidDataException($"No object {expectedObjectNumber} at {offset}");
+            }
+
+            var value = _reader.ParseObject(ref position);
+            var hasStream = value is Dictionary<string, object?> && _reader.MatchKeyword(ref position, "stream");
+            if (!hasStream)
+            {
+                return new IndirectObject(value, null);
+            }
+
+            // The stream keyword is followed by CRLF or LF before the data starts
+            if (ReadByteAt(position) == '\r')
+            {
+                position++;
+            }
+
+            if (ReadByteAt(position) == '\n')
+            {
+                position++;
+            }
+
+            var length = Resolve(((Dictionary<string, object?>)value!).GetValueOrDefault("/Length")) as long?;
+            if (length is not (>= 0 and <= int.MaxValue) || position + length.Value > _length)
+            {
+                throw new InvalidDataException($"Invalid stream length at {offset}");
+            }
+
+            return new IndirectObject(value, ReadBytes(position, (int)length.Value));
+        }
+
+        /// <summary>
+        /// Reads a single byte through a small window, returning -1 past the end of the file
+        /// </summary>
+        private int ReadByteAt(long position)
+        {
+            if (position < 0 || position >= _length)
+            {
+                return -1;
+            }
+
+            var isOutsideWindow = _windowStart < 0 || position < _windowStart || position >= _windowStart + _windowLength;
+            if (isOutsideWindow)
+            {
+                _windowStart = position;
+                _windowLength = (int)Math.Min(WindowSize, _length - position);
+                _accessor.ReadArray(position, _window, 0, _windowLength);
+            }
+
+            return _window[position - _windowStart];
+        }
+
+        /// <summary>
+        /// Reads a range of bytes from the mapped view
+        /// </summary>
+        private byte[] ReadBytes(long position, int count)
+        {
+            if (position < 0 || position + count > _length)
+            {
+                throw new InvalidDataException($"Read beyond end of file at {position}");
+            }
+
+            var bytes = new byte[count];
+            _accessor.ReadArray(position, bytes, 0, count);
+            return bytes;
+        }
+
+        /// <summary>
+        /// Decodes stream data, supporting the Flate filter with PNG predictors used by cross-reference streams
+        /// </summary>
+        private byte[] DecodeStream(Dictionary<string, object?> dictionary, byte[] rawData)
+        {
+            var filter = Resolve(dictionary.GetValueOrDefault("/Filter"));
+            var filterName = filter is List<object?> { Count: 1 } filters ? filters[0] : filter;
+            if (filterName == null)
+            {
+                return rawData;
+            }
+
+            if (filterName as string != "/FlateDecode")
+            {
+                throw new InvalidDataException($"Unsupported stream filter {filterName}");
+            }
+
+            var decodeParameters = Resolve(dictionary.GetValueOrDefault("/DecodeParms"));
+            var parameters = decodeParameters is List<object?> { Count: 1 } parameterArray
+                ? parameterArray[0] as Dictionary<string, object?>
+                : decodeParameters as Dictionary<string, object?>;
+            var predictor = parameters?.GetValueOrDefault("/Predictor") as long? ?? 1;
+            var columns = parameters?.GetValueOrDefault("/Columns") as long? ?? 1;
+
+            var inflated = Inflate(rawData);
+            return predictor switch
+            {
+                1 => inflated,
+                >= 10 => RemovePngPredictor(inflated, checked((int)columns)),
+                _ => throw new InvalidDataException($"Unsupported predictor {predictor}")
+            };
+        }
+
+        /// <summary>
+        /// Inflates zlib-compressed data
+        /// </summary>
+        private static byte[] Inflate(byte[] compressed)
+        {
+            using var input = new ZLibStream(new MemoryStream(compressed), CompressionMode.Decompress);
+            using var output = new MemoryStream();
+            input.CopyTo(output);
+            return output.ToArray();
+        }
+
+        /// <summary>
+        /// Reverses PNG row filters for single-byte samples
+        /// </summary>
+        private static byte[] RemovePngPredictor(byte[] data, int columns)
+        {
+            var rowLength = columns + 1;
+            var rowCount = data.Length / rowLength;
+            var output = new byte[rowCount * columns];
+
+            for (var row = 0; row < rowCount; row++)
+            {
+                var filterType = data[row * rowLength];
+                for (var column = 0; column < columns; column++)
+                {
+                    var raw = data[row * rowLength + 1 + column];
+                    var left = column > 0 ? output[row * columns + column - 1] : 0;
+                    var up = row > 0 ? output[(row - 1) * columns + column] : 0;
+                    var upLeft = row > 0 && column > 0 ? output[(row - 1) * columns + column - 1] : 0;
+
+                    var predicted = filterType switch
+                    {
+                        0 => 0,
+                        1 => left,
+                        2 => up,
+                        3 => (left + up) / 2,
+                        4 => PaethPredictor(left, up, upLeft),
+                        _ => throw new InvalidDataException($"Unsupported PNG filter {filterType}")
+                    };
+                    output[row * columns + column] = (byte)(raw + predicted);
+                }
+            }
+
+            return output;
+        }
+
+        /// <summary>
+        /// Computes the PNG Paeth predictor
+        /// </summary>
+        private static int PaethPredictor(int left, int up, int upLeft)
+        {
+            var estimate = left + up - upLeft;
+            var leftDistance = Math.Abs(estimate - left);
+            var upDistance = Math.Abs(estimate - up);
+            var upLeftDistance = Math.Abs(estimate - upLeft);
+
+            if (leftDistance <= upDistance && leftDistance <= upLeftDistance)
+            {
+                return left;
+            }
+
+            return upDistance <= upLeftDistance ? up : upLeft;
+        }
+
+        /// <summary>
+        /// Reads a big-endian unsigned field of a cross-reference stream entry
+        /// </summary>
+        private static long ReadBigEndian(byte[] data, int position, int width)
+        {
+            var value = 0L;
+            for (var byteIndex = 0; byteIndex < width; byteIndex++)
+            {
+                value = (value << 8) | data[position + byteIndex];
+            }
+
+            return value;
+        }
+
+        /// <summary>
+        /// Converts a parsed integer to int
+        /// </summary>
+        private static int ToInteger(object? value)
+        {
+            return value is long integer
+                ? checked((int)integer)
+                : throw new InvalidDataException("Integer expected");
+        }
+
+        /// <summary>
+        /// Converts a parsed array of integers to ints
+        /// </summary>
+        private static List<int> ToIntegers(object? value)
+        {
+            return value is List<object?> array
+                ? array.Select(ToInteger).ToList()
+                : throw new InvalidDataException("Integer array expected");
+        }
+    }
+
+    /// <summary>
+    /// Minimal tokenizer for the PDF object syntax. Names are returned with their leading slash,
+    /// integers as long, reals as double, dictionaries and arrays as Dictionary and List.
+    /// String contents are skipped because they are never needed for the page count.
+    /// </summary>
+    private sealed class PdfSyntaxReader
+    {
+        private const int MaxNestingDepth = 256;
+
+        private static readonly object SkippedString = new();
+
+        private readonly Func<long, int> _byteAt;
+        private int _nestingDepth;
+
+        /// <summary>
+        /// Initializes a new instance of the PdfSyntaxReader class
+        /// </summary>
+        /// <param name="byteAt">Returns the byte at a position, or -1 past the end of the data</param>
+        public PdfSyntaxReader(Func<long, int> byteAt)
+        {
+            _byteAt = byteAt;
+        }
+
+        /// <summary>
+        /// Parses the object starting at the position
+        /// </summary>
+        public object? ParseObject(ref long position)
+        {
+            SkipWhitespace(ref position);
+            var current = _byteAt(position);
+
+            var isContainer = current == '[' || (current == '<' && _byteAt(position + 1) == '<');
+            if (isContainer)
+            {
+                return ParseContainer(ref position);
+            }
+
+            switch (current)
+            {
+                case '<':
+                    SkipUntil(ref position, '>');
+                    return SkippedString;
+                case '(':
+                    SkipLiteralString(ref position);
+                    return SkippedString;
+                case '/':
+                    return ParseName(ref position);
+                case '+' or '-' or '.' or (>= '0' and <= '9'):
+                    return ParseNumberOrReference(ref position);
+                case -1:
+                    throw new InvalidDataException("Unexpected end of data");
+                default:
+                    return ParseKeyword(ref position);
+            }
+        }
+
+        /// <summary>
+        /// Parses an unsigned or signed integer
+        /// </summary>
+        public long ParseInteger(ref long position)
+        {
+            SkipWhitespace(ref position);
+            var token = ReadRegularToken(ref position);
+            return long.Parse(token, NumberStyles.AllowLeadingSign, CultureInfo.InvariantCulture);
+        }
+
+        /// <summary>
+        /// Advances past a keyword if it is the next token, leaving the position unchanged otherwise
+        /// </summary>
+        public bool MatchKeyword(ref long position, string keyword)
+        {
+            var lookahead = position;
+            SkipWhitespace(ref lookahead);
+
+            for (var index = 0; index < keyword.Length; index++)
+            {
+                if (_byteAt(lookahead + index) != keyword[index])
+                {
+                    return false;
+                }
+            }
+
+            var isWholeToken = !IsRegular(_byteAt(lookahead + keyword.Length));
+            if (isWholeToken)
+            {
+                position = lookahead + keyword.Length;
+            }
+
+            return isWholeToken;
+        }
+
+        /// <summary>
+        /// Skips whitespace and comments
+        /// </summary>
+        public void SkipWhitespace(ref long position)
+        {
+            while (true)
+            {
+                var current = _byteAt(position);
+                if (current == '%')
+                {
+                    while (current != -1 && current != '\r' && current != '\n')
+                    {
+                        current = _byteAt(++position);
+                    }
+                }
+                else if (IsWhitespace(current))
+                {
+                    position++;
+                }
+                else
+                {
+                    return;
+                }
+            }
+        }
+
+        /// <summary>
+        /// Parses a dictionary or an array, limiting how deeply they are nested
+        /// </summary>
+        private object ParseContainer(ref long position)
+        {
+            var isTooDeep = _nestingDepth >= MaxNestingDepth;
+            if (isTooDeep)
+            {
+                throw new InvalidDataException($"Objects nested too deeply at {position}");
+            }
+
+            _nestingDepth++;
+            try
+            {
+                return _byteAt(position) == '['
+                    ? ParseArray(ref position)
+                    : ParseDictionary(ref position);
+            }
+            finally
+            {
+                _nestingDepth--;
+            }
+        }
+
+        /// <summary>
+        /// Parses a dictionary
+        /// </summary>
+        private Dictionary<string, object?> ParseDictionary(ref long position)
+        {
+            var dictionary = new Dictionary<string, object?>();
+            position += 2;
+
+            while (true)
+            {
+                SkipWhitespace(ref position);
+                var isEnd = _byteAt(position) == '>' && _byteAt(position + 1) == '>';
+                if (isEnd)
+                {
+                    position += 2;
+                    return dictionary;
+                }
+
+                if (_byteAt(position) != '/')
+                {
+                    throw new InvalidDataException($"Dictionary key expected at {position}");
+                }
+
+                var key = ParseName(ref position);
+                dictionary[key] = ParseObject(ref position);
+            }
+        }
+
+        /// <summary>
+        /// Parses an array
+        /// </summary>
+        private List<object?> ParseArray(ref long position)
+        {
+            var array = new List<object?>();
+            position++;
+
+            while (true)
+            {
+                SkipWhitespace(ref position);
+                if (_byteAt(position) == ']')
+                {
+                    position++;
+                    return array;
+                }
+
+                array.Add(ParseObject(ref position));
+            }
+        }
+
+        /// <summary>
+        /// Parses a name, keeping its leading slash
+        /// </summary>
+        private string ParseName(ref long position)
+        {
+            position++;
+            return "/" + ReadRegularToken(ref position, allowEmpty: true);
+        }
+
+        /// <summary>
+        /// Parses a number, or an indirect reference if the integer is followed by a generation and R
+        /// </summary>
+        private object ParseNumberOrReference(ref long position)
+        {
+            var token = ReadRegularToken(ref position);
+            var isReal = token.Contains('.');
+            if (isReal)
+            {
+                return double.Parse(token, NumberStyles.Float, CultureInfo.InvariantCulture);
+            }
+
+            var integer = long.Parse(token, NumberStyles.AllowLeadingSign, CultureInfo.InvariantCulture);
+            var lookahead = position;
+            SkipWhitespace(ref lookahead);
+
+            var isGenerationNext = _byteAt(lookahead) is >= '0' and <= '9';
+            if (!isGenerationNext)
+            {
+                return integer;
+            }
+
+            ReadRegularToken(ref lookahead);
+            var isReference = MatchKeyword(ref lookahead, "R");
+            if (isReference)
+            {
+                position = lookahead;
+                return new ObjectReference(checked((int)integer));
+            }
+
+            return integer;
+        }
+
+        /// <summary>
+        /// Parses the keywords true, false and null
+        /// </summary>
+        private object? ParseKeyword(ref long position)
+        {
+            var start = position;
+            return ReadRegularToken(ref position) switch
+            {
+                "true" => true,
+                "false" => false,
+                "null" => null,
+                var keyword => throw new InvalidDataException($"Unexpected keyword '{keyword}' at {start}")
+            };
+        }
+
+        /// <summary>
+        /// Skips a literal string, honouring nested parentheses and escapes
+        /// </summary>
+        private void SkipLiteralString(ref long position)
+        {
+            var depth = 0;
+            do
+            {
+                var current = _byteAt(position++);
+                switch (current)
+                {
+                    case -1:
+                        throw new InvalidDataException("Unterminated string");
+                    case '\\':
+                        position++;
+                        break;
+                    case '(':
+                        depth++;
+                        break;
+                    case ')':
+                        depth--;
+                        break;
+                }
+            } while (depth > 0);
+        }
+
+        /// <summary>
+        /// Skips up to and including a terminator byte
+        /// </summary>
+        private void SkipUntil(ref long position, char terminator)
+        {
+            int current;
+            do
+            {
+                current = _byteAt(position++);
+                if (current == -1)
+                {
+                    throw new InvalidDataException($"Missing '{terminator}'");
+                }
+            } while (current != terminator);
+        }
+
+        /// <summary>
+        /// Reads a run of regular characters
+        /// </summary>
+        private string ReadRegularToken(ref long position, bool allowEmpty = false)
+        {
+            var builder = new StringBuilder();
+            while (IsRegular(_byteAt(position)))
+            {
+                builder.Append((char)_byteAt(position++));
+            }
+
+            if (builder.Length == 0 && !allowEmpty)
+            {
+                throw new InvalidDataException($"Token expected at {position}");
+            }
+
+            return builder.ToString();
+        }
+
+        /// <summary>
+        /// Determines whether a byte is PDF whitespace
+        /// </summary>
+        private static bool IsWhitespace(int value)
+        {
+            return value is 0 or '\t' or '\n' or '\f' or '\r' or ' ';
+        }
+
+        /// <summary>
+        /// Determines whether a byte belongs to a token, i.e. is neither whitespace, a delimiter nor the end
+        /// </summary>
+        private static bool IsRegular(int value)
+        {
+            return value != -1 && !IsWhitespace(value) &&
+                   value is not ('(' or ')' or '<' or '>' or '[' or ']' or '{' or '}' or '/' or '%');
+        }
+    }
+
+    /// <summary>
+    /// Kind of a cross-reference entry
+    /// </summary>
+    private enum CrossReferenceEntryKind
+    {
+        Free,
+        Uncompressed,
+        Compressed
+    }
+
+    /// <summary>
+    /// A cross-reference entry; the value is the file offset, or the object stream number for compressed objects
+    /// </summary>
+    private readonly record struct CrossReferenceEntry(CrossReferenceEntryKind Kind, long Value);
+
+    /// <summary>
+    /// Location of the entries of a classic cross-reference subsection
+    /// </summary>
+    private sealed record ClassicSubsection(int FirstObjectNumber, int Count, long EntriesOffset);
+
+    /// <summary>
+    /// A cross-reference section with its trailer dictionary
+    /// </summary>
+    private sealed record CrossReferenceSection(
+        Dictionary<string, object?> Trailer,
+        IReadOnlyList<ClassicSubsection> Subsections,
+        IReadOnlyDictionary<int, CrossReferenceEntry> StreamEntries);
+
+    /// <summary>
+    /// Reference to an indirect object
+    /// </summary>
+    private readonly record struct ObjectReference(int ObjectNumber);
+
+    /// <summary>
+    /// A parsed indirect object with the raw data of its stream, if any
+    /// </summary>
+    private sealed record IndirectObject(object? Value, byte[]? StreamData);
+
+    /// <summary>
+    /// Decoded data of an object stream with the offset of its first object and its object count
+    /// </summary>
+    private sealed record ObjectStream(byte[] Data, int First, int ObjectCount);
+}
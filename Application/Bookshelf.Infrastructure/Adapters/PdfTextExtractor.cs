@@ -0,0 +1,136 @@
+using System.Text;
+using Bookshelf.Application.Spi;
+using Bookshelf.Application.Spi.Dtos;
+using Microsoft.Extensions.Logging;
+using PdfSharp.Pdf;
+using PdfSharp.Pdf.Content;
+using PdfSharp.Pdf.Content.Objects;
+using PdfSharp.Pdf.IO;
+
+namespace Bookshelf.Infrastructure.Adapters;
+
+/// <summary>
+/// PDF text extractor reading the text showing operators of every page content stream with PdfSharp
+/// </summary>
+/// <remarks>
+/// The text is good enough for a search index, not for display: strings are taken as the content stream encodes them,
+/// so text drawn with embedded composite fonts or inside form XObjects is not found, and words are only separated
+/// where the content stream moves to a new line or leaves a wide gap.
+/// </remarks>
+public class PdfTextExtractor : IPdfTextExtractor
+{
+    /// <summary>
+    /// Horizontal adjustment in a TJ array, in thousandths of the font size, from which on the gap counts as a space
+    /// </summary>
+    private const double WordGapAdjustment = -200;
+
+    private readonly ILogger<PdfTextExtractor> _logger;
+
+    /// <summary>
+    /// Initializes a new instance of the PdfTextExtractor class
+    /// </summary>
+    /// <param name="logger">The logger</param>
+    public PdfTextExtractor(ILogger<PdfTextExtractor> logger)
+    {
+        _logger = logger ?? throw new ArgumentNullException(nameof(logger));
+    }
+
+    /// <inheritdoc />
+    public async Task<PdfTextContent?> ExtractTextAsync(
+        ExtractPdfTextRequest request,
+        CancellationToken cancellationToken = default)
+    {
+        return await Task.Run(() => ExtractText(request.PdfPath, cancellationToken), cancellationToken);
+    }
+
+    /// <summary>
+    /// Extracts the document information and the text of every page
+    /// </summary>
+    private PdfTextContent? ExtractText(string pdfPath, CancellationToken cancellationToken)
+    {
+        try
+        {
+            using var document = PdfReader.Open(pdfPath, PdfDocumentOpenMode.ReadOnly);
+
+            var pages = new List<string>(document.PageCount);
+            var text = new StringBuilder();
+            foreach (var page in document.Pages)
+            {
+                cancellationToken.ThrowIfCancellationRequested();
+
+                text.Clear();
+                AppendText(ContentReader.ReadContent(page), text);
+                pages.Add(text.ToString());
+            }
+
+            return new PdfTextContent(
+                document.Info.Title,
+                document.Info.Author,
+                document.Info.Subject,
+                document.Info.Keywords,
+                pages);
+        }
+        catch (Exception ex) when (ex is not OperationCanceledException)
+        {
+            _logger.LogWarning(ex, "Error extracting text from {PdfPath}", pdfPath);
+            return null;
+        }
+    }
+
+    /// <summary>
+    /// Appends the strings shown by the text operators of a content sequence
+    /// </summary>
+    private static void AppendText(CSequence sequence, StringBuilder text)
+    {
+        foreach (var element in sequence)
+        {
+            if (element is not COperator textOperator)
+            {
+                continue;
+            }
+
+            switch (textOperator.OpCode.OpCodeName)
+            {
+                case OpCodeName.Tj:
+                case OpCodeName.TJ:
+                    AppendStrings(textOperator.Operands, text);
+                    break;
+                case OpCodeName.QuoteSingle:
+                case OpCodeName.QuoteDouble:
+                    // Both quote operators move to the next line before showing their string
+                    text.Append(' ');
+                    AppendStrings(textOperator.Operands, text);
+                    break;
+                case OpCodeName.Td:
+                case OpCodeName.TD:
+                case OpCodeName.Tx:
+                case OpCodeName.ET:
+                    text.Append(' ');
+                    break;
+            }
+        }
+    }
+
+    /// <summary>
+    /// Appends the string operands of a text operator, turning wide gaps of TJ arrays into spaces
+    /// </summary>
+    private static void AppendStrings(CSequence operands, StringBuilder text)
+    {
+        foreach (var operand in operands)
+        {
+            switch (operand)
+            {
+                case CString shownString:
+                    text.Append(shownString.Value);
+                    break;
+                case CArray array:
+                    AppendStrings(array, text);
+                    break;
+                case CInteger { Value: <= (int)WordGapAdjustment }:
+                case CReal { Value: <= WordGapAdjustment }:
+                    text.Append(' ');
+                    break;
+            }
+        }
+    }
+}
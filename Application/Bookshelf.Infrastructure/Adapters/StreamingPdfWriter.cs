@@ -0,0 +1,979 @@
+using System.Diagnostics;
+using System.Globalization;
+using System.IO.Compression;
+using System.Security.Cryptography;
+using System.Text;
+using Bookshelf.Application.Core.ValueObjects;
+using PdfSharp.Pdf;
+using PdfSharp.Pdf.Advanced;
+
+namespace Bookshelf.Infrastructure.Adapters;
+
+/// <summary>
+/// Writes a merged PDF incrementally. The pages of each appended source document and every object
+/// they reference are serialized to the output stream immediately, so only the source currently
+/// being appended has to be held in memory. Stream objects with identical content, such as the fonts,
+/// ICC profiles and images every chapter of a book embeds, are written once and shared by all sources.
+/// Depending on the compression profile, uncompressed streams are Flate-compressed and all other objects
+/// are packed into object streams indexed by a cross-reference stream.
+/// </summary>
+internal sealed class StreamingPdfWriter
+{
+    private const int CatalogObjectNumber = 1;
+    private const int PagesObjectNumber = 2;
+    private const int MaxPageTreeDepth = 64;
+    private const int MaxContentKeyDepth = 16;
+    private const int MaxObjectsPerObjectStream = 100;
+    private const int CrossReferenceOffsetWidth = 5;
+    private const int CrossReferenceEntrySize = 1 + CrossReferenceOffsetWidth + 2;
+    private const long UnwrittenOffset = -1;
+    private const long CompressedOffset = -2;
+    private const string RealNumberFormat = "0.##########";
+
+    private static readonly string[] InheritablePageKeys = ["/Resources", "/MediaBox", "/CropBox", "/Rotate"];
+    private static readonly Encoding Latin1 = Encoding.Latin1;
+
+    private readonly Stream _output;
+    private readonly List<long> _objectOffsets = [UnwrittenOffset, UnwrittenOffset, UnwrittenOffset];
+    private readonly List<int> _pageObjectNumbers = [];
+    private readonly Dictionary<string, int> _sharedStreamObjectNumbers = new(StringComparer.Ordinal);
+    private readonly Dictionary<int, CompressedObjectLocation> _compressedObjectLocations = new();
+    private readonly List<ObjectStreamEntry> _objectStreamEntries = [];
+    private readonly bool _compressesStreams;
+    private readonly bool _usesObjectStreams;
+    private long _position;
+
+    /// <summary>
+    /// Initializes a new instance of the StreamingPdfWriter class and writes the PDF header
+    /// </summary>
+    /// <param name="output">The stream the merged document is written to; it is not disposed by the writer</param>
+    /// <param name="compressionProfile">How much effort is spent compressing the merged document</param>
+    public StreamingPdfWriter(Stream output, PdfCompressionProfile compressionProfile = PdfCompressionProfile.None)
+    {
+        _output = output ?? throw new ArgumentNullException(nameof(output));
+        _compressesStreams = compressionProfile != PdfCompressionProfile.None;
+        _usesObjectStreams = compressionProfile == PdfCompressionProfile.Maximum;
+        WriteToOutput("%PDF-1.7\n%âãÏÓ\n");
+    }
+
+    /// <summary>
+    /// Gets the number of pages written so far
+    /// </summary>
+    public int PageCount => _pageObjectNumbers.Count;
+
+    /// <summary>
+    /// Gets the number of bytes written so far
+    /// </summary>
+    public long Length => _position;
+
+    /// <summary>
+    /// Gets the number of stream objects that were not written because an identical stream was written before
+    /// </summary>
+    public int SharedStreamCount { get; private set; }
+
+    /// <summary>
+    /// Gets the stream data that was not written because an identical stream was written before
+    /// </summary>
+    public long DeduplicatedBytes { get; private set; }
+
+    /// <summary>
+    /// Gets the number of bytes saved by compressing streams and packing objects into object streams
+    /// </summary>
+    public long CompressionSavedBytes { get; private set; }
+
+    /// <summary>
+    /// Appends all pages of a source document, writing them and their resources to the output
+    /// </summary>
+    /// <param name="sourceDocument">The source document opened in import mode</param>
+    /// <param name="cancellationToken">Cancellation token</param>
+    /// <returns>The number of appended pages</returns>
+    public int AppendDocument(PdfDocument sourceDocument, CancellationToken cancellationToken)
+    {
+        if (sourceDocument == null)
+        {
+            throw new ArgumentNullException(nameof(sourceDocument));
+        }
+
+        var context = new SourceContext();
+        var sourcePages = Enumerable.Range(0, sourceDocument.PageCount)
+            .Select(pageIndex => sourceDocument.Pages[pageIndex])
+            .ToList();
+
+        // Pages are numbered up front so links between pages of the same source resolve to the new pages
+        var pageObjectNumbers = sourcePages
+            .Select(page => RegisterPage(page, context))
+            .ToList();
+
+        for (var pageIndex = 0; pageIndex < sourcePages.Count; pageIndex++)
+        {
+            cancellationToken.ThrowIfCancellationRequested();
+
+            WritePage(pageObjectNumbers[pageIndex], sourcePages[pageIndex], context);
+            WritePendingObjects(context, cancellationToken);
+        }
+
+        // Pages and streams only become part of the document once the whole source was written
+        _pageObjectNumbers.AddRange(pageObjectNumbers);
+        foreach (var (contentKey, objectNumber) in context.NewStreamObjectNumbers)
+        {
+            _sharedStreamObjectNumbers.TryAdd(contentKey, objectNumber);
+        }
+
+        SharedStreamCount += context.SharedStreamCount;
+        DeduplicatedBytes += context.DeduplicatedBytes;
+
+        return pageObjectNumbers.Count;
+    }
+
+    /// <summary>
+    /// Writes the page tree, catalog, document information and cross-reference table
+    /// </summary>
+    /// <param name="metadata">Optional metadata for the document information dictionary</param>
+    public void Complete(BookMetadata? metadata)
+    {
+        WriteNullForUnwrittenObjects();
+
+        var pages = new MemoryStream();
+        WriteText(pages, "<</Type/Pages/Count ");
+        WriteText(pages, _pageObjectNumbers.Count.ToString(CultureInfo.InvariantCulture));
+        WriteText(pages, "/Kids[");
+        foreach (var pageObjectNumber in _pageObjectNumbers)
+        {
+            WriteText(pages, $"{pageObjectNumber} 0 R ");
+        }
+        WriteText(pages, "]>>");
+        WriteObject(PagesObjectNumber, pages);
+
+        var catalog = new MemoryStream();
+        WriteText(catalog, $"<</Type/Catalog/Pages {PagesObjectNumber} 0 R>>");
+        WriteObject(CatalogObjectNumber, catalog);
+
+        var infoObjectNumber = AllocateObjectNumber();
+        var info = new MemoryStream();
+        WriteText(info, CreateInfoDictionary(metadata));
+        WriteObject(infoObjectNumber, info);
+
+        if (_usesObjectStreams)
+        {
+            FlushObjectStream();
+            WriteCrossReferenceStream(infoObjectNumber);
+        }
+        else
+        {
+            WriteCrossReferenceTable(infoObjectNumber);
+        }
+
+        _output.Flush();
+    }
+
+    /// <summary>
+    /// Allocates an object number for a page of the current source
+    /// </summary>
+    private int RegisterPage(PdfPage page, SourceContext context)
+    {
+        var objectNumber = AllocateObjectNumber();
+        if (page.IsIndirect)
+        {
+            context.ObjectNumbers[page.ObjectID] = objectNumber;
+        }
+
+        return objectNumber;
+    }
+
+    /// <summary>
+    /// Writes a page with its inherited attributes resolved and its parent set to the merged page tree
+    /// </summary>
+    private void WritePage(int objectNumber, PdfPage page, SourceContext context)
+    {
+        var body = new MemoryStream();
+        WriteText(body, "<<");
+        foreach (var element in page.Elements)
+        {
+            if (element.Key == "/Parent")
+            {
+                continue;
+            }
+
+            WriteName(body, element.Key);
+            WriteText(body, " ");
+            WriteItem(body, element.Value, context);
+        }
+
+        foreach (var inheritableKey in InheritablePageKeys)
+        {
+            var isMissing = page.Elements[inheritableKey] == null;
+            var inheritedValue = isMissing ? FindInheritedValue(page, inheritableKey) : null;
+            if (inheritedValue != null)
+            {
+                WriteName(body, inheritableKey);
+                WriteText(body, " ");
+                WriteItem(body, inheritedValue, context);
+            }
+        }
+
+        WriteText(body, $"/Parent {PagesObjectNumber} 0 R>>");
+
+        WriteObject(objectNumber, body);
+    }
+
+    /// <summary>
+    /// Writes all objects discovered while writing pages until none are left
+    /// </summary>
+    private void WritePendingObjects(SourceContext context, CancellationToken cancellationToken)
+    {
+        while (context.PendingObjects.TryDequeue(out var pending))
+        {
+            cancellationToken.ThrowIfCancellationRequested();
+            WriteIndirectObject(pending.ObjectNumber, pending.SourceObject, context);
+        }
+    }
+
+    /// <summary>
+    /// Writes one indirect object including its stream data
+    /// </summary>
+    private void WriteIndirectObject(int objectNumber, PdfObject sourceObject, SourceContext context)
+    {
+        // Serialize the object body first so that a read error never leaves a partial object in the output
+        var body = new MemoryStream();
+
+        if (sourceObject is PdfDictionary { Stream: not null } streamDictionary)
+        {
+            var streamData = streamDictionary.Stream.Value;
+            var isRecompressed = _compressesStreams && IsUnfiltered(streamDictionary) &&
+                                 TryDeflate(streamData, out streamData);
+
+            WriteDictionary(body, streamDictionary, context, streamData.Length, isRecompressed);
+            WriteStreamObject(objectNumber, body, streamData);
+            return;
+        }
+
+        if (sourceObject is PdfDictionary dictionary)
+        {
+            WriteDictionary(body, dictionary, context, null);
+        }
+        else
+        {
+            WriteDirectItem(body, sourceObject, context);
+        }
+
+        WriteObject(objectNumber, body);
+    }
+
+    /// <summary>
+    /// Writes an object without stream data, packing it into an object stream if the profile uses them
+    /// </summary>
+    private void WriteObject(int objectNumber, MemoryStream body)
+    {
+        if (_usesObjectStreams)
+        {
+            Debug.Assert(_objectOffsets[objectNumber] == UnwrittenOffset, "Objects must be written only once");
+
+            _objectOffsets[objectNumber] = CompressedOffset;
+            _objectStreamEntries.Add(new ObjectStreamEntry(objectNumber, body.ToArray()));
+
+            var isObjectStreamFull = _objectStreamEntries.Count >= MaxObjectsPerObjectStream;
+            if (isObjectStreamFull)
+            {
+                FlushObjectStream();
+            }
+
+            return;
+        }
+
+        BeginObject(objectNumber);
+        body.WriteTo(_output);
+        _position += body.Length;
+        EndObject();
+    }
+
+    /// <summary>
+    /// Writes an object with stream data
+    /// </summary>
+    private void WriteStreamObject(int objectNumber, MemoryStream dictionaryBody, byte[] streamData)
+    {
+        BeginObject(objectNumber);
+        dictionaryBody.WriteTo(_output);
+        _position += dictionaryBody.Length;
+
+        WriteToOutput("\nstream\n");
+        _output.Write(streamData);
+        _position += streamData.Length;
+        WriteToOutput("\nendstream");
+
+        EndObject();
+    }
+
+    /// <summary>
+    /// Writes the collected objects as one compressed object stream
+    /// </summary>
+    private void FlushObjectStream()
+    {
+        var hasNoEntries = _objectStreamEntries.Count == 0;
+        if (hasNoEntries)
+        {
+            return;
+        }
+
+        var objectStreamNumber = AllocateObjectNumber();
+        var offsets = new StringBuilder();
+        var objects = new MemoryStream();
+        for (var index = 0; index < _objectStreamEntries.Count; index++)
+        {
+            var entry = _objectStreamEntries[index];
+            offsets.Append(CultureInfo.InvariantCulture, $"{entry.ObjectNumber} {objects.Length} ");
+            objects.Write(entry.Body);
+            WriteText(objects, "\n");
+
+            _compressedObjectLocations[entry.ObjectNumber] = new CompressedObjectLocation(objectStreamNumber, index);
+        }
+
+        var offsetBytes = Latin1.GetBytes(offsets.ToString());
+        var data = new MemoryStream();
+        data.Write(offsetBytes);
+        objects.WriteTo(data);
+
+        var compressedData = Deflate(data.GetBuffer(), (int)data.Length);
+        CompressionSavedBytes += data.Length - compressedData.Length;
+
+        var dictionary = new MemoryStream();
+        WriteText(dictionary,
+            $"<</Type/ObjStm/N {_objectStreamEntries.Count}/First {offsetBytes.Length}/Filter/FlateDecode/Length {compressedData.Length}>>");
+        WriteStreamObject(objectStreamNumber, dictionary, compressedData);
+
+        _objectStreamEntries.Clear();
+    }
+
+    /// <summary>
+    /// Determines whether a stream is stored without any filter
+    /// </summary>
+    private static bool IsUnfiltered(PdfDictionary streamDictionary)
+    {
+        return streamDictionary.Elements["/Filter"] == null &&
+               streamDictionary.Elements["/DecodeParms"] == null;
+    }
+
+    /// <summary>
+    /// Flate-compresses stream data, keeping the original data if compression does not make it smaller
+    /// </summary>
+    private bool TryDeflate(byte[] streamData, out byte[] compressedData)
+    {
+        var deflatedData = Deflate(streamData, streamData.Length);
+        var isSmaller = deflatedData.Length < streamData.Length;
+        if (!isSmaller)
+        {
+            compressedData = streamData;
+            return false;
+        }
+
+        CompressionSavedBytes += streamData.Length - deflatedData.Length;
+        compressedData = deflatedData;
+        return true;
+    }
+
+    /// <summary>
+    /// Compresses data in the zlib format the FlateDecode filter expects
+    /// </summary>
+    private static byte[] Deflate(byte[] data, int length)
+    {
+        var compressed = new MemoryStream();
+        using (var zlib = new ZLibStream(compressed, CompressionLevel.Optimal, leaveOpen: true))
+        {
+            zlib.Write(data, 0, length);
+        }
+
+        return compressed.ToArray();
+    }
+
+    /// <summary>
+    /// Writes an item, emitting a reference for indirect objects
+    /// </summary>
+    private void WriteItem(Stream body, PdfItem? item, SourceContext context)
+    {
+        switch (item)
+        {
+            case PdfReference reference:
+                WriteReference(body, reference.ObjectID, reference.Value, context);
+                break;
+            case PdfObject { IsIndirect: true } indirectObject:
+                WriteReference(body, indirectObject.ObjectID, indirectObject, context);
+                break;
+            default:
+                WriteDirectItem(body, item, context);
+                break;
+        }
+    }
+
+    /// <summary>
+    /// Writes the content of an item
+    /// </summary>
+    private void WriteDirectItem(Stream body, PdfItem? item, SourceContext context)
+    {
+        switch (item)
+        {
+            case null:
+            case PdfNull:
+                WriteText(body, "null");
+                break;
+            case PdfDictionary dictionary:
+                WriteDictionary(body, dictionary, context, null);
+                break;
+            case PdfArray array:
+                WriteText(body, "[");
+                foreach (var element in array.Elements)
+                {
+                    WriteItem(body, element, context);
+                    WriteText(body, " ");
+                }
+                WriteText(body, "]");
+                break;
+            case PdfName name:
+                WriteName(body, name.Value);
+                break;
+            case PdfString text:
+                WriteString(body, text.Value);
+                break;
+            case PdfStringObject textObject:
+                WriteString(body, textObject.Value);
+                break;
+            case PdfReal real:
+                WriteText(body, real.Value.ToString(RealNumberFormat, CultureInfo.InvariantCulture));
+                break;
+            case PdfBoolean boolean:
+                WriteText(body, boolean.Value ? "true" : "false");
+                break;
+            default:
+                // Integers and literals print their PDF representation
+                WriteText(body, Convert.ToString(item, CultureInfo.InvariantCulture) ?? "null");
+                break;
+        }
+    }
+
+    /// <summary>
+    /// Writes a dictionary, replacing the stream length by the actual length of the copied stream data
+    /// </summary>
+    private void WriteDictionary(
+        Stream body,
+        PdfDictionary dictionary,
+        SourceContext context,
+        int? streamLength,
+        bool isFlateEncoded = false)
+    {
+        WriteText(body, "<<");
+        foreach (var element in dictionary.Elements)
+        {
+            var isReplacedLength = streamLength.HasValue && element.Key == "/Length";
+            if (isReplacedLength)
+            {
+                continue;
+            }
+
+            WriteName(body, element.Key);
+            WriteText(body, " ");
+            WriteItem(body, element.Value, context);
+        }
+
+        if (streamLength.HasValue)
+        {
+            WriteText(body, $"/Length {streamLength.Value}");
+        }
+
+        if (isFlateEncoded)
+        {
+            WriteText(body, "/Filter/FlateDecode");
+        }
+
+        WriteText(body, ">>");
+    }
+
+    /// <summary>
+    /// Writes a reference to an object of the current source, scheduling the object if it was not written yet
+    /// </summary>
+    private void WriteReference(Stream body, PdfObjectID objectId, PdfObject? target, SourceContext context)
+    {
+        // The source's catalog and page tree would drag all of its pages along, so they are not copied
+        var isUnresolvable = target == null || IsDocumentStructure(target);
+        if (isUnresolvable)
+        {
+            WriteText(body, "null");
+            return;
+        }
+
+        if (!context.ObjectNumbers.TryGetValue(objectId, out var objectNumber))
+        {
+            objectNumber = ResolveObjectNumber(target!, context);
+            context.ObjectNumbers[objectId] = objectNumber;
+        }
+
+        WriteText(body, $"{objectNumber} 0 R");
+    }
+
+    /// <summary>
+    /// Gets the number of an identical stream written before, or allocates a number and schedules the object
+    /// </summary>
+    private int ResolveObjectNumber(PdfObject target, SourceContext context)
+    {
+        var contentKey = GetStreamContentKey(target, context, 0);
+        var isStream = contentKey != null;
+
+        var sharedObjectNumber = 0;
+        var isShared = isStream &&
+            (context.NewStreamObjectNumbers.TryGetValue(contentKey!, out sharedObjectNumber) ||
+             _sharedStreamObjectNumbers.TryGetValue(contentKey!, out sharedObjectNumber));
+        if (isShared)
+        {
+            context.SharedStreamCount++;
+            context.DeduplicatedBytes += ((PdfDictionary)target).Stream!.Value.Length;
+            return sharedObjectNumber;
+        }
+
+        var objectNumber = AllocateObjectNumber();
+        context.PendingObjects.Enqueue(new PendingObject(target, objectNumber));
+        if (isStream)
+        {
+            context.NewStreamObjectNumbers[contentKey!] = objectNumber;
+        }
+
+        return objectNumber;
+    }
+
+    /// <summary>
+    /// Gets a key identifying the content of a stream object including everything it references,
+    /// or null if the object is no stream or references objects that cannot be compared by content
+    /// </summary>
+    private string? GetStreamContentKey(PdfObject target, SourceContext context, int depth)
+    {
+        var isStream = target is PdfDictionary { Stream: not null };
+        if (!isStream)
+        {
+            return null;
+        }
+
+        if (context.StreamContentKeys.TryGetValue(target.ObjectID, out var cachedContentKey))
+        {
+            return cachedContentKey;
+        }
+
+        var dictionary = (PdfDictionary)target;
+        var dictionaryContent = new MemoryStream();
+        var isComparable = TryWriteDictionaryContent(dictionaryContent, dictionary, context, depth);
+
+        string? contentKey = null;
+        if (isComparable)
+        {
+            using var hash = IncrementalHash.CreateHash(HashAlgorithmName.SHA256);
+            hash.AppendData(dictionaryContent.GetBuffer(), 0, (int)dictionaryContent.Length);
+            hash.AppendData(dictionary.Stream!.Value);
+            contentKey = Convert.ToHexString(hash.GetHashAndReset());
+        }
+
+        context.StreamContentKeys[target.ObjectID] = contentKey;
+        return contentKey;
+    }
+
+    /// <summary>
+    /// Writes the content of a stream dictionary for comparison, leaving out its length
+    /// </summary>
+    private bool TryWriteDictionaryContent(Stream body, PdfDictionary dictionary, SourceContext context, int depth)
+    {
+        WriteText(body, "<<");
+        foreach (var element in dictionary.Elements)
+        {
+            if (element.Key == "/Length")
+            {
+                continue;
+            }
+
+            WriteName(body, element.Key);
+            WriteText(body, " ");
+            if (!TryWriteContent(body, element.Value, context, depth))
+            {
+                return false;
+            }
+        }
+
+        WriteText(body, ">>");
+        return true;
+    }
+
+    /// <summary>
+    /// Writes an item for comparison, replacing references by the content they point to
+    /// </summary>
+    private bool TryWriteContent(Stream body, PdfItem? item, SourceContext context, int depth)
+    {
+        var isTooDeep = depth >= MaxContentKeyDepth;
+        if (isTooDeep)
+        {
+            return false;
+        }
+
+        switch (item)
+        {
+            case PdfReference reference:
+                return TryWriteReferencedContent(body, reference.Value, context, depth + 1);
+            case PdfObject { IsIndirect: true } indirectObject:
+                return TryWriteReferencedContent(body, indirectObject, context, depth + 1);
+            case PdfDictionary dictionary:
+                return TryWriteDictionaryContent(body, dictionary, context, depth + 1);
+            case PdfArray array:
+                return TryWriteArrayContent(body, array, context, depth + 1);
+            default:
+                WriteDirectItem(body, item, context);
+                return true;
+        }
+    }
+
+    /// <summary>
+    /// Writes the content of an array for comparison
+    /// </summary>
+    private bool TryWriteArrayContent(Stream body, PdfArray array, SourceContext context, int depth)
+    {
+        WriteText(body, "[");
+        foreach (var element in array.Elements)
+        {
+            if (!TryWriteContent(body, element, context, depth))
+            {
+                return false;
+            }
+
+            WriteText(body, " ");
+        }
+
+        WriteText(body, "]");
+        return true;
+    }
+
+    /// <summary>
+    /// Writes the content of a referenced object for comparison, marked so it cannot match a direct item
+    /// </summary>
+    private bool TryWriteReferencedContent(Stream body, PdfObject? target, SourceContext context, int depth)
+    {
+        // Objects tied to the page structure of their source cannot be shared with another source
+        var isUnresolvable = target == null || IsDocumentStructure(target) || IsPage(target);
+        if (isUnresolvable)
+        {
+            return false;
+        }
+
+        WriteText(body, "\0R");
+        var referencedContentKey = GetStreamContentKey(target!, context, depth);
+        if (referencedContentKey != null)
+        {
+            WriteText(body, referencedContentKey);
+            return true;
+        }
+
+        switch (target)
+        {
+            case PdfDictionary { Stream: not null }:
+                return false;
+            case PdfDictionary dictionary:
+                return TryWriteDictionaryContent(body, dictionary, context, depth);
+            case PdfArray array:
+                return TryWriteArrayContent(body, array, context, depth);
+            default:
+                WriteDirectItem(body, target, context);
+                return true;
+        }
+    }
+
+    /// <summary>
+    /// Determines whether an object is the catalog or a page tree node of its document
+    /// </summary>
+    private static bool IsDocumentStructure(PdfObject target)
+    {
+        return target is PdfDictionary dictionary &&
+               dictionary.Elements["/Type"] is PdfName type &&
+               (type.Value == "/Pages" || type.Value == "/Catalog");
+    }
+
+    /// <summary>
+    /// Determines whether an object is a page
+    /// </summary>
+    private static bool IsPage(PdfObject target)
+    {
+        return target is PdfDictionary dictionary &&
+               dictionary.Elements["/Type"] is PdfName type &&
+               type.Value == "/Page";
+    }
+
+    /// <summary>
+    /// Finds an inheritable page attribute in the page tree above a page
+    /// </summary>
+    private static PdfItem? FindInheritedValue(PdfDictionary page, string key)
+    {
+        var parent = ResolveDictionary(page.Elements["/Parent"]);
+        for (var depth = 0; parent != null && depth < MaxPageTreeDepth; depth++)
+        {
+            var value = parent.Elements[key];
+            if (value != null)
+            {
+                return value;
+            }
+
+            parent = ResolveDictionary(parent.Elements["/Parent"]);
+        }
+
+        return null;
+    }
+
+    /// <summary>
+    /// Resolves an item to a dictionary, following references
+    /// </summary>
+    private static PdfDictionary? ResolveDictionary(PdfItem? item)
+    {
+        return item switch
+        {
+            PdfReference reference => reference.Value as PdfDictionary,
+            PdfDictionary dictionary => dictionary,
+            _ => null
+        };
+    }
+
+    /// <summary>
+    /// Creates the document information dictionary
+    /// </summary>
+    private static string CreateInfoDictionary(BookMetadata? metadata)
+    {
+        var info = new MemoryStream();
+        WriteText(info, "<<");
+
+        var hasTitle = !string.IsNullOrWhiteSpace(metadata?.Title);
+        if (hasTitle)
+        {
+            WriteText(info, "/Title ");
+            WriteString(info, metadata!.Title!);
+        }
+
+        var hasAuthor = !string.IsNullOrWhiteSpace(metadata?.Author);
+        if (hasAuthor)
+        {
+            WriteText(info, "/Author ");
+            WriteString(info, metadata!.Author!);
+        }
+
+        var creationDate = DateTime.UtcNow.ToString("yyyyMMddHHmmss", CultureInfo.InvariantCulture);
+        WriteText(info, $"/CreationDate(D:{creationDate}Z)>>");
+
+        return Latin1.GetString(info.ToArray());
+    }
+
+    /// <summary>
+    /// Writes a name, escaping characters that are not allowed in PDF names
+    /// </summary>
+    private static void WriteName(Stream body, string name)
+    {
+        Debug.Assert(name.StartsWith('/'), "PDF names must start with a slash");
+
+        var builder = new StringBuilder("/");
+        foreach (var nameByte in Encoding.UTF8.GetBytes(name.Substring(1)))
+        {
+            var isRegular = nameByte > (byte)' ' && nameByte < 0x7F && "()<>[]{}/%#".IndexOf((char)nameByte) < 0;
+            builder.Append(isRegular ? ((char)nameByte).ToString() : $"#{nameByte:X2}");
+        }
+
+        WriteText(body, builder.ToString());
+    }
+
+    /// <summary>
+    /// Writes a string as a hexadecimal string, using UTF-16BE for text outside the byte range
+    /// </summary>
+    private static void WriteString(Stream body, string value)
+    {
+        var isByteString = value.All(c => c <= 0xFF);
+        var bytes = isByteString
+            ? Latin1.GetBytes(value)
+            : Encoding.BigEndianUnicode.GetPreamble().Concat(Encoding.BigEndianUnicode.GetBytes(value)).ToArray();
+
+        WriteText(body, $"<{Convert.ToHexString(bytes)}>");
+    }
+
+    /// <summary>
+    /// Writes a null object for every allocated object that was never written, e.g. because its source failed
+    /// </summary>
+    private void WriteNullForUnwrittenObjects()
+    {
+        for (var objectNumber = PagesObjectNumber + 1; objectNumber < _objectOffsets.Count; objectNumber++)
+        {
+            var isUnwritten = _objectOffsets[objectNumber] == UnwrittenOffset;
+            if (isUnwritten)
+            {
+                BeginObject(objectNumber);
+                WriteToOutput("null");
+                EndObject();
+            }
+        }
+    }
+
+    /// <summary>
+    /// Writes the cross-reference table and trailer
+    /// </summary>
+    private void WriteCrossReferenceTable(int infoObjectNumber)
+    {
+        var crossReferenceOffset = _position;
+        var objectCount = _objectOffsets.Count;
+
+        WriteToOutput($"xref\n0 {objectCount}\n0000000000 65535 f \n");
+        for (var objectNumber = 1; objectNumber < objectCount; objectNumber++)
+        {
+            WriteToOutput($"{_objectOffsets[objectNumber]:D10} 00000 n \n");
+        }
+
+        WriteToOutput(
+            $"trailer\n<</Size {objectCount}/Root {CatalogObjectNumber} 0 R/Info {infoObjectNumber} 0 R>>\n" +
+            $"startxref\n{crossReferenceOffset}\n%%EOF\n");
+    }
+
+    /// <summary>
+    /// Writes a compressed cross-reference stream, which can locate objects inside object streams, and the trailer
+    /// </summary>
+    private void WriteCrossReferenceStream(int infoObjectNumber)
+    {
+        var crossReferenceStreamNumber = AllocateObjectNumber();
+        var crossReferenceOffset = _position;
+        var objectCount = _objectOffsets.Count;
+
+        var entries = new byte[objectCount * CrossReferenceEntrySize];
+        WriteCrossReferenceEntry(entries, 0, 0, 0, 0xFFFF);
+        for (var objectNumber = 1; objectNumber < objectCount; objectNumber++)
+        {
+            if (objectNumber == crossReferenceStreamNumber)
+            {
+                WriteCrossReferenceEntry(entries, objectNumber, 1, crossReferenceOffset, 0);
+            }
+            else if (_compressedObjectLocations.TryGetValue(objectNumber, out var location))
+            {
+                WriteCrossReferenceEntry(entries, objectNumber, 2, location.ObjectStreamNumber, location.Index);
+            }
+            else
+            {
+                WriteCrossReferenceEntry(entries, objectNumber, 1, _objectOffsets[objectNumber], 0);
+            }
+        }
+
+        var compressedEntries = Deflate(entries, entries.Length);
+        var dictionary = new MemoryStream();
+        WriteText(dictionary,
+            $"<</Type/XRef/Size {objectCount}/W[1 {CrossReferenceOffsetWidth} 2]" +
+            $"/Root {CatalogObjectNumber} 0 R/Info {infoObjectNumber} 0 R" +
+            $"/Filter/FlateDecode/Length {compressedEntries.Length}>>");
+        WriteStreamObject(crossReferenceStreamNumber, dictionary, compressedEntries);
+
+        WriteToOutput($"startxref\n{crossReferenceOffset}\n%%EOF\n");
+    }
+
+    /// <summary>
+    /// Writes one big-endian cross-reference stream entry
+    /// </summary>
+    private static void WriteCrossReferenceEntry(byte[] entries, int objectNumber, byte type, long field2, int field3)
+    {
+        Debug.Assert(field2 >= 0, "Every object must be written before the cross-reference stream");
+
+        var entryOffset = objectNumber * CrossReferenceEntrySize;
+        entries[entryOffset] = type;
+        for (var byteIndex = 0; byteIndex < CrossReferenceOffsetWidth; byteIndex++)
+        {
+            var shift = 8 * (CrossReferenceOffsetWidth - 1 - byteIndex);
+            entries[entryOffset + 1 + byteIndex] = (byte)(field2 >> shift);
+        }
+
+        entries[entryOffset + 1 + CrossReferenceOffsetWidth] = (byte)(field3 >> 8);
+        entries[entryOffset + 2 + CrossReferenceOffsetWidth] = (byte)field3;
+    }
+
+    /// <summary>
+    /// Allocates the next free object number
+    /// </summary>
+    private int AllocateObjectNumber()
+    {
+        _objectOffsets.Add(UnwrittenOffset);
+        return _objectOffsets.Count - 1;
+    }
+
+    /// <summary>
+    /// Records the offset of an object and writes its header
+    /// </summary>
+    private void BeginObject(int objectNumber)
+    {
+        Debug.Assert(_objectOffsets[objectNumber] == UnwrittenOffset, "Objects must be written only once");
+
+        _objectOffsets[objectNumber] = _position;
+        WriteToOutput($"{objectNumber} 0 obj\n");
+    }
+
+    /// <summary>
+    /// Writes the end of an object
+    /// </summary>
+    private void EndObject()
+    {
+        WriteToOutput("\nendobj\n");
+    }
+
+    /// <summary>
+    /// Writes text to the output, tracking the current offset
+    /// </summary>
+    private void WriteToOutput(string text)
+    {
+        var bytes = Latin1.GetBytes(text);
+        _output.Write(bytes);
+        _position += bytes.Length;
+    }
+
+    /// <summary>
+    /// Writes text to an object body buffer
+    /// </summary>
+    private static void WriteText(Stream body, string text)
+    {
+        body.Write(Latin1.GetBytes(text));
+    }
+
+    /// <summary>
+    /// An object of the current source that was referenced but not yet written
+    /// </summary>
+    private sealed record PendingObject(PdfObject SourceObject, int ObjectNumber);
+
+    /// <summary>
+    /// An object waiting to be packed into the next object stream
+    /// </summary>
+    private sealed record ObjectStreamEntry(int ObjectNumber, byte[] Body);
+
+    /// <summary>
+    /// The position of an object inside an object stream
+    /// </summary>
+    private readonly record struct CompressedObjectLocation(int ObjectStreamNumber, int Index);
+
+    /// <summary>
+    /// Object numbering state for the source document currently being appended
+    /// </summary>
+    private sealed class SourceContext
+    {
+        /// <summary>
+        /// Gets the new object numbers keyed by the object identifiers of the source document
+        /// </summary>
+        public Dictionary<PdfObjectID, int> ObjectNumbers { get; } = new();
+
+        /// <summary>
+        /// Gets the referenced objects that still have to be written
+        /// </summary>
+        public Queue<PendingObject> PendingObjects { get; } = new();
+
+        /// <summary>
+        /// Gets the content keys of the stream objects of the source document, null for streams that cannot be shared
+        /// </summary>
+        public Dictionary<PdfObjectID, string?> StreamContentKeys { get; } = new();
+
+        /// <summary>
+        /// Gets the object numbers of the streams first written by this source, keyed by content
+        /// </summary>
+        public Dictionary<string, int> NewStreamObjectNumbers { get; } = new(StringComparer.Ordinal);
+
+        /// <summary>
+        /// Gets or sets the number of references resolved to a stream written before
+        /// </summary>
+        public int SharedStreamCount { get; set; }
+
+        /// <summary>
+        /// Gets or sets the stream data not written again by this source
+        /// </summary>
+        public long DeduplicatedBytes { get; set; }
+    }
+}
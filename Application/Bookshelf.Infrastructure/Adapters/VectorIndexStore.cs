@@ -0,0 +1,210 @@
+using System.Runtime.InteropServices;
+using System.Text;
+using Bookshelf.Application.Core.Entities;
+using Bookshelf.Application.Spi;
+using Bookshelf.Application.Spi.Dtos;
+using Microsoft.Extensions.Logging;
+
+namespace Bookshelf.Infrastructure.Adapters;
+
+/// <summary>
+/// Vector index store persisting the index inside the bookshelf directory in a format that is memory-mapped on open
+/// </summary>
+/// <remarks>
+/// <para>
+/// The file starts with a header of <see cref="HeaderSize"/> bytes: the <see cref="Magic"/> bytes, the format version,
+/// the dimensions and the numbers of books, passages and lists as 32-bit integers, followed by the offsets of the
+/// sections as 64-bit integers. The sections are the books, a fixed-size record per passage pointing into the UTF-8
+/// passage texts, the texts, the vectors and centroids as 32-bit floats, and the list offsets and passage ids as
+/// 32-bit integers. Vectors and centroids start at a multiple of <see cref="SectionAlignment"/> bytes.
+/// </para>
+/// <para>
+/// Numbers are little-endian. Opening the index only reads the header and the books; the vectors and texts are read
+/// from the mapped file as a query touches them, so the operating system keeps the hot parts of a large index in its
+/// page cache instead of the process loading all of it.
+/// </para>
+/// </remarks>
+public class VectorIndexStore : IVectorIndexStore
+{
+    /// <summary>
+    /// Bytes identifying a vector index file
+    /// </summary>
+    public static ReadOnlySpan<byte> Magic => "BSVX"u8;
+
+    /// <summary>
+    /// Size of the file header in bytes
+    /// </summary>
+    public const int HeaderSize = 72;
+
+    /// <summary>
+    /// Size of the record of a passage in bytes: book id, page, text offset and text length
+    /// </summary>
+    public const int ChunkRecordSize = 20;
+
+    /// <summary>
+    /// Alignment of the vector and centroid sections in bytes, the size of a cache line
+    /// </summary>
+    public const int SectionAlignment = 64;
+
+    private const int FileBufferSize = 64 * 1024;
+
+    private readonly ILogger<VectorIndexStore> _logger;
+
+    /// <summary>
+    /// Initializes a new instance of the VectorIndexStore class
+    /// </summary>
+    /// <param name="logger">The logger</param>
+    public VectorIndexStore(ILogger<VectorIndexStore> logger)
+    {
+        _logger = logger ?? throw new ArgumentNullException(nameof(logger));
+    }
+
+    /// <inheritdoc />
+    public async Task<IVectorIndex?> OpenIndexAsync(
+        OpenVectorIndexRequest request,
+        CancellationToken cancellationToken = default)
+    {
+        var indexPath = GetIndexPath(request.BookshelfDirectory);
+        var indexDoesNotExist = !File.Exists(indexPath);
+        if (indexDoesNotExist)
+        {
+            return null;
+        }
+
+        var isLittleEndian = BitConverter.IsLittleEndian;
+        if (!isLittleEndian)
+        {
+            _logger.LogWarning("Ignoring vector index on a big-endian machine: {IndexPath}", indexPath);
+            return null;
+        }
+
+        try
+        {
+            var index = await Task.Run(() => MappedVectorIndex.Open(indexPath), cancellationToken);
+            if (index == null)
+            {
+                _logger.LogWarning("Ignoring vector index with unsupported version: {IndexPath}", indexPath);
+            }
+
+            return index;
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException or InvalidDataException)
+        {
+            _logger.LogWarning(ex, "Unable to read vector index {IndexPath}", indexPath);
+            return null;
+        }
+    }
+
+    /// <inheritdoc />
+    public async Task<bool> SaveIndexAsync(
+        SaveVectorIndexRequest request,
+        CancellationToken cancellationToken = default)
+    {
+        var indexPath = GetIndexPath(request.BookshelfDirectory);
+        var temporaryPath = indexPath + ".tmp";
+
+        try
+        {
+            // Write to a temporary file first so an interrupted build never leaves a truncated index
+            await Task.Run(() => WriteIndex(temporaryPath, request.Content, cancellationToken), cancellationToken);
+            File.Move(temporaryPath, indexPath, overwrite: true);
+            return true;
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException)
+        {
+            _logger.LogWarning(ex, "Unable to write vector index {IndexPath}", indexPath);
+            return false;
+        }
+    }
+
+    /// <summary>
+    /// Gets the index path inside a bookshelf directory
+    /// </summary>
+    private static string GetIndexPath(string bookshelfDirectory)
+    {
+        return Path.Combine(bookshelfDirectory, VectorIndexContent.FileName);
+    }
+
+    /// <summary>
+    /// Writes an index to a file, filling in the section offsets of the header once the sections are written
+    /// </summary>
+    private static void WriteIndex(string path, VectorIndexContent content, CancellationToken cancellationToken)
+    {
+        using var stream = new FileStream(path, FileMode.Create, FileAccess.Write, FileShare.None, FileBufferSize);
+        using var writer = new BinaryWriter(stream, Encoding.UTF8);
+
+        writer.Write(new byte[HeaderSize]);
+
+        var booksOffset = stream.Position;
+        writer.Write(content.ModelId);
+        foreach (var book in content.Books)
+        {
+            writer.Write(book.FileName);
+            writer.Write7BitEncodedInt64(book.FileSizeBytes);
+            writer.Write(book.LastWriteTimeUtc.Ticks);
+            writer.Write(book.Title);
+            writer.Write7BitEncodedInt(book.FirstChunkId);
+            writer.Write7BitEncodedInt(book.ChunkCount);
+        }
+
+        var chunksOffset = stream.Position;
+        var textBytes = new List<byte[]>(content.Chunks.Count);
+        var textOffset = 0L;
+        foreach (var chunk in content.Chunks)
+        {
+            var bytes = Encoding.UTF8.GetBytes(chunk.Text);
+            textBytes.Add(bytes);
+            writer.Write(chunk.BookId);
+            writer.Write(chunk.Page);
+            writer.Write(textOffset);
+            writer.Write(bytes.Length);
+            textOffset += bytes.Length;
+        }
+
+        cancellationToken.ThrowIfCancellationRequested();
+
+        var textsOffset = stream.Position;
+        foreach (var bytes in textBytes)
+        {
+            writer.Write(bytes);
+        }
+
+        var vectorsOffset = Align(writer);
+        writer.Write(MemoryMarshal.AsBytes(content.Vectors.AsSpan()));
+
+        var centroidsOffset = Align(writer);
+        writer.Write(MemoryMarshal.AsBytes(content.Clusters.Centroids.AsSpan()));
+
+        var listsOffset = stream.Position;
+        writer.Write(MemoryMarshal.AsBytes(content.Clusters.ListOffsets.AsSpan()));
+        writer.Write(MemoryMarshal.AsBytes(content.Clusters.ListChunkIds.AsSpan()));
+
+        cancellationToken.ThrowIfCancellationRequested();
+
+        stream.Position = 0;
+        writer.Write(Magic);
+        writer.Write(VectorIndexContent.CurrentVersion);
+        writer.Write(content.Dimensions);
+        writer.Write(content.Books.Count);
+        writer.Write(content.Chunks.Count);
+        writer.Write(content.Clusters.Count);
+        writer.Write(booksOffset);
+        writer.Write(chunksOffset);
+        writer.Write(textsOffset);
+        writer.Write(vectorsOffset);
+        writer.Write(centroidsOffset);
+        writer.Write(listsOffset);
+    }
+
+    /// <summary>
+    /// Pads the file with zeros up to the next section alignment
+    /// </summary>
+    /// <returns>The aligned position</returns>
+    private static long Align(BinaryWriter writer)
+    {
+        var position = writer.BaseStream.Position;
+        var padding = (SectionAlignment - position % SectionAlignment) % SectionAlignment;
+        writer.Write(new byte[padding]);
+        return position + padding;
+    }
+}
@@ -1,6 +1,7 @@
 using Bookshelf.Application.Spi;
 using Bookshelf.Infrastructure.Adapters;
 using Microsoft.Extensions.DependencyInjection;
+using Microsoft.Extensions.Logging;
 
 namespace Bookshelf.Infrastructure;
 
@@ -12,12 +13,28 @@ public static class ServiceCollectionExtensions
     /// <summary>
     /// Adds infrastructure services to the service collection
     /// </summary>
+    /// <remarks>
+    /// Like the application services, adapters are registered with factories so the container needs no reflection.
+    /// The PDF library is only loaded once the merger reads or writes a PDF.
+    /// </remarks>
     /// <param name="services">The service collection</param>
     /// <returns>The service collection for chaining</returns>
     public static IServiceCollection AddInfrastructureServices(this IServiceCollection services)
     {
-        services.AddSingleton<IFileSystemAdapter, FileSystemAdapter>();
-        services.AddSingleton<IPdfMerger, PdfMerger>();
+        services.AddSingleton<IFileSystemAdapter>(_ => new FileSystemAdapter());
+        services.AddSingleton<IPdfMerger>(serviceProvider => new PdfMerger(
+            serviceProvider.GetRequiredService<ILogger<PdfMerger>>()));
+        services.AddSingleton<IConsolidationManifestStore>(serviceProvider => new ConsolidationManifestStore(
+            serviceProvider.GetRequiredService<ILogger<ConsolidationManifestStore>>()));
+        services.AddSingleton<IBookMetadataCacheStore>(serviceProvider => new BookMetadataCacheStore(
+            serviceProvider.GetRequiredService<ILogger<BookMetadataCacheStore>>()));
+        services.AddSingleton<IPdfTextExtractor>(serviceProvider => new PdfTextExtractor(
+            serviceProvider.GetRequiredService<ILogger<PdfTextExtractor>>()));
+        services.AddSingleton<IBookIndexStore>(serviceProvider => new BookIndexStore(
+            serviceProvider.GetRequiredService<ILogger<BookIndexStore>>()));
+        services.AddSingleton<IEmbeddingGenerator>(_ => new HashEmbeddingGenerator());
+        services.AddSingleton<IVectorIndexStore>(serviceProvider => new VectorIndexStore(
+            serviceProvider.GetRequiredService<ILogger<VectorIndexStore>>()));
         
         return services;
     }
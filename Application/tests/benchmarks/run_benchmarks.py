@@ -0,0 +1,598 @@
+"""
+Benchmarks the bookshelf consolidate and list commands on synthetic shelves
+
+Generates a shelf with the e2e PDF helpers, runs the built CLI against it and appends wall time, peak RSS,
+throughput and the stage timings of --metrics to a JSON Lines results file. Every record carries the commit
+it was measured on, so the results of two commits can be compared to catch regressions.
+
+The startup benchmark runs every command on empty directories instead, so the wall time is the cost of
+starting the process, setting up the services and parsing the command line.
+
+Usage:
+    python run_benchmarks.py run --profile medium
+    python run_benchmarks.py run --collections 40 --chapters 12 --pages 8 --image-kb 64 --repetitions 5
+    python run_benchmarks.py startup --repetitions 20 --server
+    python run_benchmarks.py compare baseline.jsonl results/benchmarks.jsonl --threshold 10
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from shelf_generator import NAMING_STYLES, generate_shelf, shelf_key
+
+
+BENCHMARKS_DIR = Path(__file__).parent
+
+# Shelf parameters of the predefined profiles
+PROFILES = {
+    "small": {"collections": 10, "chapters": 5, "pages": 4, "image_kb": 0, "single_books": 10},
+    "medium": {"collections": 50, "chapters": 10, "pages": 8, "image_kb": 32, "single_books": 25},
+    "large": {"collections": 200, "chapters": 12, "pages": 16, "image_kb": 64, "single_books": 50},
+}
+
+
+def main():
+    """
+    Parses the command line and runs the selected command
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks the bookshelf consolidate and list commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Generate a shelf and benchmark the CLI against it")
+    run_parser.add_argument("--profile", choices=sorted(PROFILES), default="small",
+                            help="Predefined shelf parameters, overridden by the options below")
+    run_parser.add_argument("--collections", type=int, help="Number of collections")
+    run_parser.add_argument("--chapters", type=int, help="Number of numbered chapters per collection")
+    run_parser.add_argument("--pages", type=int, help="Number of pages per PDF")
+    run_parser.add_argument("--image-kb", type=int, help="Weight of the embedded image per page in KB, 0 for none")
+    run_parser.add_argument("--single-books", type=int, help="Number of single PDFs in the shelf root")
+    run_parser.add_argument("--naming", choices=NAMING_STYLES + ["mixed"], default="mixed",
+                            help="Naming style of the collections, mixed cycles through all styles")
+    run_parser.add_argument("--seed", type=int, default=1, help="Seed of the generated content")
+    run_parser.add_argument("--workers", type=int, help="Processes generating the shelf, defaults to the CPUs")
+    run_parser.add_argument("--repetitions", type=int, default=3, help="Measured runs per operation")
+    run_parser.add_argument("--warmup", type=int, default=1, help="Unmeasured runs before the measured ones")
+    run_parser.add_argument("--cli", help="Path of the CLI executable, defaults to the Release build")
+    run_parser.add_argument("--consolidate-args", default="",
+                            help="Extra arguments of consolidate, e.g. \"--compression maximum\"")
+    run_parser.add_argument("--shelves-dir", default=str(BENCHMARKS_DIR / "shelves"),
+                            help="Directory of the generated shelves, reused across runs")
+    run_parser.add_argument("--results", default=str(BENCHMARKS_DIR / "results" / "benchmarks.jsonl"),
+                            help="JSON Lines file the results are appended to")
+
+    startup_parser = commands.add_parser("startup", help="Measure the cold-start latency of every command")
+    startup_parser.add_argument("--repetitions", type=int, default=10, help="Measured runs per command")
+    startup_parser.add_argument("--warmup", type=int, default=2, help="Unmeasured runs before the measured ones")
+    startup_parser.add_argument("--server", action="store_true",
+                                help="Also measure the commands forwarded to a running bookshelf server")
+    startup_parser.add_argument("--cli", help="Path of the CLI executable, defaults to the Release build")
+    startup_parser.add_argument("--results", default=str(BENCHMARKS_DIR / "results" / "benchmarks.jsonl"),
+                                help="JSON Lines file the results are appended to")
+
+    compare_parser = commands.add_parser("compare", help="Compare the results of two runs")
+    compare_parser.add_argument("baseline", help="Results file of the baseline")
+    compare_parser.add_argument("current", help="Results file of the run to check")
+    compare_parser.add_argument("--threshold", type=float, default=10.0,
+                                help="Slowdown or memory growth in percent reported as a regression")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        return run_benchmarks(args)
+    if args.command == "startup":
+        return run_startup_benchmarks(args)
+    return compare_results(args)
+
+
+def run_benchmarks(args) -> int:
+    """
+    Generates the shelf, measures every operation and appends the results
+
+    Args:
+        args: The parsed run arguments
+
+    Returns:
+        The exit code
+    """
+    cli_path = args.cli or find_cli_executable()
+    if not cli_path:
+        print("Could not find Bookshelf.Cli executable. Please build the project in Release first.",
+              file=sys.stderr)
+        return 1
+
+    spec = dict(PROFILES[args.profile])
+    for name in spec:
+        value = getattr(args, name)
+        if value is not None:
+            spec[name] = value
+    spec["naming"] = args.naming
+    spec["seed"] = args.seed
+
+    print(f"Generating shelf {shelf_key(spec)}...")
+    started = time.perf_counter()
+    shelf = generate_shelf(spec, args.shelves_dir, args.workers)
+    print(f"Shelf ready in {time.perf_counter() - started:.1f} s: "
+          f"{shelf['files']} files, {shelf['bytes'] / (1024 * 1024):.1f} MB")
+
+    operations = {
+        "consolidate": [],
+        "list-details-cold": [],
+        "list-details-warm": [],
+    }
+
+    for repetition in range(args.warmup + args.repetitions):
+        is_warmup = repetition < args.warmup
+        label = "warmup" if is_warmup else f"run {repetition - args.warmup + 1}/{args.repetitions}"
+        print(f"Benchmarking ({label})...")
+
+        with tempfile.TemporaryDirectory(prefix="bookshelf_benchmark_") as temp_dir:
+            target_dir = os.path.join(temp_dir, "target")
+            os.makedirs(target_dir)
+
+            # Every repetition starts from an empty bookshelf, so the first list reads all metadata
+            # and the second one reads it from the cache the first one wrote
+            measurements = {
+                "consolidate": run_cli(
+                    cli_path,
+                    ["consolidate", shelf["path"], target_dir] + args.consolidate_args.split(),
+                    temp_dir),
+            }
+            bookshelf = measure_bookshelf(target_dir)
+            measurements["list-details-cold"] = run_cli(cli_path, ["list", target_dir, "--details"], temp_dir)
+            measurements["list-details-warm"] = run_cli(cli_path, ["list", target_dir, "--details"], temp_dir)
+
+        if not is_warmup:
+            for operation, measurement in measurements.items():
+                operations[operation].append(measurement)
+
+    context = dict(measurement_context(cli_path), **{
+        "shelf": {
+            "key": shelf_key(spec),
+            "spec": spec,
+            "files": shelf["files"],
+            "bytes": shelf["bytes"],
+        },
+        "bookshelf": bookshelf,
+        "consolidate_args": args.consolidate_args,
+    })
+
+    # Consolidation reads the chapter files of the shelf, listing reads the books consolidated from them
+    volumes = {
+        "consolidate": shelf,
+        "list-details-cold": bookshelf,
+        "list-details-warm": bookshelf,
+    }
+    records = [summarize(context, operation, measurements, volumes[operation])
+               for operation, measurements in operations.items()]
+
+    append_records(args.results, records)
+    return 0
+
+
+def run_startup_benchmarks(args) -> int:
+    """
+    Measures how long every command takes to start and finish on empty directories
+
+    Every run is a new process, so the results track the cold start of the CLI: loading the runtime and the
+    assemblies, setting up logging and the services and parsing the command line. With --server the commands
+    are also forwarded to a running server, which leaves only the start of the client process.
+
+    Args:
+        args: The parsed startup arguments
+
+    Returns:
+        The exit code
+    """
+    cli_path = args.cli or find_cli_executable()
+    if not cli_path:
+        print("Could not find Bookshelf.Cli executable. Please build the project in Release first.",
+              file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory(prefix="bookshelf_startup_") as temp_dir:
+        source_dir = os.path.join(temp_dir, "source")
+        target_dir = os.path.join(temp_dir, "target")
+        os.makedirs(source_dir)
+        os.makedirs(target_dir)
+
+        commands = {
+            "startup-help": ["--help"],
+            "startup-list-help": ["list", "--help"],
+            "startup-list": ["list", target_dir, "--quiet"],
+            "startup-consolidate": ["consolidate", source_dir, target_dir, "--quiet"],
+        }
+
+        server = None
+        if args.server:
+            socket_path = os.path.join(temp_dir, "bookshelf.sock")
+            server = start_server(cli_path, socket_path, temp_dir)
+            for operation in ["startup-list", "startup-consolidate"]:
+                commands[operation + "-server"] = commands[operation] + [f"--server={socket_path}"]
+
+        try:
+            operations = {operation: [] for operation in commands}
+            for repetition in range(args.warmup + args.repetitions):
+                is_warmup = repetition < args.warmup
+                for operation, arguments in commands.items():
+                    measurement = measure_process([cli_path] + arguments, temp_dir)
+                    if not is_warmup:
+                        operations[operation].append(measurement)
+        finally:
+            if server:
+                server.terminate()
+                server.wait(timeout=30)
+
+    context = dict(measurement_context(cli_path), shelf={"key": "empty"})
+    records = [summarize_startup(context, operation, measurements)
+               for operation, measurements in operations.items()]
+
+    append_records(args.results, records)
+    return 0
+
+
+def start_server(cli_path: str, socket_path: str, temp_dir: str) -> subprocess.Popen:
+    """
+    Starts a bookshelf server and waits until it listens on its socket
+
+    Args:
+        cli_path: The path of the CLI executable
+        socket_path: The socket the server listens on
+        temp_dir: The working directory of the server
+
+    Returns:
+        The server process
+    """
+    server = subprocess.Popen([cli_path, "serve", "--socket", socket_path, "--quiet"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=temp_dir)
+
+    deadline = time.monotonic() + 30
+    while not os.path.exists(socket_path):
+        if server.poll() is not None:
+            raise RuntimeError(f"Bookshelf server exited with code {server.returncode}")
+        if time.monotonic() > deadline:
+            server.kill()
+            raise RuntimeError(f"Bookshelf server did not listen on {socket_path} within 30 s")
+        time.sleep(0.05)
+
+    return server
+
+
+def run_cli(cli_path: str, arguments: list, temp_dir: str) -> dict:
+    """
+    Runs the CLI once with --metrics and measures it
+
+    Args:
+        cli_path: The path of the CLI executable
+        arguments: The CLI arguments
+        temp_dir: The directory for the output and metrics files
+
+    Returns:
+        The wall time in seconds, the peak RSS in bytes (None where the platform does not report it)
+        and the metrics report of the run
+    """
+    metrics_path = os.path.join(temp_dir, "metrics.json")
+    measurement = measure_process([cli_path] + arguments + ["--quiet", "--metrics", metrics_path], temp_dir)
+
+    with open(metrics_path, encoding="utf-8") as f:
+        measurement["metrics"] = json.load(f)
+    os.remove(metrics_path)
+
+    return measurement
+
+
+def measure_process(command: list, temp_dir: str) -> dict:
+    """
+    Runs a command once and measures its wall time and peak RSS
+
+    The output goes to a file rather than a pipe, so a chatty run cannot block while the harness waits for
+    the process and its resource usage.
+
+    Args:
+        command: The executable and its arguments
+        temp_dir: The working directory, which also holds the output file
+
+    Returns:
+        The wall time in seconds and the peak RSS in bytes (None where the platform does not report it)
+    """
+    with tempfile.TemporaryFile(dir=temp_dir) as output:
+        started = time.perf_counter()
+        process = subprocess.Popen(command, stdout=output, stderr=subprocess.STDOUT, cwd=temp_dir)
+        peak_rss_bytes = None
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # Linux reports kilobytes, macOS bytes
+            peak_rss_bytes = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+        else:
+            process.wait()
+        wall_seconds = time.perf_counter() - started
+
+        if process.returncode != 0:
+            output.seek(0)
+            raise RuntimeError(
+                f"Command failed with exit code {process.returncode}: {' '.join(command)}\n"
+                f"{output.read().decode('utf-8', errors='replace')}")
+
+    return {
+        "wall_seconds": wall_seconds,
+        "peak_rss_bytes": peak_rss_bytes,
+    }
+
+
+def measure_bookshelf(directory: str) -> dict:
+    """
+    Counts the books in a consolidated bookshelf and their bytes
+
+    Args:
+        directory: The bookshelf directory
+
+    Returns:
+        The number of books and their total size
+    """
+    books = [entry for entry in os.scandir(directory) if entry.is_file() and entry.name.lower().endswith(".pdf")]
+    return {
+        "files": len(books),
+        "bytes": sum(entry.stat().st_size for entry in books),
+    }
+
+
+def summarize(context: dict, operation: str, measurements: list, volume: dict) -> dict:
+    """
+    Builds the result record of an operation from its measured runs
+
+    Medians are reported so a single disturbed run does not shift the result.
+
+    Args:
+        context: The commit, host and shelf the operation was measured on
+        operation: The name of the operation
+        measurements: The measured runs of the operation
+        volume: The number of files and bytes the operation reads, which throughput is computed from
+
+    Returns:
+        The result record
+    """
+    wall_seconds = [m["wall_seconds"] for m in measurements]
+    peak_rss = [m["peak_rss_bytes"] for m in measurements if m["peak_rss_bytes"] is not None]
+    median_wall_seconds = statistics.median(wall_seconds)
+
+    stage_totals = {}
+    for measurement in measurements:
+        for stage in measurement["metrics"]["stages"]:
+            stage_totals.setdefault(stage["stage"], []).append(stage["totalMilliseconds"])
+
+    return dict(context, **{
+        "operation": operation,
+        "repetitions": len(measurements),
+        "wall_seconds": {
+            "median": median_wall_seconds,
+            "min": min(wall_seconds),
+            "max": max(wall_seconds),
+            "samples": wall_seconds,
+        },
+        "peak_rss_mb": max(peak_rss) / (1024 * 1024) if peak_rss else None,
+        "throughput_mb_per_s": volume["bytes"] / (1024 * 1024) / median_wall_seconds,
+        "files_per_s": volume["files"] / median_wall_seconds,
+        "pages_merged": measurements[-1]["metrics"]["pagesMerged"],
+        "stage_median_ms": {stage: statistics.median(totals) for stage, totals in sorted(stage_totals.items())},
+    })
+
+
+def summarize_startup(context: dict, operation: str, measurements: list) -> dict:
+    """
+    Builds the result record of a startup operation from its measured runs
+
+    Args:
+        context: The commit and host the operation was measured on
+        operation: The name of the operation
+        measurements: The measured runs of the operation
+
+    Returns:
+        The result record, without throughput since the commands process no files
+    """
+    wall_seconds = [m["wall_seconds"] for m in measurements]
+    peak_rss = [m["peak_rss_bytes"] for m in measurements if m["peak_rss_bytes"] is not None]
+
+    return dict(context, **{
+        "operation": operation,
+        "repetitions": len(measurements),
+        "wall_seconds": {
+            "median": statistics.median(wall_seconds),
+            "min": min(wall_seconds),
+            "max": max(wall_seconds),
+            "samples": wall_seconds,
+        },
+        "peak_rss_mb": max(peak_rss) / (1024 * 1024) if peak_rss else None,
+        "throughput_mb_per_s": None,
+        "files_per_s": None,
+    })
+
+
+def measurement_context(cli_path: str) -> dict:
+    """
+    Describes the commit, host and CLI the results are measured with
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": git_output(["rev-parse", "HEAD"]),
+        "dirty": bool(git_output(["status", "--porcelain", "--untracked-files=no"])),
+        "host": {
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "cli": cli_path,
+    }
+
+
+def append_records(results_path: str, records: list):
+    """
+    Appends the result records to the results file and prints them
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(results_path)), exist_ok=True)
+    with open(results_path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+    print_records(records)
+    print(f"Results appended to {results_path}")
+
+
+def compare_results(args) -> int:
+    """
+    Compares the latest record of every operation, shelf and consolidate arguments in two results files
+
+    Args:
+        args: The parsed compare arguments
+
+    Returns:
+        1 if an operation got slower or used more memory than the threshold allows, otherwise 0
+    """
+    baseline = latest_records(args.baseline)
+    current = latest_records(args.current)
+    regressions = []
+
+    print(f"{'Operation':<28} {'Shelf':<45} {'Wall (s)':>20} {'Change':>8} {'Peak RSS (MB)':>20} {'Change':>8}")
+    for key in sorted(current):
+        if key not in baseline:
+            continue
+
+        operation = key[0]
+        shelf = format_shelf(key)
+        before = baseline[key]
+        after = current[key]
+
+        wall_change = percent_change(before["wall_seconds"]["median"], after["wall_seconds"]["median"])
+        rss_change = percent_change(before["peak_rss_mb"], after["peak_rss_mb"])
+
+        print(f"{operation:<28} {shelf:<45} "
+              f"{before['wall_seconds']['median']:>9.3f} → {after['wall_seconds']['median']:>8.3f} "
+              f"{format_change(wall_change):>8} "
+              f"{format_value(before['peak_rss_mb']):>9} → {format_value(after['peak_rss_mb']):>8} "
+              f"{format_change(rss_change):>8}")
+
+        if before["host"] != after["host"]:
+            print(f"{'':<28} Measured on different hosts, the change may not be caused by the code")
+
+        is_slower = wall_change is not None and wall_change > args.threshold
+        uses_more_memory = rss_change is not None and rss_change > args.threshold
+        if is_slower or uses_more_memory:
+            regressions.append(key)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0f}%:")
+        for key in regressions:
+            print(f"  {key[0]} on {format_shelf(key)}")
+        return 1
+
+    print(f"\nNo regressions above {args.threshold:.0f}%")
+    return 0
+
+
+def latest_records(results_path: str) -> dict:
+    """
+    Reads the latest record of every operation, shelf and consolidate arguments of a results file
+
+    Runs with different consolidate arguments, such as another compression profile, do different work,
+    so they are only compared with each other.
+
+    Args:
+        results_path: The JSON Lines results file
+
+    Returns:
+        The records by operation, shelf key and consolidate arguments
+    """
+    records = {}
+    with open(results_path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                consolidate_args = " ".join(record.get("consolidate_args", "").split())
+                records[(record["operation"], record["shelf"]["key"], consolidate_args)] = record
+    return records
+
+
+def format_shelf(key: tuple) -> str:
+    """
+    Formats the shelf and consolidate arguments of a record key
+    """
+    _, shelf, consolidate_args = key
+    return f"{shelf} {consolidate_args}" if consolidate_args else shelf
+
+
+def percent_change(before, after):
+    """
+    Computes the change from before to after in percent, or None if either is unknown
+    """
+    if not before or after is None:
+        return None
+    return (after - before) / before * 100
+
+
+def format_change(change) -> str:
+    """
+    Formats a change in percent with its sign
+    """
+    return "n/a" if change is None else f"{change:+.1f}%"
+
+
+def format_value(value) -> str:
+    """
+    Formats an optional measurement
+    """
+    return "n/a" if value is None else f"{value:.1f}"
+
+
+def print_records(records: list):
+    """
+    Prints the result records as a table
+    """
+    print(f"\n{'Operation':<28} {'Median (s)':>10} {'Min (s)':>8} {'Max (s)':>8} "
+          f"{'Peak RSS (MB)':>14} {'MB/s':>8} {'Files/s':>8}")
+    for record in records:
+        print(f"{record['operation']:<28} "
+              f"{record['wall_seconds']['median']:>10.3f} "
+              f"{record['wall_seconds']['min']:>8.3f} "
+              f"{record['wall_seconds']['max']:>8.3f} "
+              f"{format_value(record['peak_rss_mb']):>14} "
+              f"{format_value(record['throughput_mb_per_s']):>8} "
+              f"{format_value(record['files_per_s']):>8}")
+
+
+def git_output(arguments: list) -> str:
+    """
+    Runs git in the repository and returns its output, or an empty string if git is not available
+    """
+    try:
+        return subprocess.run(["git"] + arguments, cwd=BENCHMARKS_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def find_cli_executable():
+    """
+    Finds the built CLI executable, preferring the Release build
+    """
+    cli_dir = BENCHMARKS_DIR.parent.parent / "Bookshelf.Cli" / "bin"
+    possible_paths = [
+        cli_dir / "Release" / "net9.0" / "Bookshelf.Cli",
+        cli_dir / "Debug" / "net9.0" / "Bookshelf.Cli",
+    ]
+
+    for path in possible_paths:
+        if path.exists():
+            return str(path.absolute())
+
+    return None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Generates synthetic source shelves for the benchmarks
+"""
+import json
+import os
+import shutil
+import sys
+import zlib
+from pathlib import Path
+
+# Add the e2e directory to path to import pdf_helpers
+sys.path.insert(0, str(Path(__file__).parent.parent / "e2e"))
+from pdf_helpers import PdfFixtureFactory, PdfSpec
+
+
+# Bump when the generated content changes, so shelves generated by an older version are not reused
+GENERATOR_VERSION = 1
+
+# Name of the file describing a generated shelf, written last so an interrupted generation is not reused
+SHELF_DESCRIPTION_FILE = "shelf.json"
+
+# Naming styles of the collections, each recognized by one of the naming pattern plugins
+NAMING_STYLES = ["default", "oreilly", "hanser", "mitp", "wichmann"]
+
+
+def shelf_key(spec: dict) -> str:
+    """
+    Builds the directory name of a shelf from its parameters
+
+    Args:
+        spec: The shelf parameters
+
+    Returns:
+        A name that differs for every combination of parameters
+    """
+    return (
+        f"c{spec['collections']}-ch{spec['chapters']}-p{spec['pages']}"
+        f"-img{spec['image_kb']}-s{spec['single_books']}-{spec['naming']}-seed{spec['seed']}"
+    )
+
+
+def collection_file_names(style: str, index: int, chapters: int) -> list:
+    """
+    Builds the file names of a collection in the given naming style
+
+    Args:
+        style: One of NAMING_STYLES
+        index: The index of the collection, used for the ISBN of Hanser collections
+        chapters: The number of numbered chapters
+
+    Returns:
+        The file names, front and back matter included
+    """
+    numbers = range(1, chapters + 1)
+    if style == "oreilly":
+        return ["BEGINN.pdf"] + [f"Kapitel_{n}_Thema.pdf" for n in numbers] + ["Index.pdf"]
+    if style == "hanser":
+        isbn = f"9783446{index:06d}"
+        return [f"{isbn}.fm.pdf"] + [f"{isbn}.{n:03d}.pdf" for n in numbers] + [f"{isbn}.bm.pdf"]
+    if style == "mitp":
+        return ["Cover.pdf"] + [f"Kapitel_{n}_Thema.pdf" for n in numbers] + ["Stichwortverzeichnis.pdf"]
+    if style == "wichmann":
+        return ["Vorwort.pdf"] + [f"Abschnitt_{n}_Thema.pdf" for n in numbers] + ["Stichwortverzeichnis.pdf"]
+    return [f"Chapter {n:02d}.pdf" for n in numbers]
+
+
+def generate_shelf(spec: dict, shelves_dir: str, workers: int = None) -> dict:
+    """
+    Generates the source shelf of the given parameters, or reuses it if it was generated before
+
+    The shelf holds the collections as folders of chapter PDFs and the single books as PDFs in its root.
+    Every file gets its own seed, so no two files share content and the same parameters always create
+    the same files. The PDFs are generated across a process pool and linked from the fixture cache, so
+    shelves sharing files with an earlier one only generate the new files.
+
+    Args:
+        spec: The shelf parameters: collections, chapters, pages, image_kb, single_books, naming and seed
+        shelves_dir: The directory holding the generated shelves
+        workers: The number of generating processes, defaults to the number of CPUs
+
+    Returns:
+        The shelf description with its path, parameters, file count and total size in bytes
+    """
+    shelf_dir = os.path.join(shelves_dir, shelf_key(spec))
+    description_path = os.path.join(shelf_dir, SHELF_DESCRIPTION_FILE)
+
+    if os.path.exists(description_path):
+        with open(description_path, encoding="utf-8") as f:
+            description = json.load(f)
+        if description.get("generator_version") == GENERATOR_VERSION:
+            description["path"] = os.path.join(shelf_dir, "source")
+            return description
+
+    # Start over, the shelf is incomplete or was generated by another version
+    if os.path.exists(shelf_dir):
+        shutil.rmtree(shelf_dir)
+
+    source_dir = os.path.join(shelf_dir, "source")
+    with PdfFixtureFactory(workers=workers) as fixtures:
+        file_count = len(fixtures.materialize(shelf_specs(spec), source_dir))
+
+    description = {
+        "generator_version": GENERATOR_VERSION,
+        "spec": spec,
+        "files": file_count,
+        "bytes": directory_size(source_dir),
+    }
+    with open(description_path, "w", encoding="utf-8") as f:
+        json.dump(description, f, indent=2)
+
+    description["path"] = source_dir
+    return description
+
+
+def shelf_specs(spec: dict):
+    """
+    Describes the PDFs of a shelf
+
+    Args:
+        spec: The shelf parameters
+
+    Yields:
+        The PdfSpec of every collection chapter and single book
+    """
+    styles = NAMING_STYLES if spec["naming"] == "mixed" else [spec["naming"]]
+
+    for collection in range(spec["collections"]):
+        style = styles[collection % len(styles)]
+        for chapter, file_name in enumerate(collection_file_names(style, collection, spec["chapters"])):
+            yield PdfSpec(
+                os.path.join(f"Collection {collection + 1:04d}", file_name),
+                title=f"Collection {collection + 1} {file_name[:-4]}",
+                author="Benchmark Author",
+                pages=spec["pages"],
+                image_kilobytes=spec["image_kb"],
+                seed=file_seed(spec["seed"], "collection", collection, chapter)
+            )
+
+    for book in range(spec["single_books"]):
+        yield PdfSpec(
+            f"Book {book + 1:04d}.pdf",
+            title=f"Book {book + 1}",
+            author="Benchmark Author",
+            pages=spec["pages"],
+            image_kilobytes=spec["image_kb"],
+            seed=file_seed(spec["seed"], "book", book, 0)
+        )
+
+
+def file_seed(seed: int, kind: str, index: int, part: int) -> int:
+    """
+    Derives the seed of one generated file from the shelf seed
+
+    Args:
+        seed: The shelf seed
+        kind: The kind of book, collection or book
+        index: The index of the collection or single book
+        part: The index of the file within the collection
+
+    Returns:
+        A seed that is stable across runs and platforms
+    """
+    return zlib.crc32(f"{seed}-{kind}-{index}-{part}".encode("utf-8"))
+
+
+def directory_size(directory: str) -> int:
+    """
+    Sums the sizes of all files below a directory
+
+    Args:
+        directory: The directory to measure
+
+    Returns:
+        The total size in bytes
+    """
+    total = 0
+    for root, dirs, filenames in os.walk(directory):
+        for filename in filenames:
+            total += os.path.getsize(os.path.join(root, filename))
+    return total
@@ -0,0 +1,35 @@
+"""
+Helper utilities for running bookshelf commands with JSON output
+"""
+import json
+import subprocess
+
+
+def run_json_command(context, *arguments):
+    """
+    Runs a bookshelf command with JSON output and parses its report
+    
+    Args:
+        context: The behave context receiving the output, exit code and parsed report
+        arguments: The command and its arguments
+    """
+    cmd = [context.cli_path, *arguments, "--output", "json"]
+    
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+        context.command_output = result.stdout
+        context.command_exit_code = result.returncode
+        context.json_report = json.loads(result.stdout)
+        
+        if result.stderr:
+            print(f"STDERR:\n{result.stderr}")
+            
+    except subprocess.TimeoutExpired:
+        raise AssertionError("Command timed out after 60 seconds")
+    except json.JSONDecodeError as e:
+        raise AssertionError(f"Command did not write a JSON report: {e}\n{context.command_output}")
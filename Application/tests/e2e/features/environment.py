@@ -3,9 +3,15 @@ Behave environment hooks for setting up and tearing down test fixtures
 """
 import os
 import shutil
+import sys
 import tempfile
 from pathlib import Path
 
+# Add parent directory to path to import pdf_helpers and server_helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pdf_helpers import PdfFixtureFactory
+from server_helpers import start_server, stop_server
+
 
 def before_all(context):
     """
@@ -18,6 +24,25 @@ def before_all(context):
     
     print(f"Using CLI executable: {context.cli_path}")
 
+    # Share one fixture factory, so PDFs generated for one scenario are linked into the next ones
+    context.fixtures = PdfFixtureFactory()
+
+    # With BOOKSHELF_SERVER set, every command the steps run inherits it and is forwarded to one server
+    context.server_process = start_server(context.cli_path, os.environ.get("BOOKSHELF_SERVER"))
+    if context.server_process is not None:
+        print(f"Forwarding commands to the bookshelf server on {os.environ['BOOKSHELF_SERVER']}")
+
+
+def after_all(context):
+    """
+    Cleanup after all tests
+    """
+    if hasattr(context, 'fixtures'):
+        context.fixtures.close()
+
+    if getattr(context, 'server_process', None) is not None:
+        stop_server(context.server_process)
+
 
 def before_scenario(context, scenario):
     """
@@ -41,6 +66,11 @@ def after_scenario(context, scenario):
     """
     Cleanup after each scenario
     """
+    # Stop a server started by the scenario before its socket directory is removed
+    server_process = getattr(context, 'scenario_server_process', None)
+    if server_process is not None and server_process.poll() is None:
+        stop_server(server_process)
+
     # Clean up temporary directory
     if hasattr(context, 'temp_dir') and os.path.exists(context.temp_dir):
         try:
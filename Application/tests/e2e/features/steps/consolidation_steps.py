@@ -1,8 +1,10 @@
 """
 Step definitions for US0001 - Bookshelf Consolidation
 """
+import json
 import os
 import subprocess
+from dataclasses import replace
 from pathlib import Path
 from behave import given, when, then
 import sys
@@ -10,84 +12,46 @@ import sys
 # Add parent directory to path to import pdf_helpers
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from pdf_helpers import (
-    create_simple_pdf,
+    PdfSpec,
     count_pdf_pages,
     get_pdf_metadata,
     list_files_recursively
 )
 
 
+# The compression profiles of merged collections
+COMPRESSION_PROFILES = ["none", "standard", "maximum"]
+
+# The number of chapters embedding the same images
+SHARED_IMAGE_CHAPTERS = 4
+
+
 # ========== GIVEN steps ==========
 
 @given('I have multiple PDF files scattered across different folders')
 def step_create_scattered_pdfs(context):
     """Create PDF files in different subdirectories of the source"""
-    # Create PDFs in root
-    create_simple_pdf(
-        os.path.join(context.source_dir, "book1.pdf"),
-        title="Book 1",
-        author="Author 1"
-    )
-    
-    # Create PDFs in subdirectories
-    subdir1 = os.path.join(context.source_dir, "folder1")
-    os.makedirs(subdir1, exist_ok=True)
-    create_simple_pdf(
-        os.path.join(subdir1, "book2.pdf"),
-        title="Book 2",
-        author="Author 2"
-    )
-    
-    subdir2 = os.path.join(context.source_dir, "folder2")
-    os.makedirs(subdir2, exist_ok=True)
-    create_simple_pdf(
-        os.path.join(subdir2, "book3.pdf"),
-        title="Book 3",
-        author="Author 3"
-    )
-    
-    context.created_files.extend([
-        os.path.join(context.source_dir, "book1.pdf"),
-        os.path.join(subdir1, "book2.pdf"),
-        os.path.join(subdir2, "book3.pdf")
-    ])
+    context.created_files.extend(context.fixtures.materialize([
+        # Create PDFs in root
+        PdfSpec("book1.pdf", title="Book 1", author="Author 1"),
+        # Create PDFs in subdirectories
+        PdfSpec(os.path.join("folder1", "book2.pdf"), title="Book 2", author="Author 2"),
+        PdfSpec(os.path.join("folder2", "book3.pdf"), title="Book 3", author="Author 3"),
+    ], context.source_dir))
 
 
 @given('I have folders containing multiple PDF files representing book chapters')
 def step_create_collection_folders(context):
     """Create folders with multiple PDF files representing chapters"""
-    # Create collection 1
-    collection1_dir = os.path.join(context.source_dir, "Collection1")
-    os.makedirs(collection1_dir, exist_ok=True)
-    create_simple_pdf(
-        os.path.join(collection1_dir, "chapter1.pdf"),
-        title="Chapter 1",
-        author="Collection Author"
-    )
-    create_simple_pdf(
-        os.path.join(collection1_dir, "chapter2.pdf"),
-        title="Chapter 2",
-        author="Collection Author"
-    )
-    
-    # Create collection 2
-    collection2_dir = os.path.join(context.source_dir, "Collection2")
-    os.makedirs(collection2_dir, exist_ok=True)
-    create_simple_pdf(
-        os.path.join(collection2_dir, "part1.pdf"),
-        title="Part 1",
-        author="Another Author"
-    )
-    create_simple_pdf(
-        os.path.join(collection2_dir, "part2.pdf"),
-        title="Part 2",
-        author="Another Author"
-    )
-    create_simple_pdf(
-        os.path.join(collection2_dir, "part3.pdf"),
-        title="Part 3",
-        author="Another Author"
-    )
+    context.fixtures.materialize([
+        # Create collection 1
+        PdfSpec(os.path.join("Collection1", "chapter1.pdf"), title="Chapter 1", author="Collection Author"),
+        PdfSpec(os.path.join("Collection1", "chapter2.pdf"), title="Chapter 2", author="Collection Author"),
+        # Create collection 2
+        PdfSpec(os.path.join("Collection2", "part1.pdf"), title="Part 1", author="Another Author"),
+        PdfSpec(os.path.join("Collection2", "part2.pdf"), title="Part 2", author="Another Author"),
+        PdfSpec(os.path.join("Collection2", "part3.pdf"), title="Part 3", author="Another Author"),
+    ], context.source_dir)
 
 
 @given('each folder represents a single book collection')
@@ -117,35 +81,15 @@ def step_source_directory_with_collections(context):
 @given('I have a source directory with both individual PDF files and collection folders')
 def step_create_mixed_content(context):
     """Create a mix of individual PDFs and collection folders"""
-    # Individual PDF in root
-    create_simple_pdf(
-        os.path.join(context.source_dir, "standalone.pdf"),
-        title="Standalone Book",
-        author="Solo Author"
-    )
-    
-    # Single PDF in a folder
-    single_folder = os.path.join(context.source_dir, "SingleBookFolder")
-    os.makedirs(single_folder, exist_ok=True)
-    create_simple_pdf(
-        os.path.join(single_folder, "book.pdf"),
-        title="Single Book in Folder",
-        author="Folder Author"
-    )
-    
-    # Multiple PDFs in a collection folder
-    collection_folder = os.path.join(context.source_dir, "MultiPartBook")
-    os.makedirs(collection_folder, exist_ok=True)
-    create_simple_pdf(
-        os.path.join(collection_folder, "part1.pdf"),
-        title="Multi Part Book - Part 1",
-        author="Multi Author"
-    )
-    create_simple_pdf(
-        os.path.join(collection_folder, "part2.pdf"),
-        title="Multi Part Book - Part 2",
-        author="Multi Author"
-    )
+    context.fixtures.materialize([
+        # Individual PDF in root
+        PdfSpec("standalone.pdf", title="Standalone Book", author="Solo Author"),
+        # Single PDF in a folder
+        PdfSpec(os.path.join("SingleBookFolder", "book.pdf"), title="Single Book in Folder", author="Folder Author"),
+        # Multiple PDFs in a collection folder
+        PdfSpec(os.path.join("MultiPartBook", "part1.pdf"), title="Multi Part Book - Part 1", author="Multi Author"),
+        PdfSpec(os.path.join("MultiPartBook", "part2.pdf"), title="Multi Part Book - Part 2", author="Multi Author"),
+    ], context.source_dir)
 
 
 @given('some folders contain single PDFs while others contain multiple PDFs')
@@ -157,27 +101,14 @@ def step_mixed_folder_structure(context):
 @given('I have PDF files with existing metadata (title, author, creation date)')
 def step_create_pdfs_with_metadata(context):
     """Create PDFs with metadata"""
-    create_simple_pdf(
-        os.path.join(context.source_dir, "metadata_book.pdf"),
-        title="Book with Metadata",
-        author="Metadata Author"
-    )
-    
-    # Collection with metadata
-    collection_dir = os.path.join(context.source_dir, "MetadataCollection")
-    os.makedirs(collection_dir, exist_ok=True)
-    create_simple_pdf(
-        os.path.join(collection_dir, "chapter1.pdf"),
-        title="First Chapter",
-        author="Collection Author",
-        pages=2
-    )
-    create_simple_pdf(
-        os.path.join(collection_dir, "chapter2.pdf"),
-        title="Second Chapter",
-        author="Collection Author",
-        pages=2
-    )
+    context.fixtures.materialize([
+        PdfSpec("metadata_book.pdf", title="Book with Metadata", author="Metadata Author"),
+        # Collection with metadata
+        PdfSpec(os.path.join("MetadataCollection", "chapter1.pdf"),
+                title="First Chapter", author="Collection Author", pages=2),
+        PdfSpec(os.path.join("MetadataCollection", "chapter2.pdf"),
+                title="Second Chapter", author="Collection Author", pages=2),
+    ], context.source_dir)
 
 
 @given('some files are in collections that need merging')
@@ -189,28 +120,12 @@ def step_collections_need_merging(context):
 @given('I have multiple PDF files or collections with identical names')
 def step_create_naming_conflicts(context):
     """Create files with identical names in different folders"""
-    # Create conflicting book.pdf files
-    create_simple_pdf(
-        os.path.join(context.source_dir, "duplicate.pdf"),
-        title="Duplicate 1",
-        author="Author 1"
-    )
-    
-    folder1 = os.path.join(context.source_dir, "folder1")
-    os.makedirs(folder1, exist_ok=True)
-    create_simple_pdf(
-        os.path.join(folder1, "duplicate.pdf"),
-        title="Duplicate 2",
-        author="Author 2"
-    )
-    
-    folder2 = os.path.join(context.source_dir, "folder2")
-    os.makedirs(folder2, exist_ok=True)
-    create_simple_pdf(
-        os.path.join(folder2, "duplicate.pdf"),
-        title="Duplicate 3",
-        author="Author 3"
-    )
+    # Create conflicting duplicate.pdf files
+    context.fixtures.materialize([
+        PdfSpec("duplicate.pdf", title="Duplicate 1", author="Author 1"),
+        PdfSpec(os.path.join("folder1", "duplicate.pdf"), title="Duplicate 2", author="Author 2"),
+        PdfSpec(os.path.join("folder2", "duplicate.pdf"), title="Duplicate 3", author="Author 3"),
+    ], context.source_dir)
 
 
 @given('these files exist in different source folders')
@@ -222,36 +137,192 @@ def step_files_in_different_folders(context):
 @given('I have a large collection of PDFs to consolidate')
 def step_create_large_collection(context):
     """Create a large collection for progress testing"""
+    context.created_files.extend(
+        context.fixtures.materialize(large_collection_specs(), context.source_dir)
+    )
+
+
+def large_collection_specs():
+    """Describe the PDFs of the large collection"""
     # Create 10 individual PDFs
     for i in range(10):
-        create_simple_pdf(
-            os.path.join(context.source_dir, f"book{i}.pdf"),
-            title=f"Book {i}",
-            author=f"Author {i}"
-        )
+        yield PdfSpec(f"book{i}.pdf", title=f"Book {i}", author=f"Author {i}")
     
     # Create 3 collections with multiple files
     for col_num in range(3):
-        collection_dir = os.path.join(context.source_dir, f"Collection{col_num}")
-        os.makedirs(collection_dir, exist_ok=True)
         for part_num in range(3):
-            create_simple_pdf(
-                os.path.join(collection_dir, f"part{part_num}.pdf"),
+            yield PdfSpec(
+                os.path.join(f"Collection{col_num}", f"part{part_num}.pdf"),
                 title=f"Collection {col_num} Part {part_num}",
                 author=f"Collection Author {col_num}"
             )
 
 
+@given('I have consolidated a source directory with individual PDF files and a collection')
+def step_create_consolidated_bookshelf(context):
+    """Consolidate individual PDFs and a collection once, remembering when each book was written"""
+    context.fixtures.materialize(incremental_specs(), context.source_dir)
+    run_consolidation(context)
+    assert context.command_exit_code == 0, f"First consolidation failed with exit code {context.command_exit_code}"
+    context.book_write_times = get_book_write_times(context.target_dir)
+    assert len(context.book_write_times) == 3, f"Expected 3 consolidated books, found {sorted(context.book_write_times)}"
+
+
+@given('a chapter of the collection has changed since the consolidation')
+def step_change_collection_chapter(context):
+    """Replace the second chapter of the collection with a longer one"""
+    context.fixtures.materialize([
+        PdfSpec(os.path.join("Handbook", "chapter2.pdf"), title="Chapter 2 Revised", author="Handbook Author", pages=3),
+    ], context.source_dir)
+
+
+def incremental_specs():
+    """Describe the PDFs consolidated by the incremental consolidation scenarios"""
+    yield PdfSpec("Refactoring.pdf", title="Refactoring", author="Martin Fowler", pages=2)
+    yield PdfSpec("Domain Driven Design.pdf", title="Domain Driven Design", author="Eric Evans", pages=3)
+    yield PdfSpec(os.path.join("Handbook", "chapter1.pdf"), title="Chapter 1", author="Handbook Author")
+    yield PdfSpec(os.path.join("Handbook", "chapter2.pdf"), title="Chapter 2", author="Handbook Author")
+
+
+def get_book_write_times(directory):
+    """Map the consolidated PDFs in a directory to their last write times"""
+    return {
+        f: os.stat(os.path.join(directory, f)).st_mtime_ns
+        for f in os.listdir(directory)
+        if f.endswith('.pdf')
+    }
+
+
+@given('I have collection folders whose chapters have uncompressed page content')
+def step_create_uncompressed_collections(context):
+    """Create collections whose chapters store their page content without compression"""
+    context.fixtures.materialize(uncompressed_collection_specs(), context.source_dir)
+
+
+def uncompressed_collection_specs():
+    """Describe the collections of the compression scenario, whose page content the profiles can compress"""
+    for collection in ["Compressible Handbook", "Compressible Guide"]:
+        for chapter in range(1, 4):
+            yield PdfSpec(
+                os.path.join(collection, f"chapter{chapter}.pdf"),
+                title=f"{collection} Chapter {chapter}",
+                author="Compression Author",
+                pages=3,
+                page_compression=False
+            )
+
+
+@given('I have byte-identical PDF files under different names and a collection with a byte-identical chapter')
+def step_create_duplicate_content(context):
+    """Create two root PDFs with the same bytes and a collection repeating its first chapter"""
+    context.fixtures.materialize(duplicate_content_specs(), context.source_dir)
+
+
+def duplicate_content_specs():
+    """Describe the PDFs of the deduplication scenario, where equal specs produce byte-identical files"""
+    duplicated_book = PdfSpec("Clean Code.pdf", title="Clean Code", author="Robert Martin", pages=2)
+    yield duplicated_book
+    yield replace(duplicated_book, relative_path="Clean Code Duplicate.pdf")
+
+    first_chapter = PdfSpec(os.path.join("Dedup Handbook", "chapter1.pdf"), title="Chapter 1", author="Handbook Author", pages=2)
+    yield first_chapter
+    yield PdfSpec(os.path.join("Dedup Handbook", "chapter2.pdf"), title="Chapter 2", author="Handbook Author", pages=3)
+    yield replace(first_chapter, relative_path=os.path.join("Dedup Handbook", "chapter3.pdf"))
+
+
+def get_bookshelf_contents(directory):
+    """Map the consolidated PDFs in a directory to their sizes and page counts"""
+    return {
+        f: (os.path.getsize(os.path.join(directory, f)), count_pdf_pages(os.path.join(directory, f)))
+        for f in os.listdir(directory)
+        if f.endswith('.pdf')
+    }
+
+
+@given('I have a collection whose chapters embed the same images')
+def step_create_collection_with_shared_images(context):
+    """Create a collection whose chapters differ in text but embed identical images"""
+    context.fixtures.materialize(shared_image_specs(), context.source_dir)
+
+
+def shared_image_specs():
+    """Describe the chapters of the shared image scenario, where equal seeds draw equal images on equal pages"""
+    for chapter in range(1, SHARED_IMAGE_CHAPTERS + 1):
+        yield PdfSpec(
+            os.path.join("Illustrated Handbook", f"chapter{chapter}.pdf"),
+            title=f"Illustrated Handbook Chapter {chapter}",
+            author="Handbook Author",
+            pages=2,
+            image_kilobytes=48,
+            seed=14
+        )
+
+
 # ========== WHEN steps ==========
 
 @when('I run the consolidation command')
 def step_run_consolidation_command(context):
     """Execute the bookshelf consolidate command"""
+    run_consolidation(context)
+
+
+@when('I run the consolidation command with the "{option}" option')
+def step_run_consolidation_command_with_option(context, option):
+    """Execute the bookshelf consolidate command with an option"""
+    run_consolidation(context, option)
+
+
+@when('I consolidate the collections with each compression profile')
+def step_run_consolidation_with_each_compression_profile(context):
+    """Consolidate the collections into one bookshelf per compression profile and parse each JSON report"""
+    context.compression_reports = {}
+    context.compression_target_dirs = {}
+    for profile in COMPRESSION_PROFILES:
+        target_dir = os.path.join(context.temp_dir, f"target-{profile}")
+        os.makedirs(target_dir, exist_ok=True)
+        run_consolidation(context, "--output", "json", "--compression", profile, target_dir=target_dir)
+        assert context.command_exit_code == 0, f"Consolidation with {profile} compression failed"
+        context.compression_reports[profile] = json.loads(context.command_output)["summary"]
+        context.compression_target_dirs[profile] = target_dir
+
+
+@when('I run the consolidation command with JSON output and the "{option}" option')
+def step_run_first_consolidation_command_json_with_option(context, option):
+    """Execute the bookshelf consolidate command with an option, parse its JSON report and remember the bookshelf"""
+    run_consolidation(context, "--output", "json", option)
+    context.consolidation_report = json.loads(context.command_output)
+    context.first_bookshelf_contents = get_bookshelf_contents(context.target_dir)
+
+
+@when('I run the consolidation command again with JSON output')
+def step_run_consolidation_command_json(context):
+    """Execute the bookshelf consolidate command again and parse its JSON report"""
+    run_consolidation(context, "--output", "json")
+    context.consolidation_report = json.loads(context.command_output)
+
+
+@when('I run the consolidation command again with JSON output and the "{option}" option')
+def step_run_consolidation_command_json_with_option(context, option):
+    """Execute the bookshelf consolidate command again with an option and parse its JSON report"""
+    run_consolidation(context, "--output", "json", option)
+    context.consolidation_report = json.loads(context.command_output)
+
+
+def run_consolidation(context, *options, target_dir=None):
+    """
+    Runs the bookshelf consolidate command from the source to the target directory
+    
+    Args:
+        context: The behave context receiving the output and exit code
+        options: Additional command line options
+        target_dir: The bookshelf directory, or None for the scenario's target directory
+    """
     cmd = [
         context.cli_path,
         "consolidate",
         context.source_dir,
-        context.target_dir
+        target_dir or context.target_dir,
+        *options
     ]
     
     try:
@@ -485,57 +556,48 @@ def step_create_mitp_collection(context):
 def step_create_mitp_front_matter(context):
     """Create mitp front matter files"""
     patterns = ["Cover", "Titel", "Inhaltsverzeichnis", "Einleitung", "über den Autor"]
-    for pattern in patterns:
-        create_simple_pdf(
-            os.path.join(context.mitp_collection_dir, f"{pattern}.pdf"),
-            title=f"mitp {pattern}",
-            author="mitp Author"
-        )
+    context.fixtures.materialize(
+        [PdfSpec(f"{pattern}.pdf", title=f"mitp {pattern}", author="mitp Author") for pattern in patterns],
+        context.mitp_collection_dir
+    )
 
 
 @given('the collection contains files with patterns like "Kapitel_1_", "Kapitel_2_", "Kapitel_10_", "Kapitel_11_"')
 def step_create_mitp_chapters(context):
     """Create mitp chapter files"""
     chapters = [1, 2, 10, 11]
-    for ch in chapters:
-        create_simple_pdf(
-            os.path.join(context.mitp_collection_dir, f"Kapitel_{ch}_Example.pdf"),
-            title=f"Kapitel {ch}",
-            author="mitp Author"
-        )
+    context.fixtures.materialize(
+        [PdfSpec(f"Kapitel_{ch}_Example.pdf", title=f"Kapitel {ch}", author="mitp Author") for ch in chapters],
+        context.mitp_collection_dir
+    )
 
 
 @given('the collection contains files with patterns like "Anhang_A_", "Anhang_B_"')
 def step_create_mitp_appendices(context):
     """Create mitp appendix files"""
     appendices = ["A", "B"]
-    for app in appendices:
-        create_simple_pdf(
-            os.path.join(context.mitp_collection_dir, f"Anhang_{app}_Extra.pdf"),
-            title=f"Anhang {app}",
-            author="mitp Author"
-        )
+    context.fixtures.materialize(
+        [PdfSpec(f"Anhang_{app}_Extra.pdf", title=f"Anhang {app}", author="mitp Author") for app in appendices],
+        context.mitp_collection_dir
+    )
 
 
 @given('the collection contains files with patterns like "Glossar", "Stichwortverzeichnis"')
 def step_create_mitp_back_matter(context):
     """Create mitp back matter files"""
     patterns = ["Glossar", "Stichwortverzeichnis"]
-    for pattern in patterns:
-        create_simple_pdf(
-            os.path.join(context.mitp_collection_dir, f"{pattern}.pdf"),
-            title=f"mitp {pattern}",
-            author="mitp Author"
-        )
+    context.fixtures.materialize(
+        [PdfSpec(f"{pattern}.pdf", title=f"mitp {pattern}", author="mitp Author") for pattern in patterns],
+        context.mitp_collection_dir
+    )
 
 
 @given('the collection may contain duplicate files with "(1)" suffix')
 def step_create_mitp_duplicates(context):
     """Create duplicate files that should be filtered out"""
-    create_simple_pdf(
-        os.path.join(context.mitp_collection_dir, "Kapitel_1_Example(1).pdf"),
-        title="Duplicate Chapter",
-        author="mitp Author"
+    context.fixtures.materialize(
+        [PdfSpec("Kapitel_1_Example(1).pdf", title="Duplicate Chapter", author="mitp Author")],
+        context.mitp_collection_dir
     )
 
 
@@ -550,38 +612,28 @@ def step_create_wichmann_collection(context):
 def step_create_wichmann_front_matter(context):
     """Create Wichmann front matter files"""
     patterns = ["Vorwort", "Inhalt"]
-    for pattern in patterns:
-        create_simple_pdf(
-            os.path.join(context.wichmann_collection_dir, f"{pattern}.pdf"),
-            title=f"Wichmann {pattern}",
-            author="Wichmann Author"
-        )
+    context.fixtures.materialize(
+        [PdfSpec(f"{pattern}.pdf", title=f"Wichmann {pattern}", author="Wichmann Author") for pattern in patterns],
+        context.wichmann_collection_dir
+    )
 
 
 @given('the collection contains files with patterns like "_1_", "_2_", "_3_", "_4_", "_5_", "_6_", "_7_", "_8_"')
 def step_create_wichmann_chapters(context):
     """Create Wichmann chapter files"""
-    for ch in range(1, 9):
-        create_simple_pdf(
-            os.path.join(context.wichmann_collection_dir, f"Chapter_{ch}_Content.pdf"),
-            title=f"Chapter {ch}",
-            author="Wichmann Author"
-        )
+    context.fixtures.materialize(
+        [PdfSpec(f"Chapter_{ch}_Content.pdf", title=f"Chapter {ch}", author="Wichmann Author") for ch in range(1, 9)],
+        context.wichmann_collection_dir
+    )
 
 
 @given('the collection contains files with patterns like "Anhnge", "Stichwortverzeichnis"')
 def step_create_wichmann_back_matter(context):
     """Create Wichmann appendix and back matter files"""
-    create_simple_pdf(
-        os.path.join(context.wichmann_collection_dir, "Anhnge.pdf"),
-        title="Anhnge",
-        author="Wichmann Author"
-    )
-    create_simple_pdf(
-        os.path.join(context.wichmann_collection_dir, "Stichwortverzeichnis.pdf"),
-        title="Stichwortverzeichnis",
-        author="Wichmann Author"
-    )
+    context.fixtures.materialize([
+        PdfSpec("Anhnge.pdf", title="Anhnge", author="Wichmann Author"),
+        PdfSpec("Stichwortverzeichnis.pdf", title="Stichwortverzeichnis", author="Wichmann Author"),
+    ], context.wichmann_collection_dir)
 
 
 @given('I have PDF collections from different publishers')
@@ -604,21 +656,14 @@ def step_mitp_german_naming(context):
     context.mitp_collection_dir = os.path.join(context.source_dir, "MitpGerman")
     os.makedirs(context.mitp_collection_dir, exist_ok=True)
     
-    # Create front matter
-    for pattern in ["Cover", "Titel", "Inhaltsverzeichnis"]:
-        create_simple_pdf(
-            os.path.join(context.mitp_collection_dir, f"{pattern}.pdf"),
-            title=f"mitp {pattern}",
-            author="mitp Author"
-        )
-    
-    # Create chapters
-    for ch in [1, 2, 3]:
-        create_simple_pdf(
-            os.path.join(context.mitp_collection_dir, f"Kapitel_{ch}_Content.pdf"),
-            title=f"Kapitel {ch}",
-            author="mitp Author"
-        )
+    context.fixtures.materialize(
+        # Create front matter
+        [PdfSpec(f"{pattern}.pdf", title=f"mitp {pattern}", author="mitp Author")
+         for pattern in ["Cover", "Titel", "Inhaltsverzeichnis"]]
+        # Create chapters
+        + [PdfSpec(f"Kapitel_{ch}_Content.pdf", title=f"Kapitel {ch}", author="mitp Author") for ch in [1, 2, 3]],
+        context.mitp_collection_dir
+    )
 
 
 @given('I have a collection from Wichmann Verlag with underscore-based numbering')
@@ -627,20 +672,13 @@ def step_wichmann_underscore_naming(context):
     context.wichmann_collection_dir = os.path.join(context.source_dir, "WichmannUnderscore")
     os.makedirs(context.wichmann_collection_dir, exist_ok=True)
     
-    # Create front matter
-    create_simple_pdf(
-        os.path.join(context.wichmann_collection_dir, "Vorwort.pdf"),
-        title="Vorwort",
-        author="Wichmann Author"
+    context.fixtures.materialize(
+        # Create front matter
+        [PdfSpec("Vorwort.pdf", title="Vorwort", author="Wichmann Author")]
+        # Create chapters
+        + [PdfSpec(f"Chapter_{ch}_Content.pdf", title=f"Chapter {ch}", author="Wichmann Author") for ch in [1, 2, 3]],
+        context.wichmann_collection_dir
     )
-    
-    # Create chapters
-    for ch in [1, 2, 3]:
-        create_simple_pdf(
-            os.path.join(context.wichmann_collection_dir, f"Chapter_{ch}_Content.pdf"),
-            title=f"Chapter {ch}",
-            author="Wichmann Author"
-        )
 
 
 @given('I have a PDF collection from Hanser Verlag')
@@ -653,31 +691,28 @@ def step_create_hanser_collection(context):
 @given('the collection contains files with ISBN pattern "9783446######.fm.pdf"')
 def step_create_hanser_front_matter(context):
     """Create Hanser front matter file"""
-    create_simple_pdf(
-        os.path.join(context.hanser_collection_dir, "9783446123456.fm.pdf"),
-        title="Hanser Front Matter",
-        author="Hanser Author"
+    context.fixtures.materialize(
+        [PdfSpec("9783446123456.fm.pdf", title="Hanser Front Matter", author="Hanser Author")],
+        context.hanser_collection_dir
     )
 
 
 @given('the collection contains files with ISBN pattern "9783446######.001.pdf", "9783446######.002.pdf"')
 def step_create_hanser_chapters(context):
     """Create Hanser chapter files"""
-    for ch in range(1, 12):
-        create_simple_pdf(
-            os.path.join(context.hanser_collection_dir, f"9783446123456.{ch:03d}.pdf"),
-            title=f"Hanser Chapter {ch}",
-            author="Hanser Author"
-        )
+    context.fixtures.materialize(
+        [PdfSpec(f"9783446123456.{ch:03d}.pdf", title=f"Hanser Chapter {ch}", author="Hanser Author")
+         for ch in range(1, 12)],
+        context.hanser_collection_dir
+    )
 
 
 @given('the collection contains files with ISBN pattern "9783446######.bm.pdf"')
 def step_create_hanser_back_matter(context):
     """Create Hanser back matter file"""
-    create_simple_pdf(
-        os.path.join(context.hanser_collection_dir, "9783446123456.bm.pdf"),
-        title="Hanser Back Matter",
-        author="Hanser Author"
+    context.fixtures.materialize(
+        [PdfSpec("9783446123456.bm.pdf", title="Hanser Back Matter", author="Hanser Author")],
+        context.hanser_collection_dir
     )
 
 
@@ -692,39 +727,29 @@ def step_create_oreilly_collection(context):
 def step_create_oreilly_front_matter(context):
     """Create O'Reilly front matter files"""
     patterns = ["BEGINN", "Inhalt", "Vorwort"]
-    for pattern in patterns:
-        create_simple_pdf(
-            os.path.join(context.oreilly_collection_dir, f"{pattern}.pdf"),
-            title=f"O'Reilly {pattern}",
-            author="O'Reilly Author"
-        )
+    context.fixtures.materialize(
+        [PdfSpec(f"{pattern}.pdf", title=f"O'Reilly {pattern}", author="O'Reilly Author") for pattern in patterns],
+        context.oreilly_collection_dir
+    )
 
 
 @given('the collection contains files with pattern "Kapitel_1_", "Kapitel_2_", "Chapter_1_"')
 def step_create_oreilly_chapters(context):
     """Create O'Reilly chapter files (mixed German/English)"""
     chapters = [("Kapitel_1_", 1), ("Kapitel_2_", 2), ("Chapter_3_", 3)]
-    for pattern, num in chapters:
-        create_simple_pdf(
-            os.path.join(context.oreilly_collection_dir, f"{pattern}Content.pdf"),
-            title=f"Chapter {num}",
-            author="O'Reilly Author"
-        )
+    context.fixtures.materialize(
+        [PdfSpec(f"{pattern}Content.pdf", title=f"Chapter {num}", author="O'Reilly Author") for pattern, num in chapters],
+        context.oreilly_collection_dir
+    )
 
 
 @given('the collection contains files with patterns like "Index", "Anhang"')
 def step_create_oreilly_back_matter(context):
     """Create O'Reilly appendix and back matter files"""
-    create_simple_pdf(
-        os.path.join(context.oreilly_collection_dir, "Anhang.pdf"),
-        title="Appendix",
-        author="O'Reilly Author"
-    )
-    create_simple_pdf(
-        os.path.join(context.oreilly_collection_dir, "Index.pdf"),
-        title="Index",
-        author="O'Reilly Author"
-    )
+    context.fixtures.materialize([
+        PdfSpec("Anhang.pdf", title="Appendix", author="O'Reilly Author"),
+        PdfSpec("Index.pdf", title="Index", author="O'Reilly Author"),
+    ], context.oreilly_collection_dir)
 
 
 @given('I have a PDF collection with German Teil (Part) structure')
@@ -738,50 +763,38 @@ def step_create_teil_collection(context):
 def step_create_teil_parts(context):
     """Create Teil (Part) files"""
     parts = ["I", "II", "III"]
-    for part in parts:
-        create_simple_pdf(
-            os.path.join(context.teil_collection_dir, f"Teil_{part}_Introduction.pdf"),
-            title=f"Teil {part}",
-            author="Teil Author"
-        )
+    context.fixtures.materialize(
+        [PdfSpec(f"Teil_{part}_Introduction.pdf", title=f"Teil {part}", author="Teil Author") for part in parts],
+        context.teil_collection_dir
+    )
 
 
 @given('each Teil may contain multiple chapters with pattern "Kapitel_1_", "Kapitel_2_"')
 def step_create_teil_chapters(context):
     """Create chapters within the Teil structure"""
-    for ch in [1, 2]:
-        create_simple_pdf(
-            os.path.join(context.teil_collection_dir, f"Kapitel_{ch}_Content.pdf"),
-            title=f"Kapitel {ch}",
-            author="Teil Author"
-        )
+    context.fixtures.materialize(
+        [PdfSpec(f"Kapitel_{ch}_Content.pdf", title=f"Kapitel {ch}", author="Teil Author") for ch in [1, 2]],
+        context.teil_collection_dir
+    )
 
 
 @given('the collection contains front matter like "BEGINN", "Vorwort", "Inhaltsverzeichnis"')
 def step_create_teil_front_matter(context):
     """Create Teil front matter files"""
     patterns = ["BEGINN", "Vorwort", "Inhaltsverzeichnis"]
-    for pattern in patterns:
-        create_simple_pdf(
-            os.path.join(context.teil_collection_dir, f"{pattern}.pdf"),
-            title=f"Teil {pattern}",
-            author="Teil Author"
-        )
+    context.fixtures.materialize(
+        [PdfSpec(f"{pattern}.pdf", title=f"Teil {pattern}", author="Teil Author") for pattern in patterns],
+        context.teil_collection_dir
+    )
 
 
 @given('the collection contains back matter like "Index", "Anhang"')
 def step_create_teil_back_matter(context):
     """Create Teil back matter files"""
-    create_simple_pdf(
-        os.path.join(context.teil_collection_dir, "Anhang.pdf"),
-        title="Appendix",
-        author="Teil Author"
-    )
-    create_simple_pdf(
-        os.path.join(context.teil_collection_dir, "Index.pdf"),
-        title="Index",
-        author="Teil Author"
-    )
+    context.fixtures.materialize([
+        PdfSpec("Anhang.pdf", title="Appendix", author="Teil Author"),
+        PdfSpec("Index.pdf", title="Index", author="Teil Author"),
+    ], context.teil_collection_dir)
 
 
 # ========== Publisher Pattern THEN steps ==========
@@ -978,3 +991,180 @@ def step_verify_teil_back_matter(context):
     # Verify merged PDF exists
     merged_pdf = os.path.join(context.target_dir, "TeilBook.pdf")
     assert os.path.exists(merged_pdf), "Teil merged PDF was not created"
+
+
+@then('every book should be reported as skipped')
+def step_verify_all_books_skipped(context):
+    """Verify that the second consolidation skipped every unchanged book"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    summary = context.consolidation_report["summary"]
+    assert summary["skippedBooks"] == 3, f"Expected 3 skipped books, got {summary['skippedBooks']}"
+    assert summary["newBooks"] == 0 and summary["updatedBooks"] == 0, f"Expected no new or updated books: {summary}"
+    assert summary["bytesCopied"] == 0, f"Skipped books should not copy bytes, copied {summary['bytesCopied']}"
+
+
+@then('the consolidated books should not be rewritten')
+def step_verify_books_not_rewritten(context):
+    """Verify that skipped books keep their last write times"""
+    assert get_book_write_times(context.target_dir) == context.book_write_times, "Unchanged books were rewritten"
+
+
+@then('only the changed collection should be reported as updated')
+def step_verify_changed_collection_updated(context):
+    """Verify that the collection with the changed chapter was merged again"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    updated = [os.path.basename(b["sourcePath"]) for b in context.consolidation_report["books"] if b["change"] == "updated"]
+    assert updated == ["Handbook"], f"Expected only Handbook to be updated, got {updated}"
+    assert context.consolidation_report["summary"]["updatedBooks"] == 1
+
+
+@then('the other books should be reported as skipped')
+def step_verify_other_books_skipped(context):
+    """Verify that the books with unchanged sources were skipped"""
+    skipped = sorted(os.path.basename(b["sourcePath"]) for b in context.consolidation_report["books"] if b["status"] == "skipped")
+    assert skipped == ["Domain Driven Design.pdf", "Refactoring.pdf"], f"Unexpected skipped books: {skipped}"
+    for name in skipped:
+        assert get_book_write_times(context.target_dir)[name] == context.book_write_times[name], f"{name} was rewritten"
+
+
+@then('the updated merged PDF should contain the changed chapter')
+def step_verify_updated_merged_pdf(context):
+    """Verify that the merged PDF was rebuilt from the changed chapter"""
+    page_count = count_pdf_pages(os.path.join(context.target_dir, "Handbook.pdf"))
+    assert page_count == 4, f"Handbook.pdf should have 4 pages after the update, but has {page_count}"
+
+
+@then('every book should be reported as updated')
+def step_verify_all_books_updated(context):
+    """Verify that a full consolidation reprocessed every book"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    summary = context.consolidation_report["summary"]
+    assert summary["updatedBooks"] == 3, f"Expected 3 updated books, got {summary['updatedBooks']}"
+    assert summary["skippedBooks"] == 0, f"Expected no skipped books, got {summary['skippedBooks']}"
+
+
+@then('the consolidated books should be hard links to their source PDF files')
+def step_verify_books_hard_linked(context):
+    """Verify that every copied book shares its data with its source PDF"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    for source_path in context.created_files:
+        target_path = os.path.join(context.target_dir, os.path.basename(source_path))
+        assert os.path.exists(target_path), f"Book was not consolidated: {target_path}"
+        assert os.path.samefile(source_path, target_path), f"{target_path} is not a hard link to {source_path}"
+
+
+@then('the "none" compression profile should save no bytes')
+def step_verify_no_compression_savings(context):
+    """Verify that merging without compression reports no saved bytes"""
+    summary = context.compression_reports["none"]
+    assert summary["collectionsMerged"] == 2, f"Expected 2 merged collections, got {summary['collectionsMerged']}"
+    assert summary["compressionSavedBytes"] == 0, f"Uncompressed merges should not save bytes: {summary}"
+
+
+@then('the "standard" compression profile should write smaller merged PDFs than the "none" profile')
+def step_verify_standard_compression(context):
+    """Verify that the standard profile compresses the uncompressed page content"""
+    summary = context.compression_reports["standard"]
+    uncompressed_bytes = context.compression_reports["none"]["mergedOutputBytes"]
+    assert summary["compressionSavedBytes"] > 0, f"Standard compression saved no bytes: {summary}"
+    assert summary["mergedOutputBytes"] < uncompressed_bytes, \
+        f"Standard compression wrote {summary['mergedOutputBytes']} bytes, uncompressed merges {uncompressed_bytes}"
+
+
+@then('the "maximum" compression profile should pack objects into object and cross-reference streams')
+def step_verify_maximum_compression(context):
+    """Verify that the maximum profile writes object streams and a cross-reference stream"""
+    summary = context.compression_reports["maximum"]
+    assert summary["compressionSavedBytes"] > 0, f"Maximum compression saved no bytes: {summary}"
+    for merged_pdf in merged_pdf_paths(context.compression_target_dirs["maximum"]):
+        with open(merged_pdf, 'rb') as f:
+            content = f.read()
+        assert b"/Type/ObjStm" in content, f"{merged_pdf} has no object stream"
+        assert b"/Type/XRef" in content, f"{merged_pdf} has no cross-reference stream"
+
+
+@then('the merged PDFs of every compression profile should contain all pages')
+def step_verify_compressed_page_counts(context):
+    """Verify that every merged PDF of every profile still reads with all its pages"""
+    for profile, target_dir in context.compression_target_dirs.items():
+        merged_pdfs = merged_pdf_paths(target_dir)
+        assert len(merged_pdfs) == 2, f"Expected 2 merged PDFs with {profile} compression, found {merged_pdfs}"
+        for merged_pdf in merged_pdfs:
+            page_count = count_pdf_pages(merged_pdf)
+            assert page_count == 9, f"{merged_pdf} should have 9 pages with {profile} compression, but has {page_count}"
+
+
+def merged_pdf_paths(directory):
+    """List the merged PDFs of the compression scenario in a bookshelf directory"""
+    return sorted(
+        os.path.join(directory, f)
+        for f in os.listdir(directory)
+        if f.startswith("Compressible") and f.endswith('.pdf')
+    )
+
+
+@then('only one of the byte-identical PDF files should be consolidated')
+def step_verify_single_duplicate_output(context):
+    """Verify that the byte-identical root PDFs became a single book"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    outputs = [f for f in ["Clean Code.pdf", "Clean Code Duplicate.pdf"] if os.path.exists(os.path.join(context.target_dir, f))]
+    assert len(outputs) == 1, f"Expected one of the byte-identical PDFs in the bookshelf, found {outputs}"
+
+
+@then('the left out PDF file should be reported as a duplicate with its size as deduplicated bytes')
+def step_verify_duplicate_reported(context):
+    """Verify that the report names the duplicate book and the bytes it left out"""
+    summary = context.consolidation_report["summary"]
+    assert summary["duplicateBooks"] == 1, f"Expected 1 duplicate book, got {summary['duplicateBooks']}"
+
+    duplicates = [b for b in context.consolidation_report["books"] if b["status"] == "duplicate"]
+    assert len(duplicates) == 1, f"Expected 1 duplicate book record, found {duplicates}"
+    duplicate = duplicates[0]
+    file_size = os.path.getsize(duplicate["sourcePath"])
+    assert duplicate["duplicateOf"], f"The duplicate does not name the book it duplicates: {duplicate}"
+    assert duplicate["bytesDeduplicated"] == file_size, \
+        f"Expected {file_size} deduplicated bytes for the duplicate, got {duplicate['bytesDeduplicated']}"
+
+
+@then('the merged collection should leave out the byte-identical chapter')
+def step_verify_duplicate_chapter_left_out(context):
+    """Verify that the merged collection contains the repeated chapter once"""
+    page_count = count_pdf_pages(os.path.join(context.target_dir, "Dedup Handbook.pdf"))
+    assert page_count == 5, f"Dedup Handbook.pdf should have 5 pages without the repeated chapter, but has {page_count}"
+
+    collection = next(b for b in context.consolidation_report["books"] if b["name"] == "Dedup Handbook")
+    chapter_size = os.path.getsize(os.path.join(context.source_dir, "Dedup Handbook", "chapter3.pdf"))
+    assert collection["bytesDeduplicated"] == chapter_size, \
+        f"Expected {chapter_size} deduplicated bytes for the collection, got {collection['bytesDeduplicated']}"
+
+
+@then('the bookshelf should be the same as after the first consolidation')
+def step_verify_bookshelf_unchanged(context):
+    """Verify that consolidating again keeps the deduplicated bookshelf as it was"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    contents = get_bookshelf_contents(context.target_dir)
+    assert contents == context.first_bookshelf_contents, \
+        f"Bookshelf changed from {context.first_bookshelf_contents} to {contents}"
+    duplicate_books = context.consolidation_report["summary"]["duplicateBooks"]
+    assert duplicate_books == 1, f"Expected the duplicate to be left out again, got {duplicate_books} duplicates"
+
+
+@then('the merged PDF should be much smaller than its chapters together')
+def step_verify_shared_images_written_once(context):
+    """Verify that the images every chapter embeds are written to the merged PDF once"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    summary = context.consolidation_report["summary"]
+    source_bytes = summary["mergedSourceBytes"]
+    output_bytes = summary["mergedOutputBytes"]
+    assert source_bytes > 0, f"No merged sources reported: {summary}"
+    # Each chapter carries a full copy of the images, the merged PDF should keep about one of them
+    assert output_bytes * 2 < source_bytes, \
+        f"Merged PDF has {output_bytes} bytes for {source_bytes} bytes of chapters, shared images were not written once"
+
+
+@then('the merged PDF should contain every page of the chapters')
+def step_verify_shared_image_pages(context):
+    """Verify that writing shared images once keeps every page"""
+    page_count = count_pdf_pages(os.path.join(context.target_dir, "Illustrated Handbook.pdf"))
+    expected_pages = SHARED_IMAGE_CHAPTERS * 2
+    assert page_count == expected_pages, f"Illustrated Handbook.pdf should have {expected_pages} pages, but has {page_count}"
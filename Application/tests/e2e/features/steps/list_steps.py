@@ -1,6 +1,7 @@
 """
 Step definitions for US0002 - Bookshelf List
 """
+import json
 import os
 import subprocess
 from pathlib import Path
@@ -9,7 +10,7 @@ import sys
 
 # Add parent directory to path to import pdf_helpers
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from pdf_helpers import create_simple_pdf
+from pdf_helpers import PdfSpec
 
 
 # ========== GIVEN steps ==========
@@ -21,30 +22,12 @@ def step_create_bookshelf_with_pdfs(context):
     context.bookshelf_dir = context.target_dir
     
     # Create multiple PDF files with different sizes and titles
-    create_simple_pdf(
-        os.path.join(context.bookshelf_dir, "Advanced Python.pdf"),
-        title="Advanced Python",
-        author="Python Author",
-        pages=3
-    )
-    create_simple_pdf(
-        os.path.join(context.bookshelf_dir, "Clean Code.pdf"),
-        title="Clean Code",
-        author="Robert Martin",
-        pages=5
-    )
-    create_simple_pdf(
-        os.path.join(context.bookshelf_dir, "Design Patterns.pdf"),
-        title="Design Patterns",
-        author="Gang of Four",
-        pages=4
-    )
-    create_simple_pdf(
-        os.path.join(context.bookshelf_dir, "Java Intro.pdf"),
-        title="Java Intro",
-        author="Java Author",
-        pages=2
-    )
+    context.fixtures.materialize([
+        PdfSpec("Advanced Python.pdf", title="Advanced Python", author="Python Author", pages=3),
+        PdfSpec("Clean Code.pdf", title="Clean Code", author="Robert Martin", pages=5),
+        PdfSpec("Design Patterns.pdf", title="Design Patterns", author="Gang of Four", pages=4),
+        PdfSpec("Java Intro.pdf", title="Java Intro", author="Java Author", pages=2),
+    ], context.bookshelf_dir)
 
 
 @given('I have a bookshelf with multiple books')
@@ -53,30 +36,12 @@ def step_create_bookshelf_with_books(context):
     context.bookshelf_dir = context.target_dir
     
     # Create books with various titles
-    create_simple_pdf(
-        os.path.join(context.bookshelf_dir, "Python Basics.pdf"),
-        title="Python Basics",
-        author="Python Author",
-        pages=2
-    )
-    create_simple_pdf(
-        os.path.join(context.bookshelf_dir, "Advanced Python.pdf"),
-        title="Advanced Python",
-        author="Python Expert",
-        pages=4
-    )
-    create_simple_pdf(
-        os.path.join(context.bookshelf_dir, "Java Programming.pdf"),
-        title="Java Programming",
-        author="Java Author",
-        pages=3
-    )
-    create_simple_pdf(
-        os.path.join(context.bookshelf_dir, "C Sharp Guide.pdf"),
-        title="C# Guide",
-        author="Microsoft Author",
-        pages=5
-    )
+    context.fixtures.materialize([
+        PdfSpec("Python Basics.pdf", title="Python Basics", author="Python Author", pages=2),
+        PdfSpec("Advanced Python.pdf", title="Advanced Python", author="Python Expert", pages=4),
+        PdfSpec("Java Programming.pdf", title="Java Programming", author="Java Author", pages=3),
+        PdfSpec("C Sharp Guide.pdf", title="C# Guide", author="Microsoft Author", pages=5),
+    ], context.bookshelf_dir)
 
 
 @given('I have an empty bookshelf directory')
@@ -213,6 +178,36 @@ def step_run_list_command_with_sort(context):
         raise AssertionError(f"Failed to run command: {e}")
 
 
+@when('I request to list all books with details as "{output_format}"')
+def step_run_list_command_with_output_format(context, output_format):
+    """Execute the bookshelf list command with --details and a machine-readable output format"""
+    cmd = [
+        context.cli_path,
+        "list",
+        context.bookshelf_dir,
+        "--details",
+        "--output", output_format
+    ]
+    
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+        context.command_output = result.stdout
+        context.command_exit_code = result.returncode
+        
+        if result.stderr:
+            print(f"STDERR:\n{result.stderr}")
+            
+    except subprocess.TimeoutExpired:
+        raise AssertionError("Command timed out after 60 seconds")
+    except Exception as e:
+        raise AssertionError(f"Failed to run command: {e}")
+
+
 # ========== THEN steps ==========
 
 @then('I should see a list of all book titles')
@@ -348,3 +343,43 @@ def step_verify_add_instructions(context):
     output_lower = context.command_output.lower()
     # Check for instructional content
     assert "consolidate" in output_lower or "copy" in output_lower or "add" in output_lower, "No instructions for adding books found"
+
+
+@then('the output should be a JSON array with one record per book')
+def step_verify_json_array(context):
+    """Verify that the output is one JSON array holding a record per book"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    records = json.loads(context.command_output)
+    assert isinstance(records, list), f"Expected a JSON array, got {type(records).__name__}"
+    assert len(records) == 4, f"Expected 4 book records, found {len(records)}"
+    context.book_records = records
+
+
+@then('each output line should be a JSON record of type "{record_type}"')
+def step_verify_ndjson_records(context, record_type):
+    """Verify that every output line is a JSON record of the given type"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    records = [json.loads(line) for line in context.command_output.splitlines() if line.strip()]
+    assert len(records) == 4, f"Expected 4 book records, found {len(records)}"
+    for record in records:
+        assert record.get("type") == record_type, f"Unexpected record type: {record}"
+    context.book_records = records
+
+
+@then('each book record should include the title, path, size, creation date and page count')
+def step_verify_book_record_fields(context):
+    """Verify the fields of every book record"""
+    expected_page_counts = {"Advanced Python": 3, "Clean Code": 5, "Design Patterns": 4, "Java Intro": 2}
+    for record in context.book_records:
+        assert record["title"] in expected_page_counts, f"Unexpected book: {record['title']}"
+        assert os.path.samefile(os.path.dirname(record["path"]), context.bookshelf_dir), f"Unexpected path: {record['path']}"
+        assert record["sizeBytes"] == os.path.getsize(record["path"]), f"Wrong size in {record}"
+        assert record["creationDate"], f"Missing creation date in {record}"
+        assert record["pageCount"] == expected_page_counts[record["title"]], f"Wrong page count in {record}"
+
+
+@then('the book records should be in alphabetical order by title')
+def step_verify_book_records_order(context):
+    """Verify that the book records are sorted by title"""
+    titles = [record["title"] for record in context.book_records]
+    assert titles == sorted(titles, key=str.lower), f"Books are not sorted by title: {titles}"
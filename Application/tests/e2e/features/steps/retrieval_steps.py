@@ -0,0 +1,96 @@
+"""
+Step definitions for US0004 - Create RAG AI Agent
+"""
+import os
+from pathlib import Path
+from behave import given, when, then
+import sys
+
+# Add parent directory to path to import command_helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from command_helpers import run_json_command
+
+
+# ========== GIVEN steps ==========
+
+@given('I have embedded a bookshelf with books about different topics')
+def step_create_embedded_bookshelf(context):
+    """Create a bookshelf with books about different topics and embed it"""
+    context.execute_steps('Given I have a bookshelf with books about different topics')
+    run_json_command(context, "embed", context.bookshelf_dir)
+    assert context.command_exit_code == 0, f"Embedding failed with exit code {context.command_exit_code}"
+
+
+# ========== WHEN steps ==========
+
+@when('I embed the bookshelf')
+def step_run_embed_command(context):
+    """Execute the bookshelf embed command"""
+    run_json_command(context, "embed", context.bookshelf_dir)
+
+
+@when('I retrieve passages for "{question}"')
+def step_run_retrieve_command(context, question):
+    """Execute the bookshelf retrieve command"""
+    run_json_command(context, "retrieve", context.bookshelf_dir, question)
+
+
+# ========== THEN steps ==========
+
+@then('every book should be embedded into the vector index')
+def step_verify_all_books_embedded(context):
+    """Verify that the first embed run embedded every book"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    summary = context.json_report["summary"]
+    book_count = count_books(context.bookshelf_dir)
+    assert summary["success"], f"Embedding failed: {summary['errorMessage']}"
+    assert summary["bookCount"] == book_count, f"Expected {book_count} books in the vector index: {summary}"
+    assert summary["embeddedBooks"] == book_count, f"Expected every book to be embedded: {summary}"
+    assert summary["failedBooks"] == 0, f"Expected no failed books: {summary}"
+    assert summary["chunkCount"] > 0, f"Expected passages in the vector index: {summary}"
+
+
+@then('only the new book should be embedded into the vector index')
+def step_verify_new_book_embedded(context):
+    """Verify that embedding again embedded only the added book and reused the others"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    summary = context.json_report["summary"]
+    book_count = count_books(context.bookshelf_dir)
+    assert summary["bookCount"] == book_count, f"Expected the new book in the vector index: {summary}"
+    assert summary["embeddedBooks"] == 1, f"Expected only the new book to be embedded: {summary}"
+    assert summary["reusedBooks"] == book_count - 1, f"Expected the unchanged books to be reused: {summary}"
+
+
+@then('every retrieved passage should come from "{title}"')
+def step_verify_passage_titles(context, title):
+    """Verify that the retrieved passages come from a single book"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    titles = [passage["title"] for passage in context.json_report["passages"]]
+    assert titles, "No passages were retrieved"
+    assert all(t == title for t in titles), f"Expected passages from {title}, found {titles}"
+
+
+@then('every retrieved passage should cite its page number')
+def step_verify_passage_pages(context):
+    """Verify that the retrieved passages cite pages of their book, most similar first"""
+    passages = context.json_report["passages"]
+    for passage in passages:
+        assert passage["page"] >= 1, f"Passage without a page number: {passage}"
+        assert passage["text"], f"Passage without text: {passage}"
+        assert os.path.exists(passage["path"]), f"Passage of a missing book: {passage['path']}"
+    scores = [passage["score"] for passage in passages]
+    assert scores == sorted(scores, reverse=True), f"Passages are not ordered by similarity: {scores}"
+
+
+@then('no passages should be retrieved')
+def step_verify_no_passages(context):
+    """Verify that a question unrelated to the bookshelf retrieves nothing"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    passages = context.json_report["passages"]
+    assert passages == [], f"Expected no passages, found {passages}"
+    assert context.json_report["summary"]["passageCount"] == 0
+
+
+def count_books(directory):
+    """Count the PDF files in a bookshelf directory"""
+    return len([f for f in os.listdir(directory) if f.endswith('.pdf')])
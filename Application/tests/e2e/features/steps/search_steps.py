@@ -0,0 +1,113 @@
+"""
+Step definitions for US0006 - Bookshelf Search
+"""
+from pathlib import Path
+from behave import given, when, then
+import sys
+
+# Add parent directory to path to import pdf_helpers and command_helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pdf_helpers import PdfSpec, count_pdf_pages
+from command_helpers import run_json_command
+
+
+# The books of the bookshelf, which mention their title and author on every page
+TOPIC_BOOKS = [
+    PdfSpec("Kubernetes in Action.pdf", title="Kubernetes in Action", author="Marko Luksa", pages=3),
+    PdfSpec("Clean Code.pdf", title="Clean Code", author="Robert Martin", pages=2),
+    PdfSpec("Refactoring.pdf", title="Refactoring", author="Martin Fowler", pages=2),
+]
+
+# The book added after the bookshelf was indexed
+NEW_BOOK = PdfSpec("Site Reliability Engineering.pdf", title="Site Reliability Engineering", author="Betsy Beyer", pages=2)
+
+
+# ========== GIVEN steps ==========
+
+@given('I have a bookshelf with books about different topics')
+def step_create_bookshelf_with_topics(context):
+    """Create a bookshelf directory with books about different topics"""
+    context.bookshelf_dir = context.target_dir
+    context.fixtures.materialize(TOPIC_BOOKS, context.bookshelf_dir)
+
+
+@given('I have indexed a bookshelf with books about different topics')
+def step_create_indexed_bookshelf(context):
+    """Create a bookshelf with books about different topics and index it"""
+    step_create_bookshelf_with_topics(context)
+    run_json_command(context, "index", context.bookshelf_dir)
+    assert context.command_exit_code == 0, f"Indexing failed with exit code {context.command_exit_code}"
+
+
+@given('a new book has been added to the bookshelf')
+def step_add_new_book(context):
+    """Add a book to the bookshelf after it was indexed"""
+    context.fixtures.materialize([NEW_BOOK], context.bookshelf_dir)
+
+
+# ========== WHEN steps ==========
+
+@when('I index the bookshelf')
+def step_run_index_command(context):
+    """Execute the bookshelf index command"""
+    run_json_command(context, "index", context.bookshelf_dir)
+
+
+@when('I search the bookshelf for "{query}"')
+def step_run_search_command(context, query):
+    """Execute the bookshelf search command"""
+    run_json_command(context, "search", context.bookshelf_dir, query)
+
+
+# ========== THEN steps ==========
+
+@then('every book should be extracted into the index')
+def step_verify_all_books_extracted(context):
+    """Verify that the first index run extracted every book"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    summary = context.json_report["summary"]
+    assert summary["success"], f"Indexing failed: {summary['errorMessage']}"
+    assert summary["bookCount"] == len(TOPIC_BOOKS), f"Expected {len(TOPIC_BOOKS)} indexed books: {summary}"
+    assert summary["extractedBooks"] == len(TOPIC_BOOKS), f"Expected every book to be extracted: {summary}"
+    assert summary["failedBooks"] == 0, f"Expected no failed books: {summary}"
+
+
+@then('only the new book should be extracted into the index')
+def step_verify_new_book_extracted(context):
+    """Verify that indexing again extracted only the added book"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    summary = context.json_report["summary"]
+    assert summary["bookCount"] == len(TOPIC_BOOKS) + 1, f"Expected the new book to be indexed: {summary}"
+    assert summary["extractedBooks"] == 1, f"Expected only the new book to be extracted: {summary}"
+
+
+@then('the other books should be reused from the index')
+def step_verify_books_reused(context):
+    """Verify that indexing again reused the unchanged books"""
+    summary = context.json_report["summary"]
+    assert summary["reusedBooks"] == len(TOPIC_BOOKS), f"Expected the unchanged books to be reused: {summary}"
+
+
+@then('the search should only find "{title}"')
+def step_verify_search_hits(context, title):
+    """Verify that the search found a single book"""
+    assert context.command_exit_code == 0, f"Command failed with exit code {context.command_exit_code}"
+    titles = [hit["title"] for hit in context.json_report["hits"]]
+    assert titles == [title], f"Expected only {title}, found {titles}"
+    assert context.json_report["summary"]["totalHits"] == 1
+
+
+@then('the hit should list every page of "{title}"')
+def step_verify_hit_pages(context, title):
+    """Verify that the hit lists the pages of the book mentioning the query"""
+    hit = context.json_report["hits"][0]
+    expected_pages = list(range(1, count_pdf_pages(hit["path"]) + 1))
+    assert hit["title"] == title, f"Unexpected hit: {hit['title']}"
+    assert hit["pages"] == expected_pages, f"Expected pages {expected_pages}, found {hit['pages']}"
+
+
+@then('the search should report {count:d} book changed since the bookshelf was indexed')
+def step_verify_stale_books(context, count):
+    """Verify that the search reports the books changed since the index was built"""
+    stale_books = context.json_report["summary"]["staleBooks"]
+    assert stale_books == count, f"Expected {count} changed books, found {stale_books}"
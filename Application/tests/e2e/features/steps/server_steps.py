@@ -0,0 +1,119 @@
+"""
+Step definitions for the bookshelf server
+"""
+import json
+import os
+import stat
+import subprocess
+from pathlib import Path
+from behave import given, when, then
+import sys
+
+# Add parent directory to path to import server_helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from server_helpers import start_server, stop_server
+
+
+# ========== GIVEN steps ==========
+
+@given('a bookshelf server is running')
+def step_start_bookshelf_server(context):
+    """Start a bookshelf server on a socket in the scenario's temporary directory"""
+    context.server_socket_path = os.path.join(context.temp_dir, "bookshelf.sock")
+    context.scenario_server_process = start_server(context.cli_path, context.server_socket_path)
+
+
+# ========== WHEN steps ==========
+
+@when('I request to list all books with details as "{output_format}" through the bookshelf server')
+def step_run_list_command_through_server(context, output_format):
+    """Execute the bookshelf list command on the scenario's server"""
+    result = run_list_command(
+        context,
+        output_format,
+        f"--server={context.server_socket_path}"
+    )
+    context.command_output = result.stdout
+    context.command_exit_code = result.returncode
+
+
+@when('I stop the bookshelf server')
+def step_stop_bookshelf_server(context):
+    """Stop the bookshelf server the way Ctrl+C does"""
+    assert os.path.exists(context.server_socket_path), "The server socket does not exist while the server runs"
+    stop_server(context.scenario_server_process)
+
+
+# ========== THEN steps ==========
+
+@then('the output should match listing all books with details as "{output_format}" without the server')
+def step_verify_output_matches_in_process_listing(context, output_format):
+    """Verify that the server lists the same books as a command running in its own process"""
+    result = run_list_command(context, output_format)
+    assert result.returncode == 0, f"In-process list command failed with exit code {result.returncode}"
+    assert json.loads(context.command_output) == json.loads(result.stdout), "Server and in-process listings differ"
+
+
+@then('only the current user should be able to access the bookshelf server socket')
+def step_verify_socket_permissions(context):
+    """Verify that the server socket is owned by and private to the current user"""
+    socket_stat = os.stat(context.server_socket_path)
+    assert stat.S_ISSOCK(socket_stat.st_mode), f"{context.server_socket_path} is not a socket"
+    assert socket_stat.st_uid == os.getuid(), "The server socket is owned by another user"
+    socket_mode = stat.S_IMODE(socket_stat.st_mode)
+    assert socket_mode == 0o600, f"Expected socket mode 0600, found {socket_mode:04o}"
+
+
+@then('the bookshelf server should exit successfully')
+def step_verify_server_exit_code(context):
+    """Verify that the stopped server exited without an error"""
+    exit_code = context.scenario_server_process.returncode
+    assert exit_code == 0, f"The bookshelf server exited with code {exit_code}"
+
+
+@then('the bookshelf server socket should be removed')
+def step_verify_socket_removed(context):
+    """Verify that the stopped server removed its socket"""
+    assert not os.path.lexists(context.server_socket_path), "The server left its socket behind"
+
+
+def run_list_command(context, output_format, *options):
+    """
+    Runs the bookshelf list command with details in a machine-readable format
+    
+    Args:
+        context: The behave context holding the bookshelf directory
+        output_format: The output format, json or ndjson
+        options: Additional command line options
+        
+    Returns:
+        The completed process
+    """
+    cmd = [
+        context.cli_path,
+        "list",
+        context.bookshelf_dir,
+        "--details",
+        "--output", output_format,
+        *options
+    ]
+
+    # Without --server, a server configured for the whole run must not receive the command
+    env = dict(os.environ)
+    env.pop("BOOKSHELF_SERVER", None)
+
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=60,
+            env=env
+        )
+        
+        if result.stderr:
+            print(f"STDERR:\n{result.stderr}")
+            
+        return result
+    except subprocess.TimeoutExpired:
+        raise AssertionError("Command timed out after 60 seconds")
@@ -1,26 +1,52 @@
 """
 Helper utilities for creating test PDF files
 """
+import hashlib
+import json
 import os
+import random
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
+from PIL import Image
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
 from pypdf import PdfReader, PdfWriter
 
 
-def create_simple_pdf(file_path: str, title: str = "", author: str = "", pages: int = 1):
+# Bump when create_image_pdf changes its output, so PDFs cached by an older version are not reused
+FIXTURE_CACHE_VERSION = 1
+
+
+def create_image_pdf(file_path: str, title: str = "", author: str = "", pages: int = 1,
+                     image_kilobytes: int = 0, seed: int = 0, page_compression: bool = True):
     """
-    Creates a simple PDF file with the given number of pages
+    Creates a PDF file whose pages each embed an image of random pixels
+
+    The pixels are drawn from a generator seeded with the given seed, so the same arguments always create
+    the same file. Random pixels do not compress, so each page adds about the requested image weight
+    to the file, and every page gets its own pixels so the image is not stored once for all pages.
     
     Args:
         file_path: The path where the PDF should be created
         title: The PDF title metadata
         author: The PDF author metadata
         pages: The number of pages to create
+        image_kilobytes: The approximate weight of the image on each page, 0 for text-only pages
+        seed: The seed of the random pixels
+        page_compression: Whether the page content streams are compressed
     """
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    remove_existing_file(file_path)
+    
+    generator = random.Random(seed)
+    image_side = int((image_kilobytes * 1024 / 3) ** 0.5)
     
-    c = canvas.Canvas(file_path, pagesize=letter)
+    # Invariant output leaves out the creation date and document ID, so the file is identical on every run
+    c = canvas.Canvas(file_path, pagesize=letter, invariant=1, pageCompression=1 if page_compression else 0)
     
     # Set metadata
     if title:
@@ -33,12 +59,235 @@ def create_simple_pdf(file_path: str, title: str = "", author: str = "", pages:
         c.drawString(100, 750, f"Page {i + 1}")
         c.drawString(100, 700, f"Title: {title}")
         c.drawString(100, 650, f"Author: {author}")
+        if image_side > 0:
+            pixels = generator.randbytes(image_side * image_side * 3)
+            image = Image.frombytes("RGB", (image_side, image_side), pixels)
+            c.drawImage(ImageReader(image), 100, 200, width=400, height=400)
         if i < pages - 1:
             c.showPage()
     
     c.save()
 
 
+def remove_existing_file(file_path: str):
+    """
+    Removes a file before it is written again
+
+    Writing to an existing path would write through to every hard link of the file, which would change
+    the cached fixture it was linked from. Removing it first only drops this link.
+    
+    Args:
+        file_path: The path of the file
+    """
+    if os.path.lexists(file_path):
+        os.remove(file_path)
+
+
+@dataclass(frozen=True)
+class PdfSpec:
+    """
+    Describes a PDF fixture and where it goes
+    
+    Attributes:
+        relative_path: The path of the PDF relative to the directory it is placed in
+        title: The PDF title metadata
+        author: The PDF author metadata
+        pages: The number of pages
+        image_kilobytes: The approximate weight of the image on each page, 0 for text-only pages
+        seed: The seed of the image pixels
+        page_compression: Whether the page content streams are compressed, as reportlab does by default
+    """
+    relative_path: str
+    title: str = ""
+    author: str = ""
+    pages: int = 1
+    image_kilobytes: int = 0
+    seed: int = 0
+    page_compression: bool = True
+
+    def content_key(self) -> str:
+        """
+        Hashes the parameters that determine the content of the PDF, so equal PDFs share one cache entry
+        
+        Returns:
+            The hex digest of the content parameters
+        """
+        parameters = {
+            "version": FIXTURE_CACHE_VERSION,
+            "title": self.title,
+            "author": self.author,
+            "pages": self.pages,
+            "image_kilobytes": self.image_kilobytes,
+            "seed": self.seed,
+            "page_compression": self.page_compression,
+        }
+        return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class PdfFixtureFactory:
+    """
+    Builds PDF fixtures across a process pool and hard-links them from a content-addressed cache
+    
+    PDFs are generated once per content key and kept in the cache directory, which survives scenarios and
+    test runs. Placing a PDF hard-links the cached file, or copies it where the file system cannot link,
+    so repeated fixtures cost a directory entry instead of a reportlab run. Placed fixtures share their
+    data with the cache, so they must be replaced rather than written to, as the helpers in this module do.
+    
+    The factory holds a process pool once a PDF has to be generated; close it, or use it as a context
+    manager, when done.
+    """
+
+    def __init__(self, cache_dir: str = None, workers: int = None):
+        """
+        Args:
+            cache_dir: The cache directory, defaults to $BOOKSHELF_FIXTURE_CACHE or a directory in the temp directory
+            workers: The number of generating processes, defaults to the number of CPUs
+        """
+        self.cache_dir = (
+            cache_dir
+            or os.environ.get("BOOKSHELF_FIXTURE_CACHE")
+            or os.path.join(tempfile.gettempdir(), "bookshelf_fixture_cache")
+        )
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Shuts down the process pool
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def cache_path(self, spec: PdfSpec) -> str:
+        """
+        Gets the path of the cached PDF of a spec
+        
+        Args:
+            spec: The PDF spec
+            
+        Returns:
+            The path in the cache directory, sharded by the first two characters of the content key
+        """
+        key = spec.content_key()
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pdf")
+
+    def materialize(self, specs, target_dir: str) -> list:
+        """
+        Places the PDFs of the specs below the target directory, generating the ones missing from the cache
+        
+        The specs are consumed as they are produced, so a generator can describe a corpus of any size. At most
+        a few generations per worker are in flight, and each PDF is placed as soon as it is in the cache.
+        
+        Args:
+            specs: An iterable of PdfSpec
+            target_dir: The directory the relative paths of the specs are resolved against
+            
+        Returns:
+            The paths of the placed PDFs, in the order of the specs
+        """
+        max_in_flight = self.workers * 4
+        placed_paths = []
+        in_flight = {}
+
+        for spec in specs:
+            target_path = os.path.join(target_dir, spec.relative_path)
+            placed_paths.append(target_path)
+            cache_path = self.cache_path(spec)
+
+            if cache_path in in_flight:
+                in_flight[cache_path][1].append(target_path)
+                continue
+
+            if os.path.exists(cache_path):
+                link_or_copy(cache_path, target_path)
+                continue
+
+            future = self._get_executor().submit(build_cached_pdf, spec, cache_path)
+            in_flight[cache_path] = (future, [target_path])
+
+            if len(in_flight) >= max_in_flight:
+                self._place_completed(in_flight)
+
+        while in_flight:
+            self._place_completed(in_flight)
+
+        return placed_paths
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Gets the process pool, starting it on first use
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    @staticmethod
+    def _place_completed(in_flight: dict):
+        """
+        Waits for at least one generation to complete and places the PDFs of all completed ones, raising
+        the error of a failed generation
+        """
+        done, _ = wait([future for future, _ in in_flight.values()], return_when=FIRST_COMPLETED)
+        for cache_path in [path for path, (future, _) in in_flight.items() if future in done]:
+            future, target_paths = in_flight.pop(cache_path)
+            future.result()
+            for target_path in target_paths:
+                link_or_copy(cache_path, target_path)
+
+
+def build_cached_pdf(spec: PdfSpec, cache_path: str):
+    """
+    Generates the PDF of a spec into the cache, unless another process already did
+    
+    The PDF is written to a temporary file and renamed into place, so a concurrent or interrupted run
+    never leaves a partial PDF in the cache.
+    
+    Args:
+        spec: The PDF spec
+        cache_path: The path of the cached PDF
+    """
+    if os.path.exists(cache_path):
+        return
+
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        create_image_pdf(
+            temp_path,
+            title=spec.title,
+            author=spec.author,
+            pages=spec.pages,
+            image_kilobytes=spec.image_kilobytes,
+            seed=spec.seed,
+            page_compression=spec.page_compression
+        )
+        os.replace(temp_path, cache_path)
+    finally:
+        remove_existing_file(temp_path)
+
+
+def link_or_copy(source_path: str, target_path: str):
+    """
+    Hard-links a file to a new path, copying it where the file system cannot link
+    
+    Args:
+        source_path: The existing file
+        target_path: The new path, replaced if it exists
+    """
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    remove_existing_file(target_path)
+    try:
+        os.link(source_path, target_path)
+    except OSError:
+        shutil.copyfile(source_path, target_path)
+
+
 def count_pdf_pages(file_path: str) -> int:
     """
     Counts the number of pages in a PDF file
@@ -0,0 +1,65 @@
+"""
+Helper utilities for running the bookshelf server
+"""
+import signal
+import socket
+import subprocess
+import time
+
+
+# Seconds to wait for the bookshelf server to listen, and to stop
+SERVER_TIMEOUT_SECONDS = 30
+
+
+def start_server(cli_path, socket_path):
+    """
+    Starts the bookshelf server and waits until it accepts connections
+    
+    Args:
+        cli_path: The path of the CLI executable
+        socket_path: The socket the server listens on, or None to run every command in its own process
+        
+    Returns:
+        The server process, or None if no socket was given
+    """
+    if not socket_path:
+        return None
+
+    process = subprocess.Popen(
+        [cli_path, "serve", "--socket", socket_path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + SERVER_TIMEOUT_SECONDS
+    while not is_server_listening(socket_path):
+        if process.poll() is not None:
+            raise RuntimeError(f"Bookshelf server exited with code {process.returncode}")
+        if time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError(f"Bookshelf server did not listen on {socket_path}")
+        time.sleep(0.05)
+
+    return process
+
+
+def is_server_listening(socket_path):
+    """
+    Checks whether a server accepts connections on a socket, which a socket file left behind by another run does not
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+            return True
+        except OSError:
+            return False
+
+
+def stop_server(process):
+    """
+    Stops the bookshelf server the way Ctrl+C does, so it removes its socket
+    """
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=SERVER_TIMEOUT_SECONDS)
+    except subprocess.TimeoutExpired:
+        process.kill()
@@ -149,3 +149,51 @@ Feature: US0001 - Bookshelf Consolidation
     And chapters within each Teil should maintain their order
     And back matter should be placed at the end
     And the merged PDF should maintain the correct logical reading order
+
+  Scenario: Skip unchanged books when consolidating again
+    Given I have consolidated a source directory with individual PDF files and a collection
+    When I run the consolidation command again with JSON output
+    Then every book should be reported as skipped
+    And the consolidated books should not be rewritten
+
+  Scenario: Update books whose sources changed since the last consolidation
+    Given I have consolidated a source directory with individual PDF files and a collection
+    And a chapter of the collection has changed since the consolidation
+    When I run the consolidation command again with JSON output
+    Then only the changed collection should be reported as updated
+    And the other books should be reported as skipped
+    And the updated merged PDF should contain the changed chapter
+
+  Scenario: Reprocess every book with a full consolidation
+    Given I have consolidated a source directory with individual PDF files and a collection
+    When I run the consolidation command again with JSON output and the "--full" option
+    Then every book should be reported as updated
+
+  Scenario: Hard-link individual PDF files into the bookshelf
+    Given I have multiple PDF files scattered across different folders
+    When I run the consolidation command with the "--hard-link" option
+    Then the consolidated books should be hard links to their source PDF files
+    And the original files should remain unchanged in their source locations
+
+  Scenario: Compress merged collections with the compression profiles
+    Given I have collection folders whose chapters have uncompressed page content
+    When I consolidate the collections with each compression profile
+    Then the "none" compression profile should save no bytes
+    And the "standard" compression profile should write smaller merged PDFs than the "none" profile
+    And the "maximum" compression profile should pack objects into object and cross-reference streams
+    And the merged PDFs of every compression profile should contain all pages
+
+  Scenario: Consolidate byte-identical books and chapters only once
+    Given I have byte-identical PDF files under different names and a collection with a byte-identical chapter
+    When I run the consolidation command with JSON output and the "--dedup" option
+    Then only one of the byte-identical PDF files should be consolidated
+    And the left out PDF file should be reported as a duplicate with its size as deduplicated bytes
+    And the merged collection should leave out the byte-identical chapter
+    When I run the consolidation command again with JSON output and the "--dedup" option
+    Then the bookshelf should be the same as after the first consolidation
+
+  Scenario: Write images shared by the chapters of a collection once
+    Given I have a collection whose chapters embed the same images
+    When I run the consolidation command with JSON output and the "--compression=none" option
+    Then the merged PDF should be much smaller than its chapters together
+    And the merged PDF should contain every page of the chapters
@@ -40,3 +40,31 @@ Feature: US0002 - Bookshelf List
     When I request to list all books
     Then I should see a message indicating the bookshelf is empty
     And I should see instructions on how to add books
+
+  Scenario: List books as a JSON document
+    Given I have a bookshelf with multiple PDF files
+    When I request to list all books with details as "json"
+    Then the output should be a JSON array with one record per book
+    And each book record should include the title, path, size, creation date and page count
+    And the book records should be in alphabetical order by title
+
+  Scenario: Stream books as newline-delimited JSON
+    Given I have a bookshelf with multiple PDF files
+    When I request to list all books with details as "ndjson"
+    Then each output line should be a JSON record of type "book"
+    And each book record should include the title, path, size, creation date and page count
+    And the book records should be in alphabetical order by title
+
+  Scenario: List books through a running bookshelf server
+    Given I have a bookshelf with multiple PDF files
+    And a bookshelf server is running
+    When I request to list all books with details as "json" through the bookshelf server
+    Then the output should be a JSON array with one record per book
+    And the output should match listing all books with details as "json" without the server
+    And only the current user should be able to access the bookshelf server socket
+
+  Scenario: Stop the bookshelf server
+    Given a bookshelf server is running
+    When I stop the bookshelf server
+    Then the bookshelf server should exit successfully
+    And the bookshelf server socket should be removed
@@ -0,0 +1,27 @@
+Feature: US0006 - Bookshelf Search
+  # User Story: US0006 - Bookshelf Search
+  # As a book collector with a large bookshelf
+  # I want to search the text of all my books
+  # So that I can find the books and pages that cover a topic
+
+  Scenario: Index the bookshelf and search it
+    Given I have a bookshelf with books about different topics
+    When I index the bookshelf
+    Then every book should be extracted into the index
+    When I search the bookshelf for "Kubernetes"
+    Then the search should only find "Kubernetes in Action"
+    And the hit should list every page of "Kubernetes in Action"
+
+  Scenario: Reuse unchanged books when indexing again
+    Given I have indexed a bookshelf with books about different topics
+    And a new book has been added to the bookshelf
+    When I index the bookshelf
+    Then only the new book should be extracted into the index
+    And the other books should be reused from the index
+
+  Scenario: Report books added since the bookshelf was indexed
+    Given I have indexed a bookshelf with books about different topics
+    And a new book has been added to the bookshelf
+    When I search the bookshelf for "Kubernetes"
+    Then the search should only find "Kubernetes in Action"
+    And the search should report 1 book changed since the bookshelf was indexed
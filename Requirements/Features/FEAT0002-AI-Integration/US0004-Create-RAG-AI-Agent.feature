@@ -44,3 +44,24 @@ Feature: US0004 - Create RAG AI Agent
     Then I should be able to view the source excerpts used
     And I should see the book titles and page numbers
     And I should be able to open the referenced books directly
+
+  Scenario: Embed the bookshelf and retrieve passages for a question
+    Given I have a bookshelf with books about different topics
+    When I embed the bookshelf
+    Then every book should be embedded into the vector index
+    When I retrieve passages for "Which book covers Kubernetes in Action?"
+    Then every retrieved passage should come from "Kubernetes in Action"
+    And every retrieved passage should cite its page number
+
+  Scenario: Retrieve no passages for a question unrelated to the bookshelf
+    Given I have embedded a bookshelf with books about different topics
+    When I retrieve passages for "quantum chromodynamics lattice"
+    Then no passages should be retrieved
+
+  Scenario: Embed books added to the bookshelf
+    Given I have embedded a bookshelf with books about different topics
+    And a new book has been added to the bookshelf
+    When I embed the bookshelf
+    Then only the new book should be embedded into the vector index
+    When I retrieve passages for "Site Reliability Engineering"
+    Then every retrieved passage should come from "Site Reliability Engineering"